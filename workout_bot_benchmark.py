@@ -0,0 +1,182 @@
+"""
+파티션 벤치마크 모듈
+daily_workout_records와 같은 구조의 일반 테이블과 월별 파티션 테이블에 같은 합성 데이터를 넣고,
+봇의 보고서 쿼리(queries.py)를 그대로 실행해 읽은 파티션 수와 평균 실행 시간을 비교합니다.
+MySQL 백엔드에서만 실행할 수 있습니다.
+
+합성 데이터는 여러 서버(guild)에 나눠 넣고, 쿼리는 그중 한 서버(BENCHMARK_GUILD_ID)를 조회합니다.
+
+사용법:
+    python workout_bot_benchmark.py --users 200 --days 1095 --guilds 5 --repeat 20
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from workout_bot_storage import get_storage_backend
+from workout_bot_storage.base import KST, WEEKDAY_NAMES, date_param
+from workout_bot_storage.partitions import month_definitions, add_months, MAXVALUE_DEFINITION
+
+HEAP_TABLE = 'benchmark_daily_heap'
+PARTITIONED_TABLE = 'benchmark_daily_partitioned'
+INSERT_BATCH_SIZE = 5000
+
+# 보고서 쿼리가 조회하는 서버 (합성 서버 0번)
+BENCHMARK_GUILD_ID = '0'
+
+TABLE_COLUMNS = """
+    id INT AUTO_INCREMENT,
+    guild_id VARCHAR(50) NOT NULL,
+    date DATE NOT NULL,
+    weekday VARCHAR(10) NOT NULL,
+    user_id VARCHAR(50) NOT NULL,
+    user_name VARCHAR(255) NOT NULL,
+    exercised CHAR(1) NOT NULL DEFAULT 'N',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY unique_guild_date_user (guild_id, date, user_id),
+    INDEX idx_guild_user_date (guild_id, user_id, date),
+    INDEX idx_guild_weekday (guild_id, weekday)
+"""
+
+# (쿼리 이름, 설명, 파라미터를 만드는 함수)
+BENCHMARK_QUERIES = [
+    ('count_user_workouts', "이번 주 개인 운동 일수 (!요약)",
+     lambda today: (BENCHMARK_GUILD_ID, '0', date_param(today - timedelta(days=today.weekday())), date_param(today))),
+    ('workout_rankings', "지난주 랭킹 (주간 운동왕)",
+     lambda today: (BENCHMARK_GUILD_ID, date_param(today - timedelta(days=today.weekday() + 7)),
+                    date_param(today - timedelta(days=today.weekday() + 1)))),
+    ('attendance_in_range', "최근 30일 출석 (!동기화 diff)",
+     lambda today: (BENCHMARK_GUILD_ID, date_param(today - timedelta(days=29)), date_param(today))),
+    ('export_daily_records', "지난달 전체 (!내보내기)",
+     lambda today: (BENCHMARK_GUILD_ID, date_param(add_months(today.replace(day=1), -1)),
+                    date_param(today.replace(day=1) - timedelta(days=1)))),
+    ('workout_dates_by_user_id_until', "개인 전체 운동 날짜 (연속 운동일수)",
+     lambda today: (BENCHMARK_GUILD_ID, '0', date_param(today))),
+]
+
+
+def create_tables(cursor, first_month, end_month):
+    """비교용 일반 테이블과 월별 파티션 테이블을 생성합니다"""
+    for table in (HEAP_TABLE, PARTITIONED_TABLE):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    cursor.execute(f"CREATE TABLE {HEAP_TABLE} ({TABLE_COLUMNS}, PRIMARY KEY (id)) ENGINE=InnoDB")
+    definitions = month_definitions(first_month, end_month) + [MAXVALUE_DEFINITION]
+    cursor.execute(
+        f"CREATE TABLE {PARTITIONED_TABLE} ({TABLE_COLUMNS}, PRIMARY KEY (id, date)) ENGINE=InnoDB "
+        f"PARTITION BY RANGE COLUMNS(date) ({', '.join(definitions)})"
+    )
+
+
+def load_synthetic_data(conn, cursor, users, days, today, attendance_rate, guilds=1):
+    """사용자 users명(guilds개 서버에 나눠 속함)이 최근 days일 동안 attendance_rate 확률로 운동한 기록을 두 테이블에 넣습니다"""
+    rows = []
+    row_count = 0
+
+    def flush():
+        for table in (HEAP_TABLE, PARTITIONED_TABLE):
+            cursor.executemany(
+                f"INSERT INTO {table} (guild_id, date, weekday, user_id, user_name, exercised) "
+                f"VALUES (%s, %s, %s, %s, %s, 'Y')",
+                rows
+            )
+        conn.commit()
+        rows.clear()
+
+    for offset in range(days):
+        workout_date = today - timedelta(days=offset)
+        for user in range(users):
+            if random.random() < attendance_rate:
+                rows.append((
+                    str(user % guilds), date_param(workout_date), WEEKDAY_NAMES[workout_date.weekday()],
+                    str(user), f"user{user}"
+                ))
+                row_count += 1
+                if len(rows) >= INSERT_BATCH_SIZE:
+                    flush()
+    if rows:
+        flush()
+
+    for table in (HEAP_TABLE, PARTITIONED_TABLE):
+        cursor.execute(f"ANALYZE TABLE {table}")
+        cursor.fetchall()
+    return row_count
+
+
+def explain_partitions(cursor, sql, params):
+    """EXPLAIN의 partitions 열 (읽는 파티션 수)"""
+    cursor.execute(f"EXPLAIN {sql}", params)
+    columns = [column[0] for column in cursor.description]
+    partitions = set()
+    for row in cursor.fetchall():
+        value = row[columns.index('partitions')]
+        if value:
+            partitions.update(value.split(','))
+    return len(partitions)
+
+
+def time_query(cursor, sql, params, repeat):
+    """쿼리를 repeat번 실행한 평균 시간 (밀리초)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        cursor.execute(sql, params)
+        cursor.fetchall()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일반 테이블과 월별 파티션 테이블의 보고서 쿼리 성능을 비교합니다.")
+    parser.add_argument('--users', type=int, default=200, help="합성 사용자 수 (기본: 200)")
+    parser.add_argument('--days', type=int, default=1095, help="합성 기록 기간 (일, 기본: 1095)")
+    parser.add_argument('--guilds', type=int, default=1, help="사용자를 나눠 넣을 합성 서버 수 (기본: 1)")
+    parser.add_argument('--attendance-rate', type=float, default=0.5, help="하루 운동 확률 (기본: 0.5)")
+    parser.add_argument('--repeat', type=int, default=20, help="쿼리당 반복 횟수 (기본: 20)")
+    parser.add_argument('--keep', action='store_true', help="벤치마크 테이블을 삭제하지 않고 남김")
+    args = parser.parse_args()
+
+    backend = get_storage_backend()
+    if not backend.supports_partitioning:
+        print(f"❌ {backend.name} 백엔드는 파티션을 지원하지 않습니다. DATABASE_BACKEND = \"mysql\"로 실행해주세요.")
+        sys.exit(1)
+
+    random.seed(0)
+    today = datetime.now(KST).date()
+    first_month = (today - timedelta(days=args.days)).replace(day=1)
+    end_month = add_months(today.replace(day=1), 1)
+
+    conn = backend.connect_dedicated()
+    cursor = conn.cursor()
+    try:
+        print(f"🔧 벤치마크 테이블 생성 ({first_month} ~ {end_month}, 월 파티션)")
+        create_tables(cursor, first_month, end_month)
+
+        started = time.perf_counter()
+        row_count = load_synthetic_data(conn, cursor, args.users, args.days, today, args.attendance_rate, args.guilds)
+        print(f"📥 합성 기록 {row_count}행 삽입 ({time.perf_counter() - started:.1f}초, 테이블당)")
+
+        print(f"\n{'쿼리':<40} {'일반(ms)':>10} {'파티션(ms)':>10} {'읽은 파티션':>12} {'개선':>8}")
+        for name, description, make_params in BENCHMARK_QUERIES:
+            params = make_params(today)
+            sql = backend.statement(name)
+            heap_sql = sql.replace('daily_workout_records', HEAP_TABLE)
+            partitioned_sql = sql.replace('daily_workout_records', PARTITIONED_TABLE)
+
+            heap_ms = time_query(cursor, heap_sql, params, args.repeat)
+            partitioned_ms = time_query(cursor, partitioned_sql, params, args.repeat)
+            partitions = explain_partitions(cursor, partitioned_sql, params)
+            total_partitions = len(month_definitions(first_month, end_month)) + 1
+
+            print(
+                f"{description:<40} {heap_ms:>10.2f} {partitioned_ms:>10.2f} "
+                f"{f'{partitions}/{total_partitions}':>12} {heap_ms / partitioned_ms:>7.2f}x"
+            )
+    finally:
+        if not args.keep:
+            for table in (HEAP_TABLE, PARTITIONED_TABLE):
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            print("\n🧹 벤치마크 테이블을 삭제했습니다.")
+        cursor.close()
+        conn.close()
@@ -5,23 +5,36 @@ Discord 봇의 명령어들을 정의하는 패키지입니다.
 
 모듈 구조:
 - utils.py: 공통 유틸리티 함수들
+- coalesce.py: 동시에 들어온 같은 조회를 한 번만 실행 (요청 합치기)
 - summary.py: !요약 명령어
 - statistics.py: !통계 명령어  
 - trends.py: !추세 명령어
 - sync.py: !동기화 명령어
+- sync_jobs.py: !동기화 백그라운드 작업 (진행 상황 표시, 취소)
+- export.py: !내보내기 명령어 (관리자 전용)
+- guild_settings.py: !채널설정 명령어 (서버별 운동/알림 채널, 관리자 전용)
+- dashboard.py: !대시보드 명령어 (출석이 바뀌면 갱신되는 이번 주 랭킹 메시지, 관리자 전용)
+- reminder.py: !리마인더 명령어 (운동 기록이 없는 날 22:00 개인 DM 알림 신청)
 - help.py: /도움 명령어 (slash command)
 """
 
 from .utils import (
     get_bot_footer,
     send_alert_to_channel,
-    send_error_to_error_channel
+    send_error_to_error_channel,
+    count_image_attachments,
+    parse_workout_thread_date,
+    build_workout_event
 )
 
 from .summary import setup_summary_command
 from .statistics import setup_statistics_command
 from .trends import setup_trends_command
 from .sync import setup_sync_command
+from .export import setup_export_command
+from .guild_settings import setup_guild_settings_command
+from .dashboard import setup_dashboard_command
+from .reminder import setup_reminder_command
 from .help import setup_help_command
 
 def setup_commands(client):
@@ -33,8 +46,12 @@ def setup_commands(client):
     setup_statistics_command(client)
     setup_trends_command(client)
     setup_sync_command(client)
+    setup_export_command(client)
+    setup_guild_settings_command(client)
+    setup_dashboard_command(client)
+    setup_reminder_command(client)
     setup_help_command(client)
     
     print("✅ 운동 명령어 모듈이 로드되었습니다.")
-    print("📋 등록된 명령어: /도움 (slash), !요약, !통계, !추세, !동기화")
+    print("📋 등록된 명령어: /도움 (slash), !요약, !통계, !추세, !동기화, !내보내기, !채널설정, !대시보드, !리마인더")
     print("🛡️ 명령어 에러 핸들링이 활성화되었습니다.")
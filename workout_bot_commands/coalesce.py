@@ -0,0 +1,51 @@
+"""
+요청 합치기 (Request Coalescing)
+==============================
+같은 키의 조회가 동시에 여러 번 들어오면 한 번만 계산하고 결과를 나눠 줍니다.
+월요일 랭킹 게시 직후처럼 여러 멤버가 몇 초 안에 !통계/!추세/!요약을 실행해도
+DB 조회는 키마다 한 번만 실행됩니다.
+
+- 계산은 executor에서 실행되므로 DB 조회 동안 이벤트 루프가 멈추지 않습니다.
+- 결과는 계산이 끝나는 순간까지만 공유되고 캐시되지 않습니다 (다음 요청은 새로 조회).
+- 결과는 여러 호출자가 함께 쓰므로 호출자는 결과를 수정하지 않아야 합니다.
+"""
+
+import asyncio
+from functools import partial
+
+_inflight = {}  # 키 → 진행 중인 계산 (asyncio.Future)
+_stats = {}  # 이름 → {'calls', 'computations', 'coalesced'}
+
+
+async def coalesced_call(key, func, *args):
+    """
+    같은 key로 진행 중인 계산이 있으면 그 결과를 기다리고, 없으면 func(*args)를 executor에서 실행합니다.
+
+    Args:
+        key (tuple): 첫 항목은 통계 집계용 이름 (예: ('통계', 서버 ID, 시작일, 종료일))
+        func: 동기 함수 (DB 조회)
+
+    Returns:
+        func의 반환값 (예외도 기다리던 모든 호출자에게 전달)
+    """
+    name = key[0]
+    stats = _stats.setdefault(name, {'calls': 0, 'computations': 0, 'coalesced': 0})
+    stats['calls'] += 1
+
+    future = _inflight.get(key)
+    if future is not None:
+        stats['coalesced'] += 1
+        print(f"🔗 {name} 조회 합류: 진행 중인 계산 결과를 함께 사용합니다 (누적 {stats['coalesced']}회 합류)")
+    else:
+        stats['computations'] += 1
+        future = asyncio.get_running_loop().run_in_executor(None, partial(func, *args))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # 한 호출자가 취소되어도 다른 호출자가 기다리는 계산은 계속 진행
+    return await asyncio.shield(future)
+
+
+def get_coalescing_stats():
+    """이름별 호출 수, 실제 계산 수, 합쳐진 호출 수"""
+    return {name: dict(stats) for name, stats in _stats.items()}
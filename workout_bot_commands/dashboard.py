@@ -0,0 +1,255 @@
+"""
+대시보드 명령어 모듈
+==================
+!대시보드 명령어와 대시보드 메시지 갱신을 정의합니다. (관리자 전용)
+서버마다 이번 주 랭킹과 연속 운동 현황을 보여주는 메시지를 하나 게시해 고정하고,
+출석이 바뀌면 그 메시지를 수정합니다. 멤버들은 !요약을 실행하지 않고 고정 메시지로 현황을 확인할 수 있습니다.
+
+- 출석 변경(운동 사진, 메시지 삭제, 동기화)은 mark_dashboard_dirty()로 알려 주며,
+  DASHBOARD_EDIT_INTERVAL_SECONDS 동안의 변경은 모아서 메시지를 한 번만 수정합니다.
+- 매일 자정(KST)에도 한 번 다시 그립니다 (주가 바뀌면 이번 주 랭킹 초기화).
+- 대시보드 메시지가 삭제되면 다음 갱신 때 대시보드 설정을 해제합니다.
+"""
+
+import asyncio
+import discord
+from discord.ext import commands, tasks
+from datetime import datetime, time, timedelta
+from functools import partial
+from time import monotonic
+from workout_bot_config import DASHBOARD_EDIT_INTERVAL_SECONDS
+from workout_bot_guilds import get_guild_config, set_guild_dashboard, iter_guild_configs
+from workout_bot_outbox import send_outbound, PRIORITY_SCHEDULED
+from workout_bot_storage import get_storage_backend
+from workout_bot_tasks import spawn_background
+from .utils import get_bot_footer, send_error_to_error_channel, KST
+
+# 대시보드에 표시할 최대 줄 수 (랭킹/연속 운동 각각)
+DASHBOARD_MAX_LINES = 10
+
+_client = None
+_scheduled = set()  # 갱신이 예약된 서버 ID
+_last_edit = {}  # 서버 ID → 마지막으로 다시 그린 시각 (monotonic)
+_stats = {'changes': 0, 'merged': 0, 'edits': 0, 'failures': 0}
+
+
+def _field_text(lines, empty_text):
+    """임베드 필드 값 (Discord 필드 길이 제한 1024자 안에서 줄 단위로 자름)"""
+    text = ""
+    for line in lines:
+        if len(text) + len(line) + 1 > 1024:
+            break
+        text += line + "\n"
+    return text or empty_text
+
+
+async def build_dashboard_embed(guild):
+    """서버의 이번 주 랭킹과 연속 운동 현황 임베드"""
+    backend = get_storage_backend()
+    today = datetime.now(KST).date()
+    week_start = today - timedelta(days=today.weekday())
+
+    # !요약의 진행 중인 조회에 합류하지 않고 직접 조회 (출석 변경 전에 시작된 조회 결과로 그리지 않도록)
+    loop = asyncio.get_running_loop()
+    members = await loop.run_in_executor(None, backend.get_member_summaries, guild.id)
+    this_week_counts = await loop.run_in_executor(
+        None, backend.count_workouts_by_user, guild.id, week_start, today
+    )
+    names = {user_id: user_name for user_name, user_id, *_ in members}
+
+    # 같은 일수는 같은 순위로 묶음 (주간 운동왕과 같은 형식)
+    count_groups = {}
+    for user_id, count in this_week_counts.items():
+        if count > 0:
+            count_groups.setdefault(count, []).append(names.get(user_id, user_id))
+    ranking_lines = []
+    for rank, count in enumerate(sorted(count_groups, reverse=True)[:DASHBOARD_MAX_LINES]):
+        rank_emoji = {0: "🥇", 1: "🥈", 2: "🥉"}.get(rank, "💪")
+        ranking_lines.append(f"{rank_emoji} **{', '.join(sorted(count_groups[count]))}**: {count}일")
+
+    streaks = sorted(
+        (member for member in members if member[5] > 0), key=lambda member: member[5], reverse=True
+    )[:DASHBOARD_MAX_LINES]
+    streak_lines = [f"🔥 **{member[0]}**: {member[5]}일 (최장 {member[6]}일)" for member in streaks]
+
+    dashboard_embed = discord.Embed(
+        title=f"🏆 {guild.name} 이번 주 운동 현황",
+        description=f"{week_start.month}월 {week_start.day}일(월) ~ {today.month}월 {today.day}일 · 출석이 바뀌면 자동으로 갱신됩니다.",
+        color=0x00ff80,
+        timestamp=datetime.now(KST)
+    )
+    dashboard_embed.add_field(
+        name="📅 이번 주 랭킹", value=_field_text(ranking_lines, "아직 이번 주 운동 기록이 없습니다."), inline=False
+    )
+    dashboard_embed.add_field(
+        name="🔥 연속 운동 (동기화 기준)", value=_field_text(streak_lines, "연속 운동 중인 멤버가 없습니다."), inline=False
+    )
+    dashboard_embed.set_footer(text=get_bot_footer())
+    return dashboard_embed
+
+
+async def refresh_dashboard(guild_id):
+    """
+    서버의 대시보드 메시지를 다시 그립니다.
+
+    Returns:
+        bool: 수정 여부 (대시보드가 없거나 실패 시 False)
+    """
+    config = get_guild_config(guild_id)
+    if _client is None or config is None or config.dashboard_message_id is None:
+        return False
+    channel = _client.get_channel(config.dashboard_channel_id)
+    if channel is None:
+        print(f"⚠️ 대시보드 채널 {config.dashboard_channel_id}을(를) 찾을 수 없습니다. (서버 {guild_id})")
+        return False
+
+    try:
+        dashboard_embed = await build_dashboard_embed(channel.guild)
+        message = channel.get_partial_message(config.dashboard_message_id)
+        await send_outbound(partial(message.edit, embed=dashboard_embed), PRIORITY_SCHEDULED, "대시보드 갱신")
+    except discord.NotFound:
+        print(f"🗑️ 대시보드 메시지가 삭제되어 대시보드를 해제합니다. (서버 {guild_id})")
+        await asyncio.get_running_loop().run_in_executor(None, set_guild_dashboard, guild_id, None, None, _client)
+        return False
+    except Exception as e:
+        _stats['failures'] += 1
+        print(f"❌ 대시보드 갱신 중 오류 (서버 {guild_id}): {e}")
+        return False
+
+    _stats['edits'] += 1
+    return True
+
+
+def _start_refresh(guild_id):
+    _scheduled.discard(guild_id)  # 지금부터의 변경은 다음 갱신에 반영
+    _last_edit[guild_id] = monotonic()
+    spawn_background(refresh_dashboard(guild_id), f"대시보드 갱신 ({guild_id})")
+
+
+def mark_dashboard_dirty(guild_id):
+    """
+    서버의 출석이 바뀌었음을 알립니다 (이벤트 루프에서 호출).
+    대시보드가 있으면 마지막 갱신 후 DASHBOARD_EDIT_INTERVAL_SECONDS가 지난 시점에 한 번 다시 그립니다.
+    """
+    config = get_guild_config(guild_id)
+    if _client is None or config is None or config.dashboard_message_id is None:
+        return
+    guild_id = config.guild_id
+    _stats['changes'] += 1
+    if guild_id in _scheduled:
+        _stats['merged'] += 1
+        return
+    _scheduled.add(guild_id)
+    delay = max(0.0, _last_edit.get(guild_id, float('-inf')) + DASHBOARD_EDIT_INTERVAL_SECONDS - monotonic())
+    asyncio.get_running_loop().call_later(delay, _start_refresh, guild_id)
+
+
+def get_dashboard_stats():
+    """출석 변경 알림 수, 모아서 처리한 수, 메시지 수정 수, 실패 수"""
+    return dict(_stats)
+
+
+@tasks.loop(time=time(hour=15, minute=0))  # UTC 15:00 = KST 00:00
+async def _midnight_refresh():
+    """날짜가 바뀌면 (월요일이면 이번 주 랭킹도 초기화) 모든 대시보드를 다시 그림"""
+    for config in iter_guild_configs():
+        mark_dashboard_dirty(config.guild_id)
+
+
+def start_dashboard_updates():
+    """자정 갱신을 시작하고, 봇이 꺼져 있던 동안의 변경을 반영하도록 모든 대시보드를 한 번 갱신 (준비 완료 후 호출)"""
+    if not _midnight_refresh.is_running():
+        _midnight_refresh.start()
+    for config in iter_guild_configs():
+        mark_dashboard_dirty(config.guild_id)
+
+
+def setup_dashboard_command(client):
+    """대시보드 명령어를 등록하는 함수"""
+    global _client
+    _client = client
+
+    async def remove_dashboard_message(channel_id, message_id):
+        """이전 대시보드 메시지 삭제 (이미 없거나 권한이 없으면 무시)"""
+        channel = client.get_channel(channel_id)
+        if channel is None:
+            return
+        try:
+            await channel.get_partial_message(message_id).delete()
+        except discord.HTTPException as e:
+            print(f"⚠️ 이전 대시보드 메시지를 삭제하지 못했습니다: {e}")
+
+    @client.command(name='대시보드')
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def dashboard_command(ctx, action: str = None):
+        """이번 주 랭킹 대시보드를 이 채널에 게시하거나 해제하는 명령어 (관리자 전용)"""
+        try:
+            print(f"🏆 {ctx.author.display_name}이(가) !대시보드 명령어를 실행했습니다. (서버 {ctx.guild.id}, 옵션 {action or '-'})")
+            loop = asyncio.get_running_loop()
+
+            config = get_guild_config(ctx.guild.id)
+            if config is None:
+                await ctx.reply("❌ 이 서버는 아직 운동 채널이 설정되지 않았습니다. 먼저 `!채널설정 #운동채널`로 설정해주세요.")
+                return
+
+            if action == '해제':
+                if config.dashboard_message_id is None:
+                    await ctx.reply("ℹ️ 게시된 대시보드가 없습니다.")
+                    return
+                previous = (config.dashboard_channel_id, config.dashboard_message_id)
+                saved = await loop.run_in_executor(None, set_guild_dashboard, ctx.guild.id, None, None, client)
+                if not saved:
+                    await ctx.reply("❌ 대시보드 설정을 저장하지 못했습니다. 관리자에게 문의해주세요.")
+                    return
+                await remove_dashboard_message(*previous)
+                await ctx.reply("✅ 대시보드를 해제했습니다.")
+                return
+
+            if action is not None:
+                await ctx.reply("❌ 사용법: `!대시보드` (이 채널에 게시) 또는 `!대시보드 해제`")
+                return
+
+            dashboard_message = await ctx.send(embed=await build_dashboard_embed(ctx.guild))
+            try:
+                await dashboard_message.pin(reason="운동 대시보드")
+                pinned = True
+            except discord.HTTPException as e:
+                print(f"⚠️ 대시보드 메시지를 고정하지 못했습니다: {e}")
+                pinned = False
+
+            previous = (config.dashboard_channel_id, config.dashboard_message_id)
+            saved = await loop.run_in_executor(
+                None, set_guild_dashboard, ctx.guild.id, ctx.channel.id, dashboard_message.id, client
+            )
+            if not saved:
+                await dashboard_message.delete()
+                await ctx.reply("❌ 대시보드 설정을 저장하지 못했습니다. 관리자에게 문의해주세요.")
+                return
+            _last_edit[config.guild_id] = monotonic()
+
+            # 이전 대시보드는 하나만 남도록 삭제
+            if previous[1] is not None:
+                await remove_dashboard_message(*previous)
+
+            pin_note = "" if pinned else " (메시지 고정 권한이 없어 고정하지 못했습니다)"
+            await ctx.reply(
+                f"✅ 대시보드를 게시했습니다{pin_note}. 출석이 바뀌면 최대 {DASHBOARD_EDIT_INTERVAL_SECONDS}초마다 한 번 갱신됩니다."
+            )
+
+        except Exception as e:
+            print(f"❌ !대시보드 명령어 실행 중 오류: {e}")
+            await send_error_to_error_channel(
+                client,
+                f"대시보드 명령어 실행 중 오류: {str(e)}",
+                type(e).__name__,
+                "!대시보드 명령어",
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
+            )
+            try:
+                await ctx.reply("❌ 대시보드 처리 중 오류가 발생했습니다. 관리자에게 문의해주세요.")
+            except:
+                pass  # 이미 응답한 경우 무시
+
+    print("✅ 대시보드 명령어 등록 완료")
@@ -0,0 +1,79 @@
+"""
+내보내기 명령어 모듈
+==================
+!내보내기 명령어를 정의합니다.
+이 서버의 출석 기록 전체(또는 기간)를 gzip 압축 CSV 첨부파일로 보내줍니다. (관리자 전용)
+"""
+
+import asyncio
+import tempfile
+import discord
+from discord.ext import commands
+from workout_bot_export import write_attendance_csv, parse_export_date, default_export_filename
+from .utils import send_error_to_error_channel
+
+
+def setup_export_command(client):
+    """내보내기 명령어를 등록하는 함수"""
+
+    @client.command(name='내보내기')
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def export_command(ctx, start: str = None, end: str = None):
+        """이 서버의 출석 기록을 gzip 압축 CSV 파일로 내보내는 명령어 (관리자 전용)"""
+        try:
+            try:
+                start_date = parse_export_date(start)
+                end_date = parse_export_date(end)
+            except ValueError:
+                await ctx.reply("❌ 날짜는 `YYYY-MM-DD` 형식으로 입력해주세요. 예: `!내보내기 2024-01-01 2024-12-31`")
+                return
+
+            if start_date and end_date and start_date > end_date:
+                await ctx.reply("❌ 시작 날짜가 종료 날짜보다 늦습니다.")
+                return
+
+            print(f"📤 {ctx.author.display_name}이(가) !내보내기 명령어를 실행했습니다. ({start_date} ~ {end_date})")
+            initial_message = await ctx.reply("📤 출석 기록을 내보내고 있습니다...")
+
+            # 메모리 대신 임시 파일에 압축하면서 기록 (기록 수와 관계없이 메모리 사용량 일정)
+            with tempfile.TemporaryFile() as f:
+                row_count = await asyncio.get_event_loop().run_in_executor(
+                    None, write_attendance_csv, f, ctx.guild.id, start_date, end_date, True
+                )
+                file_size = f.tell()
+                f.seek(0)
+
+                size_limit = ctx.guild.filesize_limit
+                if file_size > size_limit:
+                    await initial_message.edit(
+                        content=f"❌ 파일이 너무 큽니다 ({file_size / 1024 / 1024:.1f}MB). "
+                                f"기간을 나누어 내보내거나 `python workout_bot_export.py --guild {ctx.guild.id}`를 사용해주세요."
+                    )
+                    return
+
+                filename = default_export_filename(start_date, end_date, ctx.guild.id)
+                await ctx.reply(
+                    f"✅ 출석 기록 {row_count}행을 내보냈습니다.",
+                    file=discord.File(f, filename=filename)
+                )
+                await initial_message.delete()
+
+            print(f"✅ !내보내기 완료: {row_count}행, {file_size}바이트")
+
+        except Exception as e:
+            print(f"❌ !내보내기 명령어 실행 중 오류: {e}")
+            await send_error_to_error_channel(
+                client,
+                f"내보내기 명령어 실행 중 오류: {str(e)}",
+                type(e).__name__,
+                "!내보내기 명령어",
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
+            )
+            try:
+                await ctx.reply("❌ 내보내기 중 오류가 발생했습니다. 관리자에게 문의해주세요.")
+            except:
+                pass  # 이미 응답한 경우 무시
+
+    print("✅ 내보내기 명령어 등록 완료")
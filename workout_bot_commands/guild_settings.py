@@ -0,0 +1,75 @@
+"""
+채널설정 명령어 모듈
+==================
+!채널설정 명령어를 정의합니다.
+서버마다 운동 스레드를 만들 채널과 알림을 받을 채널을 지정합니다. (관리자 전용)
+"""
+
+import asyncio
+import discord
+from discord.ext import commands
+from workout_bot_guilds import get_guild_config, set_guild_config
+from workout_bot_mirror import start_message_mirror
+from workout_bot_tasks import spawn_background
+from .utils import get_bot_footer, send_error_to_error_channel
+
+
+def setup_guild_settings_command(client):
+    """채널설정 명령어를 등록하는 함수"""
+
+    def build_settings_embed(guild, config):
+        """서버의 현재 채널 설정 임베드"""
+        settings_embed = discord.Embed(
+            title=f"⚙️ {guild.name} 채널 설정",
+            color=0x00ff80
+        )
+        if config is None:
+            settings_embed.description = "아직 운동 채널이 설정되지 않았습니다.\n`!채널설정 #운동채널 [#알림채널]`로 설정해주세요."
+        else:
+            alert_text = f"<#{config.alert_channel_id}>" if config.alert_channel_id else "봇 기본 알림 채널"
+            settings_embed.add_field(name="💪 운동 채널", value=f"<#{config.workout_channel_id}>", inline=True)
+            settings_embed.add_field(name="📧 알림 채널", value=alert_text, inline=True)
+        settings_embed.set_footer(text=get_bot_footer())
+        return settings_embed
+
+    @client.command(name='채널설정')
+    @commands.guild_only()
+    @commands.has_permissions(administrator=True)
+    async def guild_settings_command(ctx, workout_channel: discord.TextChannel = None, alert_channel: discord.TextChannel = None):
+        """서버의 운동/알림 채널을 보여주거나 설정하는 명령어 (관리자 전용)"""
+        try:
+            if workout_channel is None:
+                await ctx.reply(embed=build_settings_embed(ctx.guild, get_guild_config(ctx.guild.id)))
+                return
+
+            print(f"⚙️ {ctx.author.display_name}이(가) !채널설정 명령어를 실행했습니다. "
+                  f"(서버 {ctx.guild.id}, 운동 #{workout_channel.name}, 알림 {alert_channel.name if alert_channel else '-'})")
+
+            saved = await asyncio.get_event_loop().run_in_executor(
+                None, set_guild_config, ctx.guild.id, workout_channel.id,
+                alert_channel.id if alert_channel else None, client
+            )
+            if not saved:
+                await ctx.reply("❌ 채널 설정을 저장하지 못했습니다. 관리자에게 문의해주세요.")
+                return
+
+            await ctx.reply("✅ 채널 설정을 저장했습니다.", embed=build_settings_embed(ctx.guild, get_guild_config(ctx.guild.id)))
+            # 새 운동 채널의 스레드를 메시지 미러에 백필 (끝나기 전까지는 Discord API에서 읽음)
+            spawn_background(start_message_mirror(client), "메시지 미러 백필", limited=False)
+
+        except Exception as e:
+            print(f"❌ !채널설정 명령어 실행 중 오류: {e}")
+            await send_error_to_error_channel(
+                client,
+                f"채널설정 명령어 실행 중 오류: {str(e)}",
+                type(e).__name__,
+                "!채널설정 명령어",
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
+            )
+            try:
+                await ctx.reply("❌ 채널 설정 중 오류가 발생했습니다. 관리자에게 문의해주세요.")
+            except:
+                pass  # 이미 응답한 경우 무시
+
+    print("✅ 채널설정 명령어 등록 완료")
@@ -38,7 +38,11 @@ def setup_help_command(client):
                 `!요약` - 멤버별 운동 요약 정보
                 `!통계` - 월별/주간 운동 통계 
                 `!추세` - 운동 추세 분석
-                `!동기화 [일수]` - 운동 스레드 사진 업로드 현황 분석 (기본: 7일, 최대: 30일)
+                `!동기화 [일수]` - 운동 스레드 사진 업로드 현황 분석 (기본: 7일, 최대: 30일, 취소: `!동기화 취소`)
+                `!내보내기 [시작일] [종료일]` - 출석 기록 CSV 내보내기 (관리자 전용)
+                `!채널설정 [#운동채널] [#알림채널]` - 서버의 운동/알림 채널 설정 (관리자 전용)
+                `!대시보드 [해제]` - 자동 갱신되는 이번 주 랭킹을 이 채널에 고정 (관리자 전용)
+                `!리마인더 [켜기|끄기]` - 22시까지 운동 기록이 없으면 개인 DM으로 알림
                 `/도움` - 이 도움말 (슬래시 명령어)
                 """.strip(),
                 inline=False
@@ -92,15 +96,29 @@ def setup_help_command(client):
                 name="🔄 !동기화",
                 value="""
                 **기능**: 운동 스레드 사진 업로드 현황 분석
-                **사용법**: `!동기화` 또는 `!동기화 [일수]`
+                **사용법**: `!동기화` 또는 `!동기화 [일수]`, 취소는 `!동기화 취소`
                 **제공 정보**:
                 • 일별 운동 스레드에서 사용자별 사진 업로드 현황 (기본: 7일, 최대: 30일)
+                • 백그라운드로 실행되며 진행 상황을 응답 메시지에 표시
                 • 사용자별 총 업로드 일수 랭킹
                 • 일별 업로드 참여자 수 현황
                 """.strip(),
                 inline=False
             )
             
+            # 내보내기 명령어 상세 설명
+            help_embed.add_field(
+                name="📤 !내보내기",
+                value="""
+                **기능**: 이 서버의 출석 기록을 gzip 압축 CSV 파일로 내보내기 (관리자 전용)
+                **사용법**: `!내보내기` 또는 `!내보내기 2024-01-01 2024-12-31`
+                **제공 정보**:
+                • 날짜, 요일, 사용자 ID, 기록 당시 이름, 현재 멤버 이름
+                • 압축된 과거 기록까지 포함한 전체 출석 기록
+                """.strip(),
+                inline=False
+            )
+            
             # 자동화 기능 설명
             help_embed.add_field(
                 name="🤖 자동화 기능",
@@ -0,0 +1,69 @@
+"""
+리마인더 명령어 모듈
+==================
+!리마인더 명령어를 정의합니다.
+신청한 멤버는 매일 22:00 KST까지 이 서버에 운동 기록이 없으면 개인 DM으로 알림을 받습니다.
+"""
+
+import asyncio
+from discord.ext import commands
+from workout_bot_database import load_reminder_subscribers, set_reminder_subscription
+from .utils import send_error_to_error_channel
+
+
+def setup_reminder_command(client):
+    """리마인더 명령어를 등록하는 함수"""
+
+    @client.command(name='리마인더')
+    @commands.guild_only()
+    async def reminder_command(ctx, action: str = None):
+        """개인 DM 리마인더를 신청/해제하거나 현재 상태를 보여주는 명령어"""
+        try:
+            print(f"🔔 {ctx.author.display_name}이(가) !리마인더 명령어를 실행했습니다. (옵션 {action or '-'})")
+            loop = asyncio.get_running_loop()
+
+            if action is None:
+                subscribers = await loop.run_in_executor(None, load_reminder_subscribers, ctx.guild.id, client)
+                if subscribers is None:
+                    await ctx.reply("❌ 리마인더 상태를 불러오지 못했습니다. 관리자에게 문의해주세요.")
+                    return
+                status = "신청됨 ✅" if str(ctx.author.id) in subscribers else "신청 안 함"
+                await ctx.reply(
+                    f"🔔 개인 DM 리마인더: **{status}**\n"
+                    f"매일 22:00 (KST)까지 운동 기록이 없으면 DM으로 알려드려요. `!리마인더 켜기` / `!리마인더 끄기`"
+                )
+                return
+
+            if action not in ('켜기', '끄기'):
+                await ctx.reply("❌ 사용법: `!리마인더` (상태 보기), `!리마인더 켜기`, `!리마인더 끄기`")
+                return
+
+            enabled = action == '켜기'
+            changed = await loop.run_in_executor(
+                None, set_reminder_subscription, ctx.guild.id, ctx.author.id, enabled, client
+            )
+            if changed is None:
+                await ctx.reply("❌ 리마인더 설정을 저장하지 못했습니다. 관리자에게 문의해주세요.")
+            elif enabled:
+                note = "" if changed else " (이미 신청되어 있어요)"
+                await ctx.reply(f"✅ 개인 DM 리마인더를 신청했습니다{note}. 서버 멤버의 DM을 허용해 두어야 받을 수 있어요.")
+            else:
+                note = "" if changed else " (신청되어 있지 않았어요)"
+                await ctx.reply(f"✅ 개인 DM 리마인더를 해제했습니다{note}.")
+
+        except Exception as e:
+            print(f"❌ !리마인더 명령어 실행 중 오류: {e}")
+            await send_error_to_error_channel(
+                client,
+                f"리마인더 명령어 실행 중 오류: {str(e)}",
+                type(e).__name__,
+                "!리마인더 명령어",
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
+            )
+            try:
+                await ctx.reply("❌ 리마인더 처리 중 오류가 발생했습니다. 관리자에게 문의해주세요.")
+            except:
+                pass  # 이미 응답한 경우 무시
+
+    print("✅ 리마인더 명령어 등록 완료")
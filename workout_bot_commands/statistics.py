@@ -6,36 +6,35 @@
 """
 
 import discord
+from discord.ext import commands
 from datetime import datetime, timedelta
-from workout_bot_database import WorkoutDatabase
+from workout_bot_storage import get_storage_backend
 from .utils import get_bot_footer, send_error_to_error_channel, KST
+from .coalesce import coalesced_call
+
+def load_statistics_data(guild_id, months_to_query, week_start, week_end):
+    """서버의 !통계에 필요한 월별/주간 통계를 조회합니다 (동시 요청끼리 공유되므로 결과를 수정하지 말 것)"""
+    backend = get_storage_backend()
+    
+    # 서버의 모든 workout_members를 기준으로 월별 통계 조회
+    monthly_data = []
+    for year, month in months_to_query:
+        monthly_data.extend(backend.get_monthly_statistics(guild_id, year, month))
+    
+    # 서버의 모든 workout_members를 기준으로 주간 통계 조회
+    weekly_data = backend.get_weekly_statistics(guild_id, week_start, week_end)
+    return monthly_data, weekly_data
 
 def setup_statistics_command(client):
     """통계 명령어를 등록하는 함수"""
     
     @client.command(name='통계')
+    @commands.guild_only()
     async def workout_stats_command(ctx):
         """최근 3개월 월별, 최근 4주 주간 통계를 보여주는 명령어"""
-        cursor = None
-        db = None
         try:
             print(f"📈 {ctx.author.display_name}이(가) !통계 명령어를 실행했습니다.")
             
-            # 데이터베이스 연결
-            db = WorkoutDatabase()
-            if not db.connect():
-                await send_error_to_error_channel(
-                    client, 
-                    "데이터베이스 연결 실패", 
-                    "DatabaseConnectionError", 
-                    "!통계 명령어",
-                    f"{ctx.author.display_name} (ID: {ctx.author.id})"
-                )
-                await ctx.reply("⏳ 처리 중입니다...")
-                return
-            
-            cursor = db.connection.cursor()
-            
             # 현재 날짜 기준 계산
             now = datetime.now(KST)
             
@@ -58,35 +57,7 @@ def setup_statistics_command(client):
             
             print(f"📅 월별 통계 대상 기간: {months_to_query}")
             
-            # 모든 workout_members를 기준으로 월별 통계 조회
-            monthly_data = []
-            for year, month in months_to_query:
-                monthly_query = """
-                SELECT wm.user_name, %s as year, %s as month,
-                       COALESCE(COUNT(dwr.workout_date), 0) as workout_days,
-                       COALESCE(COUNT(DISTINCT dwr.workout_date), 0) as unique_workout_days,
-                       CASE 
-                           WHEN DAY(LAST_DAY(STR_TO_DATE(CONCAT(%s, '-', %s, '-01'), '%%Y-%%m-%%d'))) > 0 
-                           THEN ROUND((COALESCE(COUNT(DISTINCT dwr.workout_date), 0) / DAY(LAST_DAY(STR_TO_DATE(CONCAT(%s, '-', %s, '-01'), '%%Y-%%m-%%d')))) * 100, 1)
-                           ELSE 0
-                       END as workout_rate
-                FROM workout_members wm
-                LEFT JOIN daily_workout_records dwr ON wm.user_id = dwr.user_id 
-                    AND YEAR(dwr.workout_date) = %s 
-                    AND MONTH(dwr.workout_date) = %s
-                    AND dwr.workout_completed = 1
-                GROUP BY wm.user_name
-                ORDER BY workout_days DESC
-                """
-                
-                cursor.execute(monthly_query, (year, month, year, month, year, month, year, month))
-                month_results = cursor.fetchall()
-                
-                for row in month_results:
-                    monthly_data.append(row)
-            
             # === 주간 통계 (최근 4주) ===
-            # 모든 workout_members를 기준으로 주간 통계 조회
             today = now.date()
             days_since_monday = today.weekday()
             this_week_start = today - timedelta(days=days_since_monday)
@@ -95,19 +66,12 @@ def setup_statistics_command(client):
             four_weeks_ago_start = this_week_start - timedelta(weeks=4)
             last_week_end = this_week_start - timedelta(days=1)
             
-            weekly_query = """
-            SELECT wm.user_name, wwr.year, wwr.week_number, wwr.week_start_date, wwr.week_end_date, 
-                   COALESCE(wwr.workout_days, 0) as workout_days, 
-                   COALESCE(wwr.workout_rate, 0) as workout_rate
-            FROM workout_members wm
-            LEFT JOIN weekly_workout_records wwr ON wm.user_id = wwr.user_id 
-                AND wwr.week_start_date >= %s 
-                AND wwr.week_end_date <= %s
-            ORDER BY wm.user_name, wwr.year, wwr.week_number
-            """
-            
-            cursor.execute(weekly_query, (four_weeks_ago_start.strftime('%Y-%m-%d'), last_week_end.strftime('%Y-%m-%d')))
-            weekly_data = cursor.fetchall()
+            # 같은 서버, 같은 기간의 !통계가 동시에 들어오면 조회를 한 번만 실행
+            guild_id = ctx.guild.id
+            monthly_data, weekly_data = await coalesced_call(
+                ('통계', guild_id, tuple(months_to_query), four_weeks_ago_start, last_week_end),
+                load_statistics_data, guild_id, months_to_query, four_weeks_ago_start, last_week_end
+            )
             
             print(f"📅 주간 통계 기간: {four_weeks_ago_start} ~ {last_week_end}")
             print(f"📅 월별 통계 데이터: {len(monthly_data)}개, 주간 통계 데이터: {len(weekly_data)}개")
@@ -243,13 +207,9 @@ def setup_statistics_command(client):
                 f"통계 명령어 실행 중 오류: {str(e)}", 
                 type(e).__name__, 
                 "!통계 명령어",
-                f"{ctx.author.display_name} (ID: {ctx.author.id})"
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
             )
             await ctx.reply("⏳ 처리 중입니다...")
-        finally:
-            if cursor:
-                cursor.close()
-            if db:
-                db.disconnect()
     
     print("✅ 통계 명령어 등록 완료")
@@ -6,39 +6,27 @@
 """
 
 import discord
+from discord.ext import commands
 from datetime import datetime, timedelta
-from workout_bot_database import WorkoutDatabase
+from workout_bot_storage import get_storage_backend
 from .utils import get_bot_footer, send_error_to_error_channel, KST
+from .coalesce import coalesced_call
 
 def setup_summary_command(client):
     """요약 명령어를 등록하는 함수"""
     
     @client.command(name='요약')
+    @commands.guild_only()
     async def workout_summary_command(ctx):
-        """멤버별 운동 요약 정보를 보여주는 명령어"""
-        cursor = None
-        db = None
+        """이 서버 멤버별 운동 요약 정보를 보여주는 명령어"""
         try:
             print(f"📊 {ctx.author.display_name}이(가) !요약 명령어를 실행했습니다.")
             
-            # 데이터베이스 연결
-            db = WorkoutDatabase()
-            if not db.connect():
-                await send_error_to_error_channel(
-                    client, 
-                    "데이터베이스 연결 실패", 
-                    "DatabaseConnectionError", 
-                    "!요약 명령어",
-                    f"{ctx.author.display_name} (ID: {ctx.author.id})"
-                )
-                await ctx.reply("⏳ 처리 중입니다...")
-                return
-                
-            cursor = db.connection.cursor()
+            backend = get_storage_backend()
+            guild_id = ctx.guild.id
             
-            # 모든 운동 멤버 정보 조회
-            cursor.execute("SELECT user_name, user_id, total_workout_days, total_days, workout_rate, current_streak, max_streak, last_workout_date FROM workout_members ORDER BY total_workout_days DESC")
-            members = cursor.fetchall()
+            # 서버의 모든 운동 멤버 정보 조회 (같은 서버에서 동시에 들어온 !요약끼리 조회를 한 번만 실행)
+            members = await coalesced_call(('요약', guild_id), backend.get_member_summaries, guild_id)
             
             if not members:
                 await send_error_to_error_channel(
@@ -46,7 +34,8 @@ def setup_summary_command(client):
                     "운동 기록 없음", 
                     "NoDataError", 
                     "!요약 명령어",
-                    f"{ctx.author.display_name} (ID: {ctx.author.id})"
+                    f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                    guild_id=guild_id
                 )
                 await ctx.reply("⏳ 처리 중입니다...")
                 return
@@ -59,6 +48,12 @@ def setup_summary_command(client):
             days_since_monday = today.weekday()
             this_week_start = today - timedelta(days=days_since_monday)
             
+            # 이번 주 운동 일수를 모든 멤버에 대해 한 번에 조회 (출석 스냅샷이 있으면 메모리에서 계산)
+            this_week_counts = await coalesced_call(
+                ('요약 이번 주', guild_id, this_week_start, today), backend.count_workouts_by_user,
+                guild_id, this_week_start, today
+            )
+            
             # 임베드 메시지 생성
             summary_embed = discord.Embed(
                 title="📊 멤버별 운동 요약", 
@@ -69,15 +64,8 @@ def setup_summary_command(client):
             for idx, member in enumerate(members, 1):
                 user_name, user_id, total_workout_days, total_days, workout_rate, current_streak, max_streak, last_workout_date = member
                 
-                # 이번 주 운동 일수 조회
-                this_week_query = """
-                SELECT COUNT(*) as workout_count 
-                FROM daily_workout_records 
-                WHERE user_id = %s AND date >= %s AND date <= %s AND exercised = 'Y'
-                """
-                cursor.execute(this_week_query, (user_id, this_week_start.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')))
-                this_week_result = cursor.fetchone()
-                this_week_workouts = this_week_result[0] if this_week_result else 0
+                # 이번 주 운동 일수
+                this_week_workouts = this_week_counts.get(user_id, 0)
                 
                 # 이번 주 진행률 계산 (월~일 7일 기준)
                 days_passed_this_week = min(days_since_monday + 1, 7)  # 월요일=1, 화요일=2, ..., 일요일=7
@@ -126,13 +114,9 @@ def setup_summary_command(client):
                 f"요약 명령어 실행 중 오류: {str(e)}", 
                 type(e).__name__, 
                 "!요약 명령어",
-                f"{ctx.author.display_name} (ID: {ctx.author.id})"
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
             )
             await ctx.reply("⏳ 처리 중입니다...")
-        finally:
-            if cursor:
-                cursor.close()
-            if db:
-                db.disconnect()
     
     print("✅ 요약 명령어 등록 완료")
@@ -8,20 +8,184 @@
 import discord
 from discord.ext import commands
 from datetime import datetime
-from workout_bot_config import DISCORD_CHANNEL_ID
+from workout_bot_guilds import get_guild_config
 from .utils import get_bot_footer, send_error_to_error_channel, KST
-from .sync_helpers import (
-    WorkoutThreadPhotoCollector,
-    update_database_with_workout_data
-)
+from .sync_jobs import start_or_join_sync_job, get_running_sync_job
 
 def setup_sync_command(client):
     """동기화 명령어를 등록하는 함수"""
     
+    def build_sync_result_embed(job, db_update_success, rest_usage):
+        """동기화 결과 임베드를 생성합니다"""
+        collector = job.collector
+        days = job.days
+        
+        # 통계 임베드 생성
+        stats_embed = discord.Embed(
+            title="📊 운동 스레드 사진 업로드 현황",
+            description=f"최근 {days}일간의 운동 스레드 사진 업로드 분석이 완료되었습니다!",
+            color=0x00ff80,
+            timestamp=datetime.now(KST)
+        )
+        
+        # 수집 채널 정보 가져오기
+        collection_channel = client.get_channel(collector.channel_id)
+        collection_channel_name = collection_channel.name if collection_channel else "알 수 없음"
+        
+        # 기본 통계
+        stats_embed.add_field(
+            name="📈 기본 통계",
+            value=f"""
+            **수집된 스레드 수**: {collector.total_threads_found}개
+            **총 사진 업로드 횟수**: {collector.total_photos_found}회
+            **분석 기간**: 최근 {days}일
+            **수집 채널**: #{collection_channel_name}
+            **데이터베이스 업데이트**: {'✅ 성공' if db_update_success else '❌ 실패'}
+            **소요 시간**: {job.elapsed_seconds:.1f}초 (메시지 {job.progress.messages_read}개 확인)
+            """.strip(),
+            inline=False
+        )
+        
+        # 데이터베이스 변경 내역 (동기화 diff)
+        if collector.sync_diff:
+            stats_embed.add_field(
+                name="🔄 데이터베이스 변경 내역",
+                value=f"""
+                **추가된 출석**: {collector.sync_diff['inserted']}건
+                **제거된 출석**: {collector.sync_diff['removed']}건
+                **변경 없음**: {collector.sync_diff['unchanged']}건
+                """.strip(),
+                inline=False
+            )
+        
+        # Discord API 사용량 (작업 예산 대비)
+        budget_note = " ⚠️ 예산 초과" if rest_usage.over_budget else ""
+        stats_embed.add_field(
+            name="📡 Discord API 사용량",
+            value=f"""
+            **호출 수**: {rest_usage.calls}회 / 예산 {rest_usage.budget}회{budget_note}
+            **429 응답**: {rest_usage.rate_limited}회
+            **대기 시간**: {rest_usage.wait_seconds:.1f}초 (감속 {rest_usage.backoff_seconds:.1f}초)
+            """.strip(),
+            inline=False
+        )
+        
+        # 사용자별 총 업로드 횟수 계산
+        user_totals = {}
+        for date_data in collector.workout_data.values():
+            for user_name in date_data:
+                user_totals[user_name] = user_totals.get(user_name, 0) + 1
+        
+        # 상위 사용자들 표시
+        if user_totals:
+            sorted_users = sorted(user_totals.items(), key=lambda x: x[1], reverse=True)
+            top_users_text = "\n".join([f"**{user}**: {count}일" for user, count in sorted_users[:10]])
+            
+            stats_embed.add_field(
+                name="🏆 사용자별 업로드 현황 (TOP 10)",
+                value=top_users_text,
+                inline=False
+            )
+        
+        # 일별 업로드 현황
+        daily_summary = []
+        for date_key in sorted(collector.workout_data.keys(), reverse=True):
+            date_data = collector.workout_data[date_key]
+            upload_count = len(date_data)
+            
+            if upload_count > 0:
+                daily_summary.append(f"**{date_key}**: {upload_count}명")
+            else:
+                daily_summary.append(f"**{date_key}**: 업로드 없음")
+        
+        if daily_summary:
+            daily_text = "\n".join(daily_summary[:7])  # 최근 7일만 표시
+            stats_embed.add_field(
+                name="📅 일별 업로드 현황",
+                value=daily_text,
+                inline=True
+            )
+        
+        stats_embed.set_footer(text=get_bot_footer(f"🔄 사진 업로드 분석 완료"))
+        return stats_embed
+    
+    async def report_sync_result(job, success, db_update_success, rest_usage):
+        """백그라운드 동기화가 끝나면 응답 메시지를 결과로 바꿉니다"""
+        try:
+            if success:
+                stats_embed = build_sync_result_embed(job, db_update_success, rest_usage)
+                await job.message.edit(content=None, embed=stats_embed)
+                print(f"✅ !동기화 명령어 실행 완료: {job.collector.total_threads_found}개 스레드, {job.collector.total_photos_found}회 사진 업로드 분석")
+                print(f"📡 {rest_usage.summary()}")
+            else:
+                error_embed = discord.Embed(
+                    title="❌ 분석 실패",
+                    description="운동 스레드 사진 업로드 분석 중 오류가 발생했습니다.",
+                    color=0xff0000,
+                    timestamp=datetime.now(KST)
+                )
+                error_embed.set_footer(text=get_bot_footer("❌ 분석 실패"))
+                
+                await job.message.edit(content=None, embed=error_embed)
+                print(f"❌ !동기화 명령어 실행 실패")
+        except Exception as e:
+            print(f"❌ !동기화 결과 표시 중 오류: {e}")
+            await send_error_to_error_channel(
+                client, 
+                f"동기화 결과 표시 중 오류: {str(e)}", 
+                type(e).__name__, 
+                "!동기화 명령어",
+                f"{job.requester_name} (ID: {job.requested_by.id if job.requested_by else '-'})",
+                guild_id=job.guild_id
+            )
+    
+    async def report_sync_cancelled(job):
+        """수집 중 취소된 동기화의 응답 메시지를 바꿉니다 (DB는 변경되지 않음)"""
+        progress = job.progress
+        try:
+            await job.message.edit(
+                content=f"🛑 최근 {job.days}일 동기화가 취소되었습니다. 데이터베이스는 변경되지 않았습니다.\n"
+                        f"🧵 스레드 {progress.threads_scanned}개 확인 · 💬 메시지 {progress.messages_read}개 읽음 "
+                        f"({job.elapsed_seconds:.0f}초 경과)",
+                embed=None
+            )
+        except Exception as e:
+            print(f"⚠️ 동기화 취소 메시지 표시 실패: {e}")
+    
+    async def cancel_sync_job(ctx):
+        """이 서버에서 실행 중인 동기화를 취소합니다 (실행한 사람 또는 관리자만)"""
+        job = get_running_sync_job(ctx.guild.id)
+        if job is None:
+            await ctx.reply("ℹ️ 실행 중인 동기화가 없습니다.")
+            return
+        
+        is_admin = getattr(ctx.author, 'guild_permissions', None) and ctx.author.guild_permissions.administrator
+        is_requester = job.requested_by is not None and ctx.author.id == job.requested_by.id
+        if not (is_requester or is_admin):
+            await ctx.reply(f"❌ {job.requester_name}(으)로 시작된 동기화는 실행한 사람이나 관리자만 취소할 수 있습니다.")
+            return
+        
+        if job.cancel():
+            print(f"🛑 {ctx.author.display_name}이(가) !동기화 {job.days}일 작업을 취소했습니다.")
+            await ctx.reply("🛑 동기화를 취소합니다.")
+        else:
+            await ctx.reply("⏳ 이미 데이터베이스에 반영 중이라 취소할 수 없습니다. 곧 완료됩니다.")
+    
     @client.command(name='동기화')
-    async def sync_messages_command(ctx, days: int = 7):
-        """운동 스레드에서 사용자별 사진 업로드 현황을 분석하는 명령어"""
+    @commands.guild_only()
+    async def sync_messages_command(ctx, option: str = "7"):
+        """운동 스레드에서 사용자별 사진 업로드 현황을 분석하는 명령어 (백그라운드 실행, `!동기화 취소`로 중단)"""
         try:
+            if option == "취소":
+                await cancel_sync_job(ctx)
+                return
+            
+            try:
+                days = int(option)
+            except ValueError:
+                await ctx.reply("❌ 일수는 숫자로 입력해주세요. 예: `!동기화 7` (취소: `!동기화 취소`)")
+                return
+            
             # 🥚 이스터에그: 1995년도 입력시 365일 분석
             easter_egg_mode = False
             if days == 1995:
@@ -36,99 +200,33 @@ def setup_sync_command(client):
                 await ctx.reply("❌ 최소 1일 이상이어야 합니다.")
                 return
             
-            print(f"🔄 {ctx.author.display_name}이(가) !동기화 {days}일 명령어를 실행했습니다.")
-            
-            # 초기 응답
-            initial_message = await ctx.reply(f"🔍 최근 {days}일간의 운동 스레드에서 사진 업로드 현황을 분석하고 있습니다...")
+            guild_config = get_guild_config(ctx.guild.id)
+            if guild_config is None:
+                await ctx.reply("❌ 이 서버에는 운동 채널이 설정되지 않았습니다. 관리자가 `!채널설정 #채널`로 먼저 설정해주세요.")
+                return
             
-            # 운동 스레드 사진 수집기 생성
-            collector = WorkoutThreadPhotoCollector(client)
+            # 이미 실행 중인 동기화가 있으면 같은 스레드를 다시 읽지 않고 그 작업에 합류
+            running = get_running_sync_job(ctx.guild.id)
+            if running is not None:
+                coverage_note = ""
+                if days > running.days:
+                    coverage_note = f" (요청한 {days}일 중 최근 {running.days}일만 포함됩니다)"
+                follower_message = await ctx.reply(
+                    f"⏳ {running.requester_name}(으)로 시작된 최근 {running.days}일 동기화가 진행 중이라 그 작업에 합류합니다{coverage_note}. "
+                    f"끝나면 이 메시지에 결과를 표시합니다."
+                )
+                start_or_join_sync_job(client, guild_config, days, follower_message, ctx.author, report_sync_result, report_sync_cancelled)
+                print(f"🔗 {ctx.author.display_name}이(가) 진행 중인 !동기화 {running.days}일 작업에 합류했습니다.")
+                return
             
-            # 사진 수집 실행 (고정된 채널에서 수집)
-            success = await collector.collect_workout_photos(days_back=days)
+            print(f"🔄 {ctx.author.display_name}이(가) !동기화 {days}일 명령어를 실행했습니다.")
             
-            if success:
-                # 수집된 데이터를 데이터베이스에 업데이트
-                db_update_success = await update_database_with_workout_data(client, collector)
-                
-                # 통계 임베드 생성
-                stats_embed = discord.Embed(
-                    title="📊 운동 스레드 사진 업로드 현황",
-                    description=f"최근 {days}일간의 운동 스레드 사진 업로드 분석이 완료되었습니다!",
-                    color=0x00ff80,
-                    timestamp=datetime.now(KST)
-                )
-                
-                # 수집 채널 정보 가져오기
-                collection_channel = client.get_channel(DISCORD_CHANNEL_ID)
-                collection_channel_name = collection_channel.name if collection_channel else "알 수 없음"
-                
-                # 기본 통계
-                stats_embed.add_field(
-                    name="📈 기본 통계",
-                    value=f"""
-                    **수집된 스레드 수**: {collector.total_threads_found}개
-                    **총 사진 업로드 횟수**: {collector.total_photos_found}회
-                    **분석 기간**: 최근 {days}일
-                    **수집 채널**: #{collection_channel_name}
-                    **데이터베이스 업데이트**: {'✅ 성공' if db_update_success else '❌ 실패'}
-                    """.strip(),
-                    inline=False
-                )
-                
-                # 사용자별 총 업로드 횟수 계산
-                user_totals = {}
-                for date_data in collector.workout_data.values():
-                    for user_name in date_data:
-                        user_totals[user_name] = user_totals.get(user_name, 0) + 1
-                
-                # 상위 사용자들 표시
-                if user_totals:
-                    sorted_users = sorted(user_totals.items(), key=lambda x: x[1], reverse=True)
-                    top_users_text = "\n".join([f"**{user}**: {count}일" for user, count in sorted_users[:10]])
-                    
-                    stats_embed.add_field(
-                        name="🏆 사용자별 업로드 현황 (TOP 10)",
-                        value=top_users_text,
-                        inline=False
-                    )
-                
-                # 일별 업로드 현황
-                daily_summary = []
-                for date_key in sorted(collector.workout_data.keys(), reverse=True):
-                    date_data = collector.workout_data[date_key]
-                    upload_count = len(date_data)
-                    
-                    if upload_count > 0:
-                        daily_summary.append(f"**{date_key}**: {upload_count}명")
-                    else:
-                        daily_summary.append(f"**{date_key}**: 업로드 없음")
-                
-                if daily_summary:
-                    daily_text = "\n".join(daily_summary[:7])  # 최근 7일만 표시
-                    stats_embed.add_field(
-                        name="📅 일별 업로드 현황",
-                        value=daily_text,
-                        inline=True
-                    )
-                
-                stats_embed.set_footer(text=get_bot_footer(f"🔄 사진 업로드 분석 완료"))
-                
-                # 메시지 수정
-                await initial_message.edit(content=None, embed=stats_embed)
-                print(f"✅ !동기화 명령어 실행 완료: {collector.total_threads_found}개 스레드, {collector.total_photos_found}회 사진 업로드 분석")
-                
-            else:
-                error_embed = discord.Embed(
-                    title="❌ 분석 실패",
-                    description="운동 스레드 사진 업로드 분석 중 오류가 발생했습니다.",
-                    color=0xff0000,
-                    timestamp=datetime.now(KST)
-                )
-                error_embed.set_footer(text=get_bot_footer("❌ 분석 실패"))
-                
-                await initial_message.edit(content=None, embed=error_embed)
-                print(f"❌ !동기화 명령어 실행 실패")
+            # 초기 응답 후 백그라운드 작업으로 넘기고 명령어는 바로 종료
+            initial_message = await ctx.reply(
+                f"🔍 최근 {days}일간의 운동 스레드에서 사진 업로드 현황을 분석하고 있습니다...\n"
+                f"진행 상황은 이 메시지에 표시됩니다. 취소하려면 `!동기화 취소`"
+            )
+            start_or_join_sync_job(client, guild_config, days, initial_message, ctx.author, report_sync_result, report_sync_cancelled)
                 
         except Exception as e:
             print(f"❌ !동기화 명령어 실행 중 오류: {e}")
@@ -137,7 +235,8 @@ def setup_sync_command(client):
                 f"동기화 명령어 실행 중 오류: {str(e)}", 
                 type(e).__name__, 
                 "!동기화 명령어",
-                f"{ctx.author.display_name} (ID: {ctx.author.id})"
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
             )
             try:
                 await ctx.reply("❌ 분석 중 오류가 발생했습니다. 관리자에게 문의해주세요.")
@@ -152,7 +251,7 @@ def setup_sync_command(client):
             print(f"🚨 명령어 에러 발생: {type(error).__name__}")
             print(f"   사용자: {ctx.author.display_name} (ID: {ctx.author.id})")
             print(f"   입력 메시지: '{ctx.message.content}'")
-            print(f"   채널: #{ctx.channel.name}")
+            print(f"   채널: #{getattr(ctx.channel, 'name', 'DM')}")
             print(f"   시간: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')}")
             
             if isinstance(error, commands.CommandNotFound):
@@ -175,6 +274,10 @@ def setup_sync_command(client):
                     • `!통계` - 월별/주간 운동 통계
                     • `!추세` - 운동 추세 분석
                     • `!동기화 [일수]` - 운동 스레드 사진 업로드 현황 분석
+                    • `!내보내기 [시작일] [종료일]` - 출석 기록 CSV 내보내기 (관리자 전용)
+                    • `!채널설정 [#운동채널] [#알림채널]` - 서버의 운동/알림 채널 설정 (관리자 전용)
+                    • `!대시보드 [해제]` - 자동 갱신되는 이번 주 랭킹 게시 (관리자 전용)
+                    • `!리마인더 [켜기|끄기]` - 운동 기록이 없는 날 22시 개인 DM 알림
                     """.strip(),
                     inline=False
                 )
@@ -210,6 +313,15 @@ def setup_sync_command(client):
                 )
                 await ctx.reply("⏳ 처리 중입니다...")
                 
+            elif isinstance(error, commands.MissingPermissions):
+                # 관리자 전용 명령어를 일반 사용자가 실행한 경우
+                print(f"📝 MissingPermissions 처리: {error.missing_permissions}")
+                await ctx.reply("❌ 관리자만 사용할 수 있는 명령어입니다.")
+                
+            elif isinstance(error, commands.NoPrivateMessage):
+                # 서버별 기록을 다루는 명령어를 DM에서 실행한 경우
+                await ctx.reply("❌ 서버 채널에서만 사용할 수 있는 명령어입니다.")
+                
             elif isinstance(error, commands.BadArgument):
                 # 잘못된 인자 타입인 경우
                 await send_error_to_error_channel(
@@ -6,26 +6,35 @@
 
 import discord
 import asyncio
+from functools import partial
 from datetime import datetime, timedelta
 from workout_bot_database import (
-    upsert_daily_workout_record, 
+    load_attendance_set,
+    apply_workout_attendance_diff,
+    record_workout_events,
+    get_database_write_stats,
     upsert_weekly_workout_records, 
     upsert_monthly_workout_records,
     update_member_statistics
 )
-from workout_bot_config import DISCORD_CHANNEL_ID
-from .utils import send_alert_to_channel, send_error_to_error_channel, KST
+from workout_bot_mirror import get_message_mirror, message_history
+from workout_bot_members import resolve_members
+from .dashboard import mark_dashboard_dirty
+from .utils import send_alert_to_channel, send_error_to_error_channel, KST, count_image_attachments, build_workout_event
 
-async def update_database_with_workout_data(client, workout_data):
+async def update_database_with_workout_data(client, guild_id, workout_data, progress=None):
     """
-    수집된 운동 스레드 데이터를 데이터베이스에 업데이트하는 함수
+    수집된 운동 스레드 데이터를 서버의 저장된 출석과 비교하여 변경분만 데이터베이스에 반영하는 함수
     
     Args:
         client: Discord 클라이언트
+        guild_id: 운동 스레드를 수집한 서버(guild) ID
         workout_data: 수집기 객체 (workout_data 속성과 user_id_mapping 속성 포함)
+        progress (SyncProgress, optional): 진행 상황 (반영 단계/기록한 행 수 갱신)
     
     Returns:
         bool: 성공 여부
+            수집기 객체인 경우 sync_diff 속성에 {'inserted', 'removed', 'unchanged'} 개수를 기록
     """
     try:
         print("🔄 데이터베이스 업데이트 시작...")
@@ -35,58 +44,90 @@ async def update_database_with_workout_data(client, workout_data):
             # WorkoutThreadPhotoCollector 객체인 경우
             data = workout_data.workout_data
             user_id_mapping = getattr(workout_data, 'user_id_mapping', {})
+            events = getattr(workout_data, 'events', [])
+            scanned_dates = getattr(workout_data, 'scanned_dates', None)
         else:
             # 직접 딕셔너리인 경우
             data = workout_data
             user_id_mapping = {}
+            events = []
+            scanned_dates = None
         
-        # 1. 일별 운동 기록 업데이트 (배치 처리)
-        print("🔄 일별 운동 기록 업데이트 중...")
-        updated_records = 0
+        # 운동 스레드를 실제로 확인한 날짜만 제거 대상 (스레드를 못 찾은 날의 기록은 보존)
+        if scanned_dates is None:
+            scanned_dates = set(data.keys())
+        scanned_dates = {datetime.strptime(date_key, '%Y-%m-%d').date() for date_key in scanned_dates}
         
-        # 업데이트할 레코드들을 수집
-        update_data = []
+        # 1. 수집된 출석 집합 생성
+        collected = {}  # {(user_id, date): user_name}
         for date_key, user_data in data.items():
+            workout_date = datetime.strptime(date_key, '%Y-%m-%d').date()
             for user_name in user_data.keys():
                 # 실제 Discord ID 사용 (매핑이 있는 경우)
                 user_id = user_id_mapping.get(user_name, str(hash(user_name)))  # 실제 ID 또는 해시 ID
-                update_data.append((user_id, user_name, date_key))
+                collected[(user_id, workout_date)] = user_name
+        
+        # 2. 저장된 출석 집합을 한 번에 조회하여 diff 계산
+        print("🔄 저장된 출석과 비교 중...")
+        window_dates = scanned_dates | {workout_date for _, workout_date in collected}
+        stored = set()
+        if window_dates:
+            stored = await asyncio.get_event_loop().run_in_executor(
+                None, load_attendance_set, guild_id, min(window_dates), max(window_dates), client
+            )
+            if stored is None:
+                raise RuntimeError("저장된 출석 기록을 불러오지 못했습니다.")
+        
+        inserts = [
+            (user_id, user_name, workout_date)
+            for (user_id, workout_date), user_name in collected.items()
+            if (user_id, workout_date) not in stored
+        ]
+        removals = [
+            (user_id, workout_date)
+            for user_id, workout_date in stored
+            if workout_date in scanned_dates and (user_id, workout_date) not in collected
+        ]
+        unchanged = len(collected) - len(inserts)
+        sync_diff = {'inserted': len(inserts), 'removed': len(removals), 'unchanged': unchanged}
+        print(f"📊 출석 diff: 추가 {len(inserts)}개, 제거 {len(removals)}개, 변경 없음 {unchanged}개")
+        
+        # 3. 변경분만 한 번에 반영
+        diff_success = True
+        if inserts or removals:
+            print("🔄 출석 변경분 반영 중...")
+            diff_result = await asyncio.get_event_loop().run_in_executor(
+                None, apply_workout_attendance_diff, guild_id, inserts, removals, client
+            )
+            diff_success = diff_result is not None
+            if progress is not None and diff_success:
+                progress.add(rows_written=len(inserts) + len(removals))
+            for user_id, user_name, workout_date in sorted(inserts, key=lambda r: r[2]):
+                print(f"   ➕ {user_name} (ID: {user_id}) - {workout_date}")
+            for user_id, workout_date in sorted(removals, key=lambda r: r[1]):
+                print(f"   ➖ ID: {user_id} - {workout_date}")
         
-        # 배치 크기로 나누어서 처리 (한 번에 5개씩)
-        batch_size = 5
-        for i in range(0, len(update_data), batch_size):
-            batch = update_data[i:i + batch_size]
-            
-            # 배치 내에서 비동기 처리
-            tasks = []
-            for user_id, user_name, date_key in batch:
-                task = asyncio.get_event_loop().run_in_executor(
-                    None, upsert_daily_workout_record, user_id, user_name, date_key, client
-                )
-                tasks.append((task, user_name, user_id, date_key))
-            
-            # 배치 완료 대기
-            for task, user_name, user_id, date_key in tasks:
-                try:
-                    success = await task
-                    if success:
-                        updated_records += 1
-                        print(f"   ✅ 일별 기록 업데이트: {user_name} (ID: {user_id}) - {date_key}")
-                    else:
-                        print(f"   ❌ 일별 기록 업데이트 실패: {user_name} - {date_key}")
-                except Exception as e:
-                    print(f"   ❌ 일별 기록 업데이트 오류: {user_name} - {date_key}: {e}")
-            
-            # 배치 사이에 Discord heartbeat 유지를 위한 대기
-            await asyncio.sleep(0.1)
+        if hasattr(workout_data, 'workout_data'):
+            workout_data.sync_diff = sync_diff
         
-        print(f"📊 일별 운동 기록 업데이트 완료: {updated_records}개")
+        # 4. 메시지 단위 이벤트 로그 기록 (message_id 기준으로 중복 무시, 일별 기록은 위에서 반영)
+        if events:
+            print(f"🔄 운동 이벤트 로그 기록 중... ({len(events)}개 메시지)")
+            new_events = await asyncio.get_event_loop().run_in_executor(
+                None, partial(record_workout_events, events, client, derive_daily=False)
+            )
+            print(f"📊 새 운동 이벤트: {new_events or 0}개 (이미 기록된 메시지는 무시)")
+            if progress is not None:
+                progress.add(rows_written=new_events or 0)
         
-        # Discord heartbeat 유지
-        await asyncio.sleep(0.1)
+        if not (inserts or removals):
+            print("✅ 변경된 출석이 없어 집계 갱신을 건너뜁니다.")
+            return diff_success
         
-        # 2. 주간 집계 업데이트 (비동기 실행)
+        # 5. 주간 집계 업데이트 (비동기 실행)
         print("🔄 주간 집계 업데이트 중...")
+        if progress is not None:
+            progress.set_phase("주간/월간 집계 갱신")
         weekly_success = await asyncio.get_event_loop().run_in_executor(
             None, upsert_weekly_workout_records, client
         )
@@ -95,10 +136,7 @@ async def update_database_with_workout_data(client, workout_data):
         else:
             print("❌ 주간 집계 업데이트 실패")
         
-        # Discord heartbeat 유지
-        await asyncio.sleep(0.1)
-        
-        # 3. 월간 집계 업데이트 (비동기 실행)
+        # 6. 월간 집계 업데이트 (비동기 실행)
         print("🔄 월간 집계 업데이트 중...")
         monthly_success = await asyncio.get_event_loop().run_in_executor(
             None, upsert_monthly_workout_records, client
@@ -108,11 +146,10 @@ async def update_database_with_workout_data(client, workout_data):
         else:
             print("❌ 월간 집계 업데이트 실패")
         
-        # Discord heartbeat 유지
-        await asyncio.sleep(0.1)
-        
-        # 4. 멤버 통계 업데이트 (비동기 실행)
+        # 7. 멤버 통계 업데이트 (비동기 실행)
         print("🔄 멤버 통계 업데이트 중...")
+        if progress is not None:
+            progress.set_phase("멤버 통계 갱신")
         stats_success = await asyncio.get_event_loop().run_in_executor(
             None, update_member_statistics, client
         )
@@ -121,23 +158,33 @@ async def update_database_with_workout_data(client, workout_data):
         else:
             print("❌ 멤버 통계 업데이트 실패")
         
-        overall_success = updated_records > 0 and weekly_success and monthly_success and stats_success
+        # 출석이 바뀌었으므로 대시보드 갱신 예약
+        mark_dashboard_dirty(guild_id)
+        
+        # 교착 상태/잠금 대기 재시도 현황
+        write_stats = get_database_write_stats()
+        print(f"🔁 쓰기 재시도 현황: 재시도 {write_stats['retries']}회 "
+              f"(교착 {write_stats['deadlocks']}, 잠금 대기 {write_stats['lock_waits']}), 실패 {write_stats['failures']}회")
+        
+        overall_success = diff_success and weekly_success and monthly_success and stats_success
         
         if overall_success:
             print("🎉 모든 데이터베이스 업데이트 완료!")
             await send_alert_to_channel(
                 client, 
-                f"운동 스레드 분석 완료: {updated_records}개 일별 기록 업데이트, 주간/월간 집계 및 멤버 통계 갱신", 
+                f"운동 스레드 분석 완료: 일별 기록 추가 {len(inserts)}개 / 제거 {len(removals)}개, 주간/월간 집계 및 멤버 통계 갱신", 
                 "Success", 
-                "!동기화 명령어 - 데이터베이스 업데이트"
+                "!동기화 명령어 - 데이터베이스 업데이트",
+                guild_id=guild_id
             )
         else:
             print("⚠️ 일부 데이터베이스 업데이트 실패")
             await send_alert_to_channel(
                 client, 
-                f"운동 스레드 분석 부분 실패: 일별 기록 {updated_records}개, 주간집계: {weekly_success}, 월간집계: {monthly_success}, 통계: {stats_success}", 
+                f"운동 스레드 분석 부분 실패: 출석 diff: {diff_success} (추가 {len(inserts)}개 / 제거 {len(removals)}개), 주간집계: {weekly_success}, 월간집계: {monthly_success}, 통계: {stats_success}", 
                 "Warning", 
-                "!동기화 명령어 - 데이터베이스 업데이트"
+                "!동기화 명령어 - 데이터베이스 업데이트",
+                guild_id=guild_id
             )
         
         return overall_success
@@ -150,19 +197,22 @@ async def update_database_with_workout_data(client, workout_data):
             error_msg, 
             type(e).__name__, 
             "update_database_with_workout_data",
-            "시스템"
+            "시스템",
+            guild_id=guild_id
         )
         return False
 
 
-async def calculate_user_workout_from_threads(client, start_date, end_date):
+async def calculate_user_workout_from_threads(client, channel_id, start_date, end_date, progress=None):
     """
     지정된 기간의 운동 스레드에서 사용자별 사진 업로드 현황을 계산하는 함수
     
     Args:
         client: Discord 클라이언트
+        channel_id: 운동 스레드를 등록하는 채널 ID (서버 설정의 운동 채널)
         start_date: 시작 날짜 (datetime.date)
         end_date: 종료 날짜 (datetime.date, 포함)
+        progress (SyncProgress, optional): 진행 상황 (확인한 스레드/읽은 메시지 수 갱신)
         
     Returns:
         dict: {
@@ -170,13 +220,15 @@ async def calculate_user_workout_from_threads(client, start_date, end_date):
             'total_threads_found': int,
             'total_photos_found': int,
             'user_totals': {사용자: 총_업로드_일수},
-            'user_id_mapping': {사용자명: discord_id}
+            'user_id_mapping': {사용자명: discord_id},
+            'events': [workout_events 이벤트],
+            'scanned_dates': {운동 스레드를 찾은 날짜 키}
         }
     """
     try:
-        channel = client.get_channel(DISCORD_CHANNEL_ID)
+        channel = client.get_channel(channel_id)
         if not channel:
-            print(f"❌ 채널 ID {DISCORD_CHANNEL_ID}를 찾을 수 없습니다.")
+            print(f"❌ 채널 ID {channel_id}를 찾을 수 없습니다.")
             return None
         
         # 결과 데이터 초기화
@@ -184,6 +236,8 @@ async def calculate_user_workout_from_threads(client, start_date, end_date):
         total_threads_found = 0
         total_photos_found = 0
         user_id_mapping = {}  # 전체 사용자 ID 매핑
+        events = []  # 메시지 단위 운동 이벤트
+        scanned_dates = set()  # 운동 스레드를 찾은 날짜
         
         # 수집할 날짜 범위 계산
         current_date = start_date
@@ -198,84 +252,107 @@ async def calculate_user_workout_from_threads(client, start_date, end_date):
         print(f"📅 수집 기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
         print(f"📋 수집 대상 날짜: {[date.strftime('%Y-%m-%d') for date in target_dates]}")
         
-        # 활성 스레드에서 운동 스레드 찾기
-        print("🔍 활성 스레드 검색 중...")
-        active_count = 0
-        for thread in channel.threads:
-            thread_data = await _process_workout_thread(thread, target_dates)
-            if thread_data:
-                total_threads_found += 1
-                total_photos_found += thread_data['photo_count']
-                workout_data[thread_data['date_key']].update(thread_data['user_data'])
-                user_id_mapping.update(thread_data['user_id_mapping'])
-                active_count += 1
-        print(f"📊 활성 스레드에서 {active_count}개 운동 스레드 발견")
-        
-        # 보관된 스레드에서도 찾기 (더 포괄적으로)
-        print("🔍 보관된 스레드 검색 중...")
-        archived_count = 0
-        try:
-            # 더 오래된 스레드까지 찾기 위해 여러 번 조회
-            before_timestamp = None
-            max_iterations = 10  # 최대 10번 반복 (안전장치)
-            iteration = 0
-            
-            while iteration < max_iterations:
-                iteration += 1
-                found_in_this_batch = False
-                
-                # 공개 보관 스레드 조회 (페이지네이션)
-                async for thread in channel.archived_threads(limit=100, before=before_timestamp, private=False):
-                    thread_data = await _process_workout_thread(thread, target_dates)
-                    if thread_data:
-                        total_threads_found += 1
-                        total_photos_found += thread_data['photo_count']
-                        workout_data[thread_data['date_key']].update(thread_data['user_data'])
-                        user_id_mapping.update(thread_data['user_id_mapping'])
-                        archived_count += 1
-                        found_in_this_batch = True
-                    
-                    # 다음 배치를 위해 타임스탬프 업데이트
-                    before_timestamp = thread.created_at
-                
-                # 이번 배치에서 매칭되는 스레드가 없으면 중단
-                if not found_in_this_batch:
-                    break
-                    
-                print(f"  📦 배치 {iteration}: {archived_count}개 운동 스레드 발견 중...")
-            
-            # 비공개 보관 스레드도 조회 (권한이 있는 경우)
+        mirror = get_message_mirror(channel)
+        if mirror is not None:
+            # 로컬 메시지 미러에서 스레드 목록과 메시지를 읽음 (Discord API 호출 없음)
+            print("💾 로컬 메시지 미러에서 운동 스레드 검색 중...")
+            mirrored_count = 0
+            for thread in mirror.list_threads(channel):
+                thread_data = await _process_workout_thread(thread, target_dates, progress)
+                if thread_data:
+                    total_threads_found += 1
+                    total_photos_found += thread_data['photo_count']
+                    workout_data[thread_data['date_key']].update(thread_data['user_data'])
+                    user_id_mapping.update(thread_data['user_id_mapping'])
+                    events.extend(thread_data['events'])
+                    scanned_dates.add(thread_data['date_key'])
+                    mirrored_count += 1
+            print(f"📊 메시지 미러에서 {mirrored_count}개 운동 스레드 발견")
+        else:
+            # 활성 스레드에서 운동 스레드 찾기
+            print("🔍 활성 스레드 검색 중...")
+            active_count = 0
+            for thread in channel.threads:
+                thread_data = await _process_workout_thread(thread, target_dates, progress)
+                if thread_data:
+                    total_threads_found += 1
+                    total_photos_found += thread_data['photo_count']
+                    workout_data[thread_data['date_key']].update(thread_data['user_data'])
+                    user_id_mapping.update(thread_data['user_id_mapping'])
+                    events.extend(thread_data['events'])
+                    scanned_dates.add(thread_data['date_key'])
+                    active_count += 1
+            print(f"📊 활성 스레드에서 {active_count}개 운동 스레드 발견")
+        
+            # 보관된 스레드에서도 찾기 (더 포괄적으로)
+            print("🔍 보관된 스레드 검색 중...")
+            archived_count = 0
             try:
+                # 더 오래된 스레드까지 찾기 위해 여러 번 조회
                 before_timestamp = None
+                max_iterations = 10  # 최대 10번 반복 (안전장치)
                 iteration = 0
+            
                 while iteration < max_iterations:
                     iteration += 1
                     found_in_this_batch = False
-                    
-                    async for thread in channel.archived_threads(limit=100, before=before_timestamp, private=True):
-                        thread_data = await _process_workout_thread(thread, target_dates)
+                
+                    # 공개 보관 스레드 조회 (페이지네이션)
+                    async for thread in channel.archived_threads(limit=100, before=before_timestamp, private=False):
+                        thread_data = await _process_workout_thread(thread, target_dates, progress)
                         if thread_data:
                             total_threads_found += 1
                             total_photos_found += thread_data['photo_count']
                             workout_data[thread_data['date_key']].update(thread_data['user_data'])
                             user_id_mapping.update(thread_data['user_id_mapping'])
+                            events.extend(thread_data['events'])
+                            scanned_dates.add(thread_data['date_key'])
                             archived_count += 1
                             found_in_this_batch = True
-                        
-                        before_timestamp = thread.created_at
                     
+                        # 다음 배치를 위해 타임스탬프 업데이트
+                        before_timestamp = thread.created_at
+                
+                    # 이번 배치에서 매칭되는 스레드가 없으면 중단
                     if not found_in_this_batch:
                         break
+                    
+                    print(f"  📦 배치 {iteration}: {archived_count}개 운동 스레드 발견 중...")
+            
+                # 비공개 보관 스레드도 조회 (권한이 있는 경우)
+                try:
+                    before_timestamp = None
+                    iteration = 0
+                    while iteration < max_iterations:
+                        iteration += 1
+                        found_in_this_batch = False
+                    
+                        async for thread in channel.archived_threads(limit=100, before=before_timestamp, private=True):
+                            thread_data = await _process_workout_thread(thread, target_dates, progress)
+                            if thread_data:
+                                total_threads_found += 1
+                                total_photos_found += thread_data['photo_count']
+                                workout_data[thread_data['date_key']].update(thread_data['user_data'])
+                                user_id_mapping.update(thread_data['user_id_mapping'])
+                                events.extend(thread_data['events'])
+                                scanned_dates.add(thread_data['date_key'])
+                                archived_count += 1
+                                found_in_this_batch = True
                         
-            except discord.Forbidden:
-                print("ℹ️ 비공개 보관 스레드 접근 권한이 없습니다.")
+                            before_timestamp = thread.created_at
+                    
+                        if not found_in_this_batch:
+                            break
+                        
+                except discord.Forbidden:
+                    print("ℹ️ 비공개 보관 스레드 접근 권한이 없습니다.")
                 
-        except discord.Forbidden:
-            print("⚠️ 보관된 스레드에 접근할 권한이 없습니다.")
-        except Exception as e:
-            print(f"⚠️ 보관된 스레드 조회 중 오류: {e}")
+            except discord.Forbidden:
+                print("⚠️ 보관된 스레드에 접근할 권한이 없습니다.")
+            except Exception as e:
+                print(f"⚠️ 보관된 스레드 조회 중 오류: {e}")
         
-        print(f"📊 보관된 스레드에서 {archived_count}개 운동 스레드 발견")
+            print(f"📊 보관된 스레드에서 {archived_count}개 운동 스레드 발견")
         
         # 사용자별 총 업로드 횟수 계산
         user_totals = {}
@@ -292,7 +369,9 @@ async def calculate_user_workout_from_threads(client, start_date, end_date):
             'total_threads_found': total_threads_found,
             'total_photos_found': total_photos_found,
             'user_totals': user_totals,
-            'user_id_mapping': user_id_mapping
+            'user_id_mapping': user_id_mapping,
+            'events': events,
+            'scanned_dates': scanned_dates
         }
         
     except Exception as e:
@@ -300,24 +379,28 @@ async def calculate_user_workout_from_threads(client, start_date, end_date):
         return None
 
 
-async def _process_workout_thread(thread, target_dates):
+async def _process_workout_thread(thread, target_dates, progress=None):
     """
     단일 스레드가 운동 스레드인지 확인하고 사진 수집
     
     Args:
         thread: Discord 스레드
         target_dates: 대상 날짜 리스트 (datetime.date)
+        progress (SyncProgress, optional): 진행 상황
         
     Returns:
         dict or None: {
             'date_key': str,
             'user_data': {사용자: 1},
             'photo_count': int,
-            'user_id_mapping': {사용자명: discord_id}
+            'user_id_mapping': {사용자명: discord_id},
+            'events': [workout_events 이벤트]
         }
     """
     try:
         thread_name = thread.name
+        if progress is not None:
+            progress.add(threads_scanned=1)
         
         # 디버깅: 모든 스레드 이름 출력 (필요한 경우만)
         if len(target_dates) <= 10:  # 적은 날짜 범위일 때만 디버깅
@@ -347,13 +430,14 @@ async def _process_workout_thread(thread, target_dates):
                     print(f"🎯 운동 스레드 발견: '{thread_name}' (패턴: '{pattern}', 날짜: {target_date.strftime('%Y-%m-%d')})")
                     
                     # 해당 스레드에서 사진 수집
-                    user_data, photo_count, user_id_mapping = await _collect_photos_from_thread(thread, target_date.strftime('%Y-%m-%d'))
+                    user_data, photo_count, user_id_mapping, events = await _collect_photos_from_thread(thread, target_date.strftime('%Y-%m-%d'), progress)
                     
                     return {
                         'date_key': target_date.strftime('%Y-%m-%d'),
                         'user_data': user_data,
                         'photo_count': photo_count,
-                        'user_id_mapping': user_id_mapping
+                        'user_id_mapping': user_id_mapping,
+                        'events': events
                     }
                     
             # 추가로 더 유연한 매칭 (날짜만 매칭, 요일 무시)
@@ -369,13 +453,14 @@ async def _process_workout_thread(thread, target_dates):
                     print(f"🎯 운동 스레드 발견 (유연한 매칭): '{thread_name}' (날짜: {target_date.strftime('%Y-%m-%d')})")
                     
                     # 해당 스레드에서 사진 수집
-                    user_data, photo_count, user_id_mapping = await _collect_photos_from_thread(thread, target_date.strftime('%Y-%m-%d'))
+                    user_data, photo_count, user_id_mapping, events = await _collect_photos_from_thread(thread, target_date.strftime('%Y-%m-%d'), progress)
                     
                     return {
                         'date_key': target_date.strftime('%Y-%m-%d'),
                         'user_data': user_data,
                         'photo_count': photo_count,
-                        'user_id_mapping': user_id_mapping
+                        'user_id_mapping': user_id_mapping,
+                        'events': events
                     }
                 
     except Exception as e:
@@ -384,87 +469,105 @@ async def _process_workout_thread(thread, target_dates):
     return None
 
 
-async def _collect_photos_from_thread(thread, date_key):
+async def _collect_photos_from_thread(thread, date_key, progress=None):
     """
     특정 스레드에서 사용자별 사진 개수 수집
     
     Args:
         thread: Discord 스레드
         date_key: 날짜 키 (YYYY-MM-DD)
+        progress (SyncProgress, optional): 진행 상황
         
     Returns:
-        tuple: (user_data, photo_count, user_id_mapping)
+        tuple: (user_data, photo_count, user_id_mapping, events)
             user_data: {사용자명: 1}
             photo_count: int
             user_id_mapping: {사용자명: discord_id}
+            events: 사진 메시지별 workout_events 이벤트 목록
     """
     try:
         print(f"📥 스레드 '{thread.name}' ({date_key}) 사진 수집 중...")
         
         user_photos = {}  # {사용자_id: 사용자_이름}
         user_id_mapping = {}  # {사용자_이름: discord_id}
+        events = []  # 사진 메시지별 이벤트
         photo_count = 0
+        workout_date = datetime.strptime(date_key, '%Y-%m-%d').date()
         
-        async for message in thread.history(limit=None):
+        photo_messages = []  # [(메시지, 이미지 수)]
+        async for message in message_history(thread):
+            if progress is not None:
+                progress.add(messages_read=1)
+            
             # 사진이 첨부된 메시지만 확인
             if message.attachments:
                 # 이미지 파일인지 확인
-                image_count = 0
-                for attachment in message.attachments:
-                    if any(attachment.filename.lower().endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
-                        image_count += 1
+                image_count = count_image_attachments(message)
                 
                 if image_count > 0:
-                    user_id = message.author.id
-                    
-                    # 길드 멤버 정보를 통해 실제 이름 가져오기
-                    try:
-                        # 스레드가 속한 길드에서 멤버 정보 가져오기
-                        guild = thread.guild
-                        member = guild.get_member(user_id)
-                        
-                        if member:
-                            # 1순위: 서버 닉네임 (display_name)
-                            # 2순위: 글로벌 표시명 (global_name) 
-                            # 3순위: 실제 유저명 (username)
-                            user_name = member.display_name or message.author.global_name or message.author.name
-                        else:
-                            # 멤버 정보를 찾을 수 없는 경우 기본값 사용
-                            user_name = message.author.display_name or message.author.global_name or message.author.name
-                    except Exception as e:
-                        print(f"   ⚠️ 멤버 정보 가져오기 실패 (ID: {user_id}): {e}")
-                        user_name = message.author.name or message.author.global_name or message.author.display_name
-                    
-                    # 사용자별로 한 번만 카운팅 (같은 스레드에서 여러 사진 올려도 1번)
-                    if user_id not in user_photos:
-                        user_photos[user_id] = user_name
-                        user_id_mapping[user_name] = str(user_id)  # Discord ID를 문자열로 저장
-                        photo_count += 1
-                        print(f"   📸 {user_name} (ID: {user_id}): 사진 발견 (총 {image_count}개 이미지)")
+                    photo_messages.append((message, image_count))
+        
+        # 사진을 올린 사용자의 길드 멤버 정보를 한 번에 조회 (캐시에 없는 사용자만 게이트웨이에서 조회)
+        try:
+            members = await resolve_members(thread.guild, [message.author.id for message, _ in photo_messages])
+        except Exception as e:
+            print(f"   ⚠️ 멤버 정보 가져오기 실패: {e}")
+            members = {}
+        
+        for message, image_count in photo_messages:
+            user_id = message.author.id
+            member = members.get(user_id)
+            
+            if member:
+                # 1순위: 서버 닉네임 (display_name)
+                # 2순위: 글로벌 표시명 (global_name) 
+                # 3순위: 실제 유저명 (username)
+                user_name = member.display_name or message.author.global_name or message.author.name
+            else:
+                # 멤버 정보를 찾을 수 없는 경우 기본값 사용
+                user_name = message.author.display_name or message.author.global_name or message.author.name
+            
+            # 이벤트 로그는 메시지마다 기록 (집계 시 사용자/날짜별로 합쳐짐)
+            events.append(build_workout_event(message, user_name, workout_date))
+            
+            # 사용자별로 한 번만 카운팅 (같은 스레드에서 여러 사진 올려도 1번)
+            if user_id not in user_photos:
+                user_photos[user_id] = user_name
+                user_id_mapping[user_name] = str(user_id)  # Discord ID를 문자열로 저장
+                photo_count += 1
+                print(f"   📸 {user_name} (ID: {user_id}): 사진 발견 (총 {image_count}개 이미지)")
         
         # 결과 데이터 생성
         user_data = {user_name: 1 for user_name in user_photos.values()}
         
         print(f"📊 스레드 '{thread.name}' 완료: {len(user_photos)}명이 사진 업로드")
+        if progress is not None:
+            progress.add(threads_matched=1, photos_found=photo_count)
         
-        return user_data, photo_count, user_id_mapping
+        return user_data, photo_count, user_id_mapping, events
         
     except Exception as e:
         print(f"❌ 스레드 '{thread.name}' 사진 수집 중 오류: {e}")
-        return {}, 0, {}
+        # 일부만 읽은 스레드를 빈 스레드로 처리하면 동기화 diff가 기록을 지우므로 예외를 전달
+        raise
 
 
 # 운동 스레드 사진 수집기 클래스
 class WorkoutThreadPhotoCollector:
-    def __init__(self, client):
+    def __init__(self, client, guild_config):
         self.client = client
+        self.guild_id = guild_config.guild_id  # 수집 대상 서버
+        self.channel_id = guild_config.workout_channel_id  # 그 서버의 운동 채널
         self.workout_data = {}  # {날짜: {사용자: 사진_개수}}
         self.total_threads_found = 0
         self.total_photos_found = 0
         self.user_id_mapping = {}  # {사용자명: discord_id}
+        self.events = []  # workout_events에 기록할 메시지 이벤트
+        self.scanned_dates = set()  # 운동 스레드를 찾은 날짜 키
+        self.sync_diff = None  # 데이터베이스 반영 결과 {'inserted', 'removed', 'unchanged'}
         
-    async def collect_workout_photos(self, days_back=7):
-        """지정된 기간의 운동 스레드에서 사용자별 사진 업로드 개수를 수집"""
+    async def collect_workout_photos(self, days_back=7, progress=None):
+        """지정된 기간의 운동 스레드에서 사용자별 사진 업로드 개수를 수집 (progress: 진행 상황, 선택)"""
         try:
             # 날짜 범위 계산 (오늘부터 과거로)
             now = datetime.now(KST)
@@ -473,13 +576,15 @@ class WorkoutThreadPhotoCollector:
             end_date = today  # 오늘까지
             
             # 새로운 함수 사용
-            result = await calculate_user_workout_from_threads(self.client, start_date, end_date)
+            result = await calculate_user_workout_from_threads(self.client, self.channel_id, start_date, end_date, progress)
             
             if result:
                 self.workout_data = result['workout_data']
                 self.total_threads_found = result['total_threads_found']
                 self.total_photos_found = result['total_photos_found']
                 self.user_id_mapping = result['user_id_mapping']
+                self.events = result['events']
+                self.scanned_dates = result['scanned_dates']
                 
                 # 결과 출력
                 self._print_results()
@@ -0,0 +1,202 @@
+"""
+동기화 백그라운드 작업
+====================
+!동기화를 백그라운드 작업으로 실행하고, 진행 상황을 응답 메시지에 주기적으로 표시합니다.
+- 서버마다 한 번에 하나의 동기화만 실행됩니다. 같은 서버에서 !동기화와 자정 자동 동기화가 겹치면 새로 시작하지 않고
+  진행 중인 작업에 합류하며, 합류한 요청에는 작업이 끝날 때 결과를 답장합니다. 서로 다른 서버의 동기화는 동시에 실행됩니다.
+- 진행 상황(확인한 스레드, 읽은 메시지, 기록한 행)은 최대 SYNC_PROGRESS_INTERVAL초마다 한 번 메시지를 수정합니다.
+- 스레드 수집 중에는 !동기화 취소로 중단할 수 있습니다. DB 반영이 시작되면 끝까지 진행합니다.
+"""
+
+import asyncio
+import time
+from functools import partial
+from workout_bot_rest import rest_job
+from workout_bot_outbox import send_outbound, PRIORITY_SCHEDULED
+from .sync_helpers import WorkoutThreadPhotoCollector, update_database_with_workout_data
+
+# 진행 상황 메시지 수정 간격 (초)
+SYNC_PROGRESS_INTERVAL = 5.0
+
+# 동기화 REST 호출 예산 (스레드 목록 조회 + 날짜별 스레드 기록 조회 여유분)
+SYNC_REST_BUDGET_BASE = 50
+SYNC_REST_BUDGET_PER_DAY = 20
+
+PHASE_COLLECTING = "운동 스레드 수집"
+PHASE_WRITING = "데이터베이스 반영"
+
+_running_jobs = {}  # guild_id → 실행 중(이거나 마지막으로 실행한) SyncJob
+
+
+class SyncProgress:
+    """동기화 진행 상황 카운터"""
+
+    def __init__(self):
+        self.phase = PHASE_COLLECTING
+        self.threads_scanned = 0  # 이름을 확인한 스레드
+        self.threads_matched = 0  # 사진을 수집한 운동 스레드
+        self.messages_read = 0
+        self.photos_found = 0
+        self.rows_written = 0
+        self.version = 0  # 값이 바뀔 때마다 증가 (변경 없으면 메시지 수정 생략)
+
+    def add(self, **counts):
+        for name, value in counts.items():
+            setattr(self, name, getattr(self, name) + value)
+        self.version += 1
+
+    def set_phase(self, phase):
+        self.phase = phase
+        self.version += 1
+
+    def render(self, days, elapsed_seconds):
+        return (
+            f"🔄 최근 {days}일 동기화 진행 중 ({self.phase}, {elapsed_seconds:.0f}초 경과)\n"
+            f"🧵 스레드 {self.threads_scanned}개 확인 (운동 스레드 {self.threads_matched}개)\n"
+            f"💬 메시지 {self.messages_read}개 읽음 · 📸 사진 업로드 {self.photos_found}회\n"
+            f"🗄️ DB {self.rows_written}행 기록\n"
+            f"취소하려면 `!동기화 취소`"
+        )
+
+
+class SyncJob:
+    """백그라운드에서 실행 중인 동기화 작업 하나"""
+
+    def __init__(self, client, guild_config, days, message, requested_by):
+        self.client = client
+        self.guild_id = guild_config.guild_id
+        self.days = days
+        self.message = message  # 진행 상황/결과를 표시할 응답 메시지 (자동 동기화는 None)
+        self.requested_by = requested_by  # 실행한 멤버 (자동 동기화는 None)
+        self.followers = []  # 진행 중에 합류한 요청의 응답 메시지
+        self.progress = SyncProgress()
+        self.collector = WorkoutThreadPhotoCollector(client, guild_config)
+        self.started = time.monotonic()
+        self.task = None
+        self._finished = asyncio.Event()
+        self._user_cancelled = False  # !동기화 취소로 취소했는지 (종료 시 태스크 취소와 구분)
+
+    @property
+    def requester_name(self):
+        return self.requested_by.display_name if self.requested_by is not None else "자동 동기화"
+
+    @property
+    def elapsed_seconds(self):
+        return time.monotonic() - self.started
+
+    @property
+    def cancellable(self):
+        return self.progress.phase == PHASE_COLLECTING
+
+    def cancel(self):
+        """수집 단계면 작업을 취소하고 True, DB 반영 중이면 False"""
+        if not self.cancellable or self.task is None or self.task.done():
+            return False
+        self._user_cancelled = True
+        self.task.cancel()
+        return True
+
+    async def run(self, on_finished, on_cancelled):
+        """
+        수집 → DB 반영을 실행하고 결과를 콜백으로 넘깁니다.
+
+        Args:
+            on_finished: async (job, success, db_update_success, rest_usage) - 완료 시 (실패 포함)
+            on_cancelled: async (job) - 수집 중 취소 시
+        """
+        reporter = asyncio.create_task(self._report_progress(), name="sync-progress")
+        cancelled = False
+        try:
+            rest_budget = SYNC_REST_BUDGET_BASE + SYNC_REST_BUDGET_PER_DAY * self.days
+            async with rest_job(f"!동기화 {self.days}일", budget=rest_budget) as rest_usage:
+                success = await self.collector.collect_workout_photos(days_back=self.days, progress=self.progress)
+
+                # 여기부터는 취소하지 않음 (출석 diff와 집계가 어긋나지 않도록)
+                db_update_success = False
+                if success:
+                    self.progress.set_phase(PHASE_WRITING)
+                    db_update_success = await update_database_with_workout_data(
+                        self.client, self.guild_id, self.collector, self.progress
+                    )
+        except asyncio.CancelledError:
+            # !동기화 취소가 아닌 취소(봇 종료 등)는 DB 반영 중일 수 있으므로 그대로 전파
+            if not self._user_cancelled:
+                raise
+            cancelled = True
+        finally:
+            # 진행 중인 진행 상황 수정이 결과 메시지를 덮어쓰지 않도록 끝날 때까지 기다림
+            self._finished.set()
+            await reporter
+
+        if cancelled:
+            print(f"🛑 !동기화 {self.days}일 작업이 취소되었습니다 ({self.elapsed_seconds:.1f}초 경과)")
+            await on_cancelled(self)
+            await self._notify_followers(f"🛑 합류한 최근 {self.days}일 동기화가 취소되었습니다. 데이터베이스는 변경되지 않았습니다.")
+            return
+        await on_finished(self, success, db_update_success, rest_usage)
+        await self._notify_followers(self._result_line(success and db_update_success))
+
+    def _result_line(self, succeeded):
+        if not succeeded:
+            return f"❌ 합류한 최근 {self.days}일 동기화가 실패했습니다. 관리자에게 문의해주세요."
+        diff = self.collector.sync_diff or {'inserted': 0, 'removed': 0}
+        text = f"✅ 합류한 최근 {self.days}일 동기화가 완료되었습니다 (출석 추가 {diff['inserted']}건, 제거 {diff['removed']}건)."
+        if self.message is not None:
+            text += f" 결과: {self.message.jump_url}"
+        return text
+
+    async def _notify_followers(self, text):
+        for message in self.followers:
+            try:
+                await send_outbound(partial(message.edit, content=text), PRIORITY_SCHEDULED, "동기화 합류 결과")
+            except Exception as e:
+                print(f"⚠️ 동기화 합류 결과 표시 실패: {e}")
+
+    async def _report_progress(self):
+        """진행 상황이 바뀌었으면 최대 SYNC_PROGRESS_INTERVAL초마다 한 번 메시지를 수정"""
+        if self.message is None:
+            return
+        shown_version = -1
+        while True:
+            try:
+                await asyncio.wait_for(self._finished.wait(), SYNC_PROGRESS_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if self.progress.version == shown_version:
+                continue
+            shown_version = self.progress.version
+            try:
+                await send_outbound(
+                    partial(self.message.edit, content=self.progress.render(self.days, self.elapsed_seconds)),
+                    PRIORITY_SCHEDULED, "동기화 진행 상황"
+                )
+            except Exception as e:
+                print(f"⚠️ 동기화 진행 상황 표시 실패: {e}")
+
+
+def get_running_sync_job(guild_id):
+    """서버에서 실행 중인 동기화 작업 (없으면 None)"""
+    job = _running_jobs.get(guild_id)
+    if job is not None and job.task is not None and not job.task.done():
+        return job
+    return None
+
+
+def start_or_join_sync_job(client, guild_config, days, message, requested_by, on_finished, on_cancelled):
+    """
+    서버의 동기화 작업을 백그라운드로 시작하거나, 이미 실행 중이면 그 작업에 합류합니다 (서버별 single-flight).
+    확인과 시작 사이에 await가 없으므로 동시에 들어온 요청도 작업 하나만 만듭니다.
+
+    Returns:
+        tuple: (job, joined) - joined가 True면 message는 작업이 끝날 때 결과로 수정됨
+    """
+    running = get_running_sync_job(guild_config.guild_id)
+    if running is not None:
+        if message is not None:
+            running.followers.append(message)
+        return running, True
+    job = SyncJob(client, guild_config, days, message, requested_by)
+    job.task = asyncio.create_task(job.run(on_finished, on_cancelled), name=f"sync-{guild_config.guild_id}-{days}d")
+    _running_jobs[guild_config.guild_id] = job
+    return job, False
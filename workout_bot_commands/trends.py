@@ -6,35 +6,23 @@
 """
 
 import discord
+from discord.ext import commands
 from datetime import datetime, timedelta
-from workout_bot_database import WorkoutDatabase
+from workout_bot_storage import get_storage_backend
 from .utils import get_bot_footer, send_error_to_error_channel, KST
+from .coalesce import coalesced_call
 
 def setup_trends_command(client):
     """추세 명령어를 등록하는 함수"""
     
     @client.command(name='추세')
+    @commands.guild_only()
     async def workout_trend_command(ctx):
         """운동 추세 분석을 보여주는 명령어"""
-        cursor = None
-        db = None
         try:
             print(f"📊 {ctx.author.display_name}이(가) !추세 명령어를 실행했습니다.")
             
-            # 데이터베이스 연결
-            db = WorkoutDatabase()
-            if not db.connect():
-                await send_error_to_error_channel(
-                    client, 
-                    "데이터베이스 연결 실패", 
-                    "DatabaseConnectionError", 
-                    "!추세 명령어",
-                    f"{ctx.author.display_name} (ID: {ctx.author.id})"
-                )
-                await ctx.reply("⏳ 처리 중입니다...")
-                return
-            
-            cursor = db.connection.cursor()
+            backend = get_storage_backend()
             now = datetime.now(KST)
             
             # 이번 주 시작일 계산 (월요일)
@@ -45,16 +33,11 @@ def setup_trends_command(client):
             # 5주 전 시작일 계산 (지난주부터 4주를 가져오기 위해)
             five_weeks_ago = this_week_start - timedelta(weeks=5)
             
-            # 주간 데이터 조회
-            weekly_query = """
-            SELECT user_name, year, week_number, week_start_date, week_end_date, workout_days, workout_rate
-            FROM weekly_workout_records 
-            WHERE week_start_date >= %s
-            ORDER BY user_name, year, week_number
-            """
-            
-            cursor.execute(weekly_query, (five_weeks_ago.strftime('%Y-%m-%d'),))
-            all_weekly_data = cursor.fetchall()
+            # 서버의 주간 데이터 조회 (같은 서버, 같은 주의 !추세가 동시에 들어오면 조회를 한 번만 실행)
+            guild_id = ctx.guild.id
+            all_weekly_data = await coalesced_call(
+                ('추세', guild_id, five_weeks_ago), backend.get_weekly_records_since, guild_id, five_weeks_ago
+            )
             
             # 이번 주 데이터 제외하고 정확히 4주만 필터링
             weekly_data = []
@@ -201,13 +184,9 @@ def setup_trends_command(client):
                 f"추세 명령어 실행 중 오류: {str(e)}", 
                 type(e).__name__, 
                 "!추세 명령어",
-                f"{ctx.author.display_name} (ID: {ctx.author.id})"
+                f"{ctx.author.display_name} (ID: {ctx.author.id})",
+                guild_id=ctx.guild.id
             )
             await ctx.reply("⏳ 처리 중입니다...")
-        finally:
-            if cursor:
-                cursor.close()
-            if db:
-                db.disconnect()
     
     print("✅ 추세 명령어 등록 완료")
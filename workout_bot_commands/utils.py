@@ -5,10 +5,14 @@
 """
 
 import discord
-from datetime import datetime
+import re
+from datetime import datetime, date, timedelta
 import pytz
 import logging
-from workout_bot_config import BOT_VERSION, DISCORD_ALERT_CHANNEL_ID
+from functools import partial
+from workout_bot_config import BOT_VERSION
+from workout_bot_guilds import get_alert_channel_id
+from workout_bot_outbox import send_outbound, PRIORITY_ALERT
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
@@ -26,10 +30,13 @@ def get_bot_footer(additional_info=None):
     else:
         return f"{base_footer} | 조회 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}"
 
-async def send_alert_to_channel(client, message, alert_type="Info", location="Unknown", user_info=None):
-    """알림 채널에 메시지를 전송하는 함수 (에러, 정보, 알림 등)"""
+async def send_alert_to_channel(client, message, alert_type="Info", location="Unknown", user_info=None, guild_id=None):
+    """
+    알림 채널에 메시지를 전송하는 함수 (에러, 정보, 알림 등) - 전송한 메시지 반환 (실패 시 None)
+    guild_id를 주면 그 서버의 알림 채널로, 없거나 서버에 알림 채널이 없으면 전역 알림 채널로 보냅니다.
+    """
     try:
-        alert_channel_id = DISCORD_ALERT_CHANNEL_ID
+        alert_channel_id = get_alert_channel_id(guild_id)
         if not alert_channel_id:
             print("❌ DISCORD_ALERT_CHANNEL_ID가 설정되지 않았습니다.")
             return
@@ -61,13 +68,75 @@ async def send_alert_to_channel(client, message, alert_type="Info", location="Un
         alert_embed.add_field(name="🕐 발생 시간", value=datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'), inline=True)
         alert_embed.set_footer(text=get_bot_footer())
         
-        await channel.send(embed=alert_embed)
+        # 알림은 사용자 응답/스케줄러 게시보다 뒤에 나감
+        sent = await send_outbound(partial(channel.send, embed=alert_embed), PRIORITY_ALERT, f"알림 ({alert_type})")
         print(f"✅ 알림 메시지를 알림 채널에 전송했습니다: {message}")
+        return sent
         
     except Exception as e:
         print(f"❌ 알림 채널 전송 실패: {e}")
 
 # 기존 함수명과의 호환성을 위한 별칭
-async def send_error_to_error_channel(client, error_message, error_type="CommandError", location="Unknown", user_info=None):
+async def send_error_to_error_channel(client, error_message, error_type="CommandError", location="Unknown", user_info=None, guild_id=None):
     """에러 채널에 에러 메시지를 전송하는 함수 (send_alert_to_channel의 별칭)"""
-    await send_alert_to_channel(client, error_message, f"Error - {error_type}", location, user_info)
+    return await send_alert_to_channel(client, error_message, f"Error - {error_type}", location, user_info, guild_id)
+
+# 운동 사진으로 인정하는 이미지 확장자
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
+
+def count_image_attachments(message):
+    """메시지 첨부파일 중 이미지 파일 개수를 반환하는 함수"""
+    return sum(
+        1 for attachment in message.attachments
+        if any(attachment.filename.lower().endswith(ext) for ext in IMAGE_EXTENSIONS)
+    )
+
+def parse_workout_thread_date(thread_name, reference_date):
+    """
+    운동 스레드 이름("10월 31일 목")에서 날짜를 추출하는 함수
+    
+    Args:
+        thread_name: 스레드 이름
+        reference_date: 기준 날짜 (스레드 생성일 등). 연도 추정에 사용
+    
+    Returns:
+        date or None: 운동 날짜 (이름에 날짜가 없으면 None)
+    """
+    match = re.search(r'(\d{1,2})월\s*(\d{1,2})일', thread_name)
+    if not match:
+        return None
+    
+    try:
+        workout_date = date(reference_date.year, int(match.group(1)), int(match.group(2)))
+    except ValueError:
+        return None
+    
+    # 1월에 작성된 "12월 31일" 스레드처럼 연도가 넘어가는 경우
+    if workout_date > reference_date + timedelta(days=1):
+        workout_date = workout_date.replace(year=workout_date.year - 1)
+    return workout_date
+
+def build_workout_event(message, user_name, workout_date):
+    """
+    운동 사진 메시지를 workout_events에 기록할 이벤트로 변환하는 함수
+    
+    Args:
+        message: Discord 메시지
+        user_name: 사용자 표시 이름
+        workout_date: 운동 날짜 (datetime.date)
+    
+    Returns:
+        dict: record_workout_events에 전달할 이벤트
+    """
+    return {
+        'guild_id': str(message.channel.guild.id),
+        'message_id': str(message.id),
+        'thread_id': str(message.channel.id),
+        'user_id': str(message.author.id),
+        'user_name': user_name,
+        'workout_date': workout_date,
+        'attachment_count': len(message.attachments),
+        'image_count': count_image_attachments(message),
+        # DB에는 KST 기준 naive datetime으로 저장
+        'posted_at': message.created_at.astimezone(KST).replace(tzinfo=None),
+    }
@@ -9,9 +9,15 @@ BOT_VERSION = "1.1.0"
 
 # Discord Bot 설정
 DISCORD_BOT_TOKEN = {사용자 디스코드 봇 토큰}
+# 서버별 운동/알림 채널은 DB(guild_settings)에 저장하며 각 서버에서 !채널설정으로 지정합니다.
+# DISCORD_CHANNEL_ID는 기본 서버의 운동 채널로, 시작 시 그 서버를 자동 등록하고 서버 구분 전 기록을 그 서버로 옮깁니다.
 DISCORD_CHANNEL_ID = {운동 스레드를 등록할 채널 ID}
+# 알림 채널을 따로 지정하지 않은 서버와 봇 전체 알림(시작, 마이그레이션 등)을 받을 채널
 DISCORD_ALERT_CHANNEL_ID = {에러 및 알람 받을 채널 ID}
 
+# 여러 서버에서 운영할 때 게이트웨이 연결을 자동 샤딩 (AutoShardedBot, 서버 수에 따라 Discord 권장 샤드 수 사용)
+DISCORD_AUTO_SHARD = False
+
 # 데이터베이스 설정 (workout_bot_database.py에서 사용)
 DATABASE_CONFIG = {
     "host": {host},
@@ -20,3 +26,42 @@ DATABASE_CONFIG = {
     "password": {password},
     "database": {database}
 }
+
+# 저장소 백엔드 선택: "mysql" (DATABASE_CONFIG 사용) 또는 "sqlite" (내장 DB, WAL 모드)
+DATABASE_BACKEND = "mysql"
+
+# SQLite 백엔드 사용 시 데이터베이스 파일 경로
+SQLITE_DATABASE_PATH = "workout_bot.sqlite3"
+
+# 읽기 복제본 (선택): 설정하면 보고서 조회(!통계, !요약, 랭킹, 내보내기)는 복제본에서, 쓰기는 기본 DB에서 실행
+# MySQL은 DATABASE_CONFIG와 같은 형식의 dict, SQLite는 복제본(또는 테스트용 두 번째 DB) 파일 경로. None이면 사용 안 함
+DATABASE_REPLICA_CONFIG = None
+SQLITE_REPLICA_PATH = None
+
+# 동기화 등 대량 쓰기 직후 보고서 조회도 기본 DB에서 읽을 시간 (초, 복제 지연 대비)
+REPLICA_READ_AFTER_WRITE_SECONDS = 30
+
+# 출석 행렬 스냅샷 파일 경로 (재시작 후 !요약을 DB 전체 조회 없이 바로 계산, None이면 사용 안 함)
+ATTENDANCE_SNAPSHOT_PATH = "workout_attendance.snapshot"
+
+# 출석 변경 저널 보존 기간 (일, 스냅샷이 이보다 오래되면 전체를 다시 생성)
+ATTENDANCE_JOURNAL_RETENTION_DAYS = 7
+
+# 마지막으로 Discord에 동기화한 slash command 정의의 해시 (정의가 바뀐 경우에만 다시 동기화)
+SLASH_COMMAND_FINGERPRINT_PATH = "slash_commands.fingerprint"
+
+# 운동 스레드 메시지 메타데이터 로컬 미러 파일 (!동기화/주간 집계가 Discord API 대신 로컬에서 읽음, None이면 사용 안 함)
+MESSAGE_MIRROR_PATH = "workout_messages.sqlite3"
+
+# !대시보드 메시지를 다시 그리는 최소 간격 (초, 그 사이의 출석 변경은 모아서 한 번에 반영)
+DASHBOARD_EDIT_INTERVAL_SECONDS = 60
+
+# 매일 00:10 KST 자동 동기화로 다시 확인할 최근 일수 (0이면 자동 동기화 끔)
+NIGHTLY_SYNC_DAYS = 3
+
+# daily_workout_records에 남겨 둘 개월 수 (이보다 오래된 달은 월별 출석 비트맵으로 압축, 최소 12)
+COMPACTION_HORIZON_MONTHS = 24
+
+# daily_workout_records 월별 파티션 (MySQL): 미리 만들어 둘 미래 개월 수, 압축이 끝난 과거 파티션 제거 여부
+PARTITION_MONTHS_AHEAD = 3
+PARTITION_DROP_COMPACTED = True
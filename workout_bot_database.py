@@ -1,14 +1,14 @@
 """
-MySQL 데이터베이스 연결 모듈
-운동 기록을 MySQL 데이터베이스에 저장하고 조회하는 기능을 제공합니다.
+데이터베이스 연결 모듈
+운동 기록을 데이터베이스에 저장하고 조회하는 기능을 제공합니다.
+실제 쿼리는 workout_bot_storage 패키지의 백엔드(MySQL/SQLite)가 실행합니다.
+운동 기록은 서버(guild)별로 저장되므로 조회/기록 함수는 guild_id를 첫 인자로 받습니다.
 """
 
-import mysql.connector
-from mysql.connector import Error
-from datetime import datetime
+from datetime import datetime, date
 import logging
-import asyncio
-from workout_bot_config import DATABASE_CONFIG
+from workout_bot_tasks import spawn_background
+from workout_bot_storage import get_storage_backend, calculate_current_streak, calculate_max_streak
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -16,361 +16,86 @@ logger = logging.getLogger(__name__)
 
 class WorkoutDatabase:
     def __init__(self):
-        # config 파일에서 연결 정보 직접 가져오기
-        self.host = DATABASE_CONFIG["host"]
-        self.port = DATABASE_CONFIG["port"]
-        self.database = DATABASE_CONFIG["database"]
-        self.username = DATABASE_CONFIG["user"]
-        self.password = DATABASE_CONFIG["password"]
+        # 설정된 저장소 백엔드 사용 (workout_bot_config.DATABASE_BACKEND)
+        self.backend = get_storage_backend()
         self.connection = None
         
     def connect(self):
-        """MySQL 데이터베이스에 연결"""
+        """데이터베이스에 연결"""
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.username,
-                password=self.password,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
-            )
-            
-            if self.connection.is_connected():
-                # 세션 타임존을 KST로 설정
-                cursor = self.connection.cursor()
-                cursor.execute("SET time_zone = '+09:00'")
-                cursor.close()
-                
-                db_info = self.connection.get_server_info()
-                logger.info(f"✅ MySQL 서버에 성공적으로 연결되었습니다. 버전: {db_info}")
-                logger.info(f"📊 연결된 데이터베이스: {self.database}")
-                logger.info("🕐 세션 타임존: +09:00 (KST)로 설정됨")
-                return True
+            self.connection = self.backend.connect()
+            logger.info(f"✅ 데이터베이스에 성공적으로 연결되었습니다. 백엔드: {self.backend.name}")
+            return True
                 
-        except Error as e:
-            error_msg = f"❌ MySQL 연결 오류: {e}"
+        except Exception as e:
+            error_msg = f"❌ 데이터베이스 연결 오류: {e}"
             logger.error(error_msg)
             return False
     
     def disconnect(self):
-        """MySQL 데이터베이스 연결 종료"""
-        if self.connection and self.connection.is_connected():
+        """데이터베이스 연결 종료"""
+        if self.connection:
             self.connection.close()
-            logger.info("🔌 MySQL 연결이 종료되었습니다.")
+            self.connection = None
+            logger.info("🔌 데이터베이스 연결이 종료되었습니다.")
     
-    def create_tables(self):
-        """필요한 테이블들을 생성합니다"""
-        if not self.connection or not self.connection.is_connected():
-            logger.error("❌ 데이터베이스에 연결되지 않았습니다.")
-            return False
-        
-        try:
-            cursor = self.connection.cursor()
-            
-            # 기존 테이블 삭제 (workout_records, weekly_stats)
-            drop_tables = """
-            DROP TABLE IF EXISTS workout_records;
-            DROP TABLE IF EXISTS weekly_stats;
-            """
-            
-            # 멤버 정보 테이블 생성
-            create_members_table = """
-            CREATE TABLE IF NOT EXISTS workout_members (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id VARCHAR(50) NOT NULL UNIQUE,
-                user_name VARCHAR(255) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                INDEX idx_user_id (user_id),
-                INDEX idx_user_name (user_name)
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """
-            
-            # 일별 운동 기록 테이블 (기존 유지하되 구조 정리)
-            create_daily_workout_table = """
-            CREATE TABLE IF NOT EXISTS daily_workout_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                date DATE NOT NULL,
-                weekday VARCHAR(10) NOT NULL,
-                user_id VARCHAR(50) NOT NULL,
-                user_name VARCHAR(255) NOT NULL,
-                exercised CHAR(1) NOT NULL DEFAULT 'N',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_user_date (date, user_id),
-                INDEX idx_date (date),
-                INDEX idx_user_id (user_id),
-                INDEX idx_weekday (weekday),
-                FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """
-            
-            # 주간 운동 기록 집계 테이블
-            create_weekly_workout_table = """
-            CREATE TABLE IF NOT EXISTS weekly_workout_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id VARCHAR(50) NOT NULL,
-                user_name VARCHAR(255) NOT NULL,
-                year INT NOT NULL,
-                week_number INT NOT NULL,
-                week_start_date DATE NOT NULL,
-                week_end_date DATE NOT NULL,
-                workout_days INT DEFAULT 0,
-                workout_rate DECIMAL(5,2) DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_user_week (user_id, year, week_number),
-                INDEX idx_week_start (week_start_date),
-                INDEX idx_user_week (user_id, year, week_number),
-                FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """
-            
-            # 월간 운동 기록 집계 테이블
-            create_monthly_workout_table = """
-            CREATE TABLE IF NOT EXISTS monthly_workout_records (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id VARCHAR(50) NOT NULL,
-                user_name VARCHAR(255) NOT NULL,
-                year INT NOT NULL,
-                month INT NOT NULL,
-                month_start_date DATE NOT NULL,
-                month_end_date DATE NOT NULL,
-                workout_days INT DEFAULT 0,
-                total_days INT DEFAULT 0,
-                workout_rate DECIMAL(5,2) DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_user_month (user_id, year, month),
-                INDEX idx_month_start (month_start_date),
-                INDEX idx_user_month (user_id, year, month),
-                FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
-            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
-            """
-            
-            # 테이블 삭제 실행
-            for statement in drop_tables.split(';'):
-                if statement.strip():
-                    cursor.execute(statement)
-            
-            # 새 테이블 생성 실행
-            cursor.execute(create_members_table)
-            cursor.execute(create_daily_workout_table)
-            cursor.execute(create_weekly_workout_table)
-            cursor.execute(create_monthly_workout_table)
-            
-            self.connection.commit()
-            logger.info("✅ 테이블이 성공적으로 생성되었습니다.")
-            logger.info("📋 생성된 테이블:")
-            logger.info("   - workout_members (멤버 정보)")
-            logger.info("   - daily_workout_records (일별 운동 기록)")
-            logger.info("   - weekly_workout_records (주간 운동 집계)")
-            logger.info("   - monthly_workout_records (월간 운동 집계)")
-            return True
-            
-        except Error as e:
-            logger.error(f"❌ 테이블 생성 오류: {e}")
-            return False
-        finally:
-            if cursor:
-                cursor.close()
-    
-    def insert_workout_record(self, user_id, user_name, thread_id, thread_name, workout_date, attachment_count=0, message_content=""):
-        """운동 기록을 데이터베이스에 삽입"""
-        if not self.connection or not self.connection.is_connected():
-            logger.error("❌ 데이터베이스에 연결되지 않았습니다.")
-            return False
-        
-        try:
-            cursor = self.connection.cursor()
-            
-            insert_query = """
-            INSERT INTO workout_records 
-            (user_id, user_name, discord_thread_id, thread_name, workout_date, attachment_count, message_content)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            values = (user_id, user_name, thread_id, thread_name, workout_date, attachment_count, message_content)
-            cursor.execute(insert_query, values)
-            
-            self.connection.commit()
-            record_id = cursor.lastrowid
-            
-            logger.info(f"✅ 운동 기록이 저장되었습니다. ID: {record_id}")
-            logger.info(f"   👤 사용자: {user_name} (ID: {user_id})")
-            logger.info(f"   📅 날짜: {workout_date}")
-            logger.info(f"   🧵 스레드: {thread_name}")
-            
-            return record_id
-            
-        except Error as e:
-            logger.error(f"❌ 운동 기록 저장 오류: {e}")
-            return False
-        finally:
-            if cursor:
-                cursor.close()
-    
-    def get_user_workout_count(self, user_id, start_date=None, end_date=None):
-        """특정 사용자의 운동 횟수를 조회"""
-        if not self.connection or not self.connection.is_connected():
-            logger.error("❌ 데이터베이스에 연결되지 않았습니다.")
-            return 0
-        
+    def migrate(self):
+        """스키마 마이그레이션을 적용합니다 (workout_bot_storage.migrations)"""
+        return self.backend.migrate()
+    
+    def get_user_workout_count(self, guild_id, user_id, start_date=None, end_date=None):
+        """서버에서 특정 사용자의 운동 일수를 조회 (기간 생략 시 전체)"""
         try:
-            cursor = self.connection.cursor()
-            
-            if start_date and end_date:
-                query = """
-                SELECT COUNT(*) FROM workout_records 
-                WHERE user_id = %s AND workout_date BETWEEN %s AND %s
-                """
-                cursor.execute(query, (user_id, start_date, end_date))
-            else:
-                query = "SELECT COUNT(*) FROM workout_records WHERE user_id = %s"
-                cursor.execute(query, (user_id,))
-            
-            result = cursor.fetchone()
-            return result[0] if result else 0
+            return self.backend.count_user_workouts(
+                guild_id, user_id, start_date or date(1900, 1, 1), end_date or date.max
+            )
             
-        except Error as e:
+        except Exception as e:
             logger.error(f"❌ 운동 횟수 조회 오류: {e}")
             return 0
-        finally:
-            if cursor:
-                cursor.close()
-    
-    def get_weekly_rankings(self, start_date, end_date):
-        """주간 운동 랭킹을 조회"""
-        if not self.connection or not self.connection.is_connected():
-            logger.error("❌ 데이터베이스에 연결되지 않았습니다.")
-            return []
-        
+    
+    def get_weekly_rankings(self, guild_id, start_date, end_date):
+        """서버의 기간 내 운동 일수 랭킹을 조회"""
         try:
-            cursor = self.connection.cursor()
-            
-            query = """
-            SELECT user_name, user_id, COUNT(*) as workout_count
-            FROM workout_records 
-            WHERE workout_date BETWEEN %s AND %s
-            GROUP BY user_id, user_name
-            ORDER BY workout_count DESC, user_name ASC
-            """
-            
-            cursor.execute(query, (start_date, end_date))
-            results = cursor.fetchall()
+            return self.backend.get_workout_rankings(guild_id, start_date, end_date)
             
-            rankings = []
-            for row in results:
-                rankings.append({
-                    'user_name': row[0],
-                    'user_id': row[1],
-                    'workout_count': row[2]
-                })
-            
-            return rankings
-            
-        except Error as e:
+        except Exception as e:
             logger.error(f"❌ 주간 랭킹 조회 오류: {e}")
             return []
-        finally:
-            if cursor:
-                cursor.close()
     
     def test_connection(self):
         """데이터베이스 연결 테스트"""
-        if self.connect():
-            try:
-                cursor = self.connection.cursor()
-                cursor.execute("SELECT VERSION()")
-                version = cursor.fetchone()
-                logger.info(f"🔍 MySQL 버전: {version[0]}")
-                
-                cursor.execute("SHOW TABLES")
-                tables = cursor.fetchall()
-                logger.info(f"📋 데이터베이스 테이블 수: {len(tables)}")
-                
-                if tables:
-                    logger.info("📝 존재하는 테이블:")
-                    for table in tables:
-                        logger.info(f"   - {table[0]}")
-                
-                return True
-                
-            except Error as e:
-                logger.error(f"❌ 연결 테스트 오류: {e}")
-                return False
-            finally:
-                if cursor:
-                    cursor.close()
-                self.disconnect()
-        else:
-            return False
+        return self.backend.test_connection()
     
-    def calculate_current_streak_until_date(self, user_name, end_date):
+    def calculate_current_streak_until_date(self, guild_id, user_name, end_date):
         """
         특정 날짜까지의 현재 연속 운동일수를 계산합니다.
         
         Args:
+            guild_id: 서버(guild) ID
             user_name (str): 사용자 이름
             end_date (date): 계산 기준 마지막 날짜 (포함)
             
         Returns:
             int: 연속 운동일수
         """
-        if not self.connection or not self.connection.is_connected():
-            logger.error("❌ 데이터베이스에 연결되지 않았습니다.")
-            return 0
-        
         try:
-            cursor = self.connection.cursor()
-            
             # end_date부터 역순으로 운동 기록을 조회
-            query = """
-            SELECT date 
-            FROM daily_workout_records 
-            WHERE user_name = %s AND date <= %s
-            ORDER BY date DESC
-            """
-            
-            cursor.execute(query, (user_name, end_date.strftime('%Y-%m-%d')))
-            workout_dates = [row[0] for row in cursor.fetchall()]
-            
-            if not workout_dates:
-                cursor.close()
-                return 0
+            workout_dates = self.backend.get_workout_dates(guild_id, user_name=user_name, until=end_date)
+            return calculate_current_streak(workout_dates, end_date)
             
-            # 연속 운동일수 계산
-            from datetime import timedelta
-            streak = 0
-            current_date = end_date
-            
-            for workout_date in workout_dates:
-                # 문자열인 경우 date 객체로 변환
-                if isinstance(workout_date, str):
-                    from datetime import datetime
-                    workout_date = datetime.strptime(workout_date, '%Y-%m-%d').date()
-                
-                if workout_date == current_date:
-                    streak += 1
-                    current_date -= timedelta(days=1)
-                else:
-                    break
-            
-            cursor.close()
-            return streak
-            
-        except Error as e:
+        except Exception as e:
             logger.error(f"❌ 연속 운동일수 계산 중 오류: {e}")
             return 0
 
 
-def calculate_user_workout_streak(client, user_name, end_date=None):
+def calculate_user_workout_streak(client, guild_id, user_name, end_date=None):
     """
     사용자의 연속 운동일수를 계산하는 독립 함수 (Discord 알림 포함)
     
     Args:
         client: Discord 클라이언트 객체
+        guild_id: 서버(guild) ID
         user_name (str): 사용자 이름
         end_date (date, optional): 계산 기준 마지막 날짜. None이면 오늘 날짜 사용
         
@@ -378,52 +103,14 @@ def calculate_user_workout_streak(client, user_name, end_date=None):
         int: 연속 운동일수
     """
     try:
-        # 데이터베이스 연결
-        conn = get_database_connection(client)
-        if not conn:
-            logger.error("❌ 데이터베이스 연결 실패")
-            return 0
-            
-        cursor = conn.cursor()
-        
         # end_date가 없으면 오늘 날짜 사용
         if end_date is None:
             from datetime import date
             end_date = date.today()
         
         # end_date부터 역순으로 운동 기록을 조회
-        query = """
-        SELECT date 
-        FROM daily_workout_records 
-        WHERE user_name = %s AND date <= %s
-        ORDER BY date DESC
-        """
-        
-        cursor.execute(query, (user_name, end_date.strftime('%Y-%m-%d')))
-        workout_dates = [row[0] for row in cursor.fetchall()]
-        
-        cursor.close()
-        conn.close()
-        
-        if not workout_dates:
-            return 0
-        
-        # 연속 운동일수 계산
-        from datetime import timedelta
-        streak = 0
-        current_date = end_date
-        
-        for workout_date in workout_dates:
-            # 문자열인 경우 date 객체로 변환
-            if isinstance(workout_date, str):
-                from datetime import datetime
-                workout_date = datetime.strptime(workout_date, '%Y-%m-%d').date()
-            
-            if workout_date == current_date:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
+        workout_dates = get_storage_backend().get_workout_dates(guild_id, user_name=user_name, until=end_date)
+        streak = calculate_current_streak(workout_dates, end_date)
         
         logger.info(f"📈 {user_name}님의 {end_date}까지 연속 운동일수: {streak}일")
         return streak
@@ -433,46 +120,51 @@ def calculate_user_workout_streak(client, user_name, end_date=None):
         logger.error(f"❌ {error_msg}")
         # Discord 알림
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
         return 0
 
-# 사용 예시
-if __name__ == "__main__":
-    # 데이터베이스 연결 테스트
-    db = WorkoutDatabase()
+def apply_database_migrations(client=None):
+    """
+    봇 시작 시 스키마 마이그레이션을 적용하는 함수
     
-    print("🔗 MySQL 데이터베이스 연결 테스트를 시작합니다...")
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
     
-    if db.test_connection():
-        print("✅ 데이터베이스 연결 테스트 성공!")
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        applied_count = get_storage_backend().migrate()
+        logger.info(f"✅ 스키마 마이그레이션 확인 완료: {applied_count}개 적용")
+        return True
         
-        # 테이블 생성 테스트
-        if db.connect():
-            db.create_tables()
-            
-            # 샘플 데이터 삽입 테스트
-            sample_date = datetime.now().date()
-            record_id = db.insert_workout_record(
-                user_id=1234567890,
-                user_name="테스트유저",
-                thread_id=9876543210,
-                thread_name="1월 1일 월",
-                workout_date=sample_date,
-                attachment_count=2,
-                message_content="오늘 운동 완료!"
-            )
-            
-            if record_id:
-                print(f"✅ 샘플 데이터 삽입 성공! 레코드 ID: {record_id}")
-                
-                # 운동 횟수 조회 테스트
-                count = db.get_user_workout_count(1234567890)
-                print(f"📊 테스트유저의 총 운동 횟수: {count}회")
-            
-            db.disconnect()
-    else:
-        print("❌ 데이터베이스 연결 테스트 실패!")
-        print("💡 연결 정보를 확인해주세요.")
+    except Exception as e:
+        error_msg = f"스키마 마이그레이션 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return False
+
+def warm_up_database(client=None):
+    """
+    봇 시작 시 DB 연결 풀과 읽기 복제본 연결을 미리 여는 함수
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        get_storage_backend().warm_up()
+        return True
+        
+    except Exception as e:
+        error_msg = f"DB 연결 준비 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return False
 
 def get_database_connection(client=None):
     """
@@ -483,48 +175,27 @@ def get_database_connection(client=None):
         client: Discord 클라이언트 객체 (에러 알림을 위해 선택적으로 전달)
     
     Returns:
-        mysql.connector.connection.MySQLConnection: 데이터베이스 연결 객체
+        설정된 백엔드의 DB-API 연결 객체
         None: 연결 실패 시
     """
     try:
-        connection = mysql.connector.connect(
-            host=DATABASE_CONFIG["host"],
-            port=DATABASE_CONFIG["port"],
-            database=DATABASE_CONFIG["database"],
-            user=DATABASE_CONFIG["user"],
-            password=DATABASE_CONFIG["password"],
-            charset='utf8mb4',
-            collation='utf8mb4_unicode_ci'
-        )
-        
-        if connection.is_connected():
-            # 세션 타임존을 KST로 설정
-            cursor = connection.cursor()
-            cursor.execute("SET time_zone = '+09:00'")
-            cursor.close()
-            return connection
-        else:
-            error_msg = "❌ 데이터베이스 연결에 실패했습니다."
-            logger.error(error_msg)
-            # Discord 알림을 위한 비동기 함수 호출 (클라이언트가 있는 경우에만)
-            if client:
-                asyncio.create_task(send_database_error_alert(client, error_msg))
-            return None
+        return get_storage_backend().connect()
             
-    except Error as e:
+    except Exception as e:
         error_msg = f"❌ 데이터베이스 연결 중 오류 발생: {e}"
         logger.error(error_msg)
         # Discord 알림을 위한 비동기 함수 호출 (클라이언트가 있는 경우에만)
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
         return None
 
 
-def upsert_daily_workout_record(user_id, user_name, workout_date, client=None):
+def upsert_daily_workout_record(guild_id, user_id, user_name, workout_date, client=None):
     """
     일별 운동 기록을 UPSERT (INSERT OR UPDATE)하는 함수
     
     Args:
+        guild_id: 서버(guild) ID
         user_id: 사용자 Discord ID (문자열)
         user_name: 사용자 이름
         workout_date: 운동 날짜 (datetime.date 또는 문자열)
@@ -533,53 +204,9 @@ def upsert_daily_workout_record(user_id, user_name, workout_date, client=None):
     Returns:
         bool: 성공 여부
     """
-    conn = None
-    cursor = None
     try:
-        # 날짜 처리
-        if isinstance(workout_date, str):
-            from datetime import datetime
-            workout_date = datetime.strptime(workout_date, '%Y-%m-%d').date()
-        
-        # 요일 계산
-        weekdays = ['월', '화', '수', '목', '금', '토', '일']
-        weekday = weekdays[workout_date.weekday()]
-        
-        # 데이터베이스 연결
-        conn = get_database_connection(client)
-        if not conn:
-            return False
-        
-        cursor = conn.cursor()
-        
-        # 먼저 workout_members에 사용자가 있는지 확인하고 없으면 추가
-        member_check_query = "SELECT user_id FROM workout_members WHERE user_id = %s"
-        cursor.execute(member_check_query, (user_id,))
-        
-        if not cursor.fetchone():
-            # 사용자 추가
-            insert_member_query = """
-            INSERT INTO workout_members (user_id, user_name) 
-            VALUES (%s, %s)
-            ON DUPLICATE KEY UPDATE user_name = VALUES(user_name)
-            """
-            cursor.execute(insert_member_query, (user_id, user_name))
-            logger.info(f"✅ 새 멤버 추가: {user_name} (ID: {user_id})")
-        
-        # daily_workout_records UPSERT
-        upsert_daily_query = """
-        INSERT INTO daily_workout_records 
-        (date, weekday, user_id, user_name, exercised)
-        VALUES (%s, %s, %s, %s, 'Y')
-        ON DUPLICATE KEY UPDATE 
-            exercised = 'Y',
-            user_name = VALUES(user_name),
-            updated_at = CURRENT_TIMESTAMP
-        """
-        
-        cursor.execute(upsert_daily_query, (workout_date, weekday, user_id, user_name))
-        
-        conn.commit()
+        # 멤버 확인/추가 후 daily_workout_records UPSERT (한 트랜잭션)
+        get_storage_backend().record_daily_workout(guild_id, user_id, user_name, workout_date)
         logger.info(f"✅ 일별 운동 기록 업데이트: {user_name} - {workout_date}")
         return True
         
@@ -587,65 +214,128 @@ def upsert_daily_workout_record(user_id, user_name, workout_date, client=None):
         error_msg = f"일별 운동 기록 UPSERT 중 오류: {e}"
         logger.error(f"❌ {error_msg}")
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
-        if conn:
-            conn.rollback()
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
         return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def upsert_weekly_workout_records(client=None):
+def load_attendance_set(guild_id, start_date, end_date, client=None):
     """
-    daily_workout_records를 기반으로 weekly_workout_records를 업데이트하는 함수
+    서버의 기간 내 저장된 출석 집합을 조회하는 함수 (동기화 diff 계산용)
+    
+    Returns:
+        set or None: {(user_id, date)} (실패 시 None)
+    """
+    try:
+        return get_storage_backend().get_attendance_set(guild_id, start_date, end_date)
+        
+    except Exception as e:
+        error_msg = f"저장된 출석 조회 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def apply_workout_attendance_diff(guild_id, inserts, removals, client=None):
+    """
+    동기화 diff(추가/제거할 출석)만 데이터베이스에 반영하는 함수
     
     Args:
+        guild_id: 서버(guild) ID
+        inserts: (user_id, user_name, date) 목록
+        removals: (user_id, date) 목록
         client: Discord 클라이언트 (에러 알림용, 선택사항)
     
     Returns:
-        bool: 성공 여부
+        tuple or None: (추가된 기록 수, 제거된 기록 수) (실패 시 None)
     """
-    conn = None
-    cursor = None
     try:
-        conn = get_database_connection(client)
-        if not conn:
-            return False
+        result = get_storage_backend().apply_attendance_diff(guild_id, inserts, removals)
+        logger.info(f"✅ 출석 diff 반영: 추가 {result[0]}개, 제거 {result[1]}개")
+        return result
         
-        cursor = conn.cursor()
+    except Exception as e:
+        error_msg = f"출석 diff 반영 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def record_workout_events(events, client=None, derive_daily=True):
+    """
+    메시지 단위 운동 이벤트를 workout_events에 기록하는 함수 (message_id 기준 중복 무시)
+    
+    Args:
+        events: 이벤트 dict 목록 (build_workout_event 참고)
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+        derive_daily: False이면 일별 기록은 갱신하지 않음 (동기화 diff가 반영하는 경우)
+    
+    Returns:
+        int or None: 새로 기록된 이벤트 수 (실패 시 None)
+    """
+    try:
+        inserted = get_storage_backend().record_workout_events(events, derive_daily)
+        if inserted:
+            logger.info(f"✅ 운동 이벤트 기록: {inserted}개 (요청 {len(events)}개)")
+        return inserted
         
-        # 최근 4주간의 주간 집계 업데이트
-        weekly_upsert_query = """
-        INSERT INTO weekly_workout_records 
-        (user_id, user_name, year, week_number, week_start_date, week_end_date, workout_days, workout_rate)
-        SELECT 
-            user_id,
-            user_name,
-            YEAR(date) as year,
-            WEEK(date, 1) as week_number,
-            DATE_SUB(date, INTERVAL WEEKDAY(date) DAY) as week_start_date,
-            DATE_ADD(DATE_SUB(date, INTERVAL WEEKDAY(date) DAY), INTERVAL 6 DAY) as week_end_date,
-            COUNT(DISTINCT date) as workout_days,
-            ROUND((COUNT(DISTINCT date) / 7.0) * 100, 2) as workout_rate
-        FROM daily_workout_records 
-        WHERE exercised = 'Y' 
-            AND date >= DATE_SUB(CURDATE(), INTERVAL 4 WEEK)
-        GROUP BY user_id, user_name, YEAR(date), WEEK(date, 1)
-        ON DUPLICATE KEY UPDATE
-            workout_days = VALUES(workout_days),
-            workout_rate = VALUES(workout_rate),
-            week_start_date = VALUES(week_start_date),
-            week_end_date = VALUES(week_end_date),
-            user_name = VALUES(user_name),
-            updated_at = CURRENT_TIMESTAMP
-        """
+    except Exception as e:
+        error_msg = f"운동 이벤트 기록 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def mark_workout_event_deleted(guild_id, message_id, client=None):
+    """
+    삭제된 메시지의 운동 이벤트를 삭제 처리하고 일별 기록을 재계산하는 함수
+    
+    Returns:
+        tuple or None: (user_id, workout_date) - 운동 이벤트가 아니었거나 실패 시 None
+    """
+    try:
+        result = get_storage_backend().mark_workout_event_deleted(guild_id, message_id)
+        if result:
+            logger.info(f"🗑️ 운동 이벤트 삭제 처리: message_id={message_id} ({result[0]}, {result[1]})")
+        return result
         
-        cursor.execute(weekly_upsert_query)
-        affected_rows = cursor.rowcount
+    except Exception as e:
+        error_msg = f"운동 이벤트 삭제 처리 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def rebuild_workout_records_from_events(guild_id, start_date, end_date, client=None):
+    """
+    workout_events에서 서버의 기간 내 일별 운동 기록을 다시 도출하는 함수 (Discord 재조회 없음)
+    
+    Returns:
+        tuple or None: (반영된 기록 수, 제거된 기록 수)
+    """
+    try:
+        result = get_storage_backend().rebuild_daily_records_from_events(guild_id, start_date, end_date)
+        logger.info(f"✅ 이벤트 로그 기반 일별 기록 재구성: 반영 {result[0]}개, 제거 {result[1]}개")
+        return result
         
-        conn.commit()
+    except Exception as e:
+        error_msg = f"이벤트 로그 기반 재구성 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def upsert_weekly_workout_records(client=None):
+    """
+    daily_workout_records를 기반으로 weekly_workout_records를 업데이트하는 함수
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        # 최근 4주간의 주간 집계 업데이트
+        affected_rows = get_storage_backend().refresh_weekly_records()
         logger.info(f"✅ 주간 운동 기록 업데이트 완료: {affected_rows}개 레코드")
         return True
         
@@ -653,15 +343,8 @@ def upsert_weekly_workout_records(client=None):
         error_msg = f"주간 운동 기록 UPSERT 중 오류: {e}"
         logger.error(f"❌ {error_msg}")
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
-        if conn:
-            conn.rollback()
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
         return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 def upsert_monthly_workout_records(client=None):
     """
@@ -673,47 +356,9 @@ def upsert_monthly_workout_records(client=None):
     Returns:
         bool: 성공 여부
     """
-    conn = None
-    cursor = None
     try:
-        conn = get_database_connection(client)
-        if not conn:
-            return False
-        
-        cursor = conn.cursor()
-        
         # 최근 3개월간의 월간 집계 업데이트
-        monthly_upsert_query = """
-        INSERT INTO monthly_workout_records 
-        (user_id, user_name, year, month, month_start_date, month_end_date, workout_days, total_days, workout_rate)
-        SELECT 
-            user_id,
-            user_name,
-            YEAR(date) as year,
-            MONTH(date) as month,
-            DATE_FORMAT(date, '%Y-%m-01') as month_start_date,
-            LAST_DAY(date) as month_end_date,
-            COUNT(DISTINCT date) as workout_days,
-            DAY(LAST_DAY(date)) as total_days,
-            ROUND((COUNT(DISTINCT date) / DAY(LAST_DAY(date))) * 100, 2) as workout_rate
-        FROM daily_workout_records 
-        WHERE exercised = 'Y' 
-            AND date >= DATE_SUB(DATE_FORMAT(CURDATE(), '%Y-%m-01'), INTERVAL 2 MONTH)
-        GROUP BY user_id, user_name, YEAR(date), MONTH(date)
-        ON DUPLICATE KEY UPDATE
-            workout_days = VALUES(workout_days),
-            total_days = VALUES(total_days),
-            workout_rate = VALUES(workout_rate),
-            month_start_date = VALUES(month_start_date),
-            month_end_date = VALUES(month_end_date),
-            user_name = VALUES(user_name),
-            updated_at = CURRENT_TIMESTAMP
-        """
-        
-        cursor.execute(monthly_upsert_query)
-        affected_rows = cursor.rowcount
-        
-        conn.commit()
+        affected_rows = get_storage_backend().refresh_monthly_records()
         logger.info(f"✅ 월간 운동 기록 업데이트 완료: {affected_rows}개 레코드")
         return True
         
@@ -721,15 +366,8 @@ def upsert_monthly_workout_records(client=None):
         error_msg = f"월간 운동 기록 UPSERT 중 오류: {e}"
         logger.error(f"❌ {error_msg}")
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
-        if conn:
-            conn.rollback()
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
         return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 def update_member_statistics(client=None):
     """
@@ -741,93 +379,139 @@ def update_member_statistics(client=None):
     Returns:
         bool: 성공 여부
     """
-    conn = None
-    cursor = None
     try:
-        conn = get_database_connection(client)
-        if not conn:
-            return False
+        # 통계 컬럼 갱신 및 멤버별 연속 운동일수 계산
+        member_count = get_storage_backend().refresh_member_statistics()
+        logger.info(f"✅ 멤버 통계 업데이트 완료: {member_count}명")
+        return True
         
-        cursor = conn.cursor()
-        
-        # workout_members 테이블에 통계 컬럼이 있는지 확인하고 없으면 추가
-        add_columns_query = """
-        ALTER TABLE workout_members 
-        ADD COLUMN IF NOT EXISTS total_workout_days INT DEFAULT 0,
-        ADD COLUMN IF NOT EXISTS total_days INT DEFAULT 0,
-        ADD COLUMN IF NOT EXISTS workout_rate DECIMAL(5,2) DEFAULT 0.00,
-        ADD COLUMN IF NOT EXISTS current_streak INT DEFAULT 0,
-        ADD COLUMN IF NOT EXISTS max_streak INT DEFAULT 0,
-        ADD COLUMN IF NOT EXISTS last_workout_date DATE DEFAULT NULL
-        """
+    except Exception as e:
+        error_msg = f"멤버 통계 업데이트 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return False
+
+def compact_workout_history(client=None):
+    """
+    보존 기간(COMPACTION_HORIZON_MONTHS)보다 오래된 일별 운동 기록을
+    사용자별 월 단위 출석 비트맵으로 압축하는 함수
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        dict or None: {'cutoff', 'months', 'records'} - 실패 시 None
+    """
+    try:
+        from workout_bot_config import COMPACTION_HORIZON_MONTHS
         
-        try:
-            cursor.execute(add_columns_query)
-        except Exception as column_error:
-            # 컬럼이 이미 존재하는 경우 무시
-            logger.info(f"컬럼 추가 건너뜀: {column_error}")
-        
-        # 각 멤버의 통계 업데이트
-        update_stats_query = """
-        UPDATE workout_members wm
-        JOIN (
-            SELECT 
-                user_id,
-                COUNT(DISTINCT date) as total_workout_days,
-                DATEDIFF(CURDATE(), MIN(date)) + 1 as total_days,
-                ROUND((COUNT(DISTINCT date) / (DATEDIFF(CURDATE(), MIN(date)) + 1)) * 100, 2) as workout_rate,
-                MAX(date) as last_workout_date
-            FROM daily_workout_records 
-            WHERE exercised = 'Y'
-            GROUP BY user_id
-        ) stats ON wm.user_id = stats.user_id
-        SET 
-            wm.total_workout_days = stats.total_workout_days,
-            wm.total_days = stats.total_days,
-            wm.workout_rate = stats.workout_rate,
-            wm.last_workout_date = stats.last_workout_date,
-            wm.updated_at = CURRENT_TIMESTAMP
-        """
+        result = get_storage_backend().compact_history(COMPACTION_HORIZON_MONTHS)
+        logger.info(
+            f"✅ 과거 출석 압축 완료: {result['cutoff']} 이전 {result['months']}개월, "
+            f"일별 기록 {result['records']}개"
+        )
+        return result
         
-        cursor.execute(update_stats_query)
+    except Exception as e:
+        error_msg = f"과거 출석 압축 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def maintain_workout_partitions(client=None):
+    """
+    daily_workout_records 월별 파티션을 관리하는 함수 (MySQL)
+    미래 월 파티션을 미리 만들고, PARTITION_DROP_COMPACTED이면 압축이 끝난 과거 파티션을 제거합니다.
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        dict or None: {'added', 'dropped'} - 파티션 미사용 또는 실패 시 None
+    """
+    try:
+        from workout_bot_config import (
+            COMPACTION_HORIZON_MONTHS, PARTITION_MONTHS_AHEAD, PARTITION_DROP_COMPACTED
+        )
+        from workout_bot_storage.compaction import compaction_cutoff
+        from workout_bot_storage.base import KST
         
-        # 연속 운동일수 계산 및 업데이트 (각 사용자별로 개별 계산)
-        cursor.execute("SELECT user_id, user_name FROM workout_members")
-        members = cursor.fetchall()
+        drop_before = None
+        if PARTITION_DROP_COMPACTED:
+            drop_before = compaction_cutoff(datetime.now(KST).date(), COMPACTION_HORIZON_MONTHS)
         
-        for user_id, user_name in members:
-            current_streak = calculate_current_streak_for_user(user_id, user_name, client)
-            max_streak = calculate_max_streak_for_user(user_id, user_name, client)
-            
-            cursor.execute("""
-                UPDATE workout_members 
-                SET current_streak = %s, max_streak = %s 
-                WHERE user_id = %s
-            """, (current_streak, max_streak, user_id))
-        
-        conn.commit()
-        logger.info(f"✅ 멤버 통계 업데이트 완료: {len(members)}명")
-        return True
+        return get_storage_backend().maintain_partitions(PARTITION_MONTHS_AHEAD, drop_before)
         
     except Exception as e:
-        error_msg = f"멤버 통계 업데이트 중 오류: {e}"
+        error_msg = f"파티션 관리 중 오류: {e}"
         logger.error(f"❌ {error_msg}")
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
-        if conn:
-            conn.rollback()
-        return False
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def load_attendance_snapshot(client=None):
+    """
+    출석 행렬 스냅샷을 불러오는 함수 (봇 시작 시)
+    파일이 있으면 mmap으로 열어 이후 변경만 반영하고, 없으면 DB에서 새로 만듭니다.
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        dict or None: {'source', 'replayed', 'elapsed_ms'} - 사용 안 함 또는 실패 시 None
+    """
+    try:
+        from workout_bot_config import ATTENDANCE_SNAPSHOT_PATH, ATTENDANCE_JOURNAL_RETENTION_DAYS
+        
+        if not ATTENDANCE_SNAPSHOT_PATH:
+            return None
+        return get_storage_backend().load_attendance_snapshot(
+            ATTENDANCE_SNAPSHOT_PATH, ATTENDANCE_JOURNAL_RETENTION_DAYS
+        )
+        
+    except Exception as e:
+        error_msg = f"출석 스냅샷 불러오기 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
 
-def calculate_current_streak_for_user(user_id, user_name, client=None):
+def save_attendance_snapshot(client=None):
+    """
+    출석 행렬 스냅샷을 파일에 저장하고 보존 기간이 지난 출석 변경 저널을 정리하는 함수
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        int or None: 삭제된 저널 수 - 실패 시 None
+    """
+    try:
+        from workout_bot_config import ATTENDANCE_JOURNAL_RETENTION_DAYS
+        
+        backend = get_storage_backend()
+        # 저널을 지우기 전에 스냅샷에 먼저 반영
+        if backend.attendance_snapshot is not None:
+            backend.attendance_snapshot.save()
+        pruned = backend.prune_attendance_journal(ATTENDANCE_JOURNAL_RETENTION_DAYS)
+        logger.info(f"✅ 출석 스냅샷 저장 완료 (오래된 저널 {pruned}건 삭제)")
+        return pruned
+        
+    except Exception as e:
+        error_msg = f"출석 스냅샷 저장 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def calculate_current_streak_for_user(guild_id, user_id, user_name, client=None):
     """
     사용자의 현재 연속 운동일수를 계산하는 함수 (오늘 기준)
     
     Args:
+        guild_id: 서버(guild) ID
         user_id: 사용자 ID
         user_name: 사용자 이름  
         client: Discord 클라이언트 (에러 알림용, 선택사항)
@@ -835,8 +519,6 @@ def calculate_current_streak_for_user(user_id, user_name, client=None):
     Returns:
         int: 현재 연속 운동일수
     """
-    conn = None
-    cursor = None
     try:
         from datetime import datetime, timedelta
         import pytz
@@ -846,40 +528,9 @@ def calculate_current_streak_for_user(user_id, user_name, client=None):
         now = datetime.now(KST)
         yesterday = (now - timedelta(days=1)).date()
         
-        conn = get_database_connection(client)
-        if not conn:
-            return 0
-        
-        cursor = conn.cursor()
-        
         # 어제부터 역순으로 운동 기록을 조회
-        query = """
-        SELECT date 
-        FROM daily_workout_records 
-        WHERE user_id = %s AND exercised = 'Y' AND date <= %s
-        ORDER BY date DESC
-        """
-        
-        cursor.execute(query, (user_id, yesterday.strftime('%Y-%m-%d')))
-        workout_dates = [row[0] for row in cursor.fetchall()]
-        
-        if not workout_dates:
-            return 0
-        
-        # 연속 운동일수 계산
-        streak = 0
-        current_date = yesterday
-        
-        for workout_date in workout_dates:
-            # 문자열인 경우 date 객체로 변환
-            if isinstance(workout_date, str):
-                workout_date = datetime.strptime(workout_date, '%Y-%m-%d').date()
-            
-            if workout_date == current_date:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
+        workout_dates = get_storage_backend().get_workout_dates(guild_id, user_id=user_id, until=yesterday)
+        streak = calculate_current_streak(workout_dates, yesterday)
         
         logger.info(f"📈 {user_name}님의 현재 연속 운동일수: {streak}일 (기준일: {yesterday})")
         return streak
@@ -888,19 +539,15 @@ def calculate_current_streak_for_user(user_id, user_name, client=None):
         error_msg = f"현재 연속 운동일수 계산 중 오류: {e}"
         logger.error(f"❌ {error_msg}")
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
         return 0
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
-def calculate_max_streak_for_user(user_id, user_name, client=None):
+def calculate_max_streak_for_user(guild_id, user_id, user_name, client=None):
     """
     사용자의 최장 연속 운동일수를 계산하는 함수
     
     Args:
+        guild_id: 서버(guild) ID
         user_id: 사용자 ID
         user_name: 사용자 이름  
         client: Discord 클라이언트 (에러 알림용, 선택사항)
@@ -908,57 +555,179 @@ def calculate_max_streak_for_user(user_id, user_name, client=None):
     Returns:
         int: 최장 연속 운동일수
     """
-    conn = None
-    cursor = None
     try:
-        conn = get_database_connection(client)
-        if not conn:
-            return 0
+        # 해당 사용자의 모든 운동 날짜를 오름차순으로 조회
+        workout_dates = get_storage_backend().get_workout_dates(guild_id, user_id=user_id, descending=False)
+        max_streak = calculate_max_streak(workout_dates)
         
-        cursor = conn.cursor()
+        logger.info(f"📈 {user_name}님의 최장 연속 운동일수: {max_streak}일")
+        return max_streak
         
-        # 해당 사용자의 모든 운동 날짜를 오름차순으로 조회
-        query = """
-        SELECT date FROM daily_workout_records 
-        WHERE user_id = %s AND exercised = 'Y' 
-        ORDER BY date ASC
-        """
+    except Exception as e:
+        error_msg = f"최장 연속 운동일수 계산 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return 0
+
+def load_guild_settings(client=None):
+    """
+    서버별 채널 설정(guild_settings)을 불러오는 함수
+    
+    Args:
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        list or None: [(guild_id, workout_channel_id, alert_channel_id, dashboard_channel_id, dashboard_message_id)]
+                      - 실패 시 None
+    """
+    try:
+        return get_storage_backend().get_guild_settings()
         
-        cursor.execute(query, (user_id,))
-        workout_dates = [row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        error_msg = f"서버 설정 조회 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def save_guild_settings(guild_id, workout_channel_id, alert_channel_id=None, client=None):
+    """
+    서버의 운동 채널/알림 채널 설정을 저장하는 함수
+    
+    Args:
+        guild_id: 서버(guild) ID
+        workout_channel_id: 운동 스레드를 등록할 채널 ID
+        alert_channel_id: 에러 및 알람 받을 채널 ID (없으면 전역 알림 채널 사용)
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        get_storage_backend().save_guild_settings(guild_id, workout_channel_id, alert_channel_id)
+        logger.info(f"✅ 서버 설정 저장: guild={guild_id}, 운동 채널={workout_channel_id}, 알림 채널={alert_channel_id}")
+        return True
         
-        if not workout_dates:
-            return 0
+    except Exception as e:
+        error_msg = f"서버 설정 저장 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return False
+
+def save_guild_dashboard(guild_id, channel_id=None, message_id=None, client=None):
+    """
+    서버의 대시보드 메시지 위치를 저장하는 함수 (channel_id/message_id가 None이면 대시보드 해제)
+    
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        get_storage_backend().save_guild_dashboard(guild_id, channel_id, message_id)
+        logger.info(f"✅ 대시보드 설정 저장: guild={guild_id}, 채널={channel_id}, 메시지={message_id}")
+        return True
         
-        # 최장 연속일수 계산
-        from datetime import timedelta
-        max_streak = 1
-        current_streak = 1
+    except Exception as e:
+        error_msg = f"대시보드 설정 저장 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return False
+
+def load_reminder_subscribers(guild_id, client=None):
+    """
+    서버에서 DM 리마인더를 신청한 사용자 ID 집합을 불러오는 함수
+    
+    Returns:
+        set or None: {user_id} - 실패 시 None
+    """
+    try:
+        return get_storage_backend().get_reminder_subscribers(guild_id)
         
-        for i in range(1, len(workout_dates)):
-            # 날짜 차이가 1일인지 확인
-            date_diff = (workout_dates[i] - workout_dates[i-1]).days
-            
-            if date_diff == 1:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 1
+    except Exception as e:
+        error_msg = f"DM 리마인더 신청 조회 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def set_reminder_subscription(guild_id, user_id, enabled, client=None):
+    """
+    DM 리마인더 신청(enabled=True)/해제(enabled=False)를 저장하는 함수
+    
+    Returns:
+        bool or None: 상태가 바뀌었는지 여부 (이미 같은 상태면 False) - 실패 시 None
+    """
+    try:
+        changed = get_storage_backend().set_reminder_subscription(guild_id, user_id, enabled)
+        logger.info(f"✅ DM 리마인더 {'신청' if enabled else '해제'}: guild={guild_id}, user={user_id} (변경: {changed})")
+        return changed
         
-        logger.info(f"📈 {user_name}님의 최장 연속 운동일수: {max_streak}일")
-        return max_streak
+    except Exception as e:
+        error_msg = f"DM 리마인더 신청 저장 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def load_workout_participants(guild_id, workout_date, client=None):
+    """
+    서버에서 workout_date에 운동 기록이 있는 사용자 ID 집합을 불러오는 함수 (출석 스냅샷이 있으면 메모리에서 계산)
+    
+    Returns:
+        set or None: {user_id} - 실패 시 None
+    """
+    try:
+        return set(get_storage_backend().count_workouts_by_user(guild_id, workout_date, workout_date))
         
     except Exception as e:
-        error_msg = f"최장 연속 운동일수 계산 중 오류: {e}"
+        error_msg = f"운동 참여자 조회 중 오류: {e}"
         logger.error(f"❌ {error_msg}")
         if client:
-            asyncio.create_task(send_database_error_alert(client, error_msg))
-        return 0
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def claim_legacy_guild_rows(guild_id, client=None):
+    """
+    서버 구분 도입 전 기록(guild_id '0')을 기존 운동 채널의 서버로 옮기는 함수
+    
+    Args:
+        guild_id: 기록을 넘겨받을 서버(guild) ID
+        client: Discord 클라이언트 (에러 알림용, 선택사항)
+    
+    Returns:
+        dict or None: 테이블별 옮긴 행 수 - 실패 시 None
+    """
+    try:
+        from workout_bot_config import ATTENDANCE_SNAPSHOT_PATH
+        
+        backend = get_storage_backend()
+        claimed = backend.claim_legacy_rows(guild_id)
+        if any(claimed.values()):
+            logger.info(f"✅ 이전 기록을 서버 {guild_id}로 옮겼습니다: {claimed}")
+            # 스냅샷이 아직 열리지 않았으면 옛 키로 저장된 파일을 지워 다음 로드 때 새로 만들게 함
+            if backend.attendance_snapshot is None and ATTENDANCE_SNAPSHOT_PATH:
+                import os
+                if os.path.exists(ATTENDANCE_SNAPSHOT_PATH):
+                    os.remove(ATTENDANCE_SNAPSHOT_PATH)
+        return claimed
+        
+    except Exception as e:
+        error_msg = f"이전 기록 서버 이전 중 오류: {e}"
+        logger.error(f"❌ {error_msg}")
+        if client:
+            spawn_background(send_database_error_alert(client, error_msg), "DB 오류 알림")
+        return None
+
+def get_database_write_stats():
+    """
+    쓰기 트랜잭션 재시도 카운터를 반환하는 함수
+    
+    Returns:
+        dict: {'transactions', 'retries', 'deadlocks', 'lock_waits', 'failures'}
+    """
+    return get_storage_backend().get_write_stats()
 
 async def send_database_error_alert(client, error_message):
     """
@@ -980,3 +749,32 @@ async def send_database_error_alert(client, error_message):
         )
     except Exception as alert_error:
         logger.error(f"❌ Discord 알림 전송 실패: {alert_error}")
+
+
+# 사용 예시
+if __name__ == "__main__":
+    # 데이터베이스 연결 테스트
+    db = WorkoutDatabase()
+    
+    print(f"🔗 데이터베이스({db.backend.name}) 연결 테스트를 시작합니다...")
+    
+    if db.test_connection():
+        print("✅ 데이터베이스 연결 테스트 성공!")
+        
+        # 스키마 마이그레이션 적용
+        if db.connect():
+            db.migrate()
+            
+            # 샘플 데이터 삽입 테스트
+            sample_date = datetime.now().date()
+            if upsert_daily_workout_record("1", "1234567890", "테스트유저", sample_date):
+                print(f"✅ 샘플 데이터 삽입 성공! 날짜: {sample_date}")
+                
+                # 운동 횟수 조회 테스트
+                count = db.get_user_workout_count("1", "1234567890")
+                print(f"📊 테스트유저의 총 운동 일수: {count}일")
+            
+            db.disconnect()
+    else:
+        print("❌ 데이터베이스 연결 테스트 실패!")
+        print("💡 연결 정보를 확인해주세요.")
@@ -2,8 +2,11 @@
 운동 봇 이벤트 핸들러 모듈 (Workout Bot Events)
 ------------------------------------------------
 - 메시지 이벤트 처리 (첨부파일 감지 및 자동 응답)
-- 일일 운동 체크 스케줄러 (매일 22:00 KST)
+- 일일 운동 체크 스케줄러 (매일 22:00 KST, 신청한 멤버에게 개인 DM 리마인더)
 - 일일 운동 요약 스케줄러 (매일 23:30 KST)
+- 자정 증분 동기화 스케줄러 (매일 00:10 KST)
+- 과거 출석 압축 및 파티션 관리 스케줄러 (매일 04:00 KST)
+서버 설정(workout_bot_guilds)에 등록된 서버마다 그 서버의 운동 채널을 기준으로 처리합니다.
 """
 
 import discord
@@ -12,16 +15,62 @@ from datetime import datetime, time, timedelta
 import pytz
 import random
 import asyncio
+from functools import partial
 
 # 설정 import
-from workout_bot_config import DISCORD_CHANNEL_ID
-from workout_bot_commands import send_alert_to_channel
-from workout_bot_messages import encouragement_messages, reminder_messages, encourage_solo_messages
+from workout_bot_config import NIGHTLY_SYNC_DAYS
+from workout_bot_guilds import get_guild_config, get_workout_config, iter_guild_configs
+from workout_bot_commands import send_alert_to_channel, build_workout_event, parse_workout_thread_date
+from workout_bot_database import (
+    record_workout_events, mark_workout_event_deleted, compact_workout_history, maintain_workout_partitions,
+    save_attendance_snapshot, load_reminder_subscribers, load_workout_participants
+)
+from workout_bot_messages import encouragement_messages, reminder_messages, encourage_solo_messages, dm_reminder_messages
+from workout_bot_outbox import send_outbound, send_concurrently, PRIORITY_SCHEDULED
+from workout_bot_commands.sync_jobs import start_or_join_sync_job
+from workout_bot_commands.dashboard import mark_dashboard_dirty
+from workout_bot_mirror import message_history, refresh_message_mirror
+from workout_bot_members import resolve_member
+from workout_bot_reminders import enqueue_dm_reminders
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
-def setup_events(client, channel_id):
+
+class DailyReplyDebounce:
+    """
+    (서버, 사용자)별로 하루(KST) 한 번만 응원 답장을 보내기 위한 기록.
+    날짜별 집합만 두고 이전 날짜는 버리므로 하루 동안 사진을 올린 사용자 수만큼만 메모리를 씁니다.
+    """
+
+    def __init__(self, keep_days=2):
+        self.keep_days = keep_days  # 자정 직후 늦게 도착한 어제 메시지를 위해 어제 기록까지 보관
+        self._replied = {}  # KST 날짜 → {(guild_id, user_id)}
+
+    def claim(self, guild_id, user_id, day):
+        """이 날짜의 첫 기록이면 True (이후 같은 날짜는 False)"""
+        replied = self._replied.get(day)
+        if replied is None:
+            replied = self._replied[day] = set()
+            for old_day in sorted(self._replied)[:-self.keep_days]:
+                del self._replied[old_day]
+        key = (guild_id, user_id)
+        if key in replied:
+            return False
+        replied.add(key)
+        return True
+
+    def release(self, guild_id, user_id, day):
+        """claim한 기록을 되돌림 (답장 전송에 실패하면 다음 사진에서 다시 답장하도록)"""
+        replied = self._replied.get(day)
+        if replied is not None:
+            replied.discard((guild_id, user_id))
+
+
+# 운동 사진 응원 답장 기록 (봇 재시작 시 초기화 - 재시작 직후 한 번 더 답장할 수 있음)
+reply_debounce = DailyReplyDebounce()
+
+def setup_events(client):
     """이벤트 핸들러들을 설정하는 함수"""
     
     def get_today_thread_name(now=None):
@@ -33,13 +82,13 @@ def setup_events(client, channel_id):
         weekday_name = weekday_names[now.weekday()]
         return f"{date_str} {weekday_name}"
     
-    async def get_channel_by_id(channel_id, function_name):
+    async def get_channel_by_id(channel_id, function_name, guild_id=None):
         """채널 ID로 채널을 가져오고 유효성을 검사합니다"""
         channel = client.get_channel(channel_id)
         if not isinstance(channel, discord.TextChannel):
             error_msg = f"채널 ID {channel_id}를 찾을 수 없습니다."
             print(f"❌ {error_msg}")
-            await send_alert_to_channel(client, error_msg, "Error", f"workout_bot_events.py - {function_name}")
+            await send_alert_to_channel(client, error_msg, "Error", f"workout_bot_events.py - {function_name}", guild_id=guild_id)
             return None
         return channel
     
@@ -63,7 +112,7 @@ def setup_events(client, channel_id):
         workout_count = 0
         workout_users = set()
         
-        async for message in thread.history(limit=None):
+        async for message in message_history(thread):
             # 봇이 아니고 첨부파일이 있는 메시지만 카운트
             if not message.author.bot and message.attachments:
                 workout_count += 1
@@ -116,19 +165,17 @@ def setup_events(client, channel_id):
         if message.author == client.user:
             return
         
-        # 타겟 채널 또는 그 채널의 스레드에서만 처리
-        is_target_channel = message.channel.id == channel_id
-        is_target_thread = (isinstance(message.channel, discord.Thread) and 
-                           message.channel.parent_id == channel_id)
+        # 서버의 운동 채널 또는 그 채널의 스레드에서만 처리
+        guild_config = get_workout_config(message.channel) if message.guild is not None else None
         
-        if is_target_channel or is_target_thread:
+        if guild_config is not None:
             # 첨부파일이 있는 메시지 (운동 기록)인 경우
             if message.attachments:
                 # 길드 멤버 정보를 통해 실제 이름 가져오기
                 try:
                     if isinstance(message.channel, discord.Thread):
                         guild = message.channel.guild
-                        member = guild.get_member(message.author.id)
+                        member = await resolve_member(guild, message.author.id, message.author)
                         user_display_name = member.display_name if member else message.author.display_name
                     else:
                         user_display_name = message.author.display_name
@@ -141,72 +188,155 @@ def setup_events(client, channel_id):
                 
                 # 운동 스레드에서 첨부파일 업로드 시 자동 응답
                 if isinstance(message.channel, discord.Thread):
-                    # 사용자의 연속 운동일수 조회
-                    try:
-                        from workout_bot_database import calculate_user_workout_streak
-                        from datetime import date, timedelta
-                        
-                        # 어제 날짜까지의 연속 운동일수를 계산하고 오늘 운동을 더해서 +1
-                        yesterday = date.today() - timedelta(days=1)
-                        user_streak = calculate_user_workout_streak(client, user_display_name, yesterday) + 1
-                        print(f"📈 {user_display_name}님의 연속 운동일수: {user_streak}일")
-                    except Exception as streak_error:
-                        print(f"❌ 연속 운동일수 조회 중 오류: {streak_error}")
-                        user_streak = 0
+                    # 메시지 단위 이벤트 로그 기록 (재전송/재동기화 시에도 message_id로 중복 방지)
+                    posted_date = message.created_at.astimezone(KST).date()
+                    workout_date = parse_workout_thread_date(message.channel.name, posted_date) or posted_date
+                    event = build_workout_event(message, user_display_name, workout_date)
+                    inserted = await asyncio.get_event_loop().run_in_executor(
+                        None, record_workout_events, [event], client
+                    )
+                    if inserted:
+                        mark_dashboard_dirty(guild_config.guild_id)
                     
                     reactions = ["💪", "🔥", "👏", "💯", "🎉"]
                     # 요일별로 다른 리액션 추가
                     now = datetime.now(KST)
                     reaction = reactions[now.weekday() % len(reactions)]
-                    try:
-                        await message.add_reaction(reaction)
-                        # 100% 확률로 응원 메시지 전송
-                        # 메시지에서 {user} 플레이스홀더를 실제 사용자명으로 치환
-                        formatted_messages = [msg.format(user=user_display_name) for msg in encouragement_messages]
-                        encouragement_msg = f"@everyone {random.choice(formatted_messages)}"
+                    
+                    # 같은 날 같은 사용자의 두 번째 이후 사진은 리액션만 (연속 운동일수 조회/응원 답장 생략)
+                    if not reply_debounce.claim(guild_config.guild_id, message.author.id, posted_date):
+                        print(f"🔁 {user_display_name}님의 오늘 추가 운동 기록: 리액션만 남깁니다.")
+                        try:
+                            await send_concurrently([partial(message.add_reaction, reaction)], label="운동 기록 리액션")
+                        except discord.errors.Forbidden:
+                            print("리액션 추가 권한이 없습니다.")
+                        except Exception as e:
+                            print(f"리액션 추가 중 오류: {e}")
+                    else:
+                        # 사용자의 연속 운동일수 조회
+                        try:
+                            from workout_bot_database import calculate_user_workout_streak
+                            from datetime import date, timedelta
                         
-                        # 연속 운동일수 칭찬 메시지 추가
-                        streak_message = create_streak_message(user_display_name, user_streak)
+                            # 어제 날짜까지의 연속 운동일수를 계산하고 오늘 운동을 더해서 +1
+                            yesterday = date.today() - timedelta(days=1)
+                            user_streak = calculate_user_workout_streak(
+                                client, guild_config.guild_id, user_display_name, yesterday
+                            ) + 1
+                            print(f"📈 {user_display_name}님의 연속 운동일수: {user_streak}일")
+                        except Exception as streak_error:
+                            print(f"❌ 연속 운동일수 조회 중 오류: {streak_error}")
+                            user_streak = 0
+                    
+                        try:
+                            # 100% 확률로 응원 메시지 전송
+                            # 메시지에서 {user} 플레이스홀더를 실제 사용자명으로 치환
+                            formatted_messages = [msg.format(user=user_display_name) for msg in encouragement_messages]
+                            encouragement_msg = f"@everyone {random.choice(formatted_messages)}"
                         
-                        # 두 메시지를 합쳐서 한 번에 전송
-                        if streak_message:
-                            combined_message = f"{encouragement_msg}. {streak_message}"
-                        else:
-                            combined_message = encouragement_msg
+                            # 연속 운동일수 칭찬 메시지 추가
+                            streak_message = create_streak_message(user_display_name, user_streak)
+                        
+                            # 두 메시지를 합쳐서 한 번에 전송
+                            if streak_message:
+                                combined_message = f"{encouragement_msg}. {streak_message}"
+                            else:
+                                combined_message = encouragement_msg
                         
-                        await message.reply(combined_message)
-                    except discord.errors.Forbidden:
-                        print("리액션 추가 권한이 없습니다.")
-                    except Exception as e:
-                        print(f"리액션 추가 중 오류: {e}")
-                        await send_alert_to_channel(client, f"리액션 추가 중 오류: {e}", "Error", "workout_bot_events.py - on_message")
+                            # 리액션과 답장은 서로 독립적이므로 발신 큐에서 최우선으로 동시에 전송
+                            reaction_result, reply_result = await send_concurrently(
+                                [partial(message.add_reaction, reaction), partial(message.reply, combined_message)],
+                                label="운동 기록 응답",
+                                return_exceptions=True
+                            )
+                        except Exception as e:
+                            print(f"운동 기록 응답 중 오류: {e}")
+                            reply_debounce.release(guild_config.guild_id, message.author.id, posted_date)
+                            await send_alert_to_channel(
+                                client, f"운동 기록 응답 중 오류: {e}", "Error", "workout_bot_events.py - on_message",
+                                guild_id=guild_config.guild_id
+                            )
+                        else:
+                            # 답장이 실패한 경우에만 오늘의 답장 자리를 돌려줌 (리액션만 실패하면 답장은 이미 전송됨)
+                            if isinstance(reply_result, BaseException):
+                                reply_debounce.release(guild_config.guild_id, message.author.id, posted_date)
+                            for action_name, result in (("리액션 추가", reaction_result), ("응원 답장", reply_result)):
+                                if isinstance(result, discord.errors.Forbidden):
+                                    print(f"{action_name} 권한이 없습니다.")
+                                elif isinstance(result, BaseException):
+                                    print(f"{action_name} 중 오류: {result}")
+                                    await send_alert_to_channel(
+                                        client, f"{action_name} 중 오류: {result}", "Error",
+                                        "workout_bot_events.py - on_message", guild_id=guild_config.guild_id
+                                    )
         
         # 명령어 처리를 위해 필요 (commands.Bot 사용 시)
         await client.process_commands(message)
 
+    def is_workout_channel_id(guild_config, message_channel_id):
+        """메시지가 삭제된 채널이 서버의 운동 채널 또는 그 스레드인지 확인합니다 (캐시에 없으면 True)"""
+        if guild_config is None:
+            return False
+        if message_channel_id == guild_config.workout_channel_id:
+            return True
+        channel = client.get_channel(message_channel_id)
+        if channel is None:
+            # 보관된 스레드는 캐시에 없을 수 있음 - message_id 조회로 판단
+            return True
+        return isinstance(channel, discord.Thread) and channel.parent_id == guild_config.workout_channel_id
+
+    @client.event
+    async def on_raw_message_delete(payload):
+        """운동 사진 메시지가 삭제되면 이벤트 로그에 삭제를 기록하고 일별 기록을 재계산합니다"""
+        guild_config = get_guild_config(payload.guild_id)
+        if not is_workout_channel_id(guild_config, payload.channel_id):
+            return
+        deleted = await asyncio.get_event_loop().run_in_executor(
+            None, mark_workout_event_deleted, guild_config.guild_id, payload.message_id, client
+        )
+        if deleted is not None:
+            mark_dashboard_dirty(guild_config.guild_id)
+
+    @client.event
+    async def on_raw_bulk_message_delete(payload):
+        """여러 메시지가 한 번에 삭제된 경우에도 이벤트 로그에 반영합니다"""
+        guild_config = get_guild_config(payload.guild_id)
+        if not is_workout_channel_id(guild_config, payload.channel_id):
+            return
+        deleted = []
+        for message_id in sorted(payload.message_ids):
+            deleted.append(await asyncio.get_event_loop().run_in_executor(
+                None, mark_workout_event_deleted, guild_config.guild_id, message_id, client
+            ))
+        if any(result is not None for result in deleted):
+            mark_dashboard_dirty(guild_config.guild_id)
+
     @tasks.loop(time=time(hour=1, minute=0))  # UTC 01:00 = KST 10:00
     async def daily_workout_check():
         """
         매일 오전 10시에 실행되는 함수.
-        오늘의 운동 스레드를 생성합니다.
+        서버마다 오늘의 운동 스레드를 생성합니다.
         """
-        try:
-            now = datetime.now(KST)
-            print(f"🕙 [{now.strftime('%Y-%m-%d %H:%M')}] 일일 운동 체크를 시작합니다... (10:00 KST)")
-            
-            # 채널 검증
-            channel = await get_channel_by_id(channel_id, "daily_workout_check")
-            if not channel:
-                return
-            
-            # 스케줄러에서 스레드 생성 함수 호출
-            from workout_bot_schedulers import create_daily_workout_thread
-            await create_daily_workout_thread(client, channel_id)
-            
-        except Exception as e:
-            error_msg = f"일일 운동 체크 중 오류 발생: {e}"
-            print(f"❌ {error_msg}")
-            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - daily_workout_check")
+        now = datetime.now(KST)
+        print(f"🕙 [{now.strftime('%Y-%m-%d %H:%M')}] 일일 운동 체크를 시작합니다... (10:00 KST)")
+        from workout_bot_schedulers import create_daily_workout_thread
+        
+        for guild_config in iter_guild_configs():
+            try:
+                # 채널 검증
+                channel = await get_channel_by_id(guild_config.workout_channel_id, "daily_workout_check", guild_config.guild_id)
+                if not channel:
+                    continue
+                
+                # 스케줄러에서 스레드 생성 함수 호출
+                await create_daily_workout_thread(client, guild_config.workout_channel_id)
+                
+            except Exception as e:
+                error_msg = f"일일 운동 체크 중 오류 발생: {e}"
+                print(f"❌ {error_msg}")
+                await send_alert_to_channel(
+                    client, e, "Error", "workout_bot_events.py - daily_workout_check", guild_id=guild_config.guild_id
+                )
 
     @daily_workout_check.before_loop
     async def before_daily_workout_check():
@@ -220,14 +350,48 @@ def setup_events(client, channel_id):
     async def daily_workout_reminder():
         """
         매일 밤 10시에 실행되는 함수.
-        오늘의 운동 스레드에 아무도 운동 기록을 안 올렸는지 확인하고 알림을 보냅니다.
+        서버마다 오늘의 운동 스레드에 아무도 운동 기록을 안 올렸는지 확인하고 알림을 보냅니다.
         """
+        now = datetime.now(KST)
+        print(f"🕙 [{now.strftime('%Y-%m-%d %H:%M')}] 일일 운동 리마인더를 시작합니다... (22:00 KST)")
+        for guild_config in iter_guild_configs():
+            await remind_guild(guild_config, now)
+            await remind_subscribers(guild_config, now)
+
+    async def remind_subscribers(guild_config, now):
+        """서버에서 DM 리마인더를 신청한 멤버 중 오늘 운동 기록이 없는 멤버에게 DM을 예약합니다"""
+        guild_id = guild_config.guild_id
         try:
-            now = datetime.now(KST)
-            print(f"🕙 [{now.strftime('%Y-%m-%d %H:%M')}] 일일 운동 리마인더를 시작합니다... (22:00 KST)")
+            guild = client.get_guild(guild_id)
+            if guild is None:
+                return
+            loop = asyncio.get_event_loop()
+            subscribers = await loop.run_in_executor(None, load_reminder_subscribers, guild_id, client)
+            if not subscribers:
+                return
+            participants = await loop.run_in_executor(None, load_workout_participants, guild_id, now.date(), client)
+            if participants is None:
+                return
             
+            # 신청자 - 오늘 참여자 = DM 받을 멤버
+            recipients = sorted(subscribers - participants)
+            if not recipients:
+                print(f"✅ DM 리마인더 신청자 {len(subscribers)}명 모두 오늘 운동했습니다. ({guild.name})")
+                return
+            reminder_text = random.choice(dm_reminder_messages).format(guild_name=guild.name)
+            queued = enqueue_dm_reminders(client, guild, recipients, reminder_text)
+            print(f"✉️ DM 리마인더 {queued}명 예약 (신청 {len(subscribers)}명, 오늘 참여 {len(subscribers) - len(recipients)}명, {guild.name})")
+        
+        except Exception as e:
+            print(f"❌ DM 리마인더 예약 중 오류 발생: {e}")
+            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - remind_subscribers", guild_id=guild_id)
+
+    async def remind_guild(guild_config, now):
+        """서버 하나의 오늘 스레드에 운동 기록이 없으면 알림 메시지를 보냅니다"""
+        guild_id = guild_config.guild_id
+        try:
             # 채널 검증
-            channel = await get_channel_by_id(channel_id, "daily_workout_reminder")
+            channel = await get_channel_by_id(guild_config.workout_channel_id, "daily_workout_reminder", guild_id)
             if not channel:
                 return
             
@@ -250,16 +414,19 @@ def setup_events(client, channel_id):
                 
                 try:
                     # 메인 채널이 아닌 오늘의 운동 스레드에 알림 메시지 전송
-                    await today_thread.send(reminder_message)
+                    await send_outbound(partial(today_thread.send, reminder_message), PRIORITY_SCHEDULED, "운동 없음 알림")
                     print(f"✅ 운동 없음 알림 메시지 전송 완료 (스레드 '{today_thread_name}'): {reminder_message}")
                 except Exception as e:
                     print(f"❌ 알림 메시지 전송 실패: {e}")
-                    await send_alert_to_channel(client, f"알림 메시지 전송 실패: {e}", "Error", "workout_bot_events.py - daily_workout_reminder")
+                    await send_alert_to_channel(
+                        client, f"알림 메시지 전송 실패: {e}", "Error", "workout_bot_events.py - daily_workout_reminder",
+                        guild_id=guild_id
+                    )
         
         except Exception as e:
             error_msg = f"일일 운동 리마인더 중 오류 발생: {e}"
             print(f"❌ {error_msg}")
-            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - daily_workout_reminder")
+            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - daily_workout_reminder", guild_id=guild_id)
 
     @daily_workout_reminder.before_loop
     async def before_daily_workout_reminder():
@@ -273,14 +440,19 @@ def setup_events(client, channel_id):
     async def daily_workout_summary():
         """
         매일 밤 11시 30분에 실행되는 함수.
-        오늘의 운동 기록이 있는 경우 격려 메시지를 보냅니다.
+        서버마다 오늘의 운동 기록이 있는 경우 격려 메시지를 보냅니다.
         """
+        now = datetime.now(KST)
+        print(f"🕚 [{now.strftime('%Y-%m-%d %H:%M')}] 일일 운동 요약을 시작합니다... (23:30 KST)")
+        for guild_config in iter_guild_configs():
+            await summarize_guild(guild_config, now)
+
+    async def summarize_guild(guild_config, now):
+        """서버 하나의 오늘 스레드에 1명만 운동 기록을 올렸으면 격려 메시지를 보냅니다"""
+        guild_id = guild_config.guild_id
         try:
-            now = datetime.now(KST)
-            print(f"🕚 [{now.strftime('%Y-%m-%d %H:%M')}] 일일 운동 요약을 시작합니다... (23:30 KST)")
-            
             # 채널 검증
-            channel = await get_channel_by_id(channel_id, "daily_workout_summary")
+            channel = await get_channel_by_id(guild_config.workout_channel_id, "daily_workout_summary", guild_id)
             if not channel:
                 return
             
@@ -312,11 +484,14 @@ def setup_events(client, channel_id):
                 
                 try:
                     # 메인 채널이 아닌 오늘의 운동 스레드에 격려 메시지 전송
-                    await today_thread.send(encourage_message)
+                    await send_outbound(partial(today_thread.send, encourage_message), PRIORITY_SCHEDULED, "격려 메시지")
                     print(f"✅ 격려 메시지 전송 완료 (스레드 '{today_thread_name}'): {encourage_message}")
                 except Exception as e:
                     print(f"❌ 격려 메시지 전송 실패: {e}")
-                    await send_alert_to_channel(client, f"격려 메시지 전송 실패: {e}", "Error", "workout_bot_events.py - daily_workout_summary")
+                    await send_alert_to_channel(
+                        client, f"격려 메시지 전송 실패: {e}", "Error", "workout_bot_events.py - daily_workout_summary",
+                        guild_id=guild_id
+                    )
             else:
                 if len(workout_users) > 1:
                     print(f"ℹ️ 운동 기록이 {len(workout_users)}명이므로 격려 메시지를 보내지 않습니다. (1명일 때만 격려 메시지 전송)")
@@ -326,7 +501,7 @@ def setup_events(client, channel_id):
         except Exception as e:
             error_msg = f"일일 운동 요약 중 오류 발생: {e}"
             print(f"❌ {error_msg}")
-            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - daily_workout_summary")
+            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - daily_workout_summary", guild_id=guild_id)
 
     @daily_workout_summary.before_loop
     async def before_daily_workout_summary():
@@ -336,6 +511,97 @@ def setup_events(client, channel_id):
         print("⏰ 일일 운동 요약 스케줄러가 시작되었습니다. (UTC 14:30 = KST 23:30 실행)")
         print(f"🔍 현재 시간: {now.strftime('%Y-%m-%d %H:%M:%S')}")
 
+    async def report_nightly_sync(job, success, db_update_success, rest_usage):
+        """자정 자동 동기화 결과를 콘솔에 남기고 실패하면 서버의 알림 채널에 보고합니다"""
+        diff = job.collector.sync_diff or {'inserted': 0, 'removed': 0}
+        if success and db_update_success:
+            print(f"✅ 자정 자동 동기화 완료 (서버 {job.guild_id}): 스레드 {job.collector.total_threads_found}개, "
+                  f"출석 추가 {diff['inserted']}건 / 제거 {diff['removed']}건 ({job.elapsed_seconds:.1f}초)")
+            print(f"📡 {rest_usage.summary()}")
+        else:
+            await send_alert_to_channel(
+                client,
+                f"자정 자동 동기화 실패 (수집: {success}, DB 반영: {db_update_success})",
+                "Warning",
+                "workout_bot_events.py - nightly_incremental_sync",
+                guild_id=job.guild_id
+            )
+
+    async def report_nightly_sync_cancelled(job):
+        """관리자가 자정 자동 동기화를 취소한 경우"""
+        print(f"🛑 자정 자동 동기화가 취소되었습니다 ({job.elapsed_seconds:.1f}초 경과)")
+
+    @tasks.loop(time=time(hour=15, minute=10))  # UTC 15:10 = KST 00:10
+    async def nightly_incremental_sync():
+        """
+        매일 00:10에 실행되는 함수.
+        서버마다 최근 NIGHTLY_SYNC_DAYS일의 운동 스레드를 다시 읽어 놓친 사진/삭제를 데이터베이스에 반영합니다.
+        그 서버에서 !동기화가 이미 실행 중이면 새로 시작하지 않고 그 작업에 맡깁니다.
+        """
+        now = datetime.now(KST)
+        print(f"🕛 [{now.strftime('%Y-%m-%d %H:%M')}] 자정 자동 동기화를 시작합니다... (최근 {NIGHTLY_SYNC_DAYS}일)")
+        for guild_config in iter_guild_configs():
+            try:
+                # 봇이 꺼져 있던 동안의 삭제까지 맞추도록 최근 스레드는 메시지 미러를 Discord에서 다시 받음
+                refreshed = await refresh_message_mirror(client, guild_config.workout_channel_id, NIGHTLY_SYNC_DAYS)
+                if refreshed:
+                    print(f"💾 메시지 미러 최근 스레드 {refreshed}개 재확인 완료 (서버 {guild_config.guild_id})")
+                
+                job, joined = start_or_join_sync_job(
+                    client, guild_config, NIGHTLY_SYNC_DAYS, None, None, report_nightly_sync, report_nightly_sync_cancelled
+                )
+                if joined:
+                    print(f"🔗 {job.requester_name}(으)로 시작된 최근 {job.days}일 동기화가 진행 중이라 자동 동기화는 건너뜁니다.")
+            
+            except Exception as e:
+                error_msg = f"자정 자동 동기화 시작 중 오류 발생: {e}"
+                print(f"❌ {error_msg}")
+                await send_alert_to_channel(
+                    client, e, "Error", "workout_bot_events.py - nightly_incremental_sync", guild_id=guild_config.guild_id
+                )
+
+    @nightly_incremental_sync.before_loop
+    async def before_nightly_incremental_sync():
+        """자정 자동 동기화 시작 전 봇이 준비될 때까지 대기"""
+        await client.wait_until_ready()
+        print("⏰ 자정 자동 동기화 스케줄러가 시작되었습니다. (UTC 15:10 = KST 00:10 실행)")
+
+    @tasks.loop(time=time(hour=19, minute=0))  # UTC 19:00 = KST 04:00
+    async def cold_history_compaction():
+        """
+        매일 새벽 4시에 실행되는 함수.
+        보존 기간이 지난 달의 일별 운동 기록을 월별 출석 비트맵으로 압축하고,
+        월별 파티션을 정리합니다 (미래 월 추가, 압축이 끝난 과거 월 제거).
+        마지막으로 출석 스냅샷을 저장하고 오래된 출석 변경 저널을 정리합니다.
+        (새로 닫힌 달이 없으면 조회 몇 번으로 끝납니다)
+        """
+        try:
+            now = datetime.now(KST)
+            print(f"🕓 [{now.strftime('%Y-%m-%d %H:%M')}] 과거 출석 압축을 시작합니다... (04:00 KST)")
+            
+            result = await asyncio.get_event_loop().run_in_executor(None, compact_workout_history, client)
+            if result and result['months']:
+                print(f"🗜️ {result['months']}개월, 일별 기록 {result['records']}개를 압축했습니다.")
+            
+            # 압축으로 비워진 파티션 제거는 압축 이후에 실행
+            partitions = await asyncio.get_event_loop().run_in_executor(None, maintain_workout_partitions, client)
+            if partitions and (partitions['added'] or partitions['dropped']):
+                print(f"🗂️ 파티션 추가: {partitions['added']}, 제거: {partitions['dropped']}")
+            
+            # 압축까지 반영한 출석 스냅샷 저장 후 오래된 변경 저널 정리
+            await asyncio.get_event_loop().run_in_executor(None, save_attendance_snapshot, client)
+        
+        except Exception as e:
+            error_msg = f"과거 출석 압축 중 오류 발생: {e}"
+            print(f"❌ {error_msg}")
+            await send_alert_to_channel(client, e, "Error", "workout_bot_events.py - cold_history_compaction")
+
+    @cold_history_compaction.before_loop
+    async def before_cold_history_compaction():
+        """과거 출석 압축 시작 전 봇이 준비될 때까지 대기"""
+        await client.wait_until_ready()
+        print("⏰ 과거 출석 압축 스케줄러가 시작되었습니다. (UTC 19:00 = KST 04:00 실행)")
+
     # 스케줄러들을 시작하는 함수
     def start_event_schedulers():
         """이벤트 관련 스케줄러들을 시작합니다"""
@@ -359,5 +625,20 @@ def setup_events(client, channel_id):
             print("✅ 일일 운동 요약 스케줄러가 시작되었습니다.")
         else:
             print("ℹ️ 일일 운동 요약 스케줄러가 이미 실행 중입니다.")
+        
+        if NIGHTLY_SYNC_DAYS > 0:
+            print("🔄 자정 자동 동기화 스케줄러 시작을 시도합니다...")
+            if not nightly_incremental_sync.is_running():
+                nightly_incremental_sync.start()
+                print("✅ 자정 자동 동기화 스케줄러가 시작되었습니다.")
+            else:
+                print("ℹ️ 자정 자동 동기화 스케줄러가 이미 실행 중입니다.")
+        
+        print("🔄 과거 출석 압축 스케줄러 시작을 시도합니다...")
+        if not cold_history_compaction.is_running():
+            cold_history_compaction.start()
+            print("✅ 과거 출석 압축 스케줄러가 시작되었습니다.")
+        else:
+            print("ℹ️ 과거 출석 압축 스케줄러가 이미 실행 중입니다.")
 
     return start_event_schedulers
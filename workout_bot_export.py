@@ -0,0 +1,106 @@
+"""
+운동 기록 내보내기 모듈
+서버(guild) 하나의 출석 기록(daily_workout_records + 압축된 과거 기록)을 gzip 압축 CSV로 내보냅니다.
+행은 스트리밍 커서에서 읽는 즉시 압축 파일에 쓰므로 기록 수와 관계없이 메모리 사용량이 일정합니다.
+
+사용법 (CLI):
+    python workout_bot_export.py --guild 123456789 --start 2024-01-01 --end 2024-12-31 --with-names -o attendance.csv.gz
+    python workout_bot_export.py --guild 123456789 -o - > attendance.csv.gz
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import logging
+import sys
+from datetime import datetime
+from workout_bot_storage import get_storage_backend
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = ['date', 'weekday', 'user_id', 'user_name']
+MEMBER_NAME_COLUMN = 'member_name'
+
+
+def parse_export_date(value):
+    """'YYYY-MM-DD' 문자열을 날짜로 변환합니다 (None이면 None)"""
+    if value is None:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def write_attendance_csv(fileobj, guild_id, start_date=None, end_date=None, with_member_names=False):
+    """
+    서버의 출석 기록을 gzip 압축 CSV로 fileobj에 씁니다. fileobj는 닫지 않습니다.
+
+    Args:
+        fileobj: 바이너리 쓰기 가능한 파일 객체
+        guild_id: 서버(guild) ID
+        start_date (date, optional): 시작 날짜 (포함, 기본: 처음부터)
+        end_date (date, optional): 종료 날짜 (포함, 기본: 끝까지)
+        with_member_names (bool): workout_members의 현재 이름 열(member_name) 추가 여부
+
+    Returns:
+        int: 내보낸 행 수
+    """
+    columns = EXPORT_COLUMNS + ([MEMBER_NAME_COLUMN] if with_member_names else [])
+    rows = get_storage_backend().iter_attendance_history(guild_id, start_date, end_date, with_member_names)
+
+    row_count = 0
+    with gzip.GzipFile(fileobj=fileobj, mode='wb') as gz:
+        # 엑셀에서 한글 이름이 깨지지 않도록 BOM 포함
+        with io.TextIOWrapper(gz, encoding='utf-8-sig', newline='') as text:
+            writer = csv.writer(text)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                row_count += 1
+    return row_count
+
+
+def export_attendance_history(output_path, guild_id, start_date=None, end_date=None, with_member_names=False):
+    """
+    서버의 출석 기록을 gzip 압축 CSV 파일로 내보내는 함수 ('-'이면 표준 출력)
+
+    Returns:
+        int: 내보낸 행 수
+    """
+    if output_path == '-':
+        row_count = write_attendance_csv(sys.stdout.buffer, guild_id, start_date, end_date, with_member_names)
+        sys.stdout.buffer.flush()
+        return row_count
+
+    with open(output_path, 'wb') as f:
+        return write_attendance_csv(f, guild_id, start_date, end_date, with_member_names)
+
+
+def default_export_filename(start_date=None, end_date=None, guild_id=None):
+    """내보내기 파일 기본 이름 (예: workout_attendance_123456789_20240101_20241231.csv.gz)"""
+    start_text = start_date.strftime('%Y%m%d') if start_date else 'all'
+    end_text = end_date.strftime('%Y%m%d') if end_date else datetime.now().strftime('%Y%m%d')
+    guild_text = f"{guild_id}_" if guild_id is not None else ""
+    return f"workout_attendance_{guild_text}{start_text}_{end_text}.csv.gz"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="운동 출석 기록을 gzip 압축 CSV로 내보냅니다.")
+    parser.add_argument('--guild', required=True, help="내보낼 서버(guild) ID")
+    parser.add_argument('--start', help="시작 날짜 (YYYY-MM-DD, 기본: 처음부터)")
+    parser.add_argument('--end', help="종료 날짜 (YYYY-MM-DD, 기본: 끝까지)")
+    parser.add_argument('--with-names', action='store_true', help="멤버 현재 이름(member_name) 열 추가")
+    parser.add_argument('-o', '--output', help="출력 파일 경로 ('-'이면 표준 출력)")
+    args = parser.parse_args()
+
+    try:
+        start_date = parse_export_date(args.start)
+        end_date = parse_export_date(args.end)
+    except ValueError:
+        parser.error("날짜는 YYYY-MM-DD 형식으로 입력해주세요.")
+
+    output_path = args.output or default_export_filename(start_date, end_date, args.guild)
+    row_count = export_attendance_history(output_path, args.guild, start_date, end_date, args.with_names)
+
+    if output_path != '-':
+        print(f"✅ 출석 기록 {row_count}행을 내보냈습니다: {output_path}")
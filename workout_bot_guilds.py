@@ -0,0 +1,158 @@
+"""
+서버(guild)별 채널 설정 모듈
+한 번의 배포로 여러 Discord 서버를 운영할 수 있도록 서버마다 운동 채널과 알림 채널을 guild_settings 테이블에 저장합니다.
+설정은 봇 시작 시 한 번 읽어 메모리에 두고, !채널설정으로 바꾸면 DB와 메모리에 함께 반영합니다.
+
+- DISCORD_CHANNEL_ID는 서버 구분 도입 전의 단일 채널 설정입니다. 시작할 때 그 채널의 서버를 설정에 등록하고,
+  guild_id 없이 저장됐던 기록(guild_id '0')을 그 서버로 옮깁니다.
+- 알림 채널이 없는 서버는 전역 DISCORD_ALERT_CHANNEL_ID로 알림을 보냅니다.
+
+사용법:
+    load_guild_configs()                         # setup_hook에서 한 번
+    config = get_guild_config(message.guild.id)  # 서버 설정 (없으면 None)
+    config = get_workout_config(message.channel) # 운동 채널/스레드면 그 서버 설정
+"""
+
+import asyncio
+import logging
+import discord
+from workout_bot_config import DISCORD_CHANNEL_ID, DISCORD_ALERT_CHANNEL_ID
+from workout_bot_database import load_guild_settings, save_guild_settings, save_guild_dashboard, claim_legacy_guild_rows
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+_configs = {}  # guild_id(int) → GuildConfig
+_by_channel = {}  # 운동 채널 ID → GuildConfig
+
+
+class GuildConfig:
+    """서버 하나의 채널 설정"""
+
+    __slots__ = ('guild_id', 'workout_channel_id', 'alert_channel_id', 'dashboard_channel_id', 'dashboard_message_id')
+
+    def __init__(self, guild_id, workout_channel_id, alert_channel_id=None,
+                 dashboard_channel_id=None, dashboard_message_id=None):
+        self.guild_id = int(guild_id)
+        self.workout_channel_id = int(workout_channel_id)
+        self.alert_channel_id = int(alert_channel_id) if alert_channel_id else None
+        # !대시보드로 게시한 실시간 랭킹 메시지 (없으면 None)
+        self.dashboard_channel_id = int(dashboard_channel_id) if dashboard_channel_id else None
+        self.dashboard_message_id = int(dashboard_message_id) if dashboard_message_id else None
+
+    def __repr__(self):
+        return f"GuildConfig(guild={self.guild_id}, workout={self.workout_channel_id}, alert={self.alert_channel_id})"
+
+
+def _register(config):
+    previous = _configs.get(config.guild_id)
+    if previous is not None:
+        _by_channel.pop(previous.workout_channel_id, None)
+    _configs[config.guild_id] = config
+    _by_channel[config.workout_channel_id] = config
+
+
+def load_guild_configs(client=None):
+    """
+    guild_settings를 읽어 메모리의 서버 설정을 새로 채웁니다.
+
+    Returns:
+        int or None: 불러온 서버 수 (실패 시 None, 기존 설정 유지)
+    """
+    rows = load_guild_settings(client)
+    if rows is None:
+        return None
+    _configs.clear()
+    _by_channel.clear()
+    for row in rows:
+        _register(GuildConfig(*row))
+    return len(_configs)
+
+
+def set_guild_config(guild_id, workout_channel_id, alert_channel_id=None, client=None):
+    """서버 설정을 DB에 저장하고 메모리에 반영합니다 (DB 호출이 있으므로 executor에서 실행). 성공 여부 반환"""
+    if not save_guild_settings(guild_id, workout_channel_id, alert_channel_id, client):
+        return False
+    previous = get_guild_config(guild_id)
+    config = GuildConfig(guild_id, workout_channel_id, alert_channel_id)
+    if previous is not None:
+        config.dashboard_channel_id = previous.dashboard_channel_id
+        config.dashboard_message_id = previous.dashboard_message_id
+    _register(config)
+    return True
+
+
+def set_guild_dashboard(guild_id, channel_id=None, message_id=None, client=None):
+    """서버의 대시보드 메시지 위치를 DB와 메모리에 반영합니다 (None이면 해제, executor에서 실행). 성공 여부 반환"""
+    config = get_guild_config(guild_id)
+    if config is None or not save_guild_dashboard(guild_id, channel_id, message_id, client):
+        return False
+    config.dashboard_channel_id = int(channel_id) if channel_id else None
+    config.dashboard_message_id = int(message_id) if message_id else None
+    return True
+
+
+def get_guild_config(guild_id):
+    """서버 설정 (등록되지 않은 서버면 None)"""
+    if guild_id is None:
+        return None
+    return _configs.get(int(guild_id))
+
+
+def iter_guild_configs():
+    """등록된 모든 서버 설정 (스케줄러가 서버마다 작업을 실행할 때 사용)"""
+    return list(_configs.values())
+
+
+def get_workout_channel_ids():
+    """등록된 모든 운동 채널 ID"""
+    return set(_by_channel)
+
+
+def get_workout_config(channel):
+    """channel이 운동 채널이나 그 스레드면 해당 서버 설정, 아니면 None"""
+    config = _by_channel.get(channel.id)
+    if config is None and isinstance(channel, discord.Thread):
+        config = _by_channel.get(channel.parent_id)
+    return config
+
+
+def get_alert_channel_id(guild_id=None):
+    """서버의 알림 채널 ID (서버 설정이 없거나 알림 채널이 없으면 전역 알림 채널)"""
+    config = get_guild_config(guild_id)
+    if config is not None and config.alert_channel_id:
+        return config.alert_channel_id
+    return DISCORD_ALERT_CHANNEL_ID
+
+
+async def claim_legacy_guild(client):
+    """
+    DISCORD_CHANNEL_ID 채널의 서버를 설정에 등록하고, guild_id 없이 저장됐던 기록을 그 서버로 옮깁니다.
+    이미 등록된 서버는 설정을 덮어쓰지 않습니다 (!채널설정으로 바꾼 값 유지).
+
+    Returns:
+        int or None: 기록을 넘겨받은 서버 ID (DISCORD_CHANNEL_ID가 없거나 실패 시 None)
+    """
+    if not DISCORD_CHANNEL_ID:
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        # setup_hook에서는 아직 채널 캐시가 없으므로 REST로 조회
+        channel = client.get_channel(DISCORD_CHANNEL_ID) or await client.fetch_channel(DISCORD_CHANNEL_ID)
+    except discord.HTTPException as e:
+        logger.warning(f"⚠️ 기존 운동 채널 {DISCORD_CHANNEL_ID}을(를) 조회하지 못해 이전 기록 이전을 건너뜁니다: {e}")
+        return None
+
+    guild_id = channel.guild.id
+    if get_guild_config(guild_id) is None:
+        saved = await loop.run_in_executor(
+            None, set_guild_config, guild_id, DISCORD_CHANNEL_ID, DISCORD_ALERT_CHANNEL_ID, client
+        )
+        if not saved:
+            return None
+        logger.info(f"🏠 기존 운동 채널의 서버 {guild_id}을(를) 서버 설정에 등록했습니다.")
+
+    claimed = await loop.run_in_executor(None, claim_legacy_guild_rows, guild_id, client)
+    if claimed is None:
+        return None
+    return guild_id
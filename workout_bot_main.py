@@ -7,31 +7,118 @@
 - !요약: 멤버별 운동 요약 표시
 - !통계: 최근 3개월 월별, 최근 4주 주간 통계 표시
 - !추세: 운동 추세 분석 표시
+- !채널설정: 서버별 운동/알림 채널 설정 (한 번의 배포로 여러 서버 운영, DISCORD_AUTO_SHARD로 자동 샤딩)
+- !대시보드: 출석이 바뀌면 갱신되는 이번 주 랭킹 메시지 게시
+- !리마인더: 운동 기록이 없는 날 22:00 KST 개인 DM 알림 신청
 """
 
 import discord
 from discord.ext import commands
 from datetime import datetime
 import pytz
+import asyncio
+import hashlib
+import json
+import os
+import time
+from functools import partial
 
 # 모듈 import
 from workout_bot_commands import setup_commands, send_alert_to_channel
+from workout_bot_commands.dashboard import start_dashboard_updates
 from workout_bot_schedulers import setup_schedulers, create_daily_workout_thread, weekly_stats_auto
 from workout_bot_events import setup_events
-from workout_bot_config import DISCORD_BOT_TOKEN, DISCORD_CHANNEL_ID, DISCORD_ALERT_CHANNEL_ID, BOT_VERSION
+from workout_bot_database import apply_database_migrations, load_attendance_snapshot, warm_up_database
+from workout_bot_outbox import send_outbound, PRIORITY_ALERT
+from workout_bot_rest import install_rest_gateway
+from workout_bot_mirror import install_message_mirror, start_message_mirror
+from workout_bot_guilds import load_guild_configs, claim_legacy_guild, iter_guild_configs
+from workout_bot_members import install_member_resolver
+from workout_bot_tasks import bind_task_supervisor, spawn_background, drain_background_tasks
+from workout_bot_config import (
+    DISCORD_BOT_TOKEN, DISCORD_ALERT_CHANNEL_ID, DISCORD_AUTO_SHARD, BOT_VERSION, SLASH_COMMAND_FINGERPRINT_PATH
+)
 
 # 봇 설정
 intents = discord.Intents.default()
 intents.message_content = True  # 메시지 내용을 읽기 위해 필요
-intents.members = True  # 멤버 정보 접근을 위해 필요
-client = commands.Bot(command_prefix='!', intents=intents)
+intents.members = True  # 멤버 참가/변경/탈퇴 이벤트와 멤버 ID 조회(query_members)에 필요
+# 서버가 많아지면 Discord가 권장하는 샤드 수로 게이트웨이 연결을 나눔 (한 프로세스에서 모든 샤드 실행)
+bot_class = commands.AutoShardedBot if DISCORD_AUTO_SHARD else commands.Bot
+
+
+class WorkoutBot(bot_class):
+    """운동 봇 클라이언트 (시작 작업 실행, 종료 시 남은 백그라운드 작업을 먼저 정리)"""
+
+    async def setup_hook(self):
+        """
+        로그인 직후, 게이트웨이 연결 전에 프로세스당 한 번만 실행되는 시작 작업.
+        이벤트가 들어오기 전에 필요한 것(스키마, 명령어, 스케줄러)만 여기서 끝내고,
+        나머지는 게이트웨이 연결과 동시에 run_startup_tasks에서 진행합니다.
+        """
+        # 백그라운드 작업(DB 오류 알림 등)을 실행할 이벤트 루프 지정
+        bind_task_supervisor()
+
+        # 스키마 마이그레이션 적용 (다른 DB 작업보다 먼저)
+        await timed_step("마이그레이션", run_database_migrations())
+
+        # 서버별 채널 설정 (이벤트 핸들러와 출석 스냅샷이 서버 구분에 사용)
+        await timed_step("서버 설정", prepare_guild_configs())
+
+        # 명령어 등록
+        setup_commands(self)
+
+        # 스케줄러 등록 및 시작 (각 루프는 before_loop에서 준비 완료를 기다림)
+        await start_bot_schedulers()
+
+        # 서로 독립적인 시작 작업은 게이트웨이 연결과 함께 병렬로
+        spawn_background(run_startup_tasks(), "시작 작업", limited=False)
+
+    async def close(self):
+        await drain_background_tasks()
+        await super().close()
+
+
+# 시작 시 서버 전체 멤버를 내려받지 않음 - 필요한 멤버만 workout_bot_members에서 조회해 LRU 캐시에 보관
+client = WorkoutBot(command_prefix='!', intents=intents, chunk_guilds_at_startup=False)
+
+# 모든 Discord REST 호출을 라우트별로 기록 (로그인 전에 설치)
+install_rest_gateway(client)
+
+# 운동 스레드 메시지 미러 (게이트웨이 이벤트로 실시간 반영)
+install_message_mirror(client)
+
+# 필요할 때만 조회하는 멤버 캐시 (멤버 이벤트로 갱신)
+install_member_resolver(client)
 
 token = DISCORD_BOT_TOKEN
-channel_id = DISCORD_CHANNEL_ID
 
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
+# on_ready 호출 횟수 (게이트웨이 재연결마다 증가)
+ready_count = 0
+
+# 시작 소요 시간 측정 (프로세스 시작 기준)
+PROCESS_STARTED = time.monotonic()
+startup_timings = {}  # 단계 이름 → 소요 시간(초), 완료 순서대로
+time_to_ready = None  # 프로세스 시작 → 게이트웨이 준비 + 오늘의 스레드 처리 완료 (초)
+
+async def timed_step(name, coro):
+    """시작 단계 하나를 실행하고 소요 시간을 startup_timings에 기록"""
+    started = time.monotonic()
+    try:
+        return await coro
+    finally:
+        startup_timings[name] = time.monotonic() - started
+
+def format_startup_timings():
+    """시작 소요 시간 요약 (예: 준비까지 4.2초 | 마이그레이션 0.1초 · Slash 동기화 0.0초 ...)"""
+    steps = " · ".join(f"{name} {seconds:.1f}초" for name, seconds in startup_timings.items())
+    if time_to_ready is None:
+        return steps
+    return f"준비까지 {time_to_ready:.1f}초 | {steps}"
+
 async def send_error_to_channel(error_message, error_type="Exception", location="Unknown"):
     """에러 발생 시 지정된 채널에 에러 메시지를 전송하는 함수"""
     try:
@@ -41,7 +128,7 @@ async def send_error_to_channel(error_message, error_type="Exception", location=
         print(f"❌ 에러 메시지 전송 실패: {send_error}")
 
 async def send_bot_startup_notification():
-    """봇 시작 알림을 지정된 채널에 전송"""
+    """봇 시작 알림을 지정된 채널에 전송 (전송한 메시지 반환, 시작 소요 시간은 준비 후 추가)"""
     try:
         startup_message = f"🚀 근육몬 봇이 성공적으로 시작되었습니다!\n\n" \
                          f"📅 **시작 시간**: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')}\n" \
@@ -50,21 +137,107 @@ async def send_bot_startup_notification():
                          f"⚙️ **자동화 기능**: 일일 운동 체크, 주간 통계 집계\n" \
                          f"🛡️ **모니터링**: 에러 핸들링 및 알림 시스템 활성화"
         
-        await send_alert_to_channel(
+        sent = await send_alert_to_channel(
             client, 
             startup_message, 
             "Success", 
             "workout_bot_main.py - send_bot_startup_notification"
         )
         print("✅ 봇 시작 알림을 알림 채널에 전송했습니다.")
+        return sent
     except Exception as e:
         print(f"❌ 봇 시작 알림 전송 실패: {e}")
+        return None
+
+async def add_startup_timings_to_notification(message):
+    """봇 시작 알림에 시작 소요 시간 필드를 추가"""
+    if message is None or not message.embeds:
+        return
+    try:
+        embed = message.embeds[0].copy()
+        embed.add_field(name="⏱️ 시작 소요 시간", value=format_startup_timings(), inline=False)
+        await send_outbound(partial(message.edit, embed=embed), PRIORITY_ALERT, "봇 시작 소요 시간")
+    except Exception as e:
+        print(f"⚠️ 시작 소요 시간 표시 실패: {e}")
+
+async def run_database_migrations():
+    """스키마 마이그레이션 적용 (DDL은 시작 시에만 실행)"""
+    success = await asyncio.get_event_loop().run_in_executor(None, apply_database_migrations)
+    if not success:
+        await send_error_to_channel(
+            "스키마 마이그레이션 적용에 실패했습니다. 로그를 확인해주세요.",
+            "MigrationError",
+            "workout_bot_main.py - run_database_migrations"
+        )
+
+async def prepare_guild_configs():
+    """서버별 채널 설정을 불러오고, 서버 구분 도입 전 기록을 기존 운동 채널의 서버로 옮김 (출석 스냅샷보다 먼저)"""
+    loaded = await asyncio.get_event_loop().run_in_executor(None, load_guild_configs, client)
+    if loaded is None:
+        await send_error_to_channel(
+            "서버별 채널 설정을 불러오지 못했습니다. 로그를 확인해주세요.",
+            "GuildSettingsError",
+            "workout_bot_main.py - prepare_guild_configs"
+        )
+        return
+    await claim_legacy_guild(client)
+    print(f"🏠 서버 설정 {len(iter_guild_configs())}개 준비 완료")
+
+async def warm_attendance_snapshot():
+    """출석 스냅샷을 불러와서 재시작 직후의 !요약이 DB 전체 조회 없이 응답하도록 준비"""
+    result = await asyncio.get_event_loop().run_in_executor(None, load_attendance_snapshot, client)
+    if result:
+        print(f"🧮 출석 스냅샷 준비 ({result['source']}, 저널 {result['replayed']}건 반영, {result['elapsed_ms']}ms)")
+
+async def warm_database_connections():
+    """DB 연결 풀(과 읽기 복제본 연결)을 미리 열어 첫 명령어의 연결 생성 대기를 없앰"""
+    success = await asyncio.get_event_loop().run_in_executor(None, warm_up_database)
+    if not success:
+        print("⚠️ DB 연결 준비에 실패했습니다. 첫 조회 때 다시 연결합니다.")
+
+async def warm_message_mirror():
+    """메시지 미러 백필/이어 받기 (끝나기 전까지 기록 조회는 Discord API 사용)"""
+    try:
+        await start_message_mirror(client)
+    except Exception as e:
+        print(f"❌ 메시지 미러 준비 실패: {e}")
+        await send_error_to_channel(e, "MessageMirrorError", "workout_bot_main.py - warm_message_mirror")
+
+def command_tree_fingerprint():
+    """현재 등록된 slash command 정의의 해시 (애플리케이션 ID 포함)"""
+    definitions = sorted(
+        (command.to_dict(client.tree) for command in client.tree.get_commands()),
+        key=lambda definition: definition['name']
+    )
+    payload = json.dumps(
+        {'application_id': client.application_id, 'commands': definitions},
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def read_synced_fingerprint():
+    """마지막으로 동기화한 정의의 해시 (파일이 없으면 None)"""
+    if not SLASH_COMMAND_FINGERPRINT_PATH or not os.path.exists(SLASH_COMMAND_FINGERPRINT_PATH):
+        return None
+    with open(SLASH_COMMAND_FINGERPRINT_PATH, encoding='utf-8') as f:
+        return f.read().strip() or None
+
+def write_synced_fingerprint(fingerprint):
+    if not SLASH_COMMAND_FINGERPRINT_PATH:
+        return
+    with open(SLASH_COMMAND_FINGERPRINT_PATH, 'w', encoding='utf-8') as f:
+        f.write(fingerprint)
 
 async def sync_slash_commands():
-    """Slash commands 동기화"""
+    """Slash commands 동기화 (정의가 마지막 동기화 이후 바뀐 경우에만 전역 sync 호출)"""
     try:
+        fingerprint = command_tree_fingerprint()
+        if fingerprint == read_synced_fingerprint():
+            print(f"✅ Slash commands 정의 변경 없음 - 동기화 생략 ({fingerprint[:12]})")
+            return
         synced = await client.tree.sync()
-        print(f"🔄 Slash commands 동기화 완료: {len(synced)}개 명령어")
+        write_synced_fingerprint(fingerprint)
+        print(f"🔄 Slash commands 동기화 완료: {len(synced)}개 명령어 ({fingerprint[:12]})")
     except Exception as e:
         error_msg = f"Slash commands 동기화 실패: {e}"
         print(f"❌ {error_msg}")
@@ -74,11 +247,11 @@ async def start_bot_schedulers():
     """스케줄러 등록 및 시작"""
     try:
         # 기본 스케줄러 설정 및 시작
-        start_schedulers = setup_schedulers(client, channel_id)
+        start_schedulers = setup_schedulers(client)
         start_schedulers()
         
-        # 이벤트 관련 스케줄러 설정 및 시작
-        start_event_schedulers = setup_events(client, channel_id)
+        # 이벤트 관련 스케줄러 설정 및 시작 (등록된 서버마다 실행)
+        start_event_schedulers = setup_events(client)
         start_event_schedulers()
         
     except Exception as e:
@@ -86,9 +259,10 @@ async def start_bot_schedulers():
         print(f"❌ {error_msg}")
         await send_error_to_channel(e, "SchedulerStartError", "workout_bot_main.py - start_bot_schedulers")
 
-async def handle_monday_tasks():
-    """월요일에 실행되는 작업들 (전주 통계 집계 및 스레드 생성)"""
-    print("📆 오늘은 월요일입니다.")
+async def handle_monday_tasks(guild_config):
+    """월요일에 실행되는 서버별 작업들 (전주 통계 집계 및 스레드 생성)"""
+    print(f"📆 오늘은 월요일입니다. (서버 {guild_config.guild_id})")
+    channel_id = guild_config.workout_channel_id
     
     try:
         # 운동 스레드 생성 가능성 확인 (중복 스레드가 없는지)
@@ -120,7 +294,7 @@ async def handle_monday_tasks():
         try:
             print("📊 전주 주간 통계를 집계합니다...")
             # 채널 객체를 weekly_stats_auto에 전달하여 통계 메시지를 채널에 직접 전송
-            await weekly_stats_auto(channel, client, channel_id)
+            await weekly_stats_auto(channel, client)
             # 통계 메시지 전송 후에 오늘의 운동 스레드 생성
             await create_daily_workout_thread(client, channel_id)
             print("✅ 전주 통계 집계 및 스레드 생성 작업 완료. 봇은 계속 실행됩니다.")
@@ -133,44 +307,79 @@ async def handle_monday_tasks():
         print(f"✅ 오늘의 운동 스레드 '{expected_thread_name}'은(는) 이미 존재합니다.")
         print("ℹ️ 오늘의 스레드가 이미 존재하므로 전주 통계는 집계하지 않습니다.")
 
-async def handle_non_monday_tasks():
-    """월요일이 아닌 날에 실행되는 작업들 (운동 스레드만 생성)"""
+async def handle_non_monday_tasks(guild_config):
+    """월요일이 아닌 날에 실행되는 서버별 작업들 (운동 스레드만 생성)"""
     now = datetime.now(KST)
     try:
-        await create_daily_workout_thread(client, channel_id)
+        await create_daily_workout_thread(client, guild_config.workout_channel_id)
         print(f"✅ 스레드 생성 완료. 오늘은 {['월', '화', '수', '목', '금', '토', '일'][now.weekday()]}요일이므로 주간 통계는 집계하지 않습니다.")
     except Exception as e:
         error_msg = f"일일 스레드 생성 실패: {e}"
         print(f"❌ {error_msg}")
         await send_error_to_channel(e, "DailyThreadError", "workout_bot_main.py - handle_non_monday_tasks")
 
-@client.event
-async def on_ready():
+async def run_daily_startup_tasks():
     """
-    봇이 로그인하고 준비되면 자동으로 실행되는 이벤트 핸들러.
-    월요일에는 전주 통계를 보여주고 오늘의 운동 스레드를 생성합니다.
+    서버마다 월요일에는 전주 통계를 보여주고 오늘의 운동 스레드를 생성합니다.
     다른 요일에는 운동 스레드만 생성합니다.
     """
-    print(f"💪 {client.user}(으)로 로그인되었습니다.")
+    now = datetime.now(KST)
+    for guild_config in iter_guild_configs():
+        if now.weekday() == 0:  # 0=월요일
+            await handle_monday_tasks(guild_config)
+        else:
+            await handle_non_monday_tasks(guild_config)
+
+async def run_startup_tasks():
+    """
+    프로세스당 한 번 실행되는 시작 작업을 병렬로 실행하고 단계별 소요 시간을 기록합니다.
+    - 게이트웨이 연결과 동시에: Slash command 동기화, DB 연결 준비, 출석 스냅샷
+    - 준비 완료 후: 오늘의 스레드 생성을 먼저 시작하고, 봇 시작 알림을 함께 전송
+    오늘의 스레드 처리가 끝난 시점을 준비 완료(time-to-ready)로 보고, 모든 단계가 끝나면 시작 알림에 추가합니다.
+    """
+    global time_to_ready
+    independent = [
+        asyncio.create_task(timed_step("Slash 동기화", sync_slash_commands())),
+        asyncio.create_task(timed_step("DB 연결 준비", warm_database_connections())),
+        asyncio.create_task(timed_step("출석 스냅샷", warm_attendance_snapshot())),
+    ]
     
-    # 봇 시작 알림 전송
-    await send_bot_startup_notification()
+    await timed_step("게이트웨이 연결", client.wait_until_ready())
     
-    # 명령어 등록
-    setup_commands(client)
+    # 대시보드 자정 갱신 시작, 꺼져 있던 동안의 변경 반영
+    start_dashboard_updates()
     
-    # Slash commands 동기화
-    await sync_slash_commands()
+    # 메시지 미러 준비 (첫 백필은 오래 걸릴 수 있으므로 준비 시간에 포함하지 않음)
+    spawn_background(warm_message_mirror(), "메시지 미러 준비", limited=False)
     
-    # 스케줄러 등록 및 시작
-    await start_bot_schedulers()
+    # 오늘의 스레드를 먼저 시작 (스케줄러 게시는 발신 큐에서 알림보다 먼저 나감)
+    daily = asyncio.create_task(timed_step("오늘의 스레드", run_daily_startup_tasks()))
+    notification = asyncio.create_task(timed_step("시작 알림", send_bot_startup_notification()))
     
-    # 현재 요일에 따른 작업 분기
-    now = datetime.now(KST)
-    if now.weekday() == 0:  # 0=월요일
-        await handle_monday_tasks()
-    else:
-        await handle_non_monday_tasks()
+    await daily
+    time_to_ready = time.monotonic() - PROCESS_STARTED
+    
+    await asyncio.gather(*independent)
+    startup_message = await notification
+    
+    print(f"⏱️ 봇 시작 소요 시간: {format_startup_timings()}")
+    await add_startup_timings_to_notification(startup_message)
+
+@client.event
+async def on_ready():
+    """
+    게이트웨이 세션이 새로 준비될 때마다 실행되는 이벤트 핸들러.
+    시작 작업은 setup_hook에서 한 번만 실행하므로, 재연결 때는 놓친 메시지만 미러에 이어 받습니다.
+    """
+    global ready_count
+    ready_count += 1
+    if ready_count == 1:
+        print(f"💪 {client.user}(으)로 로그인되었습니다. (서버 {len(client.guilds)}개, 샤드 {client.shard_count or 1}개)")
+        return
+    
+    print(f"🔁 게이트웨이 재연결 ({ready_count}번째 준비) - 시작 작업은 다시 실행하지 않습니다.")
+    # 세션이 끊긴 동안의 메시지 이벤트는 다시 오지 않으므로 미러만 이어 받기
+    spawn_background(warm_message_mirror(), "메시지 미러 이어 받기", limited=False)
 
 # 봇 실행
 if __name__ == "__main__":
@@ -181,7 +390,10 @@ if __name__ == "__main__":
         print("  !요약 - 멤버별 운동 요약 표시")
         print("  !통계 - 최근 3개월 월별, 지난주부터 4주 주간 통계 표시")
         print("  !추세 - 운동 추세 분석 표시")
-        print("  !동기화 [일수] - 운동 스레드 사진 업로드 현황 분석 (기본: 7일, 최대: 30일)")
+        print("  !동기화 [일수] - 운동 스레드 사진 업로드 현황 분석 (기본: 7일, 최대: 30일, 취소: !동기화 취소)")
+        print("  !채널설정 [#운동채널] [#알림채널] - 서버의 운동/알림 채널 설정 (관리자 전용)")
+        print("  !대시보드 [해제] - 자동 갱신되는 이번 주 랭킹을 이 채널에 고정 (관리자 전용)")
+        print("  !리마인더 [켜기|끄기] - 운동 기록이 없는 날 22시 개인 DM 알림 신청")
         client.run(token)
     except Exception as e:
         print(f"❌ 봇 실행 중 오류 발생: {e}")
@@ -0,0 +1,186 @@
+"""
+멤버 조회 모듈
+봇 시작 시 서버 전체 멤버를 내려받지 않고(chunk_guilds_at_startup=False), 필요한 멤버만 그때그때 조회합니다.
+운동 사진을 올리는 몇 명만 필요하므로 큰 서버에서도 메모리와 준비 시간이 멤버 수에 비례해 늘지 않습니다.
+
+- 조회한 멤버는 (서버 ID, 사용자 ID) 키의 LRU 캐시에 최대 MEMBER_CACHE_SIZE명까지 보관합니다.
+- 캐시에 없는 사용자는 모아서 게이트웨이 query_members(user_ids=...)로 100명씩 한 번에 조회합니다.
+- 서버에 없는 사용자도 캐시해서(부재 기록) 같은 사용자를 반복해서 조회하지 않습니다.
+- 게이트웨이로 들어온 멤버 참가/변경/탈퇴 이벤트로 캐시를 갱신하고, MEMBER_CACHE_TTL_SECONDS가 지나면 다시 조회합니다.
+- 적중/미스/조회 횟수는 get_member_resolver_stats()로 확인합니다.
+
+사용법:
+    install_member_resolver(client)                        # client.run 이전에 한 번
+    member = await resolve_member(guild, user_id)           # 없으면 None
+    members = await resolve_members(guild, user_ids)        # {사용자 ID: Member}
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+import discord
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 캐시에 보관하는 최대 멤버 수 (서버 전체 합계)
+MEMBER_CACHE_SIZE = 2000
+
+# 캐시한 멤버 정보를 다시 조회하기까지의 시간 (초, 닉네임 변경 반영용)
+MEMBER_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# query_members 한 번에 조회할 수 있는 최대 사용자 수 (Discord 제한)
+QUERY_BATCH_SIZE = 100
+
+_NOT_MEMBER = object()  # 서버에 없는 사용자 (부재 기록)
+
+_resolver = None
+
+
+class MemberResolver:
+    """(서버 ID, 사용자 ID) → Member LRU 캐시와 일괄 조회"""
+
+    def __init__(self, max_size=MEMBER_CACHE_SIZE, ttl=MEMBER_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache = OrderedDict()  # (guild_id, user_id) → (Member 또는 _NOT_MEMBER, 저장 시각)
+        self._stats = {'hits': 0, 'misses': 0, 'queries': 0, 'not_found': 0, 'evictions': 0, 'timeouts': 0}
+
+    def _lookup(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > self.ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _store(self, key, value):
+        self._cache[key] = (value, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def remember(self, member):
+        """이벤트로 받은 Member를 캐시에 반영"""
+        self._store((member.guild.id, member.id), member)
+
+    def forget(self, guild_id, user_id):
+        self._cache.pop((guild_id, user_id), None)
+
+    def on_member_update(self, before, after):
+        # 캐시에 있는 멤버만 갱신 (이벤트마다 캐시를 늘리지 않음)
+        if (after.guild.id, after.id) in self._cache:
+            self.remember(after)
+
+    async def resolve_many(self, guild, user_ids):
+        """
+        user_ids의 멤버 정보를 돌려줍니다. 캐시에 없는 사용자만 100명 단위로 게이트웨이에서 조회합니다.
+
+        Returns:
+            dict: {사용자 ID: Member} - 서버에 없거나 조회에 실패한 사용자는 빠짐
+        """
+        members = {}
+        missing = []
+        for user_id in dict.fromkeys(int(user_id) for user_id in user_ids):
+            key = (guild.id, user_id)
+            entry = self._lookup(key)
+            if entry is None:
+                # discord.py 캐시에 이미 있는 멤버 (봇 자신, 이벤트로 캐시된 멤버)
+                member = guild.get_member(user_id)
+                if member is not None:
+                    self._store(key, member)
+                    entry = (member, None)
+            if entry is not None:
+                self._stats['hits'] += 1
+                if entry[0] is not _NOT_MEMBER:
+                    members[user_id] = entry[0]
+            else:
+                self._stats['misses'] += 1
+                missing.append(user_id)
+
+        for start in range(0, len(missing), QUERY_BATCH_SIZE):
+            batch = missing[start:start + QUERY_BATCH_SIZE]
+            self._stats['queries'] += 1
+            try:
+                # 결과는 이 캐시에만 보관 (discord.py 멤버 캐시는 늘리지 않음)
+                found = await guild.query_members(user_ids=batch, limit=len(batch), cache=False)
+            except asyncio.TimeoutError:
+                self._stats['timeouts'] += 1
+                logger.warning(f"⚠️ 멤버 {len(batch)}명 조회 시간 초과 ({guild.name}), 메시지 작성자 정보로 대신합니다.")
+                continue
+            found = {member.id: member for member in found}
+            for user_id in batch:
+                member = found.get(user_id)
+                if member is None:
+                    self._stats['not_found'] += 1
+                    self._store((guild.id, user_id), _NOT_MEMBER)
+                else:
+                    self._store((guild.id, user_id), member)
+                    members[user_id] = member
+            logger.info(f"👥 멤버 {len(batch)}명 조회 ({guild.name}, 캐시 적중률 {self.hit_rate():.0%})")
+
+        return members
+
+    def hit_rate(self):
+        lookups = self._stats['hits'] + self._stats['misses']
+        return self._stats['hits'] / lookups if lookups else 0.0
+
+    def stats(self):
+        return dict(self._stats, size=len(self._cache), max_size=self.max_size, hit_rate=round(self.hit_rate(), 3))
+
+
+def install_member_resolver(client):
+    """멤버 캐시를 만들고 멤버 이벤트 리스너를 등록합니다 (client.run 이전에 한 번)"""
+    global _resolver
+    if _resolver is not None:
+        return _resolver
+    _resolver = MemberResolver()
+
+    async def on_member_join(member):
+        _resolver.remember(member)
+
+    async def on_member_update(before, after):
+        _resolver.on_member_update(before, after)
+
+    async def on_raw_member_remove(payload):
+        _resolver.forget(payload.guild_id, payload.user.id)
+
+    client.add_listener(on_member_join, 'on_member_join')
+    client.add_listener(on_member_update, 'on_member_update')
+    client.add_listener(on_raw_member_remove, 'on_raw_member_remove')
+    return _resolver
+
+
+def get_member_resolver():
+    """멤버 캐시 (install_member_resolver 전이면 기본 설정으로 생성)"""
+    global _resolver
+    if _resolver is None:
+        _resolver = MemberResolver()
+    return _resolver
+
+
+async def resolve_members(guild, user_ids):
+    """{사용자 ID: Member} - 서버에 없는 사용자는 빠짐"""
+    return await get_member_resolver().resolve_many(guild, user_ids)
+
+
+async def resolve_member(guild, user_id, seen=None):
+    """
+    사용자 한 명의 멤버 정보 (서버에 없으면 None)
+
+    Args:
+        seen: 이벤트에 함께 온 작성자 - Member면 조회 없이 캐시를 갱신하고 그대로 돌려줌
+    """
+    if isinstance(seen, discord.Member):
+        get_member_resolver().remember(seen)
+        return seen
+    return (await resolve_members(guild, [user_id])).get(int(user_id))
+
+
+def get_member_resolver_stats():
+    """적중/미스/게이트웨이 조회/부재/축출 횟수와 캐시 크기"""
+    return get_member_resolver().stats()
@@ -3,7 +3,7 @@
 ------------------------------------------
 봇에서 사용하는 모든 메시지를 관리하는 모듈입니다.
 - 운동 응원 메시지
-- 리마인더 메시지
+- 리마인더 메시지 (스레드 알림, 개인 DM)
 - 격려 메시지
 """
 
@@ -285,6 +285,15 @@ reminder_messages = [
 
 ]
 
+# 개인 DM 리마인더 메시지 (!리마인더로 신청한 멤버 중 오늘 운동 기록이 없는 멤버에게 22:00 KST 발송)
+dm_reminder_messages = [
+    "🔔 오늘 '{guild_name}'에 아직 운동 기록이 없어요! 자정 전에 가볍게라도 움직여 볼까요? 💪",
+    "⏰ 오늘이 2시간 남았어요. '{guild_name}' 운동 스레드에 사진 한 장 남겨 주세요! 📸",
+    "🏃 짧은 스트레칭도 운동입니다! 오늘 기록을 '{guild_name}'에 남겨 봐요 🔥",
+    "💤 자기 전에 10분만! 오늘의 운동 기록이 '{guild_name}'에서 기다리고 있어요 ✨",
+    "🦕 근육몬이 찾아왔어요. 오늘 운동 아직이죠? 지금 시작하면 연속 기록을 지킬 수 있어요! 🔥",
+]
+
 # 1명만 운동했을 때 격려 메시지
 encourage_solo_messages = [
     "🏃‍♂️ 오늘은 {count}명이 운동했네요! 내일은 더 많은 분들이 참여해주세요! 💪",
@@ -0,0 +1,493 @@
+"""
+운동 스레드 메시지 미러 모듈
+운동 채널 스레드의 메시지 메타데이터(메시지 ID, 작성자, 스레드, 첨부파일)를 로컬 SQLite 파일에 보관합니다.
+서버 설정(workout_bot_guilds)에 등록된 모든 운동 채널을 한 파일에 보관하며, 채널마다 따로 백필합니다.
+!동기화, 주간 운동왕 집계, 일일 운동 체크가 같은 메시지를 Discord API로 매번 다시 받지 않고
+로컬에서 읽으므로 365일 모드도 로컬 스캔으로 끝납니다.
+
+- 게이트웨이 이벤트(메시지 작성/수정/삭제, 스레드 생성/이름 변경/삭제)로 실시간 반영
+- 채널마다 처음 한 번은 모든 스레드를 백필하고, 이후 재시작 때는 꺼져 있던 동안 활동한 스레드만 이어 받기
+- 이어 받기가 끝나기 전(ready가 아닐 때)이나 아직 백필하지 않은 채널은 기존처럼 Discord API에서 읽음
+- 꺼져 있던 동안의 메시지 삭제는 이어 받기로 알 수 없으므로, 자정 자동 동기화가 최근 스레드를 다시 받아 맞춤
+
+사용법:
+    install_message_mirror(client)      # 봇 시작 전 한 번 (이벤트 리스너 등록)
+    await start_message_mirror(client)  # on_ready에서 (백필/이어 받기, 백그라운드 가능)
+
+    async for message in message_history(thread):
+        ...
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+import discord
+from discord.ext import tasks
+from workout_bot_config import DISCORD_CHANNEL_ID, MESSAGE_MIRROR_PATH
+from workout_bot_rest import rest_job
+from workout_bot_guilds import get_workout_channel_ids
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 마지막 생존 시각 기록 간격 (분) / 이어 받기 판단 여유 시간
+ALIVE_INTERVAL_MINUTES = 1
+ALIVE_MARGIN = timedelta(minutes=10)
+
+# 미러 파일은 봇 DB와 별개의 로컬 캐시이므로 SQL을 이 모듈에 둠
+MIRROR_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS mirror_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mirror_threads (
+        thread_id INTEGER PRIMARY KEY,
+        parent_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        synced_until INTEGER NOT NULL DEFAULT 0,
+        backfilled INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mirror_messages (
+        message_id INTEGER PRIMARY KEY,
+        thread_id INTEGER NOT NULL,
+        author_id INTEGER NOT NULL,
+        author_name TEXT NOT NULL,
+        author_global_name TEXT,
+        author_display_name TEXT NOT NULL,
+        author_bot INTEGER NOT NULL DEFAULT 0,
+        attachments TEXT NOT NULL DEFAULT '[]',
+        deleted INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_mirror_messages_thread ON mirror_messages (thread_id, message_id)",
+]
+
+_mirror = None
+
+
+class MirroredAttachment:
+    """첨부파일 메타데이터 (discord.Attachment와 같은 속성 이름)"""
+
+    __slots__ = ('filename', 'content_type', 'size')
+
+    def __init__(self, filename, content_type=None, size=0):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = size
+
+
+class MirroredAuthor:
+    """작성자 정보 (메시지 작성 당시 이름)"""
+
+    __slots__ = ('id', 'name', 'global_name', 'display_name', 'bot')
+
+    def __init__(self, id, name, global_name, display_name, bot):
+        self.id = id
+        self.name = name
+        self.global_name = global_name
+        self.display_name = display_name
+        self.bot = bot
+
+
+class MirroredThread:
+    """미러에 저장된 스레드 (discord.Thread 대신 이름/길드/ID만 제공)"""
+
+    __slots__ = ('id', 'name', 'parent_id', 'guild')
+
+    def __init__(self, id, name, parent_id, guild):
+        self.id = id
+        self.name = name
+        self.parent_id = parent_id
+        self.guild = guild
+
+    @property
+    def created_at(self):
+        return discord.utils.snowflake_time(self.id)
+
+
+class MirroredMessage:
+    """미러에 저장된 메시지 (기존 코드가 쓰는 discord.Message 속성만 제공)"""
+
+    __slots__ = ('id', 'channel', 'author', 'attachments')
+
+    def __init__(self, id, channel, author, attachments):
+        self.id = id
+        self.channel = channel
+        self.author = author
+        self.attachments = attachments
+
+    @property
+    def created_at(self):
+        return discord.utils.snowflake_time(self.id)
+
+
+def _attachments_json(attachments):
+    return json.dumps(
+        [{'filename': a.filename, 'content_type': a.content_type, 'size': a.size} for a in attachments],
+        ensure_ascii=False
+    )
+
+
+def _message_row(message):
+    author = message.author
+    return (
+        message.id, message.channel.id, author.id, author.name, getattr(author, 'global_name', None),
+        author.display_name, int(author.bot), _attachments_json(message.attachments),
+    )
+
+
+class MessageMirror:
+    """운동 스레드 메시지 메타데이터 로컬 미러"""
+
+    def __init__(self, path):
+        self.path = path
+        self.ready = False  # 이어 받기 완료 (True일 때만 로컬에서 읽음)
+        self._ready_channels = set()  # 이번 세션에서 백필/이어 받기를 마친 운동 채널 ID
+        self._caught_up = set()  # 이번 세션에서 빈틈 없이 따라잡은 스레드 ID
+        self._start_task = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        for statement in MIRROR_SCHEMA:
+            self._conn.execute(statement)
+        # 단일 채널 시절의 백필 기록은 기존 운동 채널의 것
+        legacy_backfilled_at = self._get_meta('backfilled_at')
+        if legacy_backfilled_at is not None and DISCORD_CHANNEL_ID:
+            self._set_meta(f'backfilled_at:{DISCORD_CHANNEL_ID}', legacy_backfilled_at)
+            self._conn.execute("DELETE FROM mirror_meta WHERE key = 'backfilled_at'")
+
+    # --- 메타 ---
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM mirror_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute(
+            "INSERT INTO mirror_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    def mark_alive(self):
+        """지금 게이트웨이 이벤트를 받고 있음을 기록 (다음 시작 때 이어 받을 범위 판단)"""
+        self._set_meta('last_alive_at', datetime.now(timezone.utc).isoformat())
+
+    def last_alive_at(self):
+        value = self._get_meta('last_alive_at')
+        return datetime.fromisoformat(value) if value else None
+
+    # --- 쓰기 ---
+
+    def is_workout_thread(self, channel):
+        return isinstance(channel, discord.Thread) and channel.parent_id in get_workout_channel_ids()
+
+    def index_thread(self, thread, backfilled=False):
+        """스레드를 목록에 추가하거나 이름을 갱신합니다"""
+        self._conn.execute(
+            """
+            INSERT INTO mirror_threads (thread_id, parent_id, name, synced_until, backfilled) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(thread_id) DO UPDATE SET name = excluded.name
+            """,
+            (thread.id, thread.parent_id, thread.name, thread.id if backfilled else 0, int(backfilled))
+        )
+
+    def add_messages(self, messages):
+        """메시지 메타데이터를 저장합니다 (이미 있는 메시지는 첨부파일/이름 갱신)"""
+        rows = [_message_row(message) for message in messages]
+        if not rows:
+            return
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(
+                """
+                INSERT INTO mirror_messages
+                    (message_id, thread_id, author_id, author_name, author_global_name,
+                     author_display_name, author_bot, attachments)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(message_id) DO UPDATE SET attachments = excluded.attachments, deleted = 0
+                """,
+                rows
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def advance(self, thread_id, message_id):
+        """thread_id 스레드는 message_id까지 빠짐없이 저장됨"""
+        self._conn.execute(
+            "UPDATE mirror_threads SET synced_until = MAX(synced_until, ?), backfilled = 1 WHERE thread_id = ?",
+            (message_id, thread_id)
+        )
+
+    def mark_deleted(self, message_ids):
+        self._conn.executemany(
+            "UPDATE mirror_messages SET deleted = 1 WHERE message_id = ?", [(message_id,) for message_id in message_ids]
+        )
+
+    def delete_thread(self, thread_id):
+        self._conn.execute("DELETE FROM mirror_messages WHERE thread_id = ?", (thread_id,))
+        self._conn.execute("DELETE FROM mirror_threads WHERE thread_id = ?", (thread_id,))
+        self._caught_up.discard(thread_id)
+
+    # --- 읽기 ---
+
+    def list_threads(self, channel):
+        """채널의 백필된 스레드 목록 (최근 생성 순)"""
+        rows = self._conn.execute(
+            "SELECT thread_id, name FROM mirror_threads WHERE parent_id = ? AND backfilled = 1 ORDER BY thread_id DESC",
+            (channel.id,)
+        ).fetchall()
+        return [MirroredThread(thread_id, name, channel.id, channel.guild) for thread_id, name in rows]
+
+    def has_thread(self, thread_id):
+        return thread_id in self._caught_up
+
+    def covers(self, channel):
+        """이번 세션에서 channel의 스레드를 빠짐없이 보관하고 있는지"""
+        return channel.id in self._ready_channels
+
+    async def iter_messages(self, thread):
+        """스레드 메시지를 최신순으로 (thread.history(limit=None)과 같은 순서)"""
+        rows = self._conn.execute(
+            """
+            SELECT message_id, author_id, author_name, author_global_name, author_display_name, author_bot, attachments
+            FROM mirror_messages WHERE thread_id = ? AND deleted = 0 ORDER BY message_id DESC
+            """,
+            (thread.id,)
+        ).fetchall()
+        for message_id, author_id, name, global_name, display_name, bot, attachments in rows:
+            yield MirroredMessage(
+                message_id, thread,
+                MirroredAuthor(author_id, name, global_name, display_name, bool(bot)),
+                [MirroredAttachment(**attachment) for attachment in json.loads(attachments)]
+            )
+
+    def get_stats(self):
+        threads, messages = self._conn.execute(
+            "SELECT (SELECT COUNT(*) FROM mirror_threads), (SELECT COUNT(*) FROM mirror_messages WHERE deleted = 0)"
+        ).fetchone()
+        return {'threads': threads, 'messages': messages, 'ready': self.ready}
+
+    # --- Discord에서 받기 ---
+
+    async def catch_up(self, thread, full=False):
+        """
+        스레드의 빠진 메시지를 Discord에서 받습니다.
+        백필 전이거나 full=True면 전체 기록을 다시 받고, 그 사이 사라진 메시지는 삭제로 표시합니다.
+        """
+        self.index_thread(thread)
+        row = self._conn.execute(
+            "SELECT synced_until, backfilled FROM mirror_threads WHERE thread_id = ?", (thread.id,)
+        ).fetchone()
+        synced_until, backfilled = row
+        full = full or not backfilled
+
+        after = None if full else discord.Object(id=synced_until)
+        batch, seen = [], set()
+        newest = synced_until
+        async for message in thread.history(limit=None, after=after, oldest_first=True):
+            batch.append(message)
+            seen.add(message.id)
+            newest = max(newest, message.id)
+            if len(batch) >= 100:
+                self.add_messages(batch)
+                batch = []
+        self.add_messages(batch)
+
+        if full:
+            # 받는 도중 새로 올라온 메시지(newest 이후)는 비교 대상에서 제외
+            stored = {
+                message_id for (message_id,) in self._conn.execute(
+                    "SELECT message_id FROM mirror_messages WHERE thread_id = ? AND deleted = 0 AND message_id <= ?",
+                    (thread.id, newest)
+                )
+            }
+            self.mark_deleted(stored - seen)
+        self.advance(thread.id, max(newest, thread.id))
+        self._caught_up.add(thread.id)
+        return len(seen)
+
+    async def start(self, client):
+        """운동 채널마다 처음이면 전체 백필, 아니면 꺼져 있던 동안 활동한 스레드만 이어 받은 뒤 ready로 전환"""
+        self.ready = False
+        self._ready_channels.clear()
+        self._caught_up.clear()
+        last_alive = self.last_alive_at()
+        threads_done = messages_done = 0
+
+        async with rest_job("메시지 미러 백필/이어 받기") as job:
+            for channel_id in sorted(get_workout_channel_ids()):
+                channel = client.get_channel(channel_id)
+                if not isinstance(channel, discord.TextChannel):
+                    logger.warning(f"⚠️ 메시지 미러: 채널 ID {channel_id}를 찾을 수 없어 Discord API에서 계속 읽습니다.")
+                    continue
+                threads, messages = await self._start_channel(channel, last_alive)
+                threads_done += threads
+                messages_done += messages
+
+        # 이어 받지 않은 보관 스레드는 꺼지기 전에 이미 빠짐없이 저장된 상태
+        for (thread_id,) in self._conn.execute("SELECT thread_id FROM mirror_threads WHERE backfilled = 1"):
+            self._caught_up.add(thread_id)
+
+        self.mark_alive()
+        self.ready = True
+        stats = self.get_stats()
+        logger.info(
+            f"💾 메시지 미러 준비 완료: 채널 {len(self._ready_channels)}개, 스레드 {threads_done}개에서 메시지 {messages_done}개 받음 "
+            f"(전체 스레드 {stats['threads']}개, 메시지 {stats['messages']}개) | {job.summary()}"
+        )
+
+    async def _start_channel(self, channel, last_alive):
+        """채널 하나를 백필(처음) 또는 이어 받기 - (확인한 스레드 수, 받은 메시지 수) 반환"""
+        meta_key = f'backfilled_at:{channel.id}'
+        first_run = self._get_meta(meta_key) is None
+        if first_run:
+            last_alive = None
+        started = datetime.now(timezone.utc)
+        threads_done = messages_done = 0
+
+        # 활성 스레드: 꺼져 있던 동안 글이 올라온 스레드는 다시 활성화되므로 모두 확인
+        for thread in channel.threads:
+            messages_done += await self.catch_up(thread)
+            threads_done += 1
+
+        # 보관된 스레드: 처음에는 전부, 이후에는 마지막 생존 시각 이후 보관된 것만 (보관 시각 내림차순)
+        try:
+            async for thread in channel.archived_threads(limit=None):
+                if last_alive is not None and thread.archive_timestamp < last_alive - ALIVE_MARGIN:
+                    break
+                messages_done += await self.catch_up(thread)
+                threads_done += 1
+        except discord.Forbidden:
+            logger.warning(f"⚠️ 메시지 미러: #{channel.name}의 보관된 스레드를 읽을 권한이 없습니다.")
+
+        if first_run:
+            self._set_meta(meta_key, started.isoformat())
+        self._ready_channels.add(channel.id)
+        return threads_done, messages_done
+
+    async def refresh_recent(self, client, channel_id, days):
+        """channel_id 채널에서 최근 days일 안에 만든 스레드를 전체 다시 받아 꺼져 있던 동안의 삭제까지 맞춥니다"""
+        channel = client.get_channel(channel_id)
+        if not self.ready or not isinstance(channel, discord.TextChannel) or not self.covers(channel):
+            return 0
+        since = discord.utils.time_snowflake(datetime.now(timezone.utc) - timedelta(days=days + 1))
+        thread_ids = [
+            thread_id for (thread_id,) in self._conn.execute(
+                "SELECT thread_id FROM mirror_threads WHERE parent_id = ? AND thread_id >= ?", (channel.id, since)
+            )
+        ]
+        refreshed = 0
+        async with rest_job(f"메시지 미러 최근 {days}일 재확인"):
+            for thread_id in thread_ids:
+                thread = channel.get_thread(thread_id)
+                if thread is None:
+                    try:
+                        thread = await client.fetch_channel(thread_id)
+                    except discord.NotFound:
+                        self.delete_thread(thread_id)
+                        continue
+                await self.catch_up(thread, full=True)
+                refreshed += 1
+        return refreshed
+
+    # --- 게이트웨이 이벤트 ---
+
+    async def on_message(self, message):
+        if not self.is_workout_thread(message.channel):
+            return
+        self.index_thread(message.channel)
+        self.add_messages([message])
+        # 빈틈 없이 따라잡은 스레드만 저장 범위를 넓힘 (아니면 다음 이어 받기에서 빈틈을 채움)
+        if message.channel.id in self._caught_up:
+            self.advance(message.channel.id, message.id)
+
+    async def on_raw_message_edit(self, payload):
+        message = getattr(payload, 'message', None)
+        if message is not None and self.is_workout_thread(message.channel):
+            self.add_messages([message])
+
+    async def on_raw_message_delete(self, payload):
+        self.mark_deleted([payload.message_id])
+
+    async def on_raw_bulk_message_delete(self, payload):
+        self.mark_deleted(payload.message_ids)
+
+    async def on_thread_create(self, thread):
+        if thread.parent_id not in self._ready_channels:
+            return
+        # 새 스레드는 생성 시점부터 이벤트로 받으므로 바로 따라잡은 상태
+        self.index_thread(thread, backfilled=True)
+        self._caught_up.add(thread.id)
+
+    async def on_thread_update(self, before, after):
+        if after.parent_id in get_workout_channel_ids() and before.name != after.name:
+            self.index_thread(after)
+
+    async def on_raw_thread_delete(self, payload):
+        if payload.parent_id in get_workout_channel_ids():
+            self.delete_thread(payload.thread_id)
+
+
+@tasks.loop(minutes=ALIVE_INTERVAL_MINUTES)
+async def _mark_alive():
+    if _mirror is not None and _mirror.ready:
+        _mirror.mark_alive()
+
+
+def install_message_mirror(client):
+    """미러를 열고 게이트웨이 이벤트 리스너를 등록합니다 (client.run 이전에 한 번, 경로가 None이면 사용 안 함)"""
+    global _mirror
+    if _mirror is not None or not MESSAGE_MIRROR_PATH:
+        return _mirror
+    _mirror = MessageMirror(MESSAGE_MIRROR_PATH)
+    for event in ('on_message', 'on_raw_message_edit', 'on_raw_message_delete', 'on_raw_bulk_message_delete',
+                  'on_thread_create', 'on_thread_update', 'on_raw_thread_delete'):
+        client.add_listener(getattr(_mirror, event), event)
+    logger.info(f"💾 메시지 미러 파일: {MESSAGE_MIRROR_PATH}")
+    return _mirror
+
+
+async def start_message_mirror(client):
+    """백필/이어 받기 실행 (on_ready마다 호출 가능, 실행 중이면 그 작업을 기다림)"""
+    if _mirror is None:
+        return
+    if _mirror._start_task is None or _mirror._start_task.done():
+        _mirror._start_task = asyncio.create_task(_mirror.start(client), name="message-mirror-start")
+    if not _mark_alive.is_running():
+        _mark_alive.start()
+    await _mirror._start_task
+
+
+def get_message_mirror(channel=None):
+    """준비된 미러 (없거나 이어 받기 전, channel을 주면 그 채널을 아직 백필하지 않았을 때도 None)"""
+    if _mirror is not None and _mirror.ready and (channel is None or _mirror.covers(channel)):
+        return _mirror
+    return None
+
+
+def message_history(thread):
+    """스레드 메시지를 최신순으로 - 미러가 준비됐으면 로컬에서, 아니면 Discord API에서"""
+    mirror = get_message_mirror()
+    if mirror is not None and (isinstance(thread, MirroredThread) or mirror.has_thread(thread.id)):
+        return mirror.iter_messages(thread)
+    return thread.history(limit=None)
+
+
+async def refresh_message_mirror(client, channel_id, days):
+    """channel_id 채널의 최근 days일 스레드를 Discord에서 다시 받아 미러를 맞춥니다 (미러가 없으면 0)"""
+    mirror = get_message_mirror()
+    if mirror is None:
+        return 0
+    return await mirror.refresh_recent(client, channel_id, days)
@@ -0,0 +1,246 @@
+"""
+Discord 발신 큐 모듈
+봇이 보내는 메시지/리액션을 하나의 큐로 모아서 우선순위대로 내보냅니다.
+- 사용자 응답(운동 사진에 대한 리액션/응원 답장)이 가장 먼저 나갑니다.
+- 스케줄러 게시물(스레드 생성, 리마인더, 주간 통계)과 알림 채널 메시지는 그 뒤에 나가며,
+  동시에 실행되는 수를 제한해서 사용자 응답용 자리를 항상 남겨 둡니다.
+- 서로 의존하지 않는 동작(리액션과 답장 등)은 send_concurrently()로 동시에 보냅니다.
+- 우선순위별 대기열 길이, 대기/실행 시간은 get_outbox_stats()로 조회합니다.
+
+명령어(!요약 등)의 ctx.reply는 명령어 처리 흐름 안에서 바로 응답하므로 큐를 거치지 않습니다.
+
+사용법:
+    await send_outbound(partial(channel.send, text), PRIORITY_SCHEDULED, "주간 통계")
+    await send_concurrently([partial(message.add_reaction, "💪"), partial(message.reply, text)])
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 우선순위 (숫자가 작을수록 먼저)
+PRIORITY_INTERACTIVE = 0  # 사용자 메시지에 대한 리액션/답장
+PRIORITY_SCHEDULED = 1    # 스케줄러 게시물
+PRIORITY_ALERT = 2        # 알림 채널 메시지
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "사용자 응답",
+    PRIORITY_SCHEDULED: "스케줄러 게시",
+    PRIORITY_ALERT: "알림",
+}
+
+# 동시에 실행하는 발신 동작 수
+OUTBOX_WORKERS = 4
+
+# 그중 스케줄러 게시/알림이 동시에 차지할 수 있는 수 (나머지는 사용자 응답 전용)
+OUTBOX_BULK_CONCURRENCY = 2
+
+# 대기 시간 백분위 계산에 쓰는 최근 표본 수
+LATENCY_SAMPLES = 200
+
+# 이보다 오래 기다린 사용자 응답은 경고 로그를 남김 (초)
+SLOW_INTERACTIVE_WAIT = 2.0
+
+_outbox = None
+
+
+def _percentile(samples, ratio):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class OutboundAction:
+    """큐에 들어간 발신 동작 하나"""
+
+    __slots__ = ('action', 'priority', 'label', 'future', 'enqueued')
+
+    def __init__(self, action, priority, label, future):
+        self.action = action  # 인자 없이 호출하면 awaitable을 돌려주는 함수
+        self.priority = priority
+        self.label = label
+        self.future = future
+        self.enqueued = time.perf_counter()
+
+
+class OutboundQueue:
+    """우선순위별 대기열과 워커로 이루어진 발신 큐"""
+
+    def __init__(self, workers=OUTBOX_WORKERS, bulk_concurrency=OUTBOX_BULK_CONCURRENCY):
+        self.workers = workers
+        self.bulk_concurrency = min(bulk_concurrency, workers - 1)
+        self._pending = {priority: deque() for priority in PRIORITY_NAMES}
+        self._wakeup = None  # asyncio.Condition (이벤트 루프 안에서 생성)
+        self._worker_tasks = []
+        self._bulk_active = 0
+        self._active = 0
+        self.stats = {priority: self._new_stats() for priority in PRIORITY_NAMES}
+
+    @staticmethod
+    def _new_stats():
+        return {
+            'submitted': 0, 'started': 0, 'completed': 0, 'failed': 0,
+            'wait_ms_total': 0.0, 'wait_ms_max': 0.0, 'run_ms_total': 0.0,
+            'recent_wait_ms': deque(maxlen=LATENCY_SAMPLES),
+        }
+
+    def _ensure_workers(self):
+        """첫 요청 때 현재 이벤트 루프에서 워커를 시작합니다"""
+        if self._worker_tasks and not all(task.done() for task in self._worker_tasks):
+            return
+        self._wakeup = asyncio.Condition()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"outbox-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"📮 발신 큐 워커 {self.workers}개를 시작했습니다 (게시/알림 동시 {self.bulk_concurrency}개).")
+
+    # --- 요청 ---
+
+    async def submit(self, action, priority=PRIORITY_INTERACTIVE, label=None):
+        """
+        발신 동작을 큐에 넣고 완료를 기다릴 Future를 돌려줍니다.
+
+        Args:
+            action: 인자 없이 호출하면 awaitable을 돌려주는 함수 (예: partial(channel.send, text))
+            priority: PRIORITY_INTERACTIVE / PRIORITY_SCHEDULED / PRIORITY_ALERT
+            label: 로그 표시용 이름
+        """
+        self._ensure_workers()
+        future = asyncio.get_running_loop().create_future()
+        item = OutboundAction(action, priority, label or PRIORITY_NAMES[priority], future)
+        async with self._wakeup:
+            self._pending[priority].append(item)
+            self.stats[priority]['submitted'] += 1
+            self._wakeup.notify()
+        return future
+
+    async def send(self, action, priority=PRIORITY_INTERACTIVE, label=None):
+        """발신 동작을 큐에 넣고 결과(보낸 메시지 등)를 돌려줍니다. 실패하면 원래 예외를 다시 발생시킵니다"""
+        return await (await self.submit(action, priority, label))
+
+    async def send_all(self, actions, priority=PRIORITY_INTERACTIVE, label=None, return_exceptions=False):
+        """
+        서로 독립적인 발신 동작들을 한꺼번에 큐에 넣고 모두 끝날 때까지 기다립니다.
+        return_exceptions=True면 실패한 동작의 예외를 발생시키지 않고 결과 목록의 같은 위치에 담아 돌려줍니다.
+        """
+        futures = [await self.submit(action, priority, label) for action in actions]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        if return_exceptions:
+            return results
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    # --- 워커 ---
+
+    def _next_item(self):
+        """지금 실행할 수 있는 가장 높은 우선순위의 동작 (없으면 None)"""
+        for priority in sorted(self._pending):
+            queue = self._pending[priority]
+            if not queue:
+                continue
+            if priority != PRIORITY_INTERACTIVE and self._bulk_active >= self.bulk_concurrency:
+                # 게시/알림 자리가 다 찼으면 사용자 응답용 워커를 남겨 둠
+                continue
+            return queue.popleft()
+        return None
+
+    async def _worker(self):
+        while True:
+            async with self._wakeup:
+                item = self._next_item()
+                while item is None:
+                    await self._wakeup.wait()
+                    item = self._next_item()
+                is_bulk = item.priority != PRIORITY_INTERACTIVE
+                self._bulk_active += is_bulk
+                self._active += 1
+            try:
+                await self._run(item)
+            finally:
+                async with self._wakeup:
+                    self._bulk_active -= is_bulk
+                    self._active -= 1
+                    # 게시/알림 자리가 비었으니 대기 중인 워커를 깨움
+                    self._wakeup.notify_all()
+
+    async def _run(self, item):
+        started = time.perf_counter()
+        wait_ms = (started - item.enqueued) * 1000
+        stats = self.stats[item.priority]
+        stats['started'] += 1
+        stats['wait_ms_total'] += wait_ms
+        stats['wait_ms_max'] = max(stats['wait_ms_max'], wait_ms)
+        stats['recent_wait_ms'].append(wait_ms)
+        if item.priority == PRIORITY_INTERACTIVE and wait_ms > SLOW_INTERACTIVE_WAIT * 1000:
+            logger.warning(f"⚠️ 발신 큐: {item.label}이(가) {wait_ms / 1000:.1f}초 대기했습니다.")
+
+        if item.future.cancelled():
+            return
+        try:
+            result = await item.action()
+        except Exception as e:
+            stats['failed'] += 1
+            if not item.future.cancelled():
+                item.future.set_exception(e)
+        else:
+            stats['completed'] += 1
+            if not item.future.cancelled():
+                item.future.set_result(result)
+        finally:
+            stats['run_ms_total'] += (time.perf_counter() - started) * 1000
+
+    # --- 조회 ---
+
+    def get_stats(self):
+        """우선순위별 대기열 길이와 대기/실행 시간"""
+        result = {}
+        for priority, name in PRIORITY_NAMES.items():
+            stats = self.stats[priority]
+            finished = stats['completed'] + stats['failed']
+            result[name] = {
+                'depth': len(self._pending[priority]),
+                'submitted': stats['submitted'],
+                'completed': stats['completed'],
+                'failed': stats['failed'],
+                'avg_wait_ms': round(stats['wait_ms_total'] / stats['started'], 1) if stats['started'] else 0.0,
+                'p95_wait_ms': round(_percentile(stats['recent_wait_ms'], 0.95), 1),
+                'max_wait_ms': round(stats['wait_ms_max'], 1),
+                'avg_run_ms': round(stats['run_ms_total'] / finished, 1) if finished else 0.0,
+            }
+        result['active'] = self._active
+        return result
+
+
+def get_outbox():
+    """봇 전체가 공유하는 발신 큐"""
+    global _outbox
+    if _outbox is None:
+        _outbox = OutboundQueue()
+    return _outbox
+
+
+async def send_outbound(action, priority=PRIORITY_INTERACTIVE, label=None):
+    """발신 동작 하나를 큐를 통해 보내고 결과를 돌려줍니다"""
+    return await get_outbox().send(action, priority, label)
+
+
+async def send_concurrently(actions, priority=PRIORITY_INTERACTIVE, label=None, return_exceptions=False):
+    """
+    서로 독립적인 발신 동작들을 동시에 보냅니다 (하나라도 실패하면 모두 끝난 뒤 첫 예외를 발생).
+    return_exceptions=True면 동작별 결과(실패한 동작은 예외 객체)를 순서대로 돌려줍니다.
+    """
+    return await get_outbox().send_all(actions, priority, label, return_exceptions)
+
+
+def get_outbox_stats():
+    """발신 큐 지표 (대기열 길이, 대기/실행 시간)"""
+    return get_outbox().get_stats()
+
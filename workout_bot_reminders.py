@@ -0,0 +1,137 @@
+"""
+개인 DM 리마인더 발송 모듈
+!리마인더로 신청한 멤버 중 그날 운동 기록이 없는 멤버에게 보내는 DM을 하나의 대기열에서 천천히 내보냅니다.
+수천 명에게 보내도 이벤트 루프나 다른 작업(사용자 응답, 스케줄러 게시)을 막지 않습니다.
+
+- 발송은 워커 하나가 순서대로 처리하고, 초당 DM_REMINDERS_PER_SECOND통을 넘지 않도록 간격을 둡니다.
+- 발송 전체를 rest_job으로 묶어 전역 호출량이 많거나 429를 받으면 먼저 쉬어 가고,
+  발송 중 429(라우트 한도 초과)를 받을 때마다 발송 간격을 두 배로 늘립니다 (최대 DM_MAX_INTERVAL_SECONDS).
+- 라우트별 버킷 대기는 discord.py가 처리하고, DM 채널은 캐시되어 다음 발송부터 DM 채널 생성 호출이 줄어듭니다.
+- DM을 막아 둔 멤버(403)는 건너뛰고 집계만 합니다. 신청은 유지되어 DM을 다시 허용하면 다음 날부터 받습니다.
+- 발송 결과는 get_dm_reminder_stats()로 조회합니다.
+
+한 워커가 한 번에 한 통씩만 보내므로 발신 큐(workout_bot_outbox)를 거치지 않고 직접 보냅니다.
+(발신 큐 워커에서 보내면 rest_job 속도 조절이 적용되지 않음)
+
+사용법:
+    queued = enqueue_dm_reminders(client, guild, user_ids, text)
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+import discord
+from workout_bot_rest import rest_job
+from workout_bot_tasks import spawn_background
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 초당 최대 DM 발송 수 (DM 채널 생성 + 메시지 전송 = 호출 2회)
+DM_REMINDERS_PER_SECOND = 2
+
+# 429를 받아 늘린 발송 간격의 최대값 (초)
+DM_MAX_INTERVAL_SECONDS = 10.0
+
+_dispatcher = None
+
+
+class DMReminderDispatcher:
+    """DM 리마인더 대기열과 발송 워커"""
+
+    def __init__(self, per_second=DM_REMINDERS_PER_SECOND):
+        self.interval = 1.0 / per_second
+        self._queue = deque()  # (guild_id, user_id, 메시지)
+        self._queued = set()  # 대기 중인 (guild_id, user_id) - 같은 사람에게 두 번 보내지 않음
+        self._draining = False
+        self._stats = {'queued': 0, 'sent': 0, 'closed': 0, 'failed': 0, 'rate_limited': 0}
+
+    def enqueue(self, client, guild, user_ids, text):
+        """user_ids에게 보낼 DM을 대기열에 넣고 워커를 시작합니다 (이벤트 루프에서 호출). 새로 넣은 수 반환"""
+        added = 0
+        for user_id in user_ids:
+            key = (guild.id, int(user_id))
+            if key in self._queued:
+                continue
+            self._queued.add(key)
+            self._queue.append((guild.id, int(user_id), text))
+            added += 1
+        self._stats['queued'] += added
+        if added and not self._draining:
+            self._draining = spawn_background(self._drain(client), "DM 리마인더 발송", limited=False)
+            if not self._draining:
+                # 워커를 시작하지 못하면 (종료 중 등) 아무도 비우지 않을 대기열을 남기지 않음
+                logger.warning(f"⚠️ DM 리마인더 발송 워커를 시작하지 못해 대기 중인 {len(self._queue)}통을 버립니다.")
+                self._stats['queued'] -= added
+                self._queue.clear()
+                self._queued.clear()
+                return 0
+        return added
+
+    async def _drain(self, client):
+        interval = self.interval
+        sent_before = self._stats['sent']
+        try:
+            async with rest_job("DM 리마인더 발송") as job:
+                seen_rate_limited = 0
+                next_send = time.monotonic()
+                while self._queue:
+                    delay = next_send - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                    guild_id, user_id, text = self._queue.popleft()
+                    self._queued.discard((guild_id, user_id))
+                    await self._send(client, user_id, text)
+
+                    # 라우트 한도에 걸리면 이후 발송 간격을 늘림
+                    if job.rate_limited > seen_rate_limited:
+                        self._stats['rate_limited'] += job.rate_limited - seen_rate_limited
+                        seen_rate_limited = job.rate_limited
+                        interval = min(interval * 2, DM_MAX_INTERVAL_SECONDS)
+                        logger.warning(f"⚠️ DM 발송 중 rate limit - 발송 간격을 {interval:.1f}초로 늘립니다.")
+                    next_send = max(next_send, time.monotonic() - interval) + interval
+        finally:
+            self._draining = False
+            logger.info(
+                f"✉️ DM 리마인더 {self._stats['sent'] - sent_before}통 발송 "
+                f"(누적 발송 {self._stats['sent']}, DM 차단 {self._stats['closed']}, 실패 {self._stats['failed']}, "
+                f"남은 대기 {len(self._queue)})"
+            )
+            if self._queue:
+                # 종료 등으로 중단된 경우 남은 대기열은 버림 (다음 날 다시 계산)
+                self._queue.clear()
+                self._queued.clear()
+
+    async def _send(self, client, user_id, text):
+        try:
+            # user_id만으로 DM 채널 생성 (멤버/사용자 조회 호출 없음, 이미 열린 DM 채널은 캐시 사용)
+            channel = await client.create_dm(discord.Object(id=user_id))
+            await channel.send(text)
+            self._stats['sent'] += 1
+        except discord.Forbidden:
+            self._stats['closed'] += 1
+        except discord.HTTPException as e:
+            self._stats['failed'] += 1
+            logger.warning(f"⚠️ DM 리마인더 발송 실패 (사용자 {user_id}): {e}")
+
+    def stats(self):
+        return dict(self._stats, pending=len(self._queue), interval=self.interval)
+
+
+def get_dm_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = DMReminderDispatcher()
+    return _dispatcher
+
+
+def enqueue_dm_reminders(client, guild, user_ids, text):
+    """서버 guild의 user_ids에게 DM 리마인더를 예약합니다 (대기열에 새로 넣은 수 반환)"""
+    return get_dm_dispatcher().enqueue(client, guild, user_ids, text)
+
+
+def get_dm_reminder_stats():
+    """예약/발송/DM 차단/실패/rate limit 수와 남은 대기열 길이"""
+    return get_dm_dispatcher().stats()
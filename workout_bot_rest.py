@@ -0,0 +1,275 @@
+"""
+Discord REST 호출 게이트웨이 모듈
+봇의 모든 REST 호출(client.http.request)을 한 곳에서 감싸서 라우트별 호출 수, 지연 시간,
+429 응답, 버킷 대기 시간을 기록합니다.
+!동기화 같은 대량 작업은 rest_job()으로 호출 예산을 선언하고, 전역 호출량이 한도에 가까워지면
+429를 받기 전에 먼저 쉬어 갑니다. 작업이 끝나면 작업별 API 사용량을 보고합니다.
+
+사용법:
+    install_rest_gateway(client)  # 봇 시작 전 한 번
+
+    async with rest_job("!동기화 7일", budget=200) as job:
+        ...
+    print(job.summary())
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import aiohttp
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 대량 작업이 쉬어 가기 시작하는 전역 초당 호출 수 (Discord 전역 한도 50회/초보다 여유 있게)
+BULK_GLOBAL_CALLS_PER_SECOND = 40
+
+# 429를 받은 뒤 대량 작업이 추가로 쉬는 시간 (초)
+BULK_BACKOFF_AFTER_429 = 2.0
+
+# 예산을 넘긴 대량 작업의 초당 호출 수 (멈추지 않고 느리게 계속)
+OVER_BUDGET_CALLS_PER_SECOND = 5
+
+# 작업 요약에 표시할 라우트 수
+SUMMARY_TOP_ROUTES = 3
+
+# 지금 실행 중인 REST 호출 / 작업 (asyncio 태스크별로 따로 유지)
+_current_call = ContextVar('rest_current_call', default=None)
+_current_job = ContextVar('rest_current_job', default=None)
+
+_gateway = None
+
+
+def _new_route_stats():
+    return {'calls': 0, 'errors': 0, 'rate_limited': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'wait_ms': 0.0}
+
+
+class RestJob:
+    """대량 작업 하나의 REST 사용량과 예산"""
+
+    def __init__(self, name, budget=None, bulk=True):
+        self.name = name
+        self.budget = budget  # 최대 호출 수 (None이면 제한 없음)
+        self.bulk = bulk  # True면 전역 호출량이 많을 때 먼저 쉬어 감
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0  # 버킷 대기 + 429 대기
+        self.backoff_seconds = 0.0  # 한도 전에 스스로 쉰 시간
+        self.routes = {}  # 라우트 → 호출 수
+        self.started = time.monotonic()
+        self.finished = None
+        self._last_call = 0.0
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.calls > self.budget
+
+    @property
+    def elapsed_seconds(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def summary(self):
+        """작업 API 사용량 한 줄 요약"""
+        budget_text = f"/{self.budget}" if self.budget is not None else ""
+        top_routes = sorted(self.routes.items(), key=lambda item: item[1], reverse=True)[:SUMMARY_TOP_ROUTES]
+        routes_text = ", ".join(f"{route} {calls}회" for route, calls in top_routes)
+        text = (
+            f"{self.name}: REST {self.calls}{budget_text}회, 429 {self.rate_limited}회, "
+            f"대기 {self.wait_seconds:.1f}초, 감속 {self.backoff_seconds:.1f}초, 총 {self.elapsed_seconds:.1f}초"
+        )
+        if self.over_budget:
+            text += " (예산 초과)"
+        if routes_text:
+            text += f" | {routes_text}"
+        return text
+
+
+class RateLimitLogHandler(logging.Handler):
+    """
+    discord.http 로거의 429 경고를 게이트웨이에 전달합니다.
+    discord.py는 429를 내부에서 기다렸다가 재시도하므로 로그가 유일한 신호입니다.
+    """
+
+    def __init__(self, gateway):
+        super().__init__(level=logging.WARNING)
+        self.gateway = gateway
+
+    def emit(self, record):
+        message = str(record.msg)
+        if 'responded with 429' in message and len(record.args) >= 3:
+            self.gateway._on_rate_limited(float(record.args[2]), is_global=False)
+        elif message.startswith('Global rate limit has been hit') and record.args:
+            self.gateway._on_rate_limited(float(record.args[0]), is_global=True)
+
+
+class RestGateway:
+    """client.http.request를 감싸서 모든 REST 호출을 기록하는 게이트웨이"""
+
+    def __init__(self, client):
+        self.client = client
+        self.routes = {}  # 라우트(메서드 + 경로 템플릿) → 통계
+        self.global_rate_limits = 0
+        self._recent_calls = deque()  # 최근 1초간 호출 시각 (monotonic)
+        self._rate_limited_until = 0.0  # 마지막 429의 대기가 끝나는 시각 (monotonic)
+        self._original_request = None
+
+    def install(self):
+        """HTTP 클라이언트의 request와 aiohttp 추적, discord.http 로그 핸들러를 연결합니다 (로그인 전)"""
+        http = self.client.http
+        self._original_request = http.request
+        http.request = self.request
+
+        # 실제 네트워크 시간을 재서 버킷 대기 시간과 구분
+        trace = http.http_trace or aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_end)
+        http.http_trace = trace
+
+        logging.getLogger('discord.http').addHandler(RateLimitLogHandler(self))
+        logger.info("📡 Discord REST 게이트웨이가 설치되었습니다.")
+
+    # --- 요청 ---
+
+    async def request(self, route, **kwargs):
+        """HTTPClient.request 대신 호출됩니다"""
+        job = _current_job.get()
+        if job is not None and job.bulk:
+            await self._pace(job)
+
+        call = {'network': 0.0, 'retry_after': 0.0, 'rate_limited': 0}
+        token = _current_call.set(call)
+        now = time.monotonic()
+        self._prune_recent_calls(now)  # 대량 작업이 없어도 1초 이전 기록은 버림
+        self._recent_calls.append(now)
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await self._original_request(route, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            _current_call.reset(token)
+            self._record(route.key, time.perf_counter() - started, call, failed, job)
+
+    def _record(self, route_key, elapsed, call, failed, job):
+        # 네트워크 시간과 429 대기를 뺀 나머지를 버킷(선제적 rate limit) 대기로 봄
+        wait = max(0.0, elapsed - call['network'] - call['retry_after']) + call['retry_after']
+
+        stats = self.routes.setdefault(route_key, _new_route_stats())
+        stats['calls'] += 1
+        stats['errors'] += failed
+        stats['rate_limited'] += call['rate_limited']
+        stats['total_ms'] += elapsed * 1000
+        stats['max_ms'] = max(stats['max_ms'], elapsed * 1000)
+        stats['wait_ms'] += wait * 1000
+
+        if job is not None:
+            job.calls += 1
+            job.errors += failed
+            job.rate_limited += call['rate_limited']
+            job.wait_seconds += wait
+            job.routes[route_key] = job.routes.get(route_key, 0) + 1
+            if job.budget is not None and job.calls == job.budget + 1:
+                logger.warning(f"⚠️ {job.name}: REST 호출 예산 {job.budget}회를 넘었습니다. 속도를 낮춥니다.")
+
+    def _prune_recent_calls(self, now):
+        while self._recent_calls and now - self._recent_calls[0] > 1.0:
+            self._recent_calls.popleft()
+
+    async def _pace(self, job):
+        """대량 작업이 전역 한도나 예산에 닿기 전에 쉬어 갑니다"""
+        while True:
+            now = time.monotonic()
+            self._prune_recent_calls(now)
+
+            delay = 0.0
+            since_rate_limited = now - self._rate_limited_until
+            if since_rate_limited < BULK_BACKOFF_AFTER_429:
+                delay = BULK_BACKOFF_AFTER_429 - since_rate_limited
+            elif len(self._recent_calls) >= BULK_GLOBAL_CALLS_PER_SECOND:
+                delay = self._recent_calls[0] + 1.0 - now
+            elif job.over_budget:
+                delay = job._last_call + 1.0 / OVER_BUDGET_CALLS_PER_SECOND - now
+
+            if delay <= 0:
+                job._last_call = now
+                return
+            job.backoff_seconds += delay
+            await asyncio.sleep(delay)
+
+    # --- 추적 콜백 ---
+
+    async def _on_request_start(self, session, trace_config_ctx, params):
+        trace_config_ctx.started = time.perf_counter()
+
+    async def _on_request_end(self, session, trace_config_ctx, params):
+        call = _current_call.get()
+        started = getattr(trace_config_ctx, 'started', None)
+        if call is not None and started is not None:
+            call['network'] += time.perf_counter() - started
+
+    def _on_rate_limited(self, retry_after, is_global):
+        self._rate_limited_until = time.monotonic() + retry_after
+        if is_global:
+            # 같은 429에 대해 일반 경고 다음에 전역 경고가 한 번 더 기록됨
+            self.global_rate_limits += 1
+            return
+        call = _current_call.get()
+        if call is not None:
+            call['rate_limited'] += 1
+            call['retry_after'] += retry_after
+
+    # --- 조회 ---
+
+    def get_route_stats(self):
+        """라우트별 통계 (호출 수 내림차순)"""
+        return dict(sorted(self.routes.items(), key=lambda item: item[1]['calls'], reverse=True))
+
+    @asynccontextmanager
+    async def job(self, name, budget=None, bulk=True):
+        """이 블록(과 여기서 만든 태스크)의 REST 호출을 하나의 작업으로 집계합니다"""
+        job = RestJob(name, budget, bulk)
+        token = _current_job.set(job)
+        try:
+            yield job
+        finally:
+            _current_job.reset(token)
+            job.finished = time.monotonic()
+            logger.info(f"📡 {job.summary()}")
+
+
+def install_rest_gateway(client):
+    """client의 REST 호출에 게이트웨이를 설치합니다 (client.run 이전에 한 번)"""
+    global _gateway
+    if _gateway is None:
+        _gateway = RestGateway(client)
+        _gateway.install()
+    return _gateway
+
+
+def get_rest_gateway():
+    """설치된 게이트웨이 (없으면 None)"""
+    return _gateway
+
+
+@asynccontextmanager
+async def rest_job(name, budget=None, bulk=True):
+    """
+    REST 사용량을 집계할 작업 블록 (게이트웨이가 없으면 빈 집계만 반환)
+
+    Args:
+        name: 작업 이름 (로그/요약 표시용)
+        budget (int, optional): 예상 최대 호출 수 (넘으면 경고 후 속도를 낮춤)
+        bulk (bool): 전역 호출량이 많을 때 먼저 쉬어 갈지 여부
+    """
+    if _gateway is None:
+        yield RestJob(name, budget, bulk)
+        return
+    async with _gateway.job(name, budget, bulk) as job:
+        yield job
@@ -3,12 +3,17 @@ from datetime import datetime, timedelta
 import pytz
 import random
 from collections import Counter
+from functools import partial
 
 from workout_bot_messages import workout_info_messages
+from workout_bot_rest import rest_job
+from workout_bot_outbox import send_outbound, PRIORITY_SCHEDULED
+from workout_bot_mirror import get_message_mirror, message_history
+from workout_bot_members import resolve_members
 
 KST = pytz.timezone("Asia/Seoul")
 
-def setup_schedulers(client, channel_id):
+def setup_schedulers(client):
     def start_schedulers():
         print("✅ 운동 스케줄러 모듈이 로드되었습니다.")
         print("📋 등록된 스케줄러: 일일 운동 체크, 일일 운동 요약")
@@ -44,14 +49,18 @@ async def create_daily_workout_thread(client, channel_id):
         thread_message += f"\n\n💡 **오늘의 운동 팁**: {random_workout_info}"
         
         print(f"ℹ️ 오늘의 운동 스레드 '{expected_thread_name}'을(를) 생성합니다.")
-        message = await channel.send(f"{date_str} {weekday_name} {emoji}")
-        thread = await message.create_thread(name=expected_thread_name, auto_archive_duration=10080)
-        await thread.send(thread_message)
+        # 게시 → 스레드 생성 → 안내 메시지는 순서대로 (사용자 응답보다 낮은 우선순위)
+        message = await send_outbound(partial(channel.send, f"{date_str} {weekday_name} {emoji}"), PRIORITY_SCHEDULED, "스레드 게시")
+        thread = await send_outbound(
+            partial(message.create_thread, name=expected_thread_name, auto_archive_duration=10080),
+            PRIORITY_SCHEDULED, "스레드 생성"
+        )
+        await send_outbound(partial(thread.send, thread_message), PRIORITY_SCHEDULED, "스레드 안내")
         print(f"🧵 스레드가 성공적으로 생성되었습니다: {thread.name}")
     except Exception as e:
         print(f"❌ 스레드 생성에 실패했습니다: {e}")
 
-async def weekly_stats_auto(channel, client, channel_id):
+async def weekly_stats_auto(channel, client):
     try:
         now = datetime.now(KST)
         days_to_subtract = now.weekday() + 7
@@ -68,40 +77,48 @@ async def weekly_stats_auto(channel, client, channel_id):
             valid_thread_names.add(f"{date_str} {weekday_name}")
 
         if not isinstance(channel, discord.TextChannel):
-            print(f"❌ 채널 ID {channel_id}를 찾을 수 없습니다.")
+            print(f"❌ 운동 채널을 찾을 수 없습니다: {channel}")
             return
 
         guild = channel.guild
-        user_counts = Counter()
+        user_counts = Counter()  # 사용자 ID → 운동 횟수
+        authors = {}  # 사용자 ID → 메시지 작성자 (멤버 정보가 없을 때 이름 표시용)
         threads_to_check = []
         
-        for thread in channel.threads:
-            if thread.name in valid_thread_names:
-                threads_to_check.append(thread)
-        
-        try:
-            async for thread in channel.archived_threads(limit=50):
-                if thread.name in valid_thread_names:
-                    threads_to_check.append(thread)
-        except discord.errors.Forbidden:
-            print("🔐 보관된 스레드를 읽을 권한이 없습니다.")
+        # 스레드 목록/기록 조회와 멤버 조회를 하나의 대량 작업으로 집계
+        async with rest_job(f"주간 운동왕 집계 ({guild.name})"):
+            mirror = get_message_mirror(channel)
+            if mirror is not None:
+                # 로컬 메시지 미러에서 지난주 스레드 검색
+                threads_to_check = [thread for thread in mirror.list_threads(channel) if thread.name in valid_thread_names]
+            else:
+                for thread in channel.threads:
+                    if thread.name in valid_thread_names:
+                        threads_to_check.append(thread)
+            
+                try:
+                    async for thread in channel.archived_threads(limit=50):
+                        if thread.name in valid_thread_names:
+                            threads_to_check.append(thread)
+                except discord.errors.Forbidden:
+                    print("🔐 보관된 스레드를 읽을 권한이 없습니다.")
+
+            for thread in threads_to_check:
+                counted_users_in_thread = set()
+                async for message in message_history(thread):
+                    if not message.author.bot and message.attachments and message.author.id not in counted_users_in_thread:
+                        counted_users_in_thread.add(message.author.id)
+                        authors.setdefault(message.author.id, message.author)
+                        user_counts[message.author.id] += 1
 
-        for thread in threads_to_check:
-            counted_users_in_thread = set()
-            async for message in thread.history(limit=None):
-                if not message.author.bot and message.attachments and message.author.id not in counted_users_in_thread:
-                    try:
-                        member = await guild.fetch_member(message.author.id)
-                    except discord.NotFound:
-                        member = message.author
-                    counted_users_in_thread.add(message.author.id)
-                    user_counts[member] += 1
+            # 멤버 정보는 집계가 끝난 뒤 한 번에 조회 (사용자마다 fetch_member를 호출하지 않음)
+            members = await resolve_members(guild, list(user_counts))
 
         if not user_counts:
             no_stats_message = f"📅 **지난주 운동왕 ({start_of_prev_week.strftime('%m월 %d일')} ~ {end_of_prev_week.strftime('%m월 %d일')})** 🏆\n\n"
             no_stats_message += "😢 아무도 운동을 하지 않았어요... 이번 주에는 더 열심히 해봐요! 💪"
             try:
-                await channel.send(no_stats_message)
+                await send_outbound(partial(channel.send, no_stats_message), PRIORITY_SCHEDULED, "주간 통계")
                 print("✅ 운동 기록 없음 메시지가 채널에 전송되었습니다.")
             except Exception as e:
                 print(f"❌ 메시지 전송 중 오류 발생: {e}")
@@ -111,10 +128,10 @@ async def weekly_stats_auto(channel, client, channel_id):
         
         sorted_users = sorted(user_counts.items(), key=lambda item: item[1], reverse=True)
         count_groups = {}
-        for user, count in sorted_users:
+        for user_id, count in sorted_users:
             if count not in count_groups:
                 count_groups[count] = []
-            count_groups[count].append(user.display_name)
+            count_groups[count].append((members.get(user_id) or authors[user_id]).display_name)
         
         sorted_counts = sorted(count_groups.keys(), reverse=True)
         current_rank = 0
@@ -126,7 +143,7 @@ async def weekly_stats_auto(channel, client, channel_id):
             current_rank += 1
 
         try:
-            await channel.send(stats_message)
+            await send_outbound(partial(channel.send, stats_message), PRIORITY_SCHEDULED, "주간 통계")
             print("✅ 전주 통계 메시지가 채널에 전송되었습니다.")
         except Exception as e:
             print(f"❌ 통계 메시지 전송 중 오류 발생: {e}")
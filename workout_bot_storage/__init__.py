@@ -0,0 +1,74 @@
+"""
+운동 봇 저장소 패키지
+==================
+데이터베이스 작업을 백엔드별로 구현하는 패키지입니다.
+`workout_bot_config.DATABASE_BACKEND` 값으로 사용할 백엔드를 선택합니다.
+
+모듈 구조:
+- base.py: 저장소 백엔드 인터페이스 (StorageBackend) 및 공통 계산 함수
+- mysql_backend.py: MySQL 백엔드 (DATABASE_CONFIG 사용)
+- sqlite_backend.py: 내장 SQLite 백엔드 (WAL 모드, SQLITE_DATABASE_PATH 사용)
+- migrations.py: 버전별 스키마 마이그레이션 (schema_version 테이블)
+- writer.py: 교착 상태/잠금 대기 시 재시도하는 쓰기 트랜잭션 실행기
+- queries.py: 이름 붙은 SQL 쿼리 모음 (백엔드별로 한 번만 준비하여 재사용)
+- compaction.py: 오래된 일별 기록을 사용자별 월 단위 출석 비트맵으로 압축
+- partitions.py: daily_workout_records 월별 파티션 관리 (MySQL)
+- snapshot.py: 사용자 × 날짜 출석 행렬 파일 스냅샷 (mmap으로 열고 변경 저널만 재생)
+
+읽기 복제본(DATABASE_REPLICA_CONFIG / SQLITE_REPLICA_PATH)이 설정되면
+기본 백엔드에 읽기 전용 백엔드를 붙여서 보고서 조회만 복제본으로 보냅니다.
+"""
+
+import threading
+from workout_bot_config import (
+    DATABASE_BACKEND,
+    DATABASE_CONFIG,
+    SQLITE_DATABASE_PATH,
+    DATABASE_REPLICA_CONFIG,
+    SQLITE_REPLICA_PATH,
+    REPLICA_READ_AFTER_WRITE_SECONDS
+)
+
+from .base import (
+    StorageBackend,
+    calculate_current_streak,
+    calculate_max_streak,
+    to_date
+)
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_storage_backend(backend_name=None):
+    """설정값에 맞는 새로운 저장소 백엔드 객체를 생성합니다 (읽기 복제본 설정 시 함께 연결)"""
+    backend_name = (backend_name or DATABASE_BACKEND).lower()
+
+    if backend_name == "mysql":
+        # mysql-connector는 MySQL 백엔드를 사용할 때만 필요
+        from .mysql_backend import MySQLBackend
+        backend = MySQLBackend(DATABASE_CONFIG)
+        if DATABASE_REPLICA_CONFIG:
+            backend.set_reader(
+                MySQLBackend(DATABASE_REPLICA_CONFIG, pool_name="workout_bot_replica", read_only=True),
+                REPLICA_READ_AFTER_WRITE_SECONDS
+            )
+        return backend
+    if backend_name == "sqlite":
+        from .sqlite_backend import SQLiteBackend
+        backend = SQLiteBackend(SQLITE_DATABASE_PATH)
+        if SQLITE_REPLICA_PATH:
+            backend.set_reader(SQLiteBackend(SQLITE_REPLICA_PATH, read_only=True), REPLICA_READ_AFTER_WRITE_SECONDS)
+        return backend
+
+    raise ValueError(f"지원하지 않는 DATABASE_BACKEND 값입니다: {backend_name} (mysql 또는 sqlite)")
+
+
+def get_storage_backend():
+    """봇 전체에서 공유하는 저장소 백엔드를 반환합니다"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_storage_backend()
+    return _backend
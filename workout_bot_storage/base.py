@@ -0,0 +1,1161 @@
+"""
+저장소 백엔드 공통 인터페이스
+==========================
+봇이 사용하는 모든 데이터베이스 작업을 정의하는 추상 클래스입니다.
+MySQL/SQLite 백엔드가 이 인터페이스를 구현합니다.
+
+- 모든 조회/쓰기 쿼리는 queries.py에 이름으로 한 번만 정의하고 여기서 이름으로 실행합니다.
+- 연결 관리, prepared statement 캐시, Python 측 집계처럼 백엔드마다 다른 부분은 각 백엔드가 구현합니다.
+- 오래된 출석은 compaction.py가 월별 비트맵(workout_attendance_months)으로 압축하며,
+  통계 조회는 압축 구간과 daily_workout_records를 합쳐서 읽습니다.
+- 읽기 복제본이 설정되면(set_reader) 보고서 조회는 복제본으로, 쓰기는 기본 DB로 보냅니다.
+  대량 쓰기 직후에는 잠시 기본 DB에서 읽어서 방금 쓴 내용이 바로 보이게 합니다 (read-your-writes).
+- 기록은 Discord 서버별로 나뉩니다. 조회/쓰기 메서드는 guild_id(문자열)를 첫 번째 인자로 받고,
+  주간/월간 집계, 멤버 통계, 압축처럼 주기적으로 실행하는 작업만 모든 서버를 한 번에 처리합니다.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from calendar import monthrange
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, date, timedelta
+import pytz
+from .queries import QUERIES
+
+# 한국 시간대 설정
+KST = pytz.timezone('Asia/Seoul')
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = ['월', '화', '수', '목', '금', '토', '일']
+
+# 스트리밍 조회 시 한 번에 가져올 행 수
+STREAM_BATCH_SIZE = 1000
+
+# primary_reads() 블록 안인지 여부 (asyncio 태스크/스레드별로 따로 유지)
+_force_primary_reads = ContextVar('force_primary_reads', default=False)
+
+
+def to_date(value):
+    """DB에서 읽은 날짜 값(date, datetime, 'YYYY-MM-DD' 문자열)을 date 객체로 변환"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+
+
+def calculate_current_streak(workout_dates, end_date):
+    """
+    end_date부터 거꾸로 이어지는 연속 운동일수를 계산합니다.
+
+    Args:
+        workout_dates: 운동 날짜 목록 (내림차순)
+        end_date (date): 계산 기준 마지막 날짜 (포함)
+
+    Returns:
+        int: 연속 운동일수
+    """
+    streak = 0
+    current_date = end_date
+    for workout_date in workout_dates:
+        workout_date = to_date(workout_date)
+        if workout_date == current_date:
+            streak += 1
+            current_date -= timedelta(days=1)
+        elif workout_date > current_date:
+            # 같은 날짜가 중복되거나 기준일 이후인 기록은 건너뜀
+            continue
+        else:
+            break
+    return streak
+
+
+def calculate_max_streak(workout_dates):
+    """
+    최장 연속 운동일수를 계산합니다.
+
+    Args:
+        workout_dates: 운동 날짜 목록 (오름차순)
+
+    Returns:
+        int: 최장 연속 운동일수
+    """
+    if not workout_dates:
+        return 0
+
+    dates = [to_date(d) for d in workout_dates]
+    max_streak = 1
+    current_streak = 1
+    for i in range(1, len(dates)):
+        date_diff = (dates[i] - dates[i - 1]).days
+        if date_diff == 1:
+            current_streak += 1
+            max_streak = max(max_streak, current_streak)
+        elif date_diff > 1:
+            current_streak = 1
+    return max_streak
+
+
+def attendance_bit(workout_date):
+    """날짜에 해당하는 월별 출석 비트맵의 비트 (1일 = 최하위 비트)"""
+    return 1 << (to_date(workout_date).day - 1)
+
+
+def expand_attendance_bits(month_start, bits):
+    """월별 출석 비트맵을 날짜 목록(오름차순)으로 펼칩니다"""
+    month_start = to_date(month_start)
+    return [month_start + timedelta(days=day) for day in range(31) if bits >> day & 1]
+
+
+def weekly_refresh_start(today):
+    """주간 집계를 다시 계산할 시작 날짜 (최근 4주)"""
+    return today - timedelta(weeks=4)
+
+
+def monthly_refresh_start(today):
+    """월간 집계를 다시 계산할 시작 날짜 (2개월 전 1일, 이번 달 포함 3개월)"""
+    month_index = today.year * 12 + today.month - 1 - 2
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def date_param(value):
+    """날짜 값을 쿼리 파라미터('YYYY-MM-DD')로 변환 (두 백엔드 공통)"""
+    return to_date(value).strftime('%Y-%m-%d')
+
+
+def datetime_param(value):
+    """datetime 값을 쿼리 파라미터('YYYY-MM-DD HH:MM:SS')로 변환 (두 백엔드 공통)"""
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def guild_param(guild_id):
+    """Discord 서버 ID를 쿼리 파라미터(문자열)로 변환 (user_id와 같은 형식)"""
+    return str(guild_id)
+
+
+class StatementCursor:
+    """
+    백엔드 연결 위의 커서입니다.
+    queries.py에 정의된 쿼리는 run/run_many로 이름으로 실행하고,
+    DDL 등 마이그레이션용 SQL만 execute로 그대로 실행합니다.
+    """
+
+    def __init__(self, backend, connection):
+        self.backend = backend
+        self.connection = connection
+        self.raw = connection.cursor()
+        # 마지막으로 실행한 커서 (MySQL prepared statement는 이름별 커서를 사용)
+        self._last = self.raw
+
+    def execute(self, sql, params=()):
+        """SQL을 그대로 실행합니다 (마이그레이션 전용)"""
+        self.raw.execute(sql, params)
+        self._last = self.raw
+        return self
+
+    def run(self, name, params=()):
+        """queries.py에 정의된 쿼리를 이름으로 실행합니다"""
+        self._last = self.backend.execute_statement(self, name, params)
+        return self
+
+    def run_many(self, name, seq_of_params):
+        """같은 쿼리를 여러 파라미터로 한 번에 실행합니다"""
+        if seq_of_params:
+            self._last = self.backend.execute_statement_many(self, name, seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._last.fetchone()
+
+    def fetchall(self):
+        return self._last.fetchall()
+
+    @property
+    def rowcount(self):
+        return self._last.rowcount
+
+    def close(self):
+        self.raw.close()
+
+
+class StorageBackend(ABC):
+    """운동 봇 저장소 백엔드 인터페이스 (모든 쿼리는 queries.py에 정의)"""
+
+    # 백엔드 이름 (로그 및 설정값, queries.py 방언 키와 동일)
+    name = None
+
+    # daily_workout_records 월별 파티션 지원 여부 (partitions.py)
+    supports_partitioning = False
+
+    def __init__(self):
+        self._statements = {}  # 쿼리 이름 → 방언 변환된 SQL
+        self._writer = None
+        # 읽기 복제본 라우팅 (set_reader로 설정)
+        self._reader = None
+        self.read_after_write_seconds = 0
+        self._primary_reads_until = 0.0  # time.monotonic() 기준
+        self._primary_reads_lock = threading.Lock()
+        # 출석 행렬 스냅샷 (load_attendance_snapshot 이후 기간별 운동 일수를 메모리에서 계산)
+        self.attendance_snapshot = None
+
+    # --- 연결 관리 ---
+
+    @abstractmethod
+    def connect(self):
+        """DB-API 연결을 가져옵니다. 실패 시 예외를 발생시킵니다."""
+
+    def connect_dedicated(self):
+        """풀/캐시와 공유하지 않는 연결을 생성합니다 (세션 옵션을 바꾸는 마이그레이션용)."""
+        return self.connect()
+
+    def release(self, conn):
+        """사용이 끝난 연결을 반납합니다 (기본: 닫기)."""
+        conn.close()
+
+    @contextmanager
+    def connection(self, dedicated=False):
+        """연결을 열고, 정상 종료 시 commit / 예외 시 rollback 후 반납합니다."""
+        if dedicated:
+            conn = self.connect_dedicated()
+        else:
+            conn = self.connect()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if dedicated:
+                conn.close()
+            else:
+                self.release(conn)
+
+    @contextmanager
+    def session(self):
+        """connection()과 같지만 StatementCursor를 제공합니다."""
+        with self.connection() as conn:
+            cursor = self.cursor(conn)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def cursor(self, conn):
+        """연결에서 StatementCursor를 생성합니다."""
+        return StatementCursor(self, conn)
+
+    # --- 쿼리 실행 (queries.py) ---
+
+    def prepare_query(self, query):
+        """`%s` 플레이스홀더로 작성된 쿼리를 백엔드 방언으로 변환합니다."""
+        return query
+
+    def statement(self, name):
+        """이름에 해당하는 이 백엔드용 SQL을 반환합니다 (한 번 변환 후 재사용)."""
+        sql = self._statements.get(name)
+        if sql is None:
+            query = QUERIES[name]
+            if isinstance(query, dict):
+                if self.name not in query:
+                    raise KeyError(f"{self.name} 백엔드에 정의되지 않은 쿼리입니다: {name}")
+                query = query[self.name]
+            sql = self._statements[name] = self.prepare_query(query)
+        return sql
+
+    def execute_statement(self, cursor, name, params):
+        """이름으로 쿼리를 실행하고 결과를 가진 DB-API 커서를 반환합니다."""
+        cursor.raw.execute(self.statement(name), params)
+        return cursor.raw
+
+    def execute_statement_many(self, cursor, name, seq_of_params):
+        """이름으로 쿼리를 여러 파라미터에 대해 실행합니다."""
+        cursor.raw.executemany(self.statement(name), seq_of_params)
+        return cursor.raw
+
+    def query_all(self, name, params=(), replica=False):
+        """조회 쿼리를 실행하고 모든 행을 반환합니다 (replica=True면 읽기 복제본에서 조회)."""
+        with (self.read_session() if replica else self.session()) as cursor:
+            return cursor.run(name, params).fetchall()
+
+    def query_one(self, name, params=()):
+        """조회 쿼리를 실행하고 첫 번째 행을 반환합니다."""
+        with self.session() as cursor:
+            return cursor.run(name, params).fetchone()
+
+    def streaming_cursor(self, conn):
+        """결과를 미리 모두 받아두지 않는 커서를 생성합니다 (스트리밍 조회용)."""
+        return conn.cursor()
+
+    def stream_query(self, name, params=(), batch_size=STREAM_BATCH_SIZE):
+        """
+        조회 결과를 fetchmany로 batch_size개씩 읽어 한 행씩 내보내는 제너레이터입니다.
+        결과 전체를 메모리에 올리지 않으며, 읽는 동안 풀과 공유하지 않는 전용 연결을 사용합니다.
+        """
+        conn = self.connect_dedicated()
+        try:
+            cursor = self.streaming_cursor(conn)
+            cursor.execute(self.statement(name), params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            # 중간에 멈춘 경우 남은 결과는 연결과 함께 버림
+            conn.close()
+
+    # --- 읽기 복제본 라우팅 ---
+
+    def set_reader(self, reader, read_after_write_seconds=0):
+        """
+        보고서 조회를 보낼 읽기 전용 백엔드(복제본)를 설정합니다.
+
+        Args:
+            reader (StorageBackend): 복제본 백엔드 (None이면 모두 기본 DB에서 조회)
+            read_after_write_seconds (float): 대량 쓰기 후 기본 DB에서 읽을 시간 (복제 지연 대비)
+        """
+        self._reader = reader
+        self.read_after_write_seconds = read_after_write_seconds
+        if reader is not None:
+            logger.info(f"📖 보고서 조회는 읽기 복제본({reader.name})에서 실행합니다.")
+
+    @property
+    def reader(self):
+        """설정된 읽기 복제본 백엔드 (없으면 None)"""
+        return self._reader
+
+    def pin_primary_reads(self, seconds=None):
+        """앞으로 seconds초 동안 보고서 조회도 기본 DB에서 읽습니다 (기본: read_after_write_seconds)."""
+        if self._reader is None:
+            return
+        seconds = self.read_after_write_seconds if seconds is None else seconds
+        with self._primary_reads_lock:
+            self._primary_reads_until = max(self._primary_reads_until, time.monotonic() + seconds)
+
+    @contextmanager
+    def primary_reads(self):
+        """이 블록 안의 보고서 조회는 복제본 대신 기본 DB에서 읽습니다."""
+        token = _force_primary_reads.set(True)
+        try:
+            yield
+        finally:
+            _force_primary_reads.reset(token)
+
+    def read_backend(self):
+        """지금 보고서 조회를 보낼 백엔드 (복제본이 없거나 기본 DB 고정 중이면 자기 자신)"""
+        if self._reader is None or _force_primary_reads.get():
+            return self
+        if time.monotonic() < self._primary_reads_until:
+            return self
+        return self._reader
+
+    @contextmanager
+    def read_session(self):
+        """
+        보고서 조회용 session()입니다. 복제본이 설정되어 있으면 복제본 연결을 사용하고,
+        복제본에 연결할 수 없으면 기본 DB에서 조회합니다.
+        """
+        backend = self.read_backend()
+        conn = None
+        if backend is not self:
+            try:
+                conn = backend.connect()
+            except Exception as e:
+                logger.warning(f"⚠️ 읽기 복제본 연결 실패, 기본 DB에서 조회합니다: {e}")
+
+        if conn is None:
+            with self.session() as cursor:
+                yield cursor
+            return
+
+        cursor = backend.cursor(conn)
+        try:
+            yield cursor
+            # 읽기 트랜잭션을 끝내서 다음 조회가 최신 복제 상태를 보도록 함
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            backend.release(conn)
+
+    def test_connection(self):
+        """데이터베이스 연결 테스트"""
+        try:
+            with self.session() as cursor:
+                version = cursor.run('server_version').fetchone()
+                logger.info(f"🔍 {self.name} 버전: {version[0]}")
+
+                tables = cursor.run('list_tables').fetchall()
+                logger.info(f"📋 데이터베이스 테이블 수: {len(tables)}")
+
+                if tables:
+                    logger.info("📝 존재하는 테이블:")
+                    for table in tables:
+                        logger.info(f"   - {table[0]}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ 연결 테스트 오류: {e}")
+            return False
+
+    def warm_up(self):
+        """연결(풀)을 만들고 첫 쿼리를 실행해 둡니다 (읽기 복제본 포함, 첫 명령어가 연결 생성을 기다리지 않도록)"""
+        for backend in (self, self._reader):
+            if backend is None:
+                continue
+            with backend.session() as cursor:
+                cursor.run('server_version').fetchone()
+
+    # --- 스키마 (migrations.py에서만 사용) ---
+
+    def migrate(self):
+        """적용되지 않은 스키마 마이그레이션을 적용합니다. 봇 시작 시에만 호출합니다."""
+        from .migrations import apply_migrations
+        return apply_migrations(self)
+
+    def execute_ddl(self, cursor, statement):
+        """DDL 문을 실행합니다"""
+        cursor.execute(statement)
+
+    @abstractmethod
+    def column_exists(self, cursor, table, column):
+        """테이블에 컬럼이 존재하는지 확인합니다"""
+
+    def add_column(self, cursor, table, column, definition):
+        """테이블에 컬럼을 추가합니다"""
+        self.execute_ddl(cursor, f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    @abstractmethod
+    def scope_by_guild(self, cursor, table, definition):
+        """테이블에 guild_id 컬럼을 추가하고 고유 키/인덱스를 guild_id로 시작하도록 바꿉니다 (migrations.ScopeByGuild)"""
+
+    def prepare_migration_session(self, cursor):
+        """마이그레이션 연결의 세션 옵션을 설정합니다"""
+
+    @contextmanager
+    def migration_lock(self, cursor):
+        """여러 프로세스가 동시에 마이그레이션하지 않도록 잠급니다"""
+        yield
+
+    def is_lock_timeout(self, error):
+        """잠금 대기 시간 초과로 실패한 경우 True"""
+        return False
+
+    # --- 쓰기 트랜잭션 (writer.py) ---
+
+    def classify_write_conflict(self, error):
+        """
+        재시도하면 성공할 수 있는 쓰기 충돌인지 분류합니다.
+
+        Returns:
+            str or None: 'deadlock', 'lock_wait' 또는 재시도 대상이 아니면 None
+        """
+        return 'lock_wait' if self.is_lock_timeout(error) else None
+
+    @property
+    def writer(self):
+        """이 백엔드의 재시도 쓰기 실행기 (처음 사용할 때 생성)"""
+        if self._writer is None:
+            from .writer import RetryingWriter
+            self._writer = RetryingWriter(self)
+        return self._writer
+
+    def run_write(self, work, description="쓰기 작업", pin_reads=False):
+        """
+        work(cursor)를 교착 상태/잠금 대기 시 재시도하는 트랜잭션으로 실행합니다.
+        pin_reads=True면 커밋 후 잠시 보고서 조회를 기본 DB로 보냅니다 (동기화 등 대량 쓰기).
+        """
+        result = self.writer.run(work, description)
+        if self.attendance_snapshot is not None:
+            self.attendance_snapshot.mark_stale()
+        if pin_reads:
+            self.pin_primary_reads()
+        return result
+
+    def get_write_stats(self):
+        """쓰기 재시도 카운터를 반환합니다."""
+        return self.writer.get_stats()
+
+    # --- 서버별 설정 (workout_bot_guilds.py) ---
+
+    def get_guild_settings(self):
+        """
+        모든 서버의 운동 채널/알림 채널 설정을 조회합니다.
+
+        Returns:
+            list[tuple]: (guild_id, workout_channel_id, alert_channel_id, dashboard_channel_id, dashboard_message_id
+                          - 없는 값은 None)
+        """
+        return self.query_all('list_guild_settings')
+
+    def save_guild_settings(self, guild_id, workout_channel_id, alert_channel_id=None):
+        """서버의 운동 채널/알림 채널 설정을 저장합니다 (있으면 덮어씀)"""
+        params = (
+            guild_param(guild_id), str(workout_channel_id),
+            str(alert_channel_id) if alert_channel_id is not None else None
+        )
+        self.run_write(lambda cursor: cursor.run('upsert_guild_settings', params), "서버 설정 저장")
+
+    def save_guild_dashboard(self, guild_id, channel_id=None, message_id=None):
+        """서버의 대시보드 메시지 위치를 저장합니다 (None이면 해제)"""
+        params = (
+            str(channel_id) if channel_id is not None else None,
+            str(message_id) if message_id is not None else None,
+            guild_param(guild_id)
+        )
+        self.run_write(lambda cursor: cursor.run('update_guild_dashboard', params), "대시보드 설정 저장")
+
+    # --- 개인 DM 리마인더 신청 (workout_bot_reminders.py) ---
+
+    def get_reminder_subscribers(self, guild_id):
+        """서버에서 DM 리마인더를 신청한 사용자 ID 집합"""
+        return {row[0] for row in self.query_all('list_reminder_subscribers', (guild_param(guild_id),))}
+
+    def set_reminder_subscription(self, guild_id, user_id, enabled):
+        """
+        DM 리마인더 신청/해제
+
+        Returns:
+            bool: 상태가 바뀌었는지 여부 (이미 신청/해제된 상태면 False)
+        """
+        query = 'insert_reminder_subscription' if enabled else 'delete_reminder_subscription'
+        params = (guild_param(guild_id), str(user_id))
+        return self.run_write(lambda cursor: cursor.run(query, params).rowcount > 0, "DM 리마인더 신청 저장")
+
+    def list_attendance_guild_ids(self):
+        """출석 기록(압축 구간 포함)이 있는 서버 ID 목록"""
+        return sorted(row[0] for row in self.query_all('attendance_guild_ids'))
+
+    def claim_legacy_rows(self, guild_id):
+        """
+        guild_id 도입(마이그레이션 9) 이전 기록(guild_id '0')을 guild_id 서버의 기록으로 옮깁니다.
+        서버에 같은 키의 기록이 이미 있으면 (첫 시작 때 옮기지 못한 채 새 기록이 쌓인 경우) 서버 기록을 남기고
+        겹치는 '0' 기록은 지웁니다. 옮긴 기록이 있으면 출석 스냅샷도 다시 만듭니다 (서버 변경은 저널에 남지 않음).
+
+        Returns:
+            dict: {테이블 이름: 옮긴 행 수} (옮긴 행이 있는 테이블만)
+        """
+        from .queries import GUILD_SCOPED_TABLES
+
+        def work(cursor):
+            claimed = {}
+            for table in GUILD_SCOPED_TABLES:
+                count = cursor.run(f'claim_legacy_{table}', (guild_param(guild_id),)).rowcount
+                if count:
+                    claimed[table] = count
+                skipped = cursor.run(f'delete_legacy_{table}').rowcount
+                if skipped:
+                    logger.info(f"🧹 {table}: 서버에 이미 있는 기록과 겹치는 기존 기록 {skipped}행을 지웠습니다.")
+            return claimed
+
+        claimed = self.run_write(work, "기존 기록 서버 지정", pin_reads=True)
+        if claimed and self.attendance_snapshot is not None:
+            self.attendance_snapshot.rebuild()
+        return claimed
+
+    # --- 쓰기 작업 ---
+
+    def upsert_member(self, cursor, guild_id, user_id, user_name):
+        """workout_members에 사용자가 없으면 추가합니다"""
+        if cursor.run('upsert_member', (guild_param(guild_id), user_id, user_name)).rowcount == 1:
+            logger.info(f"✅ 새 멤버 추가: {user_name} (ID: {user_id}, 서버: {guild_id})")
+
+    def upsert_daily_record(self, cursor, guild_id, workout_date, weekday, user_id, user_name):
+        """daily_workout_records에 운동 기록을 UPSERT 합니다"""
+        cursor.run('upsert_daily_record', (guild_param(guild_id), date_param(workout_date), weekday, user_id, user_name))
+
+    def upsert_daily_records(self, cursor, guild_id, records):
+        """
+        daily_workout_records에 한 서버의 여러 운동 기록을 한 번에 UPSERT 합니다.
+
+        Args:
+            records: (workout_date, weekday, user_id, user_name) 목록
+        """
+        cursor.run_many('upsert_daily_record', [
+            (guild_param(guild_id), date_param(workout_date), weekday, user_id, user_name)
+            for workout_date, weekday, user_id, user_name in records
+        ])
+
+    def record_daily_workout(self, guild_id, user_id, user_name, workout_date):
+        """
+        멤버를 보장한 뒤 일별 운동 기록을 UPSERT 합니다.
+
+        Args:
+            guild_id: Discord 서버 ID
+            user_id: 사용자 Discord ID (문자열)
+            user_name: 사용자 이름
+            workout_date: 운동 날짜 (datetime.date 또는 문자열)
+        """
+        workout_date = to_date(workout_date)
+        weekday = WEEKDAY_NAMES[workout_date.weekday()]
+
+        def work(cursor):
+            self.upsert_member(cursor, guild_id, user_id, user_name)
+            self.upsert_daily_record(cursor, guild_id, workout_date, weekday, user_id, user_name)
+
+        self.run_write(work, "일별 운동 기록 UPSERT")
+
+    def get_attendance_set(self, guild_id, start_date, end_date):
+        """
+        서버의 기간 내 저장된 출석(운동 기록) 집합을 한 번의 쿼리로 조회합니다.
+
+        Returns:
+            set: {(user_id, date)}
+        """
+        rows = self.query_all(
+            'attendance_in_range', (guild_param(guild_id), date_param(start_date), date_param(end_date))
+        )
+        return {(user_id, to_date(workout_date)) for user_id, workout_date in rows}
+
+    def apply_attendance_diff(self, guild_id, inserts, removals):
+        """
+        동기화로 계산된 한 서버의 출석 변경분만 한 트랜잭션으로 반영합니다.
+
+        Args:
+            inserts: 새로 추가할 (user_id, user_name, date) 목록
+            removals: 제거할 (user_id, date) 목록 - 해당 날짜의 살아있는 이벤트도 삭제 처리
+
+        Returns:
+            tuple: (추가된 기록 수, 제거된 기록 수)
+        """
+        from .writer import attendance_sort_key
+
+        # 잠금 순서를 고정하기 위해 (date, user_id) 순서로 정렬
+        inserts = sorted(inserts, key=lambda r: attendance_sort_key(r[0], r[2]))
+        removals = sorted(removals, key=lambda r: attendance_sort_key(r[0], r[1]))
+        members = {}
+        for user_id, user_name, _ in inserts:
+            members[user_id] = user_name
+        guild = guild_param(guild_id)
+        removal_params = [(guild, user_id, date_param(workout_date)) for user_id, workout_date in removals]
+        deleted_at = datetime_param(datetime.now(KST))
+
+        def work(cursor):
+            for user_id in sorted(members):
+                self.upsert_member(cursor, guild_id, user_id, members[user_id])
+
+            self.upsert_daily_records(cursor, guild_id, [
+                (workout_date, WEEKDAY_NAMES[workout_date.weekday()], user_id, user_name)
+                for user_id, user_name, workout_date in inserts
+            ])
+
+            cursor.run_many('delete_daily_record', removal_params)
+
+            # 이벤트 로그에서도 사라진 사진으로 처리 (재구성 시 되살아나지 않도록)
+            cursor.run_many('mark_day_events_deleted', [(deleted_at,) + params for params in removal_params])
+
+        self.run_write(work, "출석 diff 반영", pin_reads=True)
+        return len(inserts), len(removals)
+
+    # --- 메시지 이벤트 로그 (workout_events) ---
+
+    def insert_workout_event(self, cursor, event):
+        """
+        workout_events에 이벤트를 추가합니다. 같은 message_id가 이미 있으면 무시합니다.
+
+        Returns:
+            bool: 새로 추가되었으면 True
+        """
+        cursor.run('insert_workout_event', (
+            guild_param(event['guild_id']), str(event['message_id']), str(event['thread_id']),
+            event['user_id'], event['user_name'],
+            date_param(event['workout_date']), event.get('attachment_count', 0),
+            event.get('image_count', 0), datetime_param(event['posted_at'])
+        ))
+        return cursor.rowcount > 0
+
+    def record_workout_events(self, events, derive_daily=True):
+        """
+        메시지 이벤트들을 기록하고, 새로 기록된 이벤트의 (사용자, 날짜)에 대해
+        일별 운동 기록을 함께 반영합니다. 같은 메시지를 다시 기록해도 결과는 같습니다.
+
+        Args:
+            events: dict 목록 (guild_id, message_id, thread_id, user_id, user_name, workout_date,
+                    attachment_count, image_count, posted_at)
+            derive_daily: False이면 이벤트만 기록 (일별 기록은 호출자가 반영)
+
+        Returns:
+            int: 새로 기록된 이벤트 수
+        """
+        from .writer import attendance_sort_key
+
+        events = sorted(events, key=lambda e: int(e['message_id']))
+
+        def work(cursor):
+            inserted = {}
+            inserted_count = 0
+            for event in events:
+                if self.insert_workout_event(cursor, event):
+                    inserted_count += 1
+                    key = (guild_param(event['guild_id']), event['user_id'], to_date(event['workout_date']))
+                    inserted[key] = event['user_name']
+
+            # 이벤트에서 일별 기록 도출 (멤버 → 일별 기록, 각각 정해진 키 순서로)
+            if derive_daily and inserted:
+                members = {(guild_id, user_id): user_name for (guild_id, user_id, _), user_name in inserted.items()}
+                for guild_id, user_id in sorted(members):
+                    self.upsert_member(cursor, guild_id, user_id, members[(guild_id, user_id)])
+                for guild_id, user_id, workout_date in sorted(
+                    inserted, key=lambda k: (k[0],) + attendance_sort_key(k[1], k[2])
+                ):
+                    self.upsert_daily_record(
+                        cursor, guild_id, workout_date, WEEKDAY_NAMES[workout_date.weekday()],
+                        user_id, inserted[(guild_id, user_id, workout_date)]
+                    )
+            return inserted_count
+
+        return self.run_write(work, "운동 이벤트 기록")
+
+    def mark_workout_event_deleted(self, guild_id, message_id, deleted_at=None):
+        """
+        삭제된 메시지의 이벤트에 deleted_at을 기록하고, 그날 남은 이벤트가 없으면
+        일별 운동 기록도 제거합니다.
+
+        Returns:
+            tuple or None: (user_id, workout_date) - 운동 이벤트가 아니었으면 None
+        """
+        if deleted_at is None:
+            deleted_at = datetime.now(KST).replace(tzinfo=None)
+
+        guild = guild_param(guild_id)
+
+        def work(cursor):
+            row = cursor.run('live_event_by_message', (guild, str(message_id))).fetchone()
+            if not row:
+                return None
+
+            user_id, workout_date = row[0], to_date(row[1])
+            cursor.run('mark_event_deleted', (datetime_param(deleted_at), guild, str(message_id)))
+
+            self.remove_orphaned_daily_records(cursor, guild_id, workout_date, workout_date, user_id)
+            return user_id, workout_date
+
+        return self.run_write(work, "운동 이벤트 삭제 처리")
+
+    def remove_orphaned_daily_records(self, cursor, guild_id, start_date, end_date, user_id=None):
+        """
+        이벤트가 기록되어 있지만 모두 삭제된 (사용자, 날짜)의 일별 기록을 제거합니다.
+        이벤트 로그 도입 이전의 기록(이벤트가 없는 행)은 건드리지 않습니다.
+
+        Returns:
+            int: 삭제된 일별 기록 수
+        """
+        date_range = (guild_param(guild_id), date_param(start_date), date_param(end_date))
+        if user_id is None:
+            cursor.run('delete_orphaned_daily_records', date_range)
+        else:
+            cursor.run('delete_orphaned_daily_records_for_user', date_range + (user_id,))
+        return cursor.rowcount
+
+    def rebuild_daily_records_from_events(self, guild_id, start_date, end_date):
+        """
+        서버의 기간 내 workout_events에서 일별 운동 기록을 다시 도출합니다 (Discord 재조회 없음).
+
+        Returns:
+            tuple: (반영된 일별 기록 수, 제거된 일별 기록 수)
+        """
+        def work(cursor):
+            rows = cursor.run(
+                'live_event_attendance', (guild_param(guild_id), date_param(start_date), date_param(end_date))
+            ).fetchall()
+            attendance = [(user_id, to_date(workout_date), user_name) for user_id, workout_date, user_name in rows]
+
+            members = {user_id: user_name for user_id, _, user_name in attendance}
+            for user_id in sorted(members):
+                self.upsert_member(cursor, guild_id, user_id, members[user_id])
+            self.upsert_daily_records(cursor, guild_id, [
+                (workout_date, WEEKDAY_NAMES[workout_date.weekday()], user_id, user_name)
+                for user_id, workout_date, user_name in attendance
+            ])
+
+            removed = self.remove_orphaned_daily_records(cursor, guild_id, start_date, end_date)
+            return len(attendance), removed
+
+        return self.run_write(work, "이벤트 로그 기반 재구성", pin_reads=True)
+
+    # --- 집계 ---
+
+    @abstractmethod
+    def refresh_weekly_records(self):
+        """모든 서버의 최근 4주간 weekly_workout_records를 다시 집계합니다. 갱신된 행 수를 반환합니다."""
+
+    @abstractmethod
+    def refresh_monthly_records(self):
+        """모든 서버의 최근 3개월간 monthly_workout_records를 다시 집계합니다. 갱신된 행 수를 반환합니다."""
+
+    def refresh_member_statistics(self):
+        """workout_members의 통계 컬럼과 연속 운동일수를 갱신합니다. 갱신된 멤버 수를 반환합니다."""
+        return self.run_write(self.update_member_statistics, "멤버 통계 업데이트", pin_reads=True)
+
+    def update_member_statistics(self, cursor, today=None):
+        """
+        모든 서버의 멤버별 운동 일수/출석률/마지막 운동일과 현재/최장 연속 운동일수(어제까지 기준)를
+        계산하여 저장합니다. 압축된 달의 출석도 함께 계산합니다.
+        """
+        if today is None:
+            today = datetime.now(KST).date()
+        yesterday = today - timedelta(days=1)
+
+        members = cursor.run('list_members').fetchall()
+
+        statistics = []
+        streaks = []
+        for guild_id, user_id, user_name in members:
+            dates = {
+                to_date(row[0]) for row in cursor.run('user_workout_dates', (guild_id, user_id)).fetchall()
+            }
+            dates = sorted(dates | self.cold_workout_dates(cursor, guild_id, user_id=user_id))
+
+            current_streak = calculate_current_streak(
+                [d for d in reversed(dates) if d <= yesterday], yesterday
+            )
+            max_streak = calculate_max_streak(dates)
+            streaks.append((current_streak, max_streak, guild_id, user_id))
+
+            if dates:
+                total_days = (today - dates[0]).days + 1
+                workout_rate = round(len(dates) / total_days * 100, 2) if total_days > 0 else 0
+                statistics.append((len(dates), total_days, workout_rate, date_param(dates[-1]), guild_id, user_id))
+
+        cursor.run_many('update_member_statistics', statistics)
+        cursor.run_many('update_member_streak', streaks)
+        return len(members)
+
+    # --- 압축된 과거 기록 (workout_attendance_months) ---
+
+    def compact_history(self, horizon_months):
+        """horizon_months개월보다 오래된 닫힌 달을 월별 비트맵으로 압축합니다 (compaction.py)."""
+        from .compaction import compact_history
+        return compact_history(self, horizon_months)
+
+    def maintain_partitions(self, months_ahead, drop_before=None):
+        """미래 월 파티션을 미리 만들고 압축이 끝난 과거 파티션을 제거합니다 (partitions.py)."""
+        from .partitions import maintain_partitions
+        return maintain_partitions(self, months_ahead, drop_before)
+
+    def load_attendance_snapshot(self, path, journal_retention_days):
+        """출석 행렬 스냅샷을 불러와(없으면 생성) 이후 운동 일수 조회에 사용합니다 (snapshot.py)."""
+        from .snapshot import AttendanceSnapshot
+        snapshot = AttendanceSnapshot(self, path, journal_retention_days)
+        result = snapshot.load()
+        self.attendance_snapshot = snapshot
+        return result
+
+    def prune_attendance_journal(self, retention_days):
+        """보존 기간이 지난 출석 변경 저널을 삭제합니다 (snapshot.py)."""
+        from .snapshot import prune_attendance_journal
+        return prune_attendance_journal(self, retention_days)
+
+    def cold_boundary(self, cursor):
+        """
+        압축된 마지막 달의 다음 달 1일을 반환합니다 (압축된 기록이 없으면 None).
+        이 날짜 이전의 출석은 월별 비트맵에, 이후의 출석은 daily_workout_records에 있습니다.
+        압축은 모든 서버의 같은 달을 함께 처리하므로 경계는 서버 공통입니다.
+        """
+        row = cursor.run('latest_compacted_month').fetchone()
+        if not row or row[0] is None:
+            return None
+        last_month = to_date(row[0])
+        return last_month + timedelta(days=monthrange(last_month.year, last_month.month)[1])
+
+    def split_at_cold_boundary(self, cursor, start_date, end_date):
+        """
+        기간을 압축 구간과 일별 기록 구간으로 나눕니다.
+
+        Returns:
+            tuple: (압축 구간 마지막 날짜 - 압축 구간과 겹치지 않으면 None, 일별 기록 구간 시작 날짜)
+        """
+        start_date = to_date(start_date)
+        boundary = self.cold_boundary(cursor)
+        if boundary is None or start_date >= boundary:
+            return None, start_date
+        return min(to_date(end_date), boundary - timedelta(days=1)), boundary
+
+    def cold_attendance(self, cursor, guild_id, start_date, end_date, user_id=None):
+        """
+        서버의 압축 구간 기간 내 출석을 조회합니다. 압축 이후 daily_workout_records에 다시 기록된
+        과거 날짜(다음 압축 때 합쳐짐)도 중복 없이 합칩니다.
+
+        Returns:
+            dict: {user_id: (user_name, set[date])}
+        """
+        start_date, end_date = to_date(start_date), to_date(end_date)
+        guild = guild_param(guild_id)
+        month_range = (date_param(start_date.replace(day=1)), date_param(end_date))
+        day_range = (date_param(start_date), date_param(end_date))
+        if user_id is None:
+            months = cursor.run('attendance_months_in_range', (guild,) + month_range).fetchall()
+            rows = cursor.run('attendance_rows_in_range', (guild,) + day_range).fetchall()
+        else:
+            months = cursor.run('user_attendance_months', (guild, user_id) + month_range).fetchall()
+            rows = cursor.run('user_attendance_rows_in_range', (guild, user_id) + day_range).fetchall()
+
+        attendance = {}
+        for row_user_id, user_name, month_start, bits in months:
+            entry = attendance.setdefault(row_user_id, [user_name, set()])
+            entry[1].update(d for d in expand_attendance_bits(month_start, bits) if start_date <= d <= end_date)
+        # 날짜순이므로 마지막 이름이 최신 이름
+        for row_user_id, user_name, workout_date in rows:
+            entry = attendance.setdefault(row_user_id, [user_name, set()])
+            entry[0] = user_name
+            entry[1].add(to_date(workout_date))
+        return {row_user_id: (user_name, dates) for row_user_id, (user_name, dates) in attendance.items()}
+
+    def cold_workout_dates(self, cursor, guild_id, user_id=None, user_name=None, until=None):
+        """서버 안에서 사용자의 압축된 출석 날짜 집합을 조회합니다 (until까지 포함)."""
+        until_param = date_param(until) if until is not None else '9999-12-31'
+        guild = guild_param(guild_id)
+        if user_id is not None:
+            months = cursor.run('user_attendance_months', (guild, user_id, '1900-01-01', until_param)).fetchall()
+        else:
+            months = cursor.run(
+                'user_name_attendance_months', (guild, user_name, '1900-01-01', until_param)
+            ).fetchall()
+
+        dates = set()
+        for _, _, month_start, bits in months:
+            dates.update(expand_attendance_bits(month_start, bits))
+        if until is not None:
+            dates = {d for d in dates if d <= to_date(until)}
+        return dates
+
+    # --- 조회 작업 ---
+
+    def get_workout_dates(self, guild_id, user_id=None, user_name=None, until=None, descending=True):
+        """
+        서버 안에서 사용자의 운동 날짜 목록을 조회합니다.
+
+        Args:
+            guild_id: Discord 서버 ID
+            user_id: 사용자 Discord ID (user_name과 둘 중 하나 필수)
+            user_name: 사용자 이름
+            until (date, optional): 이 날짜까지(포함)만 조회
+            descending (bool): True면 최신순
+
+        Returns:
+            list[date]: 운동 날짜 목록
+        """
+        until_param = date_param(until) if until is not None else '9999-12-31'
+        guild = guild_param(guild_id)
+        with self.read_session() as cursor:
+            if user_id is not None:
+                rows = cursor.run('workout_dates_by_user_id_until', (guild, user_id, until_param)).fetchall()
+            else:
+                rows = cursor.run('workout_dates_by_user_name_until', (guild, user_name, until_param)).fetchall()
+            cold_dates = self.cold_workout_dates(cursor, guild_id, user_id=user_id, user_name=user_name, until=until)
+
+        dates = [to_date(row[0]) for row in rows]
+        if cold_dates:
+            dates = sorted(cold_dates.union(dates), reverse=True)
+        return dates if descending else dates[::-1]
+
+    def get_member_summaries(self, guild_id):
+        """
+        !요약에 사용할 서버 멤버별 통계를 조회합니다.
+
+        Returns:
+            list[tuple]: (user_name, user_id, total_workout_days, total_days, workout_rate,
+                          current_streak, max_streak, last_workout_date)
+        """
+        rows = self.query_all('member_summaries', (guild_param(guild_id),), replica=True)
+        return [tuple(row[:7]) + (to_date(row[7]),) for row in rows]
+
+    def count_user_workouts(self, guild_id, user_id, start_date, end_date):
+        """서버 안에서 기간 내(양 끝 포함) 사용자의 운동 일수를 조회합니다 (압축 구간 포함)."""
+        if self.attendance_snapshot is not None and self.attendance_snapshot.ready:
+            return self.attendance_snapshot.count(guild_id, user_id, start_date, end_date)
+
+        with self.read_session() as cursor:
+            cold_end, hot_start = self.split_at_cold_boundary(cursor, start_date, end_date)
+            row = cursor.run(
+                'count_user_workouts', (guild_param(guild_id), user_id, date_param(hot_start), date_param(end_date))
+            ).fetchone()
+            count = row[0] if row else 0
+
+            if cold_end is not None:
+                cold = self.cold_attendance(cursor, guild_id, start_date, cold_end, user_id)
+                _, cold_dates = cold.get(user_id, (None, ()))
+                count += len(cold_dates)
+        return count
+
+    def count_workouts_by_user(self, guild_id, start_date, end_date):
+        """
+        서버의 기간 내(양 끝 포함) 모든 사용자의 운동 일수를 한 번에 조회합니다.
+
+        Returns:
+            dict: {user_id: 운동 일수} (운동하지 않은 사용자는 없음)
+        """
+        if self.attendance_snapshot is not None and self.attendance_snapshot.ready:
+            return self.attendance_snapshot.counts(guild_id, start_date, end_date)
+        return {
+            ranking['user_id']: ranking['workout_count']
+            for ranking in self.get_workout_rankings(guild_id, start_date, end_date)
+        }
+
+    def get_workout_rankings(self, guild_id, start_date, end_date):
+        """
+        서버의 기간 내(양 끝 포함) 운동 일수 랭킹을 조회합니다.
+
+        Returns:
+            list[dict]: {'user_name', 'user_id', 'workout_count'} (운동 일수 내림차순)
+        """
+        with self.read_session() as cursor:
+            cold_end, hot_start = self.split_at_cold_boundary(cursor, start_date, end_date)
+            rows = cursor.run(
+                'workout_rankings', (guild_param(guild_id), date_param(hot_start), date_param(end_date))
+            ).fetchall()
+            cold = self.cold_attendance(cursor, guild_id, start_date, cold_end) if cold_end is not None else {}
+
+        rankings = [
+            {'user_name': user_name, 'user_id': user_id, 'workout_count': workout_count}
+            for user_name, user_id, workout_count in rows
+        ]
+        if cold:
+            by_user_id = {}
+            for ranking in rankings:
+                by_user_id.setdefault(ranking['user_id'], ranking)
+            for user_id, (user_name, cold_dates) in cold.items():
+                if user_id in by_user_id:
+                    by_user_id[user_id]['workout_count'] += len(cold_dates)
+                else:
+                    rankings.append({'user_name': user_name, 'user_id': user_id, 'workout_count': len(cold_dates)})
+            rankings.sort(key=lambda r: (-r['workout_count'], r['user_name']))
+        return rankings
+
+    def get_monthly_statistics(self, guild_id, year, month):
+        """
+        서버 모든 멤버의 특정 월 운동 통계를 조회합니다.
+
+        Returns:
+            list[tuple]: (user_name, year, month, workout_days, unique_workout_days, workout_rate)
+        """
+        days_in_month = monthrange(year, month)[1]
+        month_start = date(year, month, 1)
+        month_end = date(year, month, days_in_month)
+
+        with self.read_session() as cursor:
+            cold_end, hot_start = self.split_at_cold_boundary(cursor, month_start, month_end)
+            guild = guild_param(guild_id)
+            rows = cursor.run(
+                'monthly_statistics', (guild, date_param(hot_start), date_param(month_end), guild)
+            ).fetchall()
+            cold = self.cold_attendance(cursor, guild_id, month_start, cold_end) if cold_end is not None else {}
+
+        if cold:
+            rows = sorted(
+                [(user_name, workout_days + len(cold.get(user_id, (None, ()))[1]))
+                 for user_id, user_name, workout_days in rows],
+                key=lambda row: row[1], reverse=True
+            )
+        else:
+            rows = [(user_name, workout_days) for _, user_name, workout_days in rows]
+
+        return [
+            (user_name, year, month, workout_days, workout_days,
+             round(workout_days / days_in_month * 100, 1))
+            for user_name, workout_days in rows
+        ]
+
+    def get_weekly_statistics(self, guild_id, start_date, end_date):
+        """
+        서버 모든 멤버의 기간 내 주간 집계를 조회합니다.
+
+        Returns:
+            list[tuple]: (user_name, year, week_number, week_start_date, week_end_date,
+                          workout_days, workout_rate)
+        """
+        rows = self.query_all(
+            'weekly_statistics', (date_param(start_date), date_param(end_date), guild_param(guild_id)), replica=True
+        )
+        return [
+            (row[0], row[1], row[2], to_date(row[3]), to_date(row[4]), row[5], float(row[6]))
+            for row in rows
+        ]
+
+    def iter_attendance_history(self, guild_id, start_date=None, end_date=None, with_member_names=False):
+        """
+        서버의 기간 내 출석 기록을 날짜, 사용자 ID 순서로 한 행씩 내보냅니다 (압축 구간 포함).
+        일별 기록은 스트리밍 커서로, 압축된 달은 한 달씩 펼쳐서 읽으므로 메모리 사용량이 일정합니다.
+
+        Yields:
+            tuple: (date 'YYYY-MM-DD', weekday, user_id, user_name[, member_name])
+                   member_name은 with_member_names일 때 workout_members의 현재 이름
+        """
+        start_date = to_date(start_date) if start_date is not None else date(1900, 1, 1)
+        end_date = to_date(end_date) if end_date is not None else date(9999, 12, 31)
+        query = 'export_daily_records_with_members' if with_member_names else 'export_daily_records'
+        # 내보내기 도중 복제본/기본 DB가 바뀌지 않도록 처음에 한 번만 정함
+        source = self.read_backend()
+
+        def daily_rows(range_start, range_end):
+            params = (guild_param(guild_id), date_param(range_start), date_param(range_end))
+            for row in source.stream_query(query, params):
+                yield (date_param(row[0]),) + tuple(row[1:])
+
+        with source.session() as cursor:
+            cold_end, hot_start = self.split_at_cold_boundary(cursor, start_date, end_date)
+
+        if cold_end is not None:
+            # 압축 이후 다시 기록된 과거 날짜는 비트맵과 병합하면서 중복 제거
+            merged = heapq.merge(
+                source._iter_cold_attendance(guild_id, start_date, cold_end, with_member_names),
+                daily_rows(start_date, cold_end),
+                key=lambda row: (row[0], row[2])
+            )
+            previous = None
+            for row in merged:
+                if (row[0], row[2]) != previous:
+                    previous = (row[0], row[2])
+                    yield row
+
+        if hot_start <= end_date:
+            yield from daily_rows(hot_start, end_date)
+
+    def _iter_cold_attendance(self, guild_id, start_date, end_date, with_member_names):
+        """압축된 달을 한 달씩 펼쳐 (날짜, 사용자 ID) 순서로 내보냅니다"""
+        query = 'export_attendance_months_with_members' if with_member_names else 'export_attendance_months'
+        month_rows = []
+        current_month = None
+
+        def flush():
+            month_rows.sort(key=lambda row: (row[0], row[2]))
+            yield from month_rows
+            month_rows.clear()
+
+        params = (guild_param(guild_id), date_param(start_date.replace(day=1)), date_param(end_date))
+        for row in self.stream_query(query, params):
+            user_id, user_name, month_start, bits = row[:4]
+            if month_start != current_month:
+                yield from flush()
+                current_month = month_start
+            for workout_date in expand_attendance_bits(month_start, bits):
+                if start_date <= workout_date <= end_date:
+                    month_rows.append(
+                        (date_param(workout_date), WEEKDAY_NAMES[workout_date.weekday()], user_id, user_name)
+                        + tuple(row[4:])
+                    )
+        yield from flush()
+
+    def get_weekly_records_since(self, guild_id, start_date):
+        """
+        서버의 start_date 이후 시작하는 주간 집계를 조회합니다 (!추세).
+
+        Returns:
+            list[tuple]: (user_name, year, week_number, week_start_date, week_end_date,
+                          workout_days, workout_rate)
+        """
+        rows = self.query_all('weekly_records_since', (guild_param(guild_id), date_param(start_date)), replica=True)
+        return [
+            (row[0], row[1], row[2], to_date(row[3]), to_date(row[4]), row[5], float(row[6]))
+            for row in rows
+        ]
@@ -0,0 +1,103 @@
+"""
+과거 출석 기록 압축
+=================
+daily_workout_records는 사용자마다 하루 한 행씩 계속 쌓이므로, 보존 기간(horizon)보다
+오래된 닫힌 달의 기록을 사용자별 월 단위 출석 비트맵(workout_attendance_months)으로 옮깁니다.
+
+- 비트맵은 1일을 최하위 비트로 하는 31비트 정수이며, 서버별 사용자의 한 달 출석이 한 행에 들어갑니다.
+- 모든 서버의 같은 달을 한 번에 압축하므로 압축 경계(cold_boundary)는 서버 공통입니다.
+- 한 달씩 한 트랜잭션으로 비트맵 UPSERT 후 일별 기록을 삭제하므로 중간에 멈춰도 다시 실행하면 이어집니다.
+- 압축 후 과거 날짜가 다시 기록되어도 (이벤트 재구성 등) 다음 실행 때 기존 비트맵에 OR로 합쳐집니다.
+- 통계 조회는 StorageBackend가 두 구간을 합쳐서 읽으므로 호출하는 쪽은 구분할 필요가 없습니다.
+
+보존 기간은 최소 MIN_HORIZON_MONTHS개월입니다. !동기화(최대 365일)와 주간/월간 집계(최근 3개월)는
+항상 daily_workout_records만 읽고 쓰면 되도록 압축 구간에 닿지 않습니다.
+"""
+
+import logging
+from calendar import monthrange
+from datetime import datetime, date
+from .base import KST, to_date, date_param, attendance_bit
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 동기화 최대 기간(365일)이 압축 구간에 닿지 않도록 하는 최소 보존 기간
+MIN_HORIZON_MONTHS = 12
+
+
+def compaction_cutoff(today, horizon_months):
+    """
+    압축하지 않고 남겨 둘 첫 달의 1일을 반환합니다.
+    이 날짜 이전의 (닫힌) 달이 압축 대상입니다.
+    """
+    horizon_months = max(horizon_months, MIN_HORIZON_MONTHS)
+    month_index = today.year * 12 + today.month - 1 - horizon_months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def compact_month(backend, month_start):
+    """
+    모든 서버의 한 달 일별 기록을 월별 비트맵에 합치고 삭제합니다 (한 트랜잭션).
+
+    Returns:
+        int: 압축된 일별 기록 수
+    """
+    month_end = month_start.replace(day=monthrange(month_start.year, month_start.month)[1])
+    month_param = date_param(month_start)
+    day_range = (month_param, date_param(month_end))
+
+    def work(cursor):
+        rows = cursor.run('compaction_rows_in_range', day_range).fetchall()
+
+        # 이미 압축된 비트맵이 있으면 OR로 합침
+        months = {
+            (guild_id, user_id): [user_name, bits]
+            for guild_id, user_id, user_name, bits in cursor.run('compaction_months_at', (month_param,)).fetchall()
+        }
+        # 날짜순이므로 마지막 이름이 최신 이름
+        for guild_id, user_id, user_name, workout_date in rows:
+            entry = months.setdefault((guild_id, user_id), [user_name, 0])
+            entry[0] = user_name
+            entry[1] |= attendance_bit(workout_date)
+
+        cursor.run_many('upsert_attendance_month', [
+            (guild_id, user_id, user_name, month_param, bits, bin(bits).count('1'))
+            for (guild_id, user_id), (user_name, bits) in sorted(months.items())
+        ])
+        cursor.run('delete_daily_records_in_range', day_range)
+        return len(rows)
+
+    return backend.run_write(work, f"{month_start.year}년 {month_start.month}월 출석 압축", pin_reads=True)
+
+
+def compact_history(backend, horizon_months, today=None):
+    """
+    보존 기간보다 오래된 달을 오래된 순서대로 한 달씩 압축합니다.
+
+    Args:
+        backend: StorageBackend 객체
+        horizon_months: daily_workout_records에 남겨 둘 개월 수 (최소 MIN_HORIZON_MONTHS)
+        today (date, optional): 기준 날짜 (기본: 오늘, KST)
+
+    Returns:
+        dict: {'cutoff': 압축 기준일, 'months': 압축한 달 수, 'records': 압축된 일별 기록 수}
+    """
+    if today is None:
+        today = datetime.now(KST).date()
+    cutoff = compaction_cutoff(today, horizon_months)
+
+    months = 0
+    records = 0
+    while True:
+        row = backend.query_one('oldest_daily_record_before', (date_param(cutoff),))
+        if not row or row[0] is None:
+            break
+
+        month_start = to_date(row[0]).replace(day=1)
+        compacted = compact_month(backend, month_start)
+        logger.info(f"🗜️ {month_start.strftime('%Y-%m')} 출석 압축: 일별 기록 {compacted}개")
+        months += 1
+        records += compacted
+
+    return {'cutoff': cutoff, 'months': months, 'records': records}
@@ -0,0 +1,796 @@
+"""
+스키마 마이그레이션
+=================
+번호가 매겨진 마이그레이션을 순서대로 적용하고 schema_version 테이블에 기록합니다.
+봇 시작 시 한 번만 실행되며, 요청 처리 경로(명령어, 동기화)에서는 DDL을 실행하지 않습니다.
+
+- 이미 적용된 버전은 건너뛰므로 여러 번 실행해도 안전합니다.
+- MySQL에서는 GET_LOCK으로 동시 실행을 막고, 짧은 lock_wait_timeout과
+  ALGORITHM=INPLACE, LOCK=NONE 으로 운영 중인 테이블을 오래 잠그지 않습니다.
+- 새 마이그레이션은 MIGRATIONS 목록 끝에 다음 번호로 추가합니다.
+"""
+
+import logging
+import time
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+CREATE_SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# 메타데이터 잠금 대기 시 재시도 횟수
+MIGRATION_LOCK_RETRIES = 3
+
+
+class Sql:
+    """백엔드별 SQL 문 목록을 실행하는 마이그레이션 단계"""
+
+    def __init__(self, statements):
+        # {'mysql': [...], 'sqlite': [...]}
+        self.statements = statements
+
+    def apply(self, backend, cursor):
+        for statement in self.statements.get(backend.name, []):
+            backend.execute_ddl(cursor, statement)
+
+
+class AddColumn:
+    """컬럼이 없을 때만 추가하는 마이그레이션 단계"""
+
+    def __init__(self, table, column, definitions):
+        self.table = table
+        self.column = column
+        # {'mysql': 'INT DEFAULT 0', 'sqlite': 'INTEGER DEFAULT 0'}
+        self.definitions = definitions
+
+    def apply(self, backend, cursor):
+        if backend.column_exists(cursor, self.table, self.column):
+            logger.info(f"ℹ️ 컬럼이 이미 존재합니다: {self.table}.{self.column}")
+            return
+        backend.add_column(cursor, self.table, self.column, self.definitions[backend.name])
+
+
+class PartitionByMonth:
+    """월별 RANGE 파티션으로 전환하는 마이그레이션 단계 (파티션을 지원하는 백엔드만)"""
+
+    def __init__(self, table, column):
+        self.table = table
+        self.column = column
+
+    def apply(self, backend, cursor):
+        if not backend.supports_partitioning:
+            logger.info(f"ℹ️ {backend.name} 백엔드는 파티션을 사용하지 않습니다: {self.table}")
+            return
+        from .partitions import initial_partition_definitions
+        backend.partition_by_month(
+            cursor, self.table, self.column, initial_partition_definitions(backend, cursor)
+        )
+
+
+class ScopeByGuild:
+    """
+    테이블에 guild_id 컬럼을 추가하고 고유 키/인덱스가 guild_id로 시작하도록 다시 만드는 마이그레이션 단계.
+    기존 행은 guild_id '0'(서버 미지정)이 되며, 봇 시작 시 기존 운동 채널의 서버로 옮겨집니다 (workout_bot_guilds.py).
+    """
+
+    def __init__(self, table, definitions):
+        self.table = table
+        # {'mysql': {'drop': [인덱스 이름], 'add': [(인덱스 이름, ADD 절)], 'primary_key': [컬럼]},
+        #  'sqlite': {'create': CREATE TABLE 문 ({table} 자리에 새 테이블 이름), 'indexes': [CREATE INDEX 문]}}
+        self.definitions = definitions
+
+    def apply(self, backend, cursor):
+        if backend.name not in self.definitions:
+            return
+        backend.scope_by_guild(cursor, self.table, self.definitions[backend.name])
+
+
+class Migration:
+    """번호가 매겨진 단일 마이그레이션"""
+
+    def __init__(self, version, description, steps):
+        self.version = version
+        self.description = description
+        self.steps = steps
+
+    def apply(self, backend, cursor):
+        for step in self.steps:
+            step.apply(backend, cursor)
+
+
+MIGRATIONS = [
+    Migration(1, "기본 스키마 (멤버, 일별/주간/월간 기록)", [
+        Sql({
+            'mysql': [
+                """
+                CREATE TABLE IF NOT EXISTS workout_members (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id VARCHAR(50) NOT NULL UNIQUE,
+                    user_name VARCHAR(255) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    INDEX idx_user_id (user_id),
+                    INDEX idx_user_name (user_name)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS daily_workout_records (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    date DATE NOT NULL,
+                    weekday VARCHAR(10) NOT NULL,
+                    user_id VARCHAR(50) NOT NULL,
+                    user_name VARCHAR(255) NOT NULL,
+                    exercised CHAR(1) NOT NULL DEFAULT 'N',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE KEY unique_user_date (date, user_id),
+                    INDEX idx_date (date),
+                    INDEX idx_user_id (user_id),
+                    INDEX idx_weekday (weekday),
+                    FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS weekly_workout_records (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id VARCHAR(50) NOT NULL,
+                    user_name VARCHAR(255) NOT NULL,
+                    year INT NOT NULL,
+                    week_number INT NOT NULL,
+                    week_start_date DATE NOT NULL,
+                    week_end_date DATE NOT NULL,
+                    workout_days INT DEFAULT 0,
+                    workout_rate DECIMAL(5,2) DEFAULT 0.00,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    UNIQUE KEY unique_user_week (user_id, year, week_number),
+                    INDEX idx_week_start (week_start_date),
+                    INDEX idx_user_week (user_id, year, week_number),
+                    FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS monthly_workout_records (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id VARCHAR(50) NOT NULL,
+                    user_name VARCHAR(255) NOT NULL,
+                    year INT NOT NULL,
+                    month INT NOT NULL,
+                    month_start_date DATE NOT NULL,
+                    month_end_date DATE NOT NULL,
+                    workout_days INT DEFAULT 0,
+                    total_days INT DEFAULT 0,
+                    workout_rate DECIMAL(5,2) DEFAULT 0.00,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    UNIQUE KEY unique_user_month (user_id, year, month),
+                    INDEX idx_month_start (month_start_date),
+                    INDEX idx_user_month (user_id, year, month),
+                    FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+            ],
+            'sqlite': [
+                """
+                CREATE TABLE IF NOT EXISTS workout_members (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL UNIQUE,
+                    user_name TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_members_user_name ON workout_members (user_name)",
+                """
+                CREATE TABLE IF NOT EXISTS daily_workout_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date DATE NOT NULL,
+                    weekday TEXT NOT NULL,
+                    user_id TEXT NOT NULL REFERENCES workout_members(user_id) ON UPDATE CASCADE,
+                    user_name TEXT NOT NULL,
+                    exercised TEXT NOT NULL DEFAULT 'N',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (date, user_id)
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_daily_user_id ON daily_workout_records (user_id)",
+                """
+                CREATE TABLE IF NOT EXISTS weekly_workout_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL REFERENCES workout_members(user_id) ON UPDATE CASCADE,
+                    user_name TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    week_number INTEGER NOT NULL,
+                    week_start_date DATE NOT NULL,
+                    week_end_date DATE NOT NULL,
+                    workout_days INTEGER DEFAULT 0,
+                    workout_rate REAL DEFAULT 0.00,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (user_id, year, week_number)
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_weekly_week_start ON weekly_workout_records (week_start_date)",
+                """
+                CREATE TABLE IF NOT EXISTS monthly_workout_records (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL REFERENCES workout_members(user_id) ON UPDATE CASCADE,
+                    user_name TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    month_start_date DATE NOT NULL,
+                    month_end_date DATE NOT NULL,
+                    workout_days INTEGER DEFAULT 0,
+                    total_days INTEGER DEFAULT 0,
+                    workout_rate REAL DEFAULT 0.00,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (user_id, year, month)
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_monthly_month_start ON monthly_workout_records (month_start_date)",
+            ],
+        }),
+    ]),
+    # 기존에는 update_member_statistics가 동기화 때마다 ALTER TABLE로 추가하던 컬럼들
+    Migration(2, "workout_members 통계 컬럼", [
+        AddColumn("workout_members", "total_workout_days", {'mysql': "INT DEFAULT 0", 'sqlite': "INTEGER DEFAULT 0"}),
+        AddColumn("workout_members", "total_days", {'mysql': "INT DEFAULT 0", 'sqlite': "INTEGER DEFAULT 0"}),
+        AddColumn("workout_members", "workout_rate", {'mysql': "DECIMAL(5,2) DEFAULT 0.00", 'sqlite': "REAL DEFAULT 0.00"}),
+        AddColumn("workout_members", "current_streak", {'mysql': "INT DEFAULT 0", 'sqlite': "INTEGER DEFAULT 0"}),
+        AddColumn("workout_members", "max_streak", {'mysql': "INT DEFAULT 0", 'sqlite': "INTEGER DEFAULT 0"}),
+        AddColumn("workout_members", "last_workout_date", {'mysql': "DATE DEFAULT NULL", 'sqlite': "DATE DEFAULT NULL"}),
+    ]),
+    # 일별 기록 UPSERT가 갱신하는 updated_at 컬럼
+    Migration(3, "daily_workout_records.updated_at 컬럼", [
+        AddColumn("daily_workout_records", "updated_at", {
+            'mysql': "TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+            # SQLite는 ADD COLUMN에 상수가 아닌 기본값을 허용하지 않음
+            'sqlite': "TIMESTAMP DEFAULT NULL",
+        }),
+    ]),
+    # 과거 create_tables가 매번 삭제하던 구버전 테이블 정리
+    Migration(4, "구버전 workout_records, weekly_stats 테이블 삭제", [
+        Sql({
+            'mysql': [
+                "DROP TABLE IF EXISTS workout_records",
+                "DROP TABLE IF EXISTS weekly_stats",
+            ],
+            'sqlite': [
+                "DROP TABLE IF EXISTS workout_records",
+                "DROP TABLE IF EXISTS weekly_stats",
+            ],
+        }),
+    ]),
+    # 메시지 단위 출석 이벤트 로그 (message_id 기준 멱등, 삭제는 deleted_at으로만 표시)
+    Migration(5, "workout_events 메시지 이벤트 로그", [
+        Sql({
+            'mysql': [
+                """
+                CREATE TABLE IF NOT EXISTS workout_events (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    message_id VARCHAR(50) NOT NULL,
+                    thread_id VARCHAR(50) NOT NULL,
+                    user_id VARCHAR(50) NOT NULL,
+                    user_name VARCHAR(255) NOT NULL,
+                    workout_date DATE NOT NULL,
+                    attachment_count INT NOT NULL DEFAULT 0,
+                    image_count INT NOT NULL DEFAULT 0,
+                    posted_at DATETIME NOT NULL,
+                    deleted_at DATETIME NULL DEFAULT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE KEY unique_message_id (message_id),
+                    INDEX idx_date_user (workout_date, user_id),
+                    INDEX idx_user_date (user_id, workout_date)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+            ],
+            'sqlite': [
+                """
+                CREATE TABLE IF NOT EXISTS workout_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    message_id TEXT NOT NULL UNIQUE,
+                    thread_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    workout_date DATE NOT NULL,
+                    attachment_count INTEGER NOT NULL DEFAULT 0,
+                    image_count INTEGER NOT NULL DEFAULT 0,
+                    posted_at TIMESTAMP NOT NULL,
+                    deleted_at TIMESTAMP DEFAULT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_events_date_user ON workout_events (workout_date, user_id)",
+                "CREATE INDEX IF NOT EXISTS idx_events_user_date ON workout_events (user_id, workout_date)",
+            ],
+        }),
+    ]),
+    # 오래된 daily_workout_records를 사용자별 월 단위 출석 비트맵으로 압축 (compaction.py)
+    Migration(6, "workout_attendance_months 월별 출석 비트맵", [
+        Sql({
+            'mysql': [
+                """
+                CREATE TABLE IF NOT EXISTS workout_attendance_months (
+                    user_id VARCHAR(50) NOT NULL,
+                    user_name VARCHAR(255) NOT NULL,
+                    month_start DATE NOT NULL,
+                    attendance_bits INT UNSIGNED NOT NULL DEFAULT 0,
+                    workout_days TINYINT UNSIGNED NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, month_start),
+                    INDEX idx_month_start (month_start),
+                    INDEX idx_user_name_month (user_name, month_start),
+                    FOREIGN KEY (user_id) REFERENCES workout_members(user_id) ON UPDATE CASCADE
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+            ],
+            'sqlite': [
+                """
+                CREATE TABLE IF NOT EXISTS workout_attendance_months (
+                    user_id TEXT NOT NULL REFERENCES workout_members(user_id) ON UPDATE CASCADE,
+                    user_name TEXT NOT NULL,
+                    month_start DATE NOT NULL,
+                    attendance_bits INTEGER NOT NULL DEFAULT 0,
+                    workout_days INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, month_start)
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_attendance_months_month ON workout_attendance_months (month_start)",
+                "CREATE INDEX IF NOT EXISTS idx_attendance_months_name ON workout_attendance_months (user_name, month_start)",
+            ],
+        }),
+    ]),
+    # 날짜 범위 조회가 해당 월만 읽도록 daily_workout_records를 월별 파티션으로 분할 (partitions.py)
+    # 파티션 테이블 제약으로 외래 키를 제거하고 기본 키를 (id, date)로 바꿉니다. 테이블을 다시 쓰므로 기록 수에 비례해 걸립니다.
+    Migration(7, "daily_workout_records 월별 RANGE 파티션", [
+        PartitionByMonth("daily_workout_records", "date"),
+    ]),
+    # daily_workout_records의 변경된 (사용자, 날짜)를 트리거로 기록 (snapshot.py가 워터마크 이후만 다시 읽음)
+    # 바이너리 로그가 켜진 MySQL에서는 트리거 생성에 TRIGGER 권한(또는 log_bin_trust_function_creators)이 필요합니다.
+    Migration(8, "attendance_journal 출석 변경 저널", [
+        Sql({
+            'mysql': [
+                """
+                CREATE TABLE IF NOT EXISTS attendance_journal (
+                    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    user_id VARCHAR(50) NOT NULL,
+                    date DATE NOT NULL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_changed_at (changed_at)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_insert",
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_update",
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_delete",
+                """
+                CREATE TRIGGER trg_daily_records_journal_insert AFTER INSERT ON daily_workout_records
+                FOR EACH ROW INSERT INTO attendance_journal (user_id, date) VALUES (NEW.user_id, NEW.date)
+                """,
+                """
+                CREATE TRIGGER trg_daily_records_journal_update AFTER UPDATE ON daily_workout_records
+                FOR EACH ROW BEGIN
+                    IF NOT (OLD.exercised <=> NEW.exercised) THEN
+                        INSERT INTO attendance_journal (user_id, date) VALUES (NEW.user_id, NEW.date);
+                    END IF;
+                END
+                """,
+                """
+                CREATE TRIGGER trg_daily_records_journal_delete AFTER DELETE ON daily_workout_records
+                FOR EACH ROW INSERT INTO attendance_journal (user_id, date) VALUES (OLD.user_id, OLD.date)
+                """,
+            ],
+            'sqlite': [
+                """
+                CREATE TABLE IF NOT EXISTS attendance_journal (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT NOT NULL,
+                    date DATE NOT NULL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS idx_attendance_journal_changed_at ON attendance_journal (changed_at)",
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_daily_records_journal_insert AFTER INSERT ON daily_workout_records
+                BEGIN
+                    INSERT INTO attendance_journal (user_id, date) VALUES (NEW.user_id, NEW.date);
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_daily_records_journal_update AFTER UPDATE OF exercised ON daily_workout_records
+                WHEN OLD.exercised IS NOT NEW.exercised
+                BEGIN
+                    INSERT INTO attendance_journal (user_id, date) VALUES (NEW.user_id, NEW.date);
+                END
+                """,
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_daily_records_journal_delete AFTER DELETE ON daily_workout_records
+                BEGIN
+                    INSERT INTO attendance_journal (user_id, date) VALUES (OLD.user_id, OLD.date);
+                END
+                """,
+            ],
+        }),
+    ]),
+    # 하나의 봇 배포로 여러 Discord 서버를 운영하도록 모든 기록을 서버(guild_id)별로 나눔
+    # 외래 키(workout_members.user_id 참조)는 멤버 고유 키가 (guild_id, user_id)로 바뀌므로 제거합니다.
+    # SQLite는 고유 제약을 바꿀 수 없어 자식 테이블부터 새 테이블로 옮겨 만듭니다 (트리거도 다시 생성).
+    Migration(9, "서버별 설정(guild_settings) 및 모든 기록에 guild_id", [
+        Sql({
+            'mysql': [
+                """
+                CREATE TABLE IF NOT EXISTS guild_settings (
+                    guild_id VARCHAR(50) NOT NULL PRIMARY KEY,
+                    workout_channel_id VARCHAR(50) NOT NULL,
+                    alert_channel_id VARCHAR(50) NULL DEFAULT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+            ],
+            'sqlite': [
+                """
+                CREATE TABLE IF NOT EXISTS guild_settings (
+                    guild_id TEXT NOT NULL PRIMARY KEY,
+                    workout_channel_id TEXT NOT NULL,
+                    alert_channel_id TEXT DEFAULT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+            ],
+        }),
+        ScopeByGuild("daily_workout_records", {
+            'mysql': {
+                'drop': ['unique_user_date', 'idx_date', 'idx_user_id', 'idx_weekday'],
+                'add': [
+                    ('unique_guild_date_user', "ADD UNIQUE KEY unique_guild_date_user (guild_id, date, user_id)"),
+                    ('idx_guild_user_date', "ADD INDEX idx_guild_user_date (guild_id, user_id, date)"),
+                    ('idx_guild_weekday', "ADD INDEX idx_guild_weekday (guild_id, weekday)"),
+                ],
+            },
+            'sqlite': {
+                'create': """
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id TEXT NOT NULL DEFAULT '0',
+                    date DATE NOT NULL,
+                    weekday TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    exercised TEXT NOT NULL DEFAULT 'N',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT NULL,
+                    UNIQUE (guild_id, date, user_id)
+                )
+                """,
+                'indexes': [
+                    "CREATE INDEX IF NOT EXISTS idx_daily_guild_user_date ON daily_workout_records (guild_id, user_id, date)",
+                ],
+            },
+        }),
+        ScopeByGuild("weekly_workout_records", {
+            'mysql': {
+                'drop': ['unique_user_week', 'idx_week_start', 'idx_user_week'],
+                'add': [
+                    ('unique_guild_user_week',
+                     "ADD UNIQUE KEY unique_guild_user_week (guild_id, user_id, year, week_number)"),
+                    ('idx_guild_week_start', "ADD INDEX idx_guild_week_start (guild_id, week_start_date)"),
+                ],
+            },
+            'sqlite': {
+                'create': """
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id TEXT NOT NULL DEFAULT '0',
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    week_number INTEGER NOT NULL,
+                    week_start_date DATE NOT NULL,
+                    week_end_date DATE NOT NULL,
+                    workout_days INTEGER DEFAULT 0,
+                    workout_rate REAL DEFAULT 0.00,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (guild_id, user_id, year, week_number)
+                )
+                """,
+                'indexes': [
+                    "CREATE INDEX IF NOT EXISTS idx_weekly_guild_week_start ON weekly_workout_records (guild_id, week_start_date)",
+                ],
+            },
+        }),
+        ScopeByGuild("monthly_workout_records", {
+            'mysql': {
+                'drop': ['unique_user_month', 'idx_month_start', 'idx_user_month'],
+                'add': [
+                    ('unique_guild_user_month', "ADD UNIQUE KEY unique_guild_user_month (guild_id, user_id, year, month)"),
+                    ('idx_guild_month_start', "ADD INDEX idx_guild_month_start (guild_id, month_start_date)"),
+                ],
+            },
+            'sqlite': {
+                'create': """
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id TEXT NOT NULL DEFAULT '0',
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    year INTEGER NOT NULL,
+                    month INTEGER NOT NULL,
+                    month_start_date DATE NOT NULL,
+                    month_end_date DATE NOT NULL,
+                    workout_days INTEGER DEFAULT 0,
+                    total_days INTEGER DEFAULT 0,
+                    workout_rate REAL DEFAULT 0.00,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (guild_id, user_id, year, month)
+                )
+                """,
+                'indexes': [
+                    "CREATE INDEX IF NOT EXISTS idx_monthly_guild_month_start ON monthly_workout_records (guild_id, month_start_date)",
+                ],
+            },
+        }),
+        ScopeByGuild("workout_events", {
+            'mysql': {
+                'drop': ['unique_message_id', 'idx_date_user', 'idx_user_date'],
+                'add': [
+                    ('unique_guild_message', "ADD UNIQUE KEY unique_guild_message (guild_id, message_id)"),
+                    ('idx_guild_date_user', "ADD INDEX idx_guild_date_user (guild_id, workout_date, user_id)"),
+                    ('idx_guild_user_date', "ADD INDEX idx_guild_user_date (guild_id, user_id, workout_date)"),
+                ],
+            },
+            'sqlite': {
+                'create': """
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id TEXT NOT NULL DEFAULT '0',
+                    message_id TEXT NOT NULL,
+                    thread_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    workout_date DATE NOT NULL,
+                    attachment_count INTEGER NOT NULL DEFAULT 0,
+                    image_count INTEGER NOT NULL DEFAULT 0,
+                    posted_at TIMESTAMP NOT NULL,
+                    deleted_at TIMESTAMP DEFAULT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE (guild_id, message_id)
+                )
+                """,
+                'indexes': [
+                    "CREATE INDEX IF NOT EXISTS idx_events_guild_date_user ON workout_events (guild_id, workout_date, user_id)",
+                    "CREATE INDEX IF NOT EXISTS idx_events_guild_user_date ON workout_events (guild_id, user_id, workout_date)",
+                ],
+            },
+        }),
+        ScopeByGuild("workout_attendance_months", {
+            'mysql': {
+                'drop': ['idx_month_start', 'idx_user_name_month'],
+                'add': [
+                    ('idx_guild_month_start', "ADD INDEX idx_guild_month_start (guild_id, month_start)"),
+                    ('idx_guild_user_name_month', "ADD INDEX idx_guild_user_name_month (guild_id, user_name, month_start)"),
+                ],
+                'primary_key': ['guild_id', 'user_id', 'month_start'],
+            },
+            'sqlite': {
+                'create': """
+                CREATE TABLE {table} (
+                    guild_id TEXT NOT NULL DEFAULT '0',
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    month_start DATE NOT NULL,
+                    attendance_bits INTEGER NOT NULL DEFAULT 0,
+                    workout_days INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (guild_id, user_id, month_start)
+                )
+                """,
+                'indexes': [
+                    "CREATE INDEX IF NOT EXISTS idx_attendance_months_guild_month ON workout_attendance_months (guild_id, month_start)",
+                    "CREATE INDEX IF NOT EXISTS idx_attendance_months_guild_name "
+                    "ON workout_attendance_months (guild_id, user_name, month_start)",
+                ],
+            },
+        }),
+        # 자식 테이블의 외래 키를 모두 없앤 뒤 멤버 고유 키를 바꿈
+        ScopeByGuild("workout_members", {
+            'mysql': {
+                'drop': ['user_id', 'idx_user_id', 'idx_user_name'],
+                'add': [
+                    ('unique_guild_user', "ADD UNIQUE KEY unique_guild_user (guild_id, user_id)"),
+                    ('idx_guild_user_name', "ADD INDEX idx_guild_user_name (guild_id, user_name)"),
+                ],
+            },
+            'sqlite': {
+                'create': """
+                CREATE TABLE {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    guild_id TEXT NOT NULL DEFAULT '0',
+                    user_id TEXT NOT NULL,
+                    user_name TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    total_workout_days INTEGER DEFAULT 0,
+                    total_days INTEGER DEFAULT 0,
+                    workout_rate REAL DEFAULT 0.00,
+                    current_streak INTEGER DEFAULT 0,
+                    max_streak INTEGER DEFAULT 0,
+                    last_workout_date DATE DEFAULT NULL,
+                    UNIQUE (guild_id, user_id)
+                )
+                """,
+                'indexes': [
+                    "CREATE INDEX IF NOT EXISTS idx_members_guild_user_name ON workout_members (guild_id, user_name)",
+                ],
+            },
+        }),
+        AddColumn("attendance_journal", "guild_id", {
+            'mysql': "VARCHAR(50) NOT NULL DEFAULT '0'",
+            'sqlite': "TEXT NOT NULL DEFAULT '0'",
+        }),
+        # 저널에 서버도 기록 (SQLite는 테이블을 다시 만들 때 트리거가 함께 삭제됨)
+        Sql({
+            'mysql': [
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_insert",
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_update",
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_delete",
+                """
+                CREATE TRIGGER trg_daily_records_journal_insert AFTER INSERT ON daily_workout_records
+                FOR EACH ROW INSERT INTO attendance_journal (guild_id, user_id, date)
+                VALUES (NEW.guild_id, NEW.user_id, NEW.date)
+                """,
+                """
+                CREATE TRIGGER trg_daily_records_journal_update AFTER UPDATE ON daily_workout_records
+                FOR EACH ROW BEGIN
+                    IF NOT (OLD.exercised <=> NEW.exercised) THEN
+                        INSERT INTO attendance_journal (guild_id, user_id, date) VALUES (NEW.guild_id, NEW.user_id, NEW.date);
+                    END IF;
+                END
+                """,
+                """
+                CREATE TRIGGER trg_daily_records_journal_delete AFTER DELETE ON daily_workout_records
+                FOR EACH ROW INSERT INTO attendance_journal (guild_id, user_id, date)
+                VALUES (OLD.guild_id, OLD.user_id, OLD.date)
+                """,
+            ],
+            'sqlite': [
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_insert",
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_update",
+                "DROP TRIGGER IF EXISTS trg_daily_records_journal_delete",
+                """
+                CREATE TRIGGER trg_daily_records_journal_insert AFTER INSERT ON daily_workout_records
+                BEGIN
+                    INSERT INTO attendance_journal (guild_id, user_id, date) VALUES (NEW.guild_id, NEW.user_id, NEW.date);
+                END
+                """,
+                """
+                CREATE TRIGGER trg_daily_records_journal_update AFTER UPDATE OF exercised ON daily_workout_records
+                WHEN OLD.exercised IS NOT NEW.exercised
+                BEGIN
+                    INSERT INTO attendance_journal (guild_id, user_id, date) VALUES (NEW.guild_id, NEW.user_id, NEW.date);
+                END
+                """,
+                """
+                CREATE TRIGGER trg_daily_records_journal_delete AFTER DELETE ON daily_workout_records
+                BEGIN
+                    INSERT INTO attendance_journal (guild_id, user_id, date) VALUES (OLD.guild_id, OLD.user_id, OLD.date);
+                END
+                """,
+            ],
+        }),
+    ]),
+    # !대시보드로 게시한 서버별 실시간 랭킹 메시지 위치
+    Migration(10, "guild_settings 대시보드 메시지 컬럼", [
+        AddColumn("guild_settings", "dashboard_channel_id", {'mysql': "VARCHAR(50) NULL DEFAULT NULL", 'sqlite': "TEXT DEFAULT NULL"}),
+        AddColumn("guild_settings", "dashboard_message_id", {'mysql': "VARCHAR(50) NULL DEFAULT NULL", 'sqlite': "TEXT DEFAULT NULL"}),
+    ]),
+    # !리마인더로 신청한 멤버 (22:00 KST에 그날 운동하지 않았으면 DM 발송)
+    Migration(11, "reminder_subscriptions 개인 DM 리마인더 신청", [
+        Sql({
+            'mysql': [
+                """
+                CREATE TABLE IF NOT EXISTS reminder_subscriptions (
+                    guild_id VARCHAR(50) NOT NULL,
+                    user_id VARCHAR(50) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (guild_id, user_id)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+                """,
+            ],
+            'sqlite': [
+                """
+                CREATE TABLE IF NOT EXISTS reminder_subscriptions (
+                    guild_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (guild_id, user_id)
+                )
+                """,
+            ],
+        }),
+    ]),
+]
+
+
+def get_schema_version(backend):
+    """현재 적용된 최신 스키마 버전을 반환합니다 (schema_version 테이블이 없으면 0)"""
+    try:
+        row = backend.query_one('latest_schema_version')
+    except Exception:
+        return 0
+    if not row or row[0] is None:
+        return 0
+    return row[0]
+
+
+def apply_migrations(backend, migrations=None):
+    """
+    적용되지 않은 마이그레이션을 버전 순서대로 적용합니다.
+
+    Args:
+        backend: StorageBackend 객체
+        migrations: 적용할 마이그레이션 목록 (기본: MIGRATIONS)
+
+    Returns:
+        int: 이번에 적용된 마이그레이션 개수
+    """
+    migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+    applied_count = 0
+
+    # 세션 옵션(lock_wait_timeout)을 바꾸므로 풀과 공유하지 않는 연결 사용
+    with backend.connection(dedicated=True) as conn:
+        cursor = backend.cursor(conn)
+        try:
+            backend.prepare_migration_session(cursor)
+            backend.execute_ddl(cursor, CREATE_SCHEMA_VERSION_TABLE)
+
+            with backend.migration_lock(cursor):
+                cursor.run('applied_schema_versions')
+                applied_versions = {row[0] for row in cursor.fetchall()}
+
+                for migration in migrations:
+                    if migration.version in applied_versions:
+                        continue
+
+                    logger.info(f"🔧 마이그레이션 {migration.version} 적용 중: {migration.description}")
+                    started = time.monotonic()
+                    _apply_with_retry(backend, cursor, migration)
+
+                    cursor.run('insert_schema_version', (migration.version, migration.description))
+                    conn.commit()
+
+                    applied_count += 1
+                    logger.info(f"✅ 마이그레이션 {migration.version} 완료 ({time.monotonic() - started:.2f}초)")
+        finally:
+            cursor.close()
+
+    if applied_count:
+        logger.info(f"📋 스키마 마이그레이션 {applied_count}개 적용 완료 (백엔드: {backend.name})")
+    else:
+        logger.info(f"✅ 스키마가 최신 상태입니다 (백엔드: {backend.name})")
+    return applied_count
+
+
+def _apply_with_retry(backend, cursor, migration):
+    """메타데이터 잠금 대기 시간 초과 시 잠시 쉬었다가 다시 시도합니다"""
+    for attempt in range(1, MIGRATION_LOCK_RETRIES + 1):
+        try:
+            migration.apply(backend, cursor)
+            return
+        except Exception as e:
+            if attempt == MIGRATION_LOCK_RETRIES or not backend.is_lock_timeout(e):
+                raise
+            logger.warning(f"⚠️ 마이그레이션 {migration.version} 잠금 대기 초과, 재시도 {attempt}/{MIGRATION_LOCK_RETRIES}: {e}")
+            time.sleep(attempt * 2)
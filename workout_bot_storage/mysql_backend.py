@@ -0,0 +1,301 @@
+"""
+MySQL 저장소 백엔드
+=================
+기존 workout_bot_database.py의 MySQL 코드를 StorageBackend 인터페이스로 옮긴 구현입니다.
+
+연결은 커넥션 풀에서 가져오며, queries.py의 쿼리는 연결마다 이름별로 한 번만
+서버 측 prepared statement로 준비한 뒤 재사용합니다.
+풀은 pool_reset_session=False로 만들어 반납 시 세션(준비된 문장, 타임존)이 초기화되지 않게 합니다.
+"""
+
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import datetime
+import mysql.connector
+from mysql.connector import pooling
+from .base import StorageBackend, KST, to_date, date_param, weekly_refresh_start, monthly_refresh_start
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 마이그레이션 DDL이 메타데이터 잠금을 기다리는 최대 시간 (초)
+MIGRATION_LOCK_WAIT_TIMEOUT = 10
+
+# 재시도 대상 InnoDB 오류 코드
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+# 커넥션 풀 크기 (초과 요청은 풀 밖의 임시 연결 사용)
+MYSQL_POOL_SIZE = 8
+
+
+class MySQLBackend(StorageBackend):
+    """mysql.connector 기반 저장소 백엔드"""
+
+    name = "mysql"
+    supports_partitioning = True
+
+    def __init__(self, config, pool_name="workout_bot", read_only=False):
+        super().__init__()
+        # config 파일에서 연결 정보 직접 가져오기
+        self.host = config["host"]
+        self.port = config["port"]
+        self.database = config["database"]
+        self.username = config["user"]
+        self.password = config["password"]
+        # 읽기 복제본은 풀 이름을 따로 쓰고, 세션을 읽기 전용 트랜잭션으로 설정
+        self.pool_name = pool_name
+        self.read_only = read_only
+
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # 실제 연결 객체 → {'connection_id': 서버 스레드 ID, 'statements': {쿼리 이름: prepared 커서}}
+        self._sessions = weakref.WeakKeyDictionary()
+        self._sessions_lock = threading.Lock()
+
+    def _connection_options(self):
+        return dict(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.username,
+            password=self.password,
+            charset='utf8mb4',
+            collation='utf8mb4_unicode_ci'
+        )
+
+    def _get_pool(self):
+        """커넥션 풀을 처음 사용할 때 생성합니다"""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name=self.pool_name,
+                    pool_size=MYSQL_POOL_SIZE,
+                    # 세션을 초기화하면 서버 측 prepared statement가 모두 해제되므로 유지
+                    pool_reset_session=False,
+                    **self._connection_options()
+                )
+            return self._pool
+
+    @staticmethod
+    def _raw_connection(conn):
+        """풀 연결(PooledMySQLConnection)이면 실제 연결 객체를 반환합니다"""
+        return getattr(conn, '_cnx', None) or conn
+
+    def _session_state(self, conn):
+        """
+        연결별 세션 상태를 반환합니다. 재연결되어 서버 스레드 ID가 바뀌었으면
+        타임존 설정과 준비된 문장 캐시를 새로 시작합니다.
+
+        Returns:
+            tuple: (세션 상태 dict, 새 세션 여부)
+        """
+        raw = self._raw_connection(conn)
+        connection_id = raw.connection_id
+        with self._sessions_lock:
+            state = self._sessions.get(raw)
+            if state is not None and state['connection_id'] == connection_id:
+                return state, False
+            state = {'connection_id': connection_id, 'statements': {}}
+            self._sessions[raw] = state
+            return state, True
+
+    def connect_dedicated(self):
+        """풀을 거치지 않는 새 연결을 생성하고 세션 타임존을 KST로 설정합니다"""
+        connection = mysql.connector.connect(**self._connection_options())
+
+        if not connection.is_connected():
+            raise mysql.connector.Error("데이터베이스 연결에 실패했습니다.")
+
+        self._init_session(connection)
+        return connection
+
+    def _init_session(self, connection):
+        """세션 타임존을 KST로 설정합니다 (읽기 복제본은 읽기 전용 트랜잭션도 설정)"""
+        cursor = connection.cursor()
+        cursor.execute("SET time_zone = '+09:00'")
+        if self.read_only:
+            cursor.execute("SET SESSION TRANSACTION READ ONLY")
+        cursor.close()
+
+    def connect(self):
+        """풀에서 연결을 가져옵니다 (세션 타임존은 연결마다 한 번만 설정)"""
+        try:
+            connection = self._get_pool().get_connection()
+        except pooling.PoolError:
+            # 풀이 모두 사용 중이면 임시 연결 사용 (release에서 닫힘)
+            logger.debug("ℹ️ 커넥션 풀이 모두 사용 중이어서 임시 연결을 사용합니다.")
+            return self.connect_dedicated()
+
+        _, is_new_session = self._session_state(connection)
+        if is_new_session:
+            self._init_session(connection)
+        return connection
+
+    def execute_statement(self, cursor, name, params):
+        """이 연결에서 준비해 둔 prepared statement로 쿼리를 실행합니다"""
+        prepared = self._prepared_cursor(cursor.connection, name)
+        prepared.execute(self.statement(name), params)
+        return prepared
+
+    def execute_statement_many(self, cursor, name, seq_of_params):
+        """prepared statement를 파라미터마다 다시 실행합니다 (준비는 한 번)"""
+        prepared = self._prepared_cursor(cursor.connection, name)
+        prepared.executemany(self.statement(name), seq_of_params)
+        return prepared
+
+    def streaming_cursor(self, conn):
+        """결과를 서버에서 fetchmany 단위로 받아오는 비버퍼 커서"""
+        return conn.cursor(buffered=False)
+
+    def _prepared_cursor(self, conn, name):
+        """연결별·쿼리 이름별 prepared 커서 (같은 SQL 객체로 실행하면 다시 준비하지 않음)"""
+        state, _ = self._session_state(conn)
+        prepared = state['statements'].get(name)
+        if prepared is None:
+            prepared = state['statements'][name] = self._raw_connection(conn).cursor(prepared=True)
+        return prepared
+
+    # --- 마이그레이션 지원 ---
+
+    def prepare_migration_session(self, cursor):
+        """메타데이터 잠금을 오래 기다리지 않도록 세션 잠금 대기 시간을 짧게 설정"""
+        cursor.execute(f"SET SESSION lock_wait_timeout = {MIGRATION_LOCK_WAIT_TIMEOUT}")
+
+    @contextmanager
+    def migration_lock(self, cursor):
+        """GET_LOCK으로 여러 봇 프로세스의 동시 마이그레이션을 방지"""
+        cursor.execute("SELECT GET_LOCK('workout_bot_migrations', 60)")
+        if cursor.fetchone()[0] != 1:
+            raise mysql.connector.Error("마이그레이션 잠금을 획득하지 못했습니다.")
+        try:
+            yield
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK('workout_bot_migrations')")
+            cursor.fetchone()
+
+    def column_exists(self, cursor, table, column):
+        """information_schema에서 컬럼 존재 여부 확인"""
+        cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column))
+        return cursor.fetchone()[0] > 0
+
+    def add_column(self, cursor, table, column, definition):
+        """테이블 복사나 쓰기 차단 없이 컬럼 추가 (Online DDL)"""
+        self.execute_ddl(
+            cursor,
+            f"ALTER TABLE {table} ADD COLUMN {column} {definition}, ALGORITHM=INPLACE, LOCK=NONE"
+        )
+
+    def scope_by_guild(self, cursor, table, definition):
+        """
+        guild_id 컬럼을 추가하고 외래 키를 제거한 뒤, 기존 키를 지우고 guild_id로 시작하는 키를
+        ALTER TABLE 한 번으로 추가합니다 (고유 키가 없는 순간이 없도록). 단계별로 확인하므로 다시 실행해도 안전합니다.
+        """
+        if not self.column_exists(cursor, table, 'guild_id'):
+            self.add_column(cursor, table, 'guild_id', "VARCHAR(50) NOT NULL DEFAULT '0'")
+
+        for (constraint_name,) in cursor.run('table_foreign_keys', (table,)).fetchall():
+            logger.info(f"🔧 {table}.{constraint_name} 외래 키 제거 (멤버 고유 키가 서버별로 바뀜)")
+            self.execute_ddl(cursor, f"ALTER TABLE {table} DROP FOREIGN KEY {constraint_name}")
+
+        existing = {row[0] for row in cursor.run('table_indexes', (table,)).fetchall()}
+        clauses = [f"DROP INDEX {name}" for name in definition['drop'] if name in existing]
+        primary_key = definition.get('primary_key')
+        if primary_key:
+            current = [row[0] for row in cursor.run('primary_key_columns', (table,)).fetchall()]
+            if current != primary_key:
+                clauses.append(f"DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(primary_key)})")
+        clauses += [clause for name, clause in definition['add'] if name not in existing]
+        if clauses:
+            self.execute_ddl(cursor, f"ALTER TABLE {table} {', '.join(clauses)}")
+
+    def is_lock_timeout(self, error):
+        """ER_LOCK_WAIT_TIMEOUT (메타데이터 잠금 포함)"""
+        return getattr(error, 'errno', None) == ER_LOCK_WAIT_TIMEOUT
+
+    def classify_write_conflict(self, error):
+        """InnoDB 교착 상태(1213) / 잠금 대기 시간 초과(1205)"""
+        errno = getattr(error, 'errno', None)
+        if errno == ER_LOCK_DEADLOCK:
+            return 'deadlock'
+        if errno == ER_LOCK_WAIT_TIMEOUT:
+            return 'lock_wait'
+        return None
+
+    # --- 월별 파티션 (partitions.py) ---
+
+    def list_partitions(self, cursor, table):
+        """
+        테이블의 파티션 목록을 순서대로 반환합니다 (파티션이 없으면 빈 목록).
+
+        Returns:
+            list[tuple]: (파티션 이름, 상한 날짜 - MAXVALUE 파티션은 None)
+        """
+        partitions = []
+        for name, description in cursor.run('table_partitions', (table,)).fetchall():
+            bound = None if description == 'MAXVALUE' else to_date(description.strip("'"))
+            partitions.append((name, bound))
+        return partitions
+
+    def partition_by_month(self, cursor, table, column, definitions):
+        """
+        테이블을 column 기준 RANGE COLUMNS 파티션으로 전환합니다.
+        파티션 테이블은 외래 키를 지원하지 않고 모든 고유 키에 파티션 컬럼이 있어야 하므로
+        외래 키를 제거하고 기본 키에 column을 추가합니다. (단계별로 확인하므로 다시 실행해도 안전)
+        """
+        if self.list_partitions(cursor, table):
+            logger.info(f"ℹ️ {table} 테이블은 이미 파티션되어 있습니다.")
+            return
+
+        for (constraint_name,) in cursor.run('table_foreign_keys', (table,)).fetchall():
+            logger.info(f"🔧 {table}.{constraint_name} 외래 키 제거 (파티션 테이블 제약)")
+            self.execute_ddl(cursor, f"ALTER TABLE {table} DROP FOREIGN KEY {constraint_name}")
+
+        primary_key = [row[0] for row in cursor.run('primary_key_columns', (table,)).fetchall()]
+        if column not in primary_key:
+            self.execute_ddl(
+                cursor,
+                f"ALTER TABLE {table} DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(primary_key + [column])})"
+            )
+
+        self.execute_ddl(
+            cursor, f"ALTER TABLE {table} PARTITION BY RANGE COLUMNS({column}) ({', '.join(definitions)})"
+        )
+
+    def reorganize_partition(self, cursor, table, partition, definitions):
+        """파티션 하나를 여러 파티션으로 나눕니다 (MAXVALUE 파티션 분할로 미래 월 추가)"""
+        self.execute_ddl(
+            cursor, f"ALTER TABLE {table} REORGANIZE PARTITION {partition} INTO ({', '.join(definitions)})"
+        )
+
+    def partition_has_rows(self, cursor, table, partition):
+        """파티션에 행이 하나라도 있는지 확인합니다 (해당 파티션만 읽음)"""
+        cursor.execute(f"SELECT 1 FROM {table} PARTITION ({partition}) LIMIT 1")
+        return cursor.fetchone() is not None
+
+    def drop_partitions(self, cursor, table, partitions):
+        """파티션을 삭제합니다 (행 단위 DELETE 없이 파일째 제거)"""
+        self.execute_ddl(cursor, f"ALTER TABLE {table} DROP PARTITION {', '.join(partitions)}")
+
+    # --- 집계 (INSERT ... SELECT로 서버에서 한 번에 계산) ---
+
+    def refresh_weekly_records(self):
+        """최근 4주간의 주간 집계 업데이트"""
+        since = date_param(weekly_refresh_start(datetime.now(KST).date()))
+        return self.run_write(
+            lambda cursor: cursor.run('refresh_weekly_records', (since,)).rowcount, "주간 집계 업데이트",
+            pin_reads=True
+        )
+
+    def refresh_monthly_records(self):
+        """최근 3개월간의 월간 집계 업데이트"""
+        since = date_param(monthly_refresh_start(datetime.now(KST).date()))
+        return self.run_write(
+            lambda cursor: cursor.run('refresh_monthly_records', (since,)).rowcount, "월간 집계 업데이트",
+            pin_reads=True
+        )
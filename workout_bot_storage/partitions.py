@@ -0,0 +1,122 @@
+"""
+daily_workout_records 월별 파티션 관리
+===================================
+MySQL에서는 daily_workout_records를 date 기준 RANGE COLUMNS 파티션으로 나눕니다 (마이그레이션 7).
+날짜 범위로 조회하는 쿼리는 해당 월 파티션만 읽고 (파티션 프루닝), 오래된 달은 파일째 제거할 수 있습니다.
+
+- 파티션 이름: pYYYYMM (해당 월), 마지막 pmax는 MAXVALUE 파티션 (미리 만들지 않은 미래 날짜 보관)
+- maintain_partitions: pmax를 나눠 앞으로 months_ahead개월의 파티션을 미리 만들고,
+  drop_before 이전의 파티션 중 비어 있는 것(압축이 끝난 달)을 DROP PARTITION으로 제거합니다.
+- 파티션을 지원하지 않는 백엔드(SQLite)에서는 아무것도 하지 않습니다.
+"""
+
+import logging
+from datetime import datetime, date
+from .base import KST, to_date
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLE = 'daily_workout_records'
+PARTITION_COLUMN = 'date'
+MAXVALUE_PARTITION = 'pmax'
+MAXVALUE_DEFINITION = f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)"
+
+# 마이그레이션 시 미리 만들 미래 월 수 (이후에는 maintain_partitions가 관리)
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def add_months(month_start, months):
+    """month_start(1일)에서 months개월 뒤의 1일을 반환합니다"""
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month_start):
+    """월 파티션 이름 (예: p202401)"""
+    return f"p{month_start.strftime('%Y%m')}"
+
+
+def partition_definition(month_start):
+    """월 파티션 정의 (다음 달 1일 미만)"""
+    return f"PARTITION {partition_name(month_start)} VALUES LESS THAN ('{add_months(month_start, 1).isoformat()}')"
+
+
+def month_definitions(first_month, end_month):
+    """first_month부터 end_month 직전 달까지의 파티션 정의 목록"""
+    definitions = []
+    month_start = first_month
+    while month_start < end_month:
+        definitions.append(partition_definition(month_start))
+        month_start = add_months(month_start, 1)
+    return definitions
+
+
+def initial_partition_definitions(backend, cursor, months_ahead=DEFAULT_MONTHS_AHEAD, today=None):
+    """가장 오래된 기록의 달부터 months_ahead개월 뒤까지의 파티션 정의 (마이그레이션용)"""
+    if today is None:
+        today = datetime.now(KST).date()
+    this_month = today.replace(day=1)
+
+    row = cursor.run('oldest_daily_record_before', ('9999-12-31',)).fetchone()
+    first_month = to_date(row[0]).replace(day=1) if row and row[0] is not None else this_month
+    first_month = min(first_month, this_month)
+
+    return month_definitions(first_month, add_months(this_month, months_ahead + 1)) + [MAXVALUE_DEFINITION]
+
+
+def maintain_partitions(backend, months_ahead, drop_before=None, today=None):
+    """
+    미래 월 파티션을 미리 만들고, drop_before 이전의 빈 파티션을 제거합니다.
+
+    Args:
+        backend: StorageBackend 객체
+        months_ahead: 이번 달 이후로 미리 만들어 둘 개월 수
+        drop_before (date, optional): 이 날짜 이전 달의 파티션 중 비어 있는 것을 제거 (None이면 제거 안 함)
+        today (date, optional): 기준 날짜 (기본: 오늘, KST)
+
+    Returns:
+        dict or None: {'added': [파티션 이름], 'dropped': [파티션 이름]} - 파티션 미지원/미적용이면 None
+    """
+    if not backend.supports_partitioning:
+        return None
+    if today is None:
+        today = datetime.now(KST).date()
+    end_month = add_months(today.replace(day=1), months_ahead + 1)
+
+    # DDL이므로 마이그레이션과 같은 잠금/세션 설정 사용
+    with backend.connection(dedicated=True) as conn:
+        cursor = backend.cursor(conn)
+        try:
+            backend.prepare_migration_session(cursor)
+            with backend.migration_lock(cursor):
+                partitions = backend.list_partitions(cursor, PARTITIONED_TABLE)
+                if not partitions:
+                    logger.info(f"ℹ️ {PARTITIONED_TABLE} 테이블이 파티션되어 있지 않습니다.")
+                    return None
+
+                # 미래 월: pmax를 나눠서 추가 (pmax는 보통 비어 있어 즉시 끝남)
+                last_bound = max(bound for _, bound in partitions if bound is not None)
+                added = month_definitions(last_bound, end_month)
+                if added:
+                    backend.reorganize_partition(
+                        cursor, PARTITIONED_TABLE, MAXVALUE_PARTITION, added + [MAXVALUE_DEFINITION]
+                    )
+
+                # 과거 월: 압축으로 비워진 파티션만 제거 (남은 기록이 있으면 다음에 다시 확인)
+                dropped = []
+                if drop_before is not None:
+                    month_partitions = [(name, bound) for name, bound in partitions if bound is not None]
+                    # 가장 최근 월 파티션은 남겨서 이전 날짜 기록이 다시 들어올 곳을 유지
+                    for name, bound in month_partitions[:-1]:
+                        if bound <= drop_before and not backend.partition_has_rows(cursor, PARTITIONED_TABLE, name):
+                            dropped.append(name)
+                    if dropped:
+                        backend.drop_partitions(cursor, PARTITIONED_TABLE, dropped)
+        finally:
+            cursor.close()
+
+    added_names = [definition.split()[1] for definition in added]
+    if added_names or dropped:
+        logger.info(f"🗂️ 파티션 관리: 추가 {added_names}, 제거 {dropped}")
+    return {'added': added_names, 'dropped': dropped}
@@ -0,0 +1,541 @@
+"""
+봇이 실행하는 모든 조회/쓰기 쿼리
+==============================
+쿼리는 여기에서 이름으로 한 번만 정의하고, 백엔드는 이름으로 실행합니다.
+(StorageBackend.run / query_all / query_one)
+
+- 문자열: 두 백엔드에서 그대로 쓰는 쿼리 (`%s` 플레이스홀더, SQLite는 `?`로 변환)
+- dict: 방언이 다른 쿼리 ({'mysql': ..., 'sqlite': ...}). 한쪽 백엔드에만 있는 쿼리도 있습니다.
+
+MySQL은 이름별로 서버 측 prepared statement를 연결마다 한 번만 준비하여 재사용하고,
+SQLite는 연결(스레드)마다 유지되는 sqlite3 문장 캐시를 사용합니다.
+스키마 DDL은 migrations.py에 있습니다.
+
+daily_workout_records는 MySQL에서 date 기준 월별 파티션으로 나뉘므로 (partitions.py),
+이 테이블을 읽는 쿼리는 가능한 한 date 범위를 파라미터(상수)로 받아 파티션 프루닝이 되도록 작성합니다.
+
+기록은 Discord 서버(guild_id)별로 나뉘며 모든 고유 키/인덱스가 guild_id로 시작합니다 (마이그레이션 9).
+서버 하나의 기록을 읽고 쓰는 쿼리는 guild_id를 첫 번째 파라미터로 받고,
+집계/압축/저널처럼 모든 서버를 한 번에 처리하는 쿼리만 guild_id를 결과 열로 돌려줍니다.
+"""
+
+# guild_id 컬럼이 있는 테이블 (guild_id 도입 이전 기록을 기존 서버로 옮길 때 사용)
+GUILD_SCOPED_TABLES = (
+    'workout_members',
+    'daily_workout_records',
+    'weekly_workout_records',
+    'monthly_workout_records',
+    'workout_events',
+    'workout_attendance_months',
+    'attendance_journal',
+)
+
+
+QUERIES = {
+    # --- 연결 점검 ---
+    'server_version': {
+        'mysql': "SELECT VERSION()",
+        'sqlite': "SELECT sqlite_version()",
+    },
+    'list_tables': {
+        'mysql': "SHOW TABLES",
+        'sqlite': "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name",
+    },
+
+    # --- 스키마 버전 (migrations.py) ---
+    'applied_schema_versions': "SELECT version FROM schema_version",
+    'latest_schema_version': "SELECT MAX(version) FROM schema_version",
+    'insert_schema_version': "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+
+    # --- 서버별 설정 (workout_bot_guilds.py) ---
+    'list_guild_settings': """
+    SELECT guild_id, workout_channel_id, alert_channel_id, dashboard_channel_id, dashboard_message_id
+    FROM guild_settings
+    """,
+    'update_guild_dashboard': """
+    UPDATE guild_settings SET dashboard_channel_id = %s, dashboard_message_id = %s, updated_at = CURRENT_TIMESTAMP
+    WHERE guild_id = %s
+    """,
+    'upsert_guild_settings': {
+        'mysql': """
+        INSERT INTO guild_settings (guild_id, workout_channel_id, alert_channel_id)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            workout_channel_id = VALUES(workout_channel_id),
+            alert_channel_id = VALUES(alert_channel_id),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        'sqlite': """
+        INSERT INTO guild_settings (guild_id, workout_channel_id, alert_channel_id)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (guild_id) DO UPDATE SET
+            workout_channel_id = excluded.workout_channel_id,
+            alert_channel_id = excluded.alert_channel_id,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+
+    # --- 개인 DM 리마인더 신청 (workout_bot_reminders.py) ---
+    'list_reminder_subscribers': "SELECT user_id FROM reminder_subscriptions WHERE guild_id = %s",
+    'insert_reminder_subscription': {
+        'mysql': "INSERT IGNORE INTO reminder_subscriptions (guild_id, user_id) VALUES (%s, %s)",
+        'sqlite': """
+        INSERT INTO reminder_subscriptions (guild_id, user_id) VALUES (%s, %s)
+        ON CONFLICT (guild_id, user_id) DO NOTHING
+        """,
+    },
+    'delete_reminder_subscription': "DELETE FROM reminder_subscriptions WHERE guild_id = %s AND user_id = %s",
+
+    # 일별 기록이나 압축된 출석이 있는 서버 (스냅샷 전체 생성)
+    'attendance_guild_ids': """
+    SELECT DISTINCT guild_id FROM daily_workout_records
+    UNION
+    SELECT DISTINCT guild_id FROM workout_attendance_months
+    """,
+
+    # --- 멤버 ---
+    'upsert_member': {
+        # 이미 있으면 변경 없음 (rowcount 0) - SELECT 후 INSERT 경쟁 방지
+        'mysql': """
+        INSERT INTO workout_members (guild_id, user_id, user_name)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE user_id = user_id
+        """,
+        'sqlite': """
+        INSERT INTO workout_members (guild_id, user_id, user_name)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (guild_id, user_id) DO NOTHING
+        """,
+    },
+    'list_members': "SELECT guild_id, user_id, user_name FROM workout_members",
+    'update_member_streak': """
+    UPDATE workout_members
+    SET current_streak = %s, max_streak = %s
+    WHERE guild_id = %s AND user_id = %s
+    """,
+    'update_member_statistics': """
+    UPDATE workout_members
+    SET total_workout_days = %s, total_days = %s, workout_rate = %s,
+        last_workout_date = %s, updated_at = CURRENT_TIMESTAMP
+    WHERE guild_id = %s AND user_id = %s
+    """,
+
+    # --- 일별 운동 기록 ---
+    'upsert_daily_record': {
+        'mysql': """
+        INSERT INTO daily_workout_records
+        (guild_id, date, weekday, user_id, user_name, exercised)
+        VALUES (%s, %s, %s, %s, %s, 'Y')
+        ON DUPLICATE KEY UPDATE
+            exercised = 'Y',
+            user_name = VALUES(user_name),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        'sqlite': """
+        INSERT INTO daily_workout_records
+        (guild_id, date, weekday, user_id, user_name, exercised)
+        VALUES (%s, %s, %s, %s, %s, 'Y')
+        ON CONFLICT (guild_id, date, user_id) DO UPDATE SET
+            exercised = 'Y',
+            user_name = excluded.user_name,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+    'delete_daily_record': "DELETE FROM daily_workout_records WHERE guild_id = %s AND user_id = %s AND date = %s",
+    'attendance_in_range': """
+    SELECT user_id, date FROM daily_workout_records
+    WHERE guild_id = %s AND exercised = 'Y' AND date >= %s AND date <= %s
+    """,
+    'attendance_rows_in_range': """
+    SELECT user_id, user_name, date FROM daily_workout_records
+    WHERE guild_id = %s AND exercised = 'Y' AND date >= %s AND date <= %s
+    ORDER BY date, user_id
+    """,
+    'user_attendance_rows_in_range': """
+    SELECT user_id, user_name, date FROM daily_workout_records
+    WHERE guild_id = %s AND user_id = %s AND exercised = 'Y' AND date >= %s AND date <= %s
+    ORDER BY date
+    """,
+    'attendance_since': """
+    SELECT DISTINCT guild_id, user_id, user_name, date
+    FROM daily_workout_records
+    WHERE exercised = 'Y' AND date >= %s
+    """,
+    'user_workout_dates': """
+    SELECT date FROM daily_workout_records
+    WHERE guild_id = %s AND user_id = %s AND exercised = 'Y'
+    ORDER BY date ASC
+    """,
+    'workout_dates_by_user_id_until': """
+    SELECT DISTINCT date
+    FROM daily_workout_records
+    WHERE guild_id = %s AND user_id = %s AND exercised = 'Y' AND date <= %s
+    ORDER BY date DESC
+    """,
+    'workout_dates_by_user_name_until': """
+    SELECT DISTINCT date
+    FROM daily_workout_records
+    WHERE guild_id = %s AND user_name = %s AND exercised = 'Y' AND date <= %s
+    ORDER BY date DESC
+    """,
+    'count_user_workouts': """
+    SELECT COUNT(*) as workout_count
+    FROM daily_workout_records
+    WHERE guild_id = %s AND user_id = %s AND date >= %s AND date <= %s AND exercised = 'Y'
+    """,
+    'workout_rankings': """
+    SELECT user_name, user_id, COUNT(DISTINCT date) as workout_count
+    FROM daily_workout_records
+    WHERE guild_id = %s AND date >= %s AND date <= %s AND exercised = 'Y'
+    GROUP BY user_id, user_name
+    ORDER BY workout_count DESC, user_name ASC
+    """,
+
+    # --- 주간/월간 집계 ---
+    'refresh_weekly_records': {
+        'mysql': """
+        INSERT INTO weekly_workout_records
+        (guild_id, user_id, user_name, year, week_number, week_start_date, week_end_date, workout_days, workout_rate)
+        SELECT
+            guild_id,
+            user_id,
+            user_name,
+            YEAR(date) as year,
+            WEEK(date, 1) as week_number,
+            DATE_SUB(date, INTERVAL WEEKDAY(date) DAY) as week_start_date,
+            DATE_ADD(DATE_SUB(date, INTERVAL WEEKDAY(date) DAY), INTERVAL 6 DAY) as week_end_date,
+            COUNT(DISTINCT date) as workout_days,
+            ROUND((COUNT(DISTINCT date) / 7.0) * 100, 2) as workout_rate
+        FROM daily_workout_records
+        WHERE exercised = 'Y'
+            AND date >= %s
+        GROUP BY guild_id, user_id, user_name, YEAR(date), WEEK(date, 1)
+        ON DUPLICATE KEY UPDATE
+            workout_days = VALUES(workout_days),
+            workout_rate = VALUES(workout_rate),
+            week_start_date = VALUES(week_start_date),
+            week_end_date = VALUES(week_end_date),
+            user_name = VALUES(user_name),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+    'upsert_weekly_record': {
+        'sqlite': """
+        INSERT INTO weekly_workout_records
+        (guild_id, user_id, user_name, year, week_number, week_start_date, week_end_date, workout_days, workout_rate)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (guild_id, user_id, year, week_number) DO UPDATE SET
+            workout_days = excluded.workout_days,
+            workout_rate = excluded.workout_rate,
+            week_start_date = excluded.week_start_date,
+            week_end_date = excluded.week_end_date,
+            user_name = excluded.user_name,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+    'refresh_monthly_records': {
+        'mysql': """
+        INSERT INTO monthly_workout_records
+        (guild_id, user_id, user_name, year, month, month_start_date, month_end_date, workout_days, total_days, workout_rate)
+        SELECT
+            guild_id,
+            user_id,
+            user_name,
+            YEAR(date) as year,
+            MONTH(date) as month,
+            DATE_FORMAT(date, '%Y-%m-01') as month_start_date,
+            LAST_DAY(date) as month_end_date,
+            COUNT(DISTINCT date) as workout_days,
+            DAY(LAST_DAY(date)) as total_days,
+            ROUND((COUNT(DISTINCT date) / DAY(LAST_DAY(date))) * 100, 2) as workout_rate
+        FROM daily_workout_records
+        WHERE exercised = 'Y'
+            AND date >= %s
+        GROUP BY guild_id, user_id, user_name, YEAR(date), MONTH(date)
+        ON DUPLICATE KEY UPDATE
+            workout_days = VALUES(workout_days),
+            total_days = VALUES(total_days),
+            workout_rate = VALUES(workout_rate),
+            month_start_date = VALUES(month_start_date),
+            month_end_date = VALUES(month_end_date),
+            user_name = VALUES(user_name),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+    'monthly_attendance_counts': {
+        'sqlite': """
+        SELECT guild_id, user_id, user_name,
+               CAST(strftime('%Y', date) AS INTEGER) as year,
+               CAST(strftime('%m', date) AS INTEGER) as month,
+               COUNT(DISTINCT date) as workout_days
+        FROM daily_workout_records
+        WHERE exercised = 'Y' AND date >= %s
+        GROUP BY guild_id, user_id, user_name, year, month
+        """,
+    },
+    'upsert_monthly_record': {
+        'sqlite': """
+        INSERT INTO monthly_workout_records
+        (guild_id, user_id, user_name, year, month, month_start_date, month_end_date, workout_days, total_days, workout_rate)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (guild_id, user_id, year, month) DO UPDATE SET
+            workout_days = excluded.workout_days,
+            total_days = excluded.total_days,
+            workout_rate = excluded.workout_rate,
+            month_start_date = excluded.month_start_date,
+            month_end_date = excluded.month_end_date,
+            user_name = excluded.user_name,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+
+    # --- 통계 조회 (!요약, !통계, !추세) ---
+    'member_summaries': """
+    SELECT user_name, user_id, total_workout_days, total_days, workout_rate,
+           current_streak, max_streak, last_workout_date
+    FROM workout_members
+    WHERE guild_id = %s
+    ORDER BY total_workout_days DESC
+    """,
+    # 기간 조건을 파생 테이블의 WHERE에 두어 해당 월 파티션만 읽도록 함
+    'monthly_statistics': """
+    SELECT wm.user_id, wm.user_name, COALESCE(month_days.workout_days, 0) as workout_days
+    FROM workout_members wm
+    LEFT JOIN (
+        SELECT user_id, COUNT(DISTINCT date) as workout_days
+        FROM daily_workout_records
+        WHERE guild_id = %s AND date >= %s AND date <= %s AND exercised = 'Y'
+        GROUP BY user_id
+    ) month_days ON wm.user_id = month_days.user_id
+    WHERE wm.guild_id = %s
+    ORDER BY workout_days DESC
+    """,
+    'weekly_statistics': """
+    SELECT wm.user_name, wwr.year, wwr.week_number, wwr.week_start_date, wwr.week_end_date,
+           COALESCE(wwr.workout_days, 0) as workout_days,
+           COALESCE(wwr.workout_rate, 0) as workout_rate
+    FROM workout_members wm
+    LEFT JOIN weekly_workout_records wwr ON wwr.guild_id = wm.guild_id
+        AND wm.user_id = wwr.user_id
+        AND wwr.week_start_date >= %s
+        AND wwr.week_end_date <= %s
+    WHERE wm.guild_id = %s
+    ORDER BY wm.user_name, wwr.year, wwr.week_number
+    """,
+    'weekly_records_since': """
+    SELECT user_name, year, week_number, week_start_date, week_end_date, workout_days, workout_rate
+    FROM weekly_workout_records
+    WHERE guild_id = %s AND week_start_date >= %s
+    ORDER BY user_name, year, week_number
+    """,
+
+    # --- 압축된 과거 출석 (workout_attendance_months, compaction.py) ---
+    'latest_compacted_month': "SELECT MAX(month_start) FROM workout_attendance_months",
+    'attendance_months_in_range': """
+    SELECT user_id, user_name, month_start, attendance_bits
+    FROM workout_attendance_months
+    WHERE guild_id = %s AND month_start >= %s AND month_start <= %s
+    ORDER BY month_start, user_id
+    """,
+    'user_attendance_months': """
+    SELECT user_id, user_name, month_start, attendance_bits
+    FROM workout_attendance_months
+    WHERE guild_id = %s AND user_id = %s AND month_start >= %s AND month_start <= %s
+    ORDER BY month_start
+    """,
+    'user_name_attendance_months': """
+    SELECT user_id, user_name, month_start, attendance_bits
+    FROM workout_attendance_months
+    WHERE guild_id = %s AND user_name = %s AND month_start >= %s AND month_start <= %s
+    ORDER BY month_start
+    """,
+    'upsert_attendance_month': {
+        'mysql': """
+        INSERT INTO workout_attendance_months
+        (guild_id, user_id, user_name, month_start, attendance_bits, workout_days)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            user_name = VALUES(user_name),
+            attendance_bits = VALUES(attendance_bits),
+            workout_days = VALUES(workout_days),
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        'sqlite': """
+        INSERT INTO workout_attendance_months
+        (guild_id, user_id, user_name, month_start, attendance_bits, workout_days)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON CONFLICT (guild_id, user_id, month_start) DO UPDATE SET
+            user_name = excluded.user_name,
+            attendance_bits = excluded.attendance_bits,
+            workout_days = excluded.workout_days,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+    },
+    # 압축은 모든 서버의 같은 달을 한 번에 처리 (압축 경계는 서버 공통)
+    'compaction_rows_in_range': """
+    SELECT guild_id, user_id, user_name, date FROM daily_workout_records
+    WHERE exercised = 'Y' AND date >= %s AND date <= %s
+    ORDER BY date, guild_id, user_id
+    """,
+    'compaction_months_at': """
+    SELECT guild_id, user_id, user_name, attendance_bits
+    FROM workout_attendance_months
+    WHERE month_start = %s
+    """,
+    'oldest_daily_record_before': "SELECT MIN(date) FROM daily_workout_records WHERE date < %s",
+    'delete_daily_records_in_range': "DELETE FROM daily_workout_records WHERE date >= %s AND date <= %s",
+
+    # --- 출석 변경 저널 (snapshot.py) ---
+    'attendance_journal_max_id': "SELECT MAX(id) FROM attendance_journal",
+    'attendance_journal_min_id': "SELECT MIN(id) FROM attendance_journal",
+    'attendance_journal_since': """
+    SELECT id, guild_id, user_id, date FROM attendance_journal
+    WHERE id > %s
+    ORDER BY id
+    """,
+    'delete_attendance_journal_before': "DELETE FROM attendance_journal WHERE changed_at < %s",
+
+    # --- 출석 기록 내보내기 (스트리밍, 날짜 인덱스 순서) ---
+    'export_daily_records': """
+    SELECT date, weekday, user_id, user_name
+    FROM daily_workout_records
+    WHERE guild_id = %s AND exercised = 'Y' AND date >= %s AND date <= %s
+    ORDER BY date, user_id
+    """,
+    'export_daily_records_with_members': """
+    SELECT dwr.date, dwr.weekday, dwr.user_id, dwr.user_name, wm.user_name
+    FROM daily_workout_records dwr
+    LEFT JOIN workout_members wm ON wm.guild_id = dwr.guild_id AND wm.user_id = dwr.user_id
+    WHERE dwr.guild_id = %s AND dwr.exercised = 'Y' AND dwr.date >= %s AND dwr.date <= %s
+    ORDER BY dwr.date, dwr.user_id
+    """,
+    'export_attendance_months': """
+    SELECT user_id, user_name, month_start, attendance_bits
+    FROM workout_attendance_months
+    WHERE guild_id = %s AND month_start >= %s AND month_start <= %s
+    ORDER BY month_start, user_id
+    """,
+    'export_attendance_months_with_members': """
+    SELECT wam.user_id, wam.user_name, wam.month_start, wam.attendance_bits, wm.user_name
+    FROM workout_attendance_months wam
+    LEFT JOIN workout_members wm ON wm.guild_id = wam.guild_id AND wm.user_id = wam.user_id
+    WHERE wam.guild_id = %s AND wam.month_start >= %s AND wam.month_start <= %s
+    ORDER BY wam.month_start, wam.user_id
+    """,
+
+    # --- 월별 파티션 (partitions.py, MySQL 전용) ---
+    'table_partitions': {
+        'mysql': """
+        SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+        FROM information_schema.PARTITIONS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+        ORDER BY PARTITION_ORDINAL_POSITION
+        """,
+    },
+    'table_foreign_keys': {
+        'mysql': """
+        SELECT CONSTRAINT_NAME
+        FROM information_schema.REFERENTIAL_CONSTRAINTS
+        WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+    },
+    'table_indexes': {
+        'mysql': """
+        SELECT DISTINCT INDEX_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """,
+    },
+    'primary_key_columns': {
+        'mysql': """
+        SELECT COLUMN_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'
+        ORDER BY ORDINAL_POSITION
+        """,
+    },
+
+    # --- 메시지 이벤트 로그 (workout_events) ---
+    'insert_workout_event': {
+        'mysql': """
+        INSERT IGNORE INTO workout_events
+        (guild_id, message_id, thread_id, user_id, user_name, workout_date, attachment_count, image_count, posted_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+        'sqlite': """
+        INSERT INTO workout_events
+        (guild_id, message_id, thread_id, user_id, user_name, workout_date, attachment_count, image_count, posted_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (guild_id, message_id) DO NOTHING
+        """,
+    },
+    'live_event_by_message': """
+    SELECT user_id, workout_date FROM workout_events
+    WHERE guild_id = %s AND message_id = %s AND deleted_at IS NULL
+    """,
+    'mark_event_deleted': """
+    UPDATE workout_events SET deleted_at = %s
+    WHERE guild_id = %s AND message_id = %s AND deleted_at IS NULL
+    """,
+    'mark_day_events_deleted': """
+    UPDATE workout_events SET deleted_at = %s
+    WHERE guild_id = %s AND user_id = %s AND workout_date = %s AND deleted_at IS NULL
+    """,
+    'live_event_attendance': """
+    SELECT user_id, workout_date, MAX(user_name)
+    FROM workout_events
+    WHERE guild_id = %s AND workout_date >= %s AND workout_date <= %s AND deleted_at IS NULL
+    GROUP BY user_id, workout_date
+    ORDER BY workout_date, user_id
+    """,
+    # 이벤트가 있지만 모두 삭제된 (사용자, 날짜)의 일별 기록 제거
+    # (이벤트 로그 도입 이전의 기록은 이벤트가 없으므로 유지)
+    'delete_orphaned_daily_records': """
+    DELETE FROM daily_workout_records
+    WHERE guild_id = %s AND date >= %s AND date <= %s
+        AND EXISTS (
+            SELECT 1 FROM workout_events e
+            WHERE e.guild_id = daily_workout_records.guild_id
+                AND e.user_id = daily_workout_records.user_id
+                AND e.workout_date = daily_workout_records.date
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM workout_events e
+            WHERE e.guild_id = daily_workout_records.guild_id
+                AND e.user_id = daily_workout_records.user_id
+                AND e.workout_date = daily_workout_records.date
+                AND e.deleted_at IS NULL
+        )
+    """,
+    'delete_orphaned_daily_records_for_user': """
+    DELETE FROM daily_workout_records
+    WHERE guild_id = %s AND date >= %s AND date <= %s AND user_id = %s
+        AND EXISTS (
+            SELECT 1 FROM workout_events e
+            WHERE e.guild_id = daily_workout_records.guild_id
+                AND e.user_id = daily_workout_records.user_id
+                AND e.workout_date = daily_workout_records.date
+        )
+        AND NOT EXISTS (
+            SELECT 1 FROM workout_events e
+            WHERE e.guild_id = daily_workout_records.guild_id
+                AND e.user_id = daily_workout_records.user_id
+                AND e.workout_date = daily_workout_records.date
+                AND e.deleted_at IS NULL
+        )
+    """,
+}
+
+# guild_id 도입 이전 기록(guild_id '0')을 기존 서버로 옮기는 쿼리 (테이블마다 하나, workout_bot_guilds.py)
+# 서버에 같은 키의 기록이 이미 있으면 그 행은 건너뛰고(서버 기록 유지), 남은 '0' 기록은 지움
+QUERIES.update({
+    f'claim_legacy_{table}': {
+        'mysql': f"UPDATE IGNORE {table} SET guild_id = %s WHERE guild_id = '0'",
+        'sqlite': f"UPDATE OR IGNORE {table} SET guild_id = %s WHERE guild_id = '0'",
+    }
+    for table in GUILD_SCOPED_TABLES
+})
+QUERIES.update({
+    f'delete_legacy_{table}': f"DELETE FROM {table} WHERE guild_id = '0'"
+    for table in GUILD_SCOPED_TABLES
+})
@@ -0,0 +1,392 @@
+"""
+출석 행렬 스냅샷
+==============
+(서버, 사용자) × 날짜 출석 행렬을 평평한 바이너리 파일로 저장해 두고, 봇 시작 시 mmap으로 열어서
+스냅샷의 워터마크(attendance_journal id) 이후의 변경만 다시 읽습니다.
+재시작 직후에도 !요약의 기간별 운동 일수를 테이블 전체 조회 없이 메모리에서 계산합니다.
+
+파일 형식 (리틀 엔디언):
+- 헤더: 매직, 버전, 기준 날짜(ordinal), 날짜 수, 워터마크, 저장 시각(UNIX 초), 행 수
+- 행 키 목록: (길이 2바이트 + UTF-8 '서버 ID:사용자 ID') × 행 수
+- 출석 비트 행: 행마다 ceil(날짜 수 / 8)바이트 (기준 날짜 = 최하위 비트)
+
+- 변경 저널은 daily_workout_records 트리거가 채웁니다 (마이그레이션 8).
+  저널에 나온 (서버, 사용자, 날짜)는 실제 출석(압축 구간 포함)을 다시 읽어서 반영하므로
+  압축처럼 출석이 바뀌지 않는 삭제도 그대로 안전합니다.
+- 스냅샷이 저널 보존 기간보다 오래되었거나 형식이 맞지 않으면 전체를 다시 만듭니다.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
+from .base import KST, to_date, date_param, datetime_param, guild_param
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'WBATTSNP'
+# 2: 행 키가 '서버 ID:사용자 ID' (마이그레이션 9)
+SNAPSHOT_VERSION = 2
+# 매직, 버전, 기준 날짜 ordinal, 날짜 수, 워터마크, 저장 시각, 행 수
+HEADER = struct.Struct('<8sIiIqqI')
+USER_ID_LENGTH = struct.Struct('<H')
+
+# 저널 보존 기간 기본값 (일, 04:00 작업에서 이보다 오래된 저널 삭제)
+DEFAULT_JOURNAL_RETENTION_DAYS = 7
+
+# 저널의 빈 id(아직 커밋되지 않은 트랜잭션)를 기다리는 최대 시간 (초, 지나면 롤백된 것으로 봄)
+JOURNAL_GAP_TIMEOUT = 600
+
+# 다시 읽을 날짜들을 한 번에 조회할 때 묶는 최대 간격 (일)
+RECHECK_RANGE_GAP_DAYS = 31
+
+# 조회 시 저널을 다시 확인하는 최소 간격 (초) - 이 프로세스의 쓰기 직후에는 간격과 무관하게 확인
+CATCH_UP_INTERVAL_SECONDS = 1.0
+
+
+def date_ranges(dates, max_gap_days=RECHECK_RANGE_GAP_DAYS):
+    """날짜 집합을 max_gap_days 이내로 이어지는 (시작, 끝) 구간 목록으로 묶습니다"""
+    ranges = []
+    for day in sorted(dates):
+        if ranges and (day - ranges[-1][1]).days <= max_gap_days:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return [tuple(r) for r in ranges]
+
+
+def attendance_between(backend, cursor, guild_id, start_date, end_date):
+    """서버의 기간 내 실제 출석 (압축 구간 포함) 집합 {(user_id, date)}"""
+    present = set()
+    cold_end, hot_start = backend.split_at_cold_boundary(cursor, start_date, end_date)
+    if cold_end is not None:
+        for user_id, (_, dates) in backend.cold_attendance(cursor, guild_id, start_date, cold_end).items():
+            present.update((user_id, d) for d in dates)
+    if hot_start <= end_date:
+        rows = cursor.run(
+            'attendance_in_range', (guild_param(guild_id), date_param(hot_start), date_param(end_date))
+        ).fetchall()
+        present.update((user_id, to_date(workout_date)) for user_id, workout_date in rows)
+    return present
+
+
+def prune_attendance_journal(backend, retention_days=DEFAULT_JOURNAL_RETENTION_DAYS, now=None):
+    """retention_days일보다 오래된 출석 변경 저널을 삭제합니다. 삭제된 행 수를 반환합니다."""
+    if now is None:
+        now = datetime.now(KST)
+    cutoff = datetime_param(now - timedelta(days=retention_days))
+    return backend.run_write(
+        lambda cursor: cursor.run('delete_attendance_journal_before', (cutoff,)).rowcount, "출석 변경 저널 정리"
+    )
+
+
+def encode_row_key(key):
+    """(guild_id, user_id) 행 키를 파일에 저장할 문자열로 변환"""
+    return f"{key[0]}:{key[1]}"
+
+
+def decode_row_key(text):
+    """파일의 행 키 문자열을 (guild_id, user_id)로 변환"""
+    guild_id, _, user_id = text.partition(':')
+    return guild_id, user_id
+
+
+class AttendanceSnapshot:
+    """(서버, 사용자)별 출석 비트 행렬 (파일 스냅샷 + 저널 재생)"""
+
+    def __init__(self, backend, path, journal_retention_days=DEFAULT_JOURNAL_RETENTION_DAYS):
+        self.backend = backend
+        self.path = path
+        self.journal_retention_days = journal_retention_days
+        self.ready = False
+
+        self._lock = threading.RLock()
+        self._base = None       # 비트 0에 해당하는 날짜 ordinal
+        self._rows = {}         # (guild_id, user_id) → 출석 비트 (int, 읽은 행만)
+        self._mapped = {}       # (guild_id, user_id) → mmap 안의 행 오프셋 (아직 읽지 않은 행)
+        self._row_bytes = 0
+        self._file = None
+        self._mmap = None
+        self._watermark = 0     # 이 id까지의 저널은 모두 반영됨
+        self._applied = set()   # 워터마크 이후 이미 반영한 id (중간에 빈 id가 있을 때)
+        self._gaps = {}         # 빈 id → 처음 발견한 시각 (monotonic)
+        self._last_catch_up = float('-inf')  # 마지막 저널 확인 시각 (monotonic)
+        self._stale = True      # 마지막 저널 확인 이후 이 프로세스에서 쓰기가 있었는지
+
+    # --- 불러오기 / 저장 ---
+
+    def load(self):
+        """
+        스냅샷 파일을 mmap으로 열고 워터마크 이후의 변경만 반영합니다.
+        파일이 없거나 쓸 수 없으면 DB에서 전체를 다시 만듭니다.
+
+        Returns:
+            dict: {'source': 'snapshot' 또는 'rebuild', 'replayed': 반영한 저널 수, 'elapsed_ms'}
+        """
+        started = time.perf_counter()
+        with self._lock:
+            loaded = self._open()
+            if not loaded:
+                self.rebuild()
+            replayed = self._catch_up()
+            self.ready = True
+
+        result = {
+            'source': 'snapshot' if loaded else 'rebuild',
+            'replayed': replayed,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info(
+            f"🧮 출석 스냅샷 준비 완료 ({result['source']}): 서버별 사용자 {len(self._rows) + len(self._mapped)}명, "
+            f"저널 {replayed}건 반영, {result['elapsed_ms']}ms"
+        )
+        return result
+
+    def _open(self):
+        """스냅샷 파일을 mmap으로 엽니다. 사용할 수 없으면 False"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            f = open(self.path, 'rb')
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 빈 파일
+                f.close()
+                return False
+        except OSError as e:
+            logger.warning(f"⚠️ 출석 스냅샷을 열 수 없어 다시 만듭니다: {e}")
+            return False
+
+        try:
+            magic, version, base, days, watermark, saved_at, row_count = HEADER.unpack_from(mapped, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError("스냅샷 형식이 다릅니다")
+            if time.time() - saved_at > (self.journal_retention_days - 1) * 86400:
+                raise ValueError("저널 보존 기간보다 오래된 스냅샷입니다")
+            row = self.backend.query_one('attendance_journal_min_id')
+            if row and row[0] is not None and row[0] > watermark + 1:
+                raise ValueError("워터마크 이후 저널 일부가 이미 삭제되었습니다")
+
+            offset = HEADER.size
+            keys = []
+            for _ in range(row_count):
+                (length,) = USER_ID_LENGTH.unpack_from(mapped, offset)
+                offset += USER_ID_LENGTH.size
+                keys.append(decode_row_key(mapped[offset:offset + length].decode('utf-8')))
+                offset += length
+
+            row_bytes = (days + 7) // 8
+            if offset + row_bytes * row_count > len(mapped):
+                raise ValueError("스냅샷 파일이 잘려 있습니다")
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            logger.warning(f"⚠️ 출석 스냅샷을 사용할 수 없어 다시 만듭니다: {e}")
+            mapped.close()
+            f.close()
+            return False
+
+        self._close_mapping()
+        self._file, self._mmap = f, mapped
+        self._base = base
+        self._row_bytes = row_bytes
+        self._rows = {}
+        self._mapped = {key: offset + i * row_bytes for i, key in enumerate(keys)}
+        self._reset_watermark(watermark)
+        return True
+
+    def rebuild(self):
+        """DB의 전체 출석(압축 구간 포함)으로 행렬을 다시 만들고 저장합니다"""
+        started = time.perf_counter()
+        with self._lock, self.backend.primary_reads():
+            # 조회 도중의 변경은 다음 _catch_up에서 다시 읽도록 워터마크를 먼저 기록
+            row = self.backend.query_one('attendance_journal_max_id')
+            watermark = row[0] if row and row[0] is not None else 0
+
+            rows = {}
+            base = None
+            for guild_id in self.backend.list_attendance_guild_ids():
+                for row in self.backend.iter_attendance_history(guild_id):
+                    ordinal = to_date(row[0]).toordinal()
+                    if base is None:
+                        base = ordinal  # 날짜 오름차순이므로 첫 서버의 첫 행이 그 서버의 가장 오래된 날짜
+                    elif ordinal < base:
+                        # 다른 서버에 더 오래된 기록이 있으면 지금까지의 행을 밀어서 기준을 앞당김
+                        rows = {key: bits << (base - ordinal) for key, bits in rows.items()}
+                        base = ordinal
+                    key = (guild_id, row[2])
+                    rows[key] = rows.get(key, 0) | (1 << (ordinal - base))
+
+            self._close_mapping()
+            self._base = base if base is not None else datetime.now(KST).date().toordinal()
+            self._rows = rows
+            self._mapped = {}
+            self._reset_watermark(watermark)
+            self._write()
+
+        logger.info(
+            f"🧮 출석 스냅샷 재생성: 서버별 사용자 {len(rows)}명, {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    def save(self):
+        """최신 변경을 반영한 뒤 스냅샷 파일을 원자적으로 교체합니다"""
+        with self._lock:
+            self._catch_up()
+            self._write()
+
+    def _write(self):
+        if not self.path:
+            return
+        self._materialize_all()
+        self._close_mapping()
+
+        keys = sorted(self._rows)
+        days = max((bits.bit_length() for bits in self._rows.values()), default=0)
+        row_bytes = (days + 7) // 8
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(
+                SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self._base, days,
+                self._watermark, int(time.time()), len(keys)
+            ))
+            for key in keys:
+                encoded = encode_row_key(key).encode('utf-8')
+                f.write(USER_ID_LENGTH.pack(len(encoded)))
+                f.write(encoded)
+            for key in keys:
+                f.write(self._rows[key].to_bytes(row_bytes, 'little'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def close(self):
+        """열려 있는 mmap을 닫습니다 (읽지 않은 행은 메모리로 옮김)"""
+        with self._lock:
+            self._materialize_all()
+            self._close_mapping()
+
+    def _close_mapping(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    # --- 행 접근 ---
+
+    def _row(self, key):
+        """(guild_id, user_id)의 출석 비트 (mmap에 있으면 처음 접근할 때 읽음)"""
+        bits = self._rows.get(key)
+        if bits is None:
+            offset = self._mapped.pop(key, None)
+            if offset is None:
+                return 0
+            bits = self._rows[key] = int.from_bytes(self._mmap[offset:offset + self._row_bytes], 'little')
+        return bits
+
+    def _materialize_all(self):
+        for key in list(self._mapped):
+            self._row(key)
+
+    def _set(self, key, workout_date, present):
+        ordinal = workout_date.toordinal()
+        if ordinal < self._base:
+            # 기준 날짜보다 이전 기록이 새로 생기면 모든 행을 밀어서 기준을 앞당김
+            self._materialize_all()
+            shift = self._base - ordinal
+            self._rows = {row_key: bits << shift for row_key, bits in self._rows.items()}
+            self._base = ordinal
+        bit = 1 << (ordinal - self._base)
+        bits = self._row(key)
+        self._rows[key] = bits | bit if present else bits & ~bit
+
+    # --- 저널 재생 ---
+
+    def _reset_watermark(self, watermark):
+        self._watermark = watermark
+        self._applied.clear()
+        self._gaps.clear()
+
+    def mark_stale(self):
+        """쓰기 후 호출 - 다음 조회에서 간격과 무관하게 저널을 확인합니다"""
+        self._stale = True
+
+    def _maybe_catch_up(self):
+        """쓰기가 있었거나 CATCH_UP_INTERVAL_SECONDS가 지났을 때만 저널 확인 (조회마다 DB를 읽지 않음)"""
+        if self._stale or time.monotonic() - self._last_catch_up >= CATCH_UP_INTERVAL_SECONDS:
+            self._catch_up()
+
+    def _catch_up(self):
+        """워터마크 이후의 저널에 나온 (서버, 사용자, 날짜)의 실제 출석을 다시 읽어 반영합니다"""
+        # 확인 도중의 쓰기는 다음 조회에서 다시 확인하도록 먼저 기록
+        self._stale = False
+        self._last_catch_up = time.monotonic()
+        with self.backend.session() as cursor:
+            journal = cursor.run('attendance_journal_since', (self._watermark,)).fetchall()
+            if not journal:
+                return 0
+
+            now = time.monotonic()
+            seen = {journal_id for journal_id, _, _, _ in journal}
+            for missing in range(self._watermark + 1, max(seen)):
+                if missing not in seen and missing not in self._applied:
+                    self._gaps.setdefault(missing, now)
+
+            changed = set()
+            for journal_id, guild_id, user_id, workout_date in journal:
+                if journal_id in self._applied:
+                    continue
+                self._applied.add(journal_id)
+                self._gaps.pop(journal_id, None)
+                changed.add((guild_id, user_id, to_date(workout_date)))
+
+            for guild_id in {guild_id for guild_id, _, _ in changed}:
+                guild_changed = [(user_id, workout_date) for g, user_id, workout_date in changed if g == guild_id]
+                for start_date, end_date in date_ranges({workout_date for _, workout_date in guild_changed}):
+                    present = attendance_between(self.backend, cursor, guild_id, start_date, end_date)
+                    for user_id, workout_date in guild_changed:
+                        if start_date <= workout_date <= end_date:
+                            self._set((guild_id, user_id), workout_date, (user_id, workout_date) in present)
+
+        # 빈 id 없이 이어지는 곳까지 (또는 오래 비어 있던 id는 건너뛰고) 워터마크 전진
+        while True:
+            next_id = self._watermark + 1
+            if next_id in self._applied:
+                self._applied.discard(next_id)
+            elif next_id in self._gaps and now - self._gaps[next_id] > JOURNAL_GAP_TIMEOUT:
+                del self._gaps[next_id]
+            else:
+                break
+            self._watermark = next_id
+        return len(changed)
+
+    # --- 조회 ---
+
+    def _count(self, key, start_date, end_date):
+        bits = self._row(key)
+        start = to_date(start_date).toordinal() - self._base
+        end = min(to_date(end_date).toordinal() - self._base, bits.bit_length() - 1)
+        if end < 0 or end < start:
+            return 0
+        start = max(start, 0)
+        return ((bits >> start) & ((1 << (end - start + 1)) - 1)).bit_count()
+
+    def count(self, guild_id, user_id, start_date, end_date):
+        """서버 안에서 기간 내(양 끝 포함) 사용자의 운동 일수"""
+        with self._lock:
+            self._maybe_catch_up()
+            return self._count((guild_param(guild_id), user_id), start_date, end_date)
+
+    def counts(self, guild_id, start_date, end_date):
+        """서버의 기간 내(양 끝 포함) 모든 사용자의 운동 일수 {user_id: 일수} (0일은 제외)"""
+        guild = guild_param(guild_id)
+        with self._lock:
+            self._maybe_catch_up()
+            # 이 서버의 행만 읽음 (다른 서버의 행은 mmap에 그대로 둠)
+            keys = [key for key in self._rows if key[0] == guild]
+            keys += [key for key in self._mapped if key[0] == guild]
+            counts = {user_id: self._count((row_guild, user_id), start_date, end_date) for row_guild, user_id in keys}
+        return {user_id: count for user_id, count in counts.items() if count}
@@ -0,0 +1,159 @@
+"""
+SQLite 저장소 백엔드
+==================
+MySQL 서버 없이 로컬 개발, 벤치마크, 소규모 운영에 사용하는 내장 저장소입니다.
+WAL 모드로 열어서 읽기(명령어)와 쓰기(동기화)가 서로를 막지 않도록 합니다.
+
+연결은 스레드마다 하나씩 열어 두고 재사용하므로, sqlite3의 연결별 문장 캐시
+(cached_statements)에 queries.py의 쿼리가 한 번씩만 컴파일되어 남습니다.
+"""
+
+import logging
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime, date, timedelta
+from calendar import monthrange
+from .base import StorageBackend, KST, to_date, weekly_refresh_start, monthly_refresh_start
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 연결별로 컴파일된 문장을 보관할 개수 (queries.py 쿼리 수보다 넉넉하게)
+STATEMENT_CACHE_SIZE = 128
+
+
+def mysql_week_number(day):
+    """MySQL WEEK(date, 1)과 같은 주차 번호(0~53, 월요일 시작)를 계산합니다"""
+    iso_year, iso_week, _ = day.isocalendar()
+    if iso_year < day.year:
+        # 연초의 며칠이 작년 마지막 ISO 주차에 속하는 경우
+        return 0
+    if iso_year > day.year:
+        # 연말의 며칠이 다음해 1주차에 속하는 경우 → 직전 주차 + 1
+        return mysql_week_number(day - timedelta(days=7)) + 1
+    return iso_week
+
+
+class SQLiteBackend(StorageBackend):
+    """sqlite3 기반 내장 저장소 백엔드 (WAL 모드)"""
+
+    name = "sqlite"
+
+    def __init__(self, path, read_only=False):
+        super().__init__()
+        self.path = path
+        # 읽기 복제본 역할로 열면 쓰기 쿼리를 거부 (PRAGMA query_only)
+        self.read_only = read_only
+        self._local = threading.local()
+
+    def connect_dedicated(self):
+        """SQLite 파일을 열고 WAL 모드 및 연결 옵션을 설정합니다"""
+        # 동기화는 executor 스레드에서 실행되므로 스레드 검사 비활성화
+        connection = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        if self.read_only:
+            connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def connect(self):
+        """현재 스레드의 연결을 반환합니다 (없으면 새로 열기)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self.connect_dedicated()
+        return connection
+
+    def release(self, conn):
+        """스레드별 연결은 문장 캐시를 유지하기 위해 닫지 않습니다"""
+
+    def prepare_query(self, query):
+        """`%s` 플레이스홀더를 sqlite3의 `?`로 변환합니다"""
+        return query.replace('%s', '?')
+
+    # --- 마이그레이션 지원 ---
+
+    def column_exists(self, cursor, table, column):
+        """PRAGMA table_info로 컬럼 존재 여부 확인"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
+
+    def scope_by_guild(self, cursor, table, definition):
+        """
+        고유 제약은 ALTER TABLE로 바꿀 수 없으므로 guild_id가 있는 새 테이블을 만들어 행을 옮긴 뒤 이름을 바꿉니다.
+        외래 키가 없는 새 테이블로 옮기므로 자식 테이블부터 실행해야 합니다 (멤버 테이블은 마지막).
+        """
+        if self.column_exists(cursor, table, 'guild_id'):
+            logger.info(f"ℹ️ 컬럼이 이미 존재합니다: {table}.guild_id")
+            return
+        new_table = f"{table}_by_guild"
+        cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+        cursor.execute(definition['create'].format(table=new_table))
+
+        cursor.execute(f"PRAGMA table_info({new_table})")
+        new_columns = {row[1] for row in cursor.fetchall()}
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = ', '.join(row[1] for row in cursor.fetchall() if row[1] in new_columns)
+
+        cursor.execute(f"INSERT INTO {new_table} ({columns}) SELECT {columns} FROM {table}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+        for statement in definition['indexes']:
+            cursor.execute(statement)
+
+    def is_lock_timeout(self, error):
+        """다른 연결이 쓰기 잠금을 잡고 있어 timeout 이후 실패한 경우"""
+        return isinstance(error, sqlite3.OperationalError) and (
+            'locked' in str(error) or 'busy' in str(error)
+        )
+
+    # --- 집계 (SQLite에 없는 날짜 함수는 Python에서 계산) ---
+
+    def refresh_weekly_records(self):
+        """최근 4주간의 주간 집계 업데이트 (MySQL WEEK(date, 1) 기준과 동일하게 Python에서 집계)"""
+        since = weekly_refresh_start(datetime.now(KST).date())
+
+        def work(cursor):
+            rows = cursor.run('attendance_since', (since.isoformat(),)).fetchall()
+
+            weeks = defaultdict(set)
+            for guild_id, user_id, user_name, workout_date in rows:
+                workout_date = to_date(workout_date)
+                week_start = workout_date - timedelta(days=workout_date.weekday())
+                key = (guild_id, user_id, user_name, workout_date.year, mysql_week_number(workout_date), week_start)
+                weeks[key].add(workout_date)
+
+            values = [
+                (guild_id, user_id, user_name, year, week_number, week_start.isoformat(),
+                 (week_start + timedelta(days=6)).isoformat(),
+                 len(days), round(len(days) / 7.0 * 100, 2))
+                for (guild_id, user_id, user_name, year, week_number, week_start), days in weeks.items()
+            ]
+            cursor.run_many('upsert_weekly_record', sorted(values))
+            return len(values)
+
+        return self.run_write(work, "주간 집계 업데이트", pin_reads=True)
+
+    def refresh_monthly_records(self):
+        """최근 3개월간의 월간 집계 업데이트"""
+        since = monthly_refresh_start(datetime.now(KST).date())
+
+        def work(cursor):
+            rows = cursor.run('monthly_attendance_counts', (since.isoformat(),)).fetchall()
+
+            values = []
+            for guild_id, user_id, user_name, year, month, workout_days in rows:
+                total_days = monthrange(year, month)[1]
+                values.append((
+                    guild_id, user_id, user_name, year, month,
+                    date(year, month, 1).isoformat(), date(year, month, total_days).isoformat(),
+                    workout_days, total_days, round(workout_days / total_days * 100, 2)
+                ))
+
+            cursor.run_many('upsert_monthly_record', sorted(values))
+            return len(values)
+
+        return self.run_write(work, "월간 집계 업데이트", pin_reads=True)
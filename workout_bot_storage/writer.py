@@ -0,0 +1,101 @@
+"""
+재시도 쓰기 계층
+==============
+출석 UPSERT처럼 여러 작업이 동시에 같은 키를 쓰는 트랜잭션을 실행합니다.
+
+- 쓰기 전에 키를 unique_guild_date_user 인덱스 순서 (guild_id, date, user_id)로 정렬하여
+  트랜잭션끼리 서로 다른 순서로 잠금을 잡는 교착 상태를 줄입니다.
+- InnoDB 교착 상태(1213)와 잠금 대기 시간 초과(1205), SQLite 'database is locked'는
+  트랜잭션 전체를 지터가 있는 지수 백오프로 재시도합니다.
+- 재시도/실패 횟수를 카운터로 노출합니다 (get_stats).
+"""
+
+import logging
+import random
+import threading
+import time
+from .base import to_date
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 재시도 설정
+MAX_WRITE_ATTEMPTS = 5
+BASE_RETRY_DELAY = 0.05  # 초
+MAX_RETRY_DELAY = 2.0  # 초
+
+
+def attendance_sort_key(user_id, workout_date):
+    """출석 키를 unique_guild_date_user (guild_id, date, user_id) 인덱스 순서로 정렬하기 위한 키 (서버 안에서)"""
+    return to_date(workout_date), str(user_id)
+
+
+class RetryingWriter:
+    """쓰기 트랜잭션을 교착 상태/잠금 대기 오류 시 재시도하는 실행기"""
+
+    def __init__(self, backend, max_attempts=MAX_WRITE_ATTEMPTS,
+                 base_delay=BASE_RETRY_DELAY, max_delay=MAX_RETRY_DELAY):
+        self.backend = backend
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._stats = {
+            'transactions': 0,   # 성공한 트랜잭션 수
+            'retries': 0,        # 재시도한 횟수 (전체)
+            'deadlocks': 0,      # 교착 상태로 재시도/실패한 횟수
+            'lock_waits': 0,     # 잠금 대기 시간 초과로 재시도/실패한 횟수
+            'failures': 0,       # 최종 실패한 트랜잭션 수
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def get_stats(self):
+        """재시도 카운터 스냅샷을 반환합니다"""
+        with self._lock:
+            return dict(self._stats)
+
+    def backoff_delay(self, attempt):
+        """attempt번째 재시도 전 대기 시간 (full jitter 지수 백오프)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def run(self, work, description="쓰기 작업"):
+        """
+        새 연결/트랜잭션에서 work(cursor)를 실행하고 commit 합니다.
+        재시도 가능한 잠금 오류는 트랜잭션 전체를 다시 실행하므로 work는 여러 번 호출될 수 있습니다.
+
+        Args:
+            work: cursor를 받아 쓰기 작업을 수행하는 함수
+            description: 로그용 작업 설명
+
+        Returns:
+            work의 반환값
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                with self.backend.session() as cursor:
+                    result = work(cursor)
+                self._count('transactions')
+                return result
+
+            except Exception as e:
+                conflict = self.backend.classify_write_conflict(e)
+                if conflict is None:
+                    self._count('failures')
+                    raise
+
+                self._count('deadlocks' if conflict == 'deadlock' else 'lock_waits')
+                if attempt >= self.max_attempts:
+                    self._count('failures')
+                    logger.error(f"❌ {description}: {conflict} 재시도 {self.max_attempts}회 실패 - {e}")
+                    raise
+
+                self._count('retries')
+                delay = self.backoff_delay(attempt)
+                logger.warning(
+                    f"⚠️ {description}: {conflict} 발생, {delay:.2f}초 후 재시도 "
+                    f"({attempt}/{self.max_attempts - 1})"
+                )
+                time.sleep(delay)
@@ -0,0 +1,172 @@
+"""
+백그라운드 작업 관리 모듈
+결과를 기다리지 않는 작업(DB 오류 알림, 미러 이어 받기 등)을 한곳에서 실행하고 관리합니다.
+
+- 실행 중인 작업의 참조를 보관해서 작업이 중간에 가비지 컬렉션되지 않습니다.
+- 짧은 작업(알림 등)은 동시에 MAX_CONCURRENT_TASKS개까지만 실행하고, 대기 중인 작업이 MAX_PENDING_TASKS를 넘으면
+  새 작업은 버립니다 (DB 장애로 알림이 쏟아져도 작업이 끝없이 늘지 않음).
+- 오래 걸리는 작업(시작 작업, 미러 백필, DM 발송)은 limited=False로 실행해 동시 실행 자리를 차지하지 않습니다.
+  (참조 보관과 종료 시 정리는 똑같이 적용)
+- executor 스레드처럼 이벤트 루프가 없는 곳에서도 spawn_background()를 호출할 수 있습니다.
+- 봇 종료 시 남은 작업을 SHUTDOWN_TIMEOUT_SECONDS까지 기다린 뒤 취소합니다.
+- 실패한 작업은 로그를 남기고, 작업 수/실패 수는 get_background_task_stats()로 조회합니다.
+
+사용법:
+    bind_task_supervisor()                                               # setup_hook에서 (이벤트 루프 지정)
+    spawn_background(send_database_error_alert(client, msg), "DB 오류 알림")
+    spawn_background(run_startup_tasks(), "시작 작업", limited=False)      # 오래 걸리는 작업
+    await drain_background_tasks()                                       # 봇 클래스의 close()에서
+"""
+
+import asyncio
+import logging
+import threading
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 동시에 실행하는 짧은 백그라운드 작업 수 (limited=False 작업은 세지 않음)
+MAX_CONCURRENT_TASKS = 8
+
+# 실행 중 + 대기 중인 작업이 이보다 많으면 새 작업은 버림
+MAX_PENDING_TASKS = 200
+
+# 봇 종료 시 남은 작업을 기다리는 최대 시간 (초)
+SHUTDOWN_TIMEOUT_SECONDS = 10
+
+_supervisor = None
+
+
+class TaskSupervisor:
+    """백그라운드 작업의 참조 보관, 동시 실행 제한, 종료 시 정리"""
+
+    def __init__(self, max_concurrent=MAX_CONCURRENT_TASKS, max_pending=MAX_PENDING_TASKS):
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self._loop = None
+        self._semaphore = None
+        self._tasks = set()
+        self._closing = False
+        self._lock = threading.Lock()  # 다른 스레드에서 버린 작업 수를 셀 때 사용
+        self._stats = {'spawned': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'dropped': 0}
+
+    def bind(self, loop):
+        """작업을 실행할 이벤트 루프 지정 (setup_hook에서 한 번)"""
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._closing = False
+
+    def _drop(self, coro, name, reason):
+        coro.close()  # 실행하지 않은 코루틴 경고 방지
+        with self._lock:
+            self._stats['dropped'] += 1
+        logger.warning(f"⚠️ 백그라운드 작업 '{name}'을(를) 실행하지 않았습니다: {reason}")
+
+    def spawn(self, coro, name=None, limited=True):
+        """
+        코루틴을 백그라운드 작업으로 실행합니다. 어느 스레드에서나 호출할 수 있습니다.
+
+        Args:
+            limited: False면 동시 실행 제한을 받지 않음 (몇 분씩 걸리는 작업이 알림을 막지 않도록)
+
+        Returns:
+            bool: 실행 예약 여부 (루프가 없거나 종료 중이거나 대기 작업이 너무 많으면 False)
+        """
+        name = name or getattr(coro, '__qualname__', '백그라운드 작업')
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._drop(coro, name, "이벤트 루프가 준비되지 않음")
+            return False
+        if self._closing:
+            self._drop(coro, name, "봇 종료 중")
+            return False
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return self._start(coro, name, limited)
+        else:
+            # executor 스레드 등에서 호출된 경우 루프 스레드에서 시작
+            try:
+                loop.call_soon_threadsafe(self._start, coro, name, limited)
+            except RuntimeError:
+                # 위의 확인 직후 루프가 닫힌 경우
+                self._drop(coro, name, "이벤트 루프 종료")
+                return False
+        return True
+
+    def _start(self, coro, name, limited):
+        if self._closing:
+            self._drop(coro, name, "봇 종료 중")
+            return False
+        if len(self._tasks) >= self.max_pending:
+            self._drop(coro, name, f"대기 중인 작업이 {self.max_pending}개를 넘음")
+            return False
+        self._stats['spawned'] += 1
+        task = self._loop.create_task(self._run(coro, name, limited), name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def _run(self, coro, name, limited):
+        try:
+            if limited:
+                async with self._semaphore:
+                    await coro
+            else:
+                await coro
+        except asyncio.CancelledError:
+            self._stats['cancelled'] += 1
+            coro.close()
+            raise
+        except Exception as e:
+            self._stats['failed'] += 1
+            logger.error(f"❌ 백그라운드 작업 '{name}' 실패: {type(e).__name__}: {e}", exc_info=e)
+        else:
+            self._stats['completed'] += 1
+
+    async def drain(self, timeout=SHUTDOWN_TIMEOUT_SECONDS):
+        """새 작업을 받지 않고, 남은 작업을 timeout초까지 기다린 뒤 나머지는 취소합니다"""
+        self._closing = True
+        if not self._tasks:
+            return
+        logger.info(f"⏳ 남은 백그라운드 작업 {len(self._tasks)}개를 기다립니다...")
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"⚠️ 종료 시간 안에 끝나지 않은 백그라운드 작업 {len(pending)}개를 취소했습니다.")
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, running=len(self._tasks))
+
+
+def get_task_supervisor():
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = TaskSupervisor()
+    return _supervisor
+
+
+def bind_task_supervisor():
+    """현재 실행 중인 이벤트 루프에서 백그라운드 작업을 실행하도록 지정 (setup_hook에서 호출)"""
+    get_task_supervisor().bind(asyncio.get_running_loop())
+
+
+def spawn_background(coro, name=None, limited=True):
+    """결과를 기다리지 않는 작업 실행 (어느 스레드에서나 호출 가능, 예약 여부 반환, 오래 걸리는 작업은 limited=False)"""
+    return get_task_supervisor().spawn(coro, name, limited)
+
+
+async def drain_background_tasks(timeout=SHUTDOWN_TIMEOUT_SECONDS):
+    """봇 종료 시 남은 백그라운드 작업을 timeout초까지 기다린 뒤 취소 (봇 클래스의 close()에서 호출)"""
+    await get_task_supervisor().drain(timeout)
+
+
+def get_background_task_stats():
+    """시작/완료/실패/취소/버린 작업 수와 실행 중인 작업 수"""
+    return get_task_supervisor().stats()